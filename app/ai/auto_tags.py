@@ -5,6 +5,7 @@ We map specialty buckets to curated keyword/phrase lists, match with
 word/phrase boundaries, score by hit count, and return the top tags.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Tuple
 import re
 
@@ -1331,12 +1332,13 @@ def _build_phrase_regex(phrase: str) -> re.Pattern:
     return re.compile(rf"(?:^|[^a-z0-9]){escaped}(?:$|[^a-z0-9])", re.IGNORECASE)
 
 
-_SPECIALTY_PATTERNS: Dict[str, List[Tuple[re.Pattern, str]]] = {}
-for specialty, phrases in SPECIALTY_KEYWORDS.items():
-    compiled: List[Tuple[re.Pattern, str]] = []
-    for p in phrases:
-        compiled.append((_build_phrase_regex(p), p))
-    _SPECIALTY_PATTERNS[specialty] = compiled
+@lru_cache(maxsize=1)
+def _specialty_patterns() -> Dict[str, List[Tuple[re.Pattern, str]]]:
+    """Compiled on first use: ~1k regexes are too slow to build at import time."""
+    return {
+        specialty: [(_build_phrase_regex(p), p) for p in phrases]
+        for specialty, phrases in SPECIALTY_KEYWORDS.items()
+    }
 
 
 def _score_specialties(blob: str) -> List[Tuple[str, int, List[str]]]:
@@ -1346,7 +1348,7 @@ def _score_specialties(blob: str) -> List[Tuple[str, int, List[str]]]:
     if not blob:
         return []
     scores: List[Tuple[str, int, List[str]]] = []
-    for key, patterns in _SPECIALTY_PATTERNS.items():
+    for key, patterns in _specialty_patterns().items():
         matches: List[str] = []
         count = 0
         for regex, phrase in patterns:
@@ -1,7 +1,10 @@
 # app/ai/classifier.py
 from typing import Optional, Tuple, List
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 # pull in your beefed-up taxonomy
 try:
     from app.ai.taxonomy import BASE_CATEGORIES
@@ -109,8 +112,7 @@ def classify_opportunity(
 
     # 4) LLM fallback
     if llm_client is None:
-        # keep this loud while we tune
-        print(f"[AI classifier] llm_client is None -> keeping rule result {best_cat} {best_conf}")
+        logger.debug(f"llm_client is None -> keeping rule result {best_cat} {best_conf}")
         return best_cat, best_conf
 
     try:
@@ -155,17 +157,17 @@ def classify_opportunity(
         llm_cat = llm_cat.replace(".", "").strip()
 
         if llm_cat in BASE_CATEGORIES:
-            print(f"[AI classifier] LLM picked {llm_cat}")
+            logger.debug(f"LLM picked {llm_cat}")
             return llm_cat, 0.9
 
         # sometimes LLM says "construction project" or "it/software"
         for cat in BASE_CATEGORIES:
             if cat in llm_cat:
-                print(f"[AI classifier] LLM fuzzy -> {cat}")
+                logger.debug(f"LLM fuzzy -> {cat}")
                 return cat, 0.85
 
     except Exception as e:
-        print(f"[AI classifier] LLM error: {e}")
+        logger.warning(f"LLM error: {e}")
 
     # 5) fallback to rule-based
     return best_cat, best_conf
@@ -7,6 +7,7 @@ import re
 from urllib.parse import urlparse
 from typing import Any, Callable, Dict, List, Sequence
 
+from app.core import metrics
 from app.core.settings import settings
 
 logger = logging.getLogger("ai_client")
@@ -71,7 +72,10 @@ class OllamaGenerateClient:
             resp.raise_for_status()
             return resp.json()
 
-        data = retry_with_backoff(_call)
+        with metrics.llm_call("ollama", self.model) as call:
+            data = retry_with_backoff(_call)
+            call.prompt_tokens = int(data.get("prompt_eval_count") or 0)
+            call.completion_tokens = int(data.get("eval_count") or 0)
         # /api/generate returns {"response": "...", ...}
         return data.get("response", "").strip()
 
@@ -100,7 +104,11 @@ class OpenAIChatClient:
                 response_format={"type": "json_object"} if format == "json" else None,
             )
 
-        resp = retry_with_backoff(_call)
+        with metrics.llm_call("openai", self.model) as call:
+            resp = retry_with_backoff(_call)
+            usage = getattr(resp, "usage", None)
+            call.prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+            call.completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
         content = resp.choices[0].message.content if resp.choices else ""
         return (content or "").strip()
 
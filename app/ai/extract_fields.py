@@ -1,8 +1,11 @@
 # app/ai/extract_fields.py
 import re
 import json
+import logging
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
 DATE_PAT = re.compile(
     r"(?:due|closing|proposal(?:s)? due|bids? due)\s*[:\-]?\s*"
     r"([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{2,4})",
@@ -73,5 +76,5 @@ def extract_key_fields(text: str, llm_client=None) -> Dict[str, Any]:
         merged = {**llm_data, **data}
         return merged
     except Exception as e:
-        print(f"[AI extract_fields] LLM parse error: {e}")
+        logger.warning(f"LLM parse error: {e}")
         return data
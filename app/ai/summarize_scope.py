@@ -1,6 +1,9 @@
 # app/ai/summarize_scope.py
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 def summarize_scope(
     title: str = "",
     description: str = "",
@@ -46,6 +49,6 @@ def summarize_scope(
         summary = llm_client.chat(messages, temperature=0)
         return summary.strip()
     except Exception as e:
-        print(f"[AI summarize_scope] LLM error: {e}")
+        logger.warning(f"LLM error: {e}")
         words = blob.split()
         return " ".join(words[:max_words])
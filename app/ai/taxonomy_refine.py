@@ -1,7 +1,10 @@
 # app/ai/taxonomy_refine.py
+import logging
 from typing import List, Dict, Any
 from .taxonomy import BASE_CATEGORIES
 
+logger = logging.getLogger(__name__)
+
 def suggest_new_keywords(
     title: str,
     description: str = "",
@@ -57,5 +60,5 @@ def suggest_new_keywords(
             "new_keywords": [kw.strip().lower() for kw in new_keywords if kw.strip()],
         }
     except Exception as e:
-        print(f"[AI taxonomy_refine] LLM error: {e}")
+        logger.warning(f"LLM error: {e}")
         return {}
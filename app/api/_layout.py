@@ -1,10 +1,7 @@
 ﻿# app/routers/_layout.py
 
 from typing import Dict, Optional
-import sqlite3
-import os
-from urllib.parse import urlparse
-from app.core.settings import settings
+from app.services.tier import get_tier_info
 
 def _nav_links_html(user_email: Optional[str]) -> str:
     # Match Homepage_test /opportunities sidebar markup/icons
@@ -165,121 +162,17 @@ def _cookie_consent_html() -> str:
 </div>
     """
 
-_TIER_ORDER = {"free": 0, "starter": 1, "professional": 2, "enterprise": 3}
-
-
-def _normalize_tier(raw: Optional[str]) -> str:
-    mapping = {
-        "free": "Free",
-        "starter": "Starter",
-        "professional": "Professional",
-        "enterprise": "Enterprise",
-    }
-    key = (raw or "Free").strip().lower()
-    return mapping.get(key, "Free")
-
-
-def _get_user_tier_info(user_email: Optional[str]) -> Dict[str, Optional[str]]:
+async def _get_user_tier_info(user_email: Optional[str]) -> Dict[str, Optional[str]]:
     """
-    Best-effort effective tier lookup for the header badge and billing.
+    Effective tier for the header badge and billing (cached; app/services/tier.py).
     Returns a dict with keys: effective, label, source, team_id, team_name, team_member_count.
     """
-    default = {
-        "effective": "Free",
-        "label": "Free",
-        "source": "self",
-        "team_id": None,
-        "team_name": None,
-        "team_member_count": 0,
-        "user_id": None,
-    }
-    if not user_email:
-        return default
-    db_url = settings.DB_URL or ""
-    if not db_url.startswith("sqlite"):
-        return default
-    try:
-        # Normalize path for sqlite+aiosqlite:///./muni_local.db
-        if db_url.startswith("sqlite+aiosqlite:///"):
-            db_path = db_url.split(":///")[-1]
-        else:
-            parsed = urlparse(db_url.replace("sqlite+aiosqlite", "sqlite"))
-            db_path = parsed.path
-            if db_path.startswith("//"):
-                db_path = db_path[1:]
-        db_path = os.path.abspath(db_path)
-        conn = sqlite3.connect(db_path)
-        try:
-            cur = conn.execute(
-                "SELECT id, team_id, COALESCE(Tier, tier) FROM users WHERE lower(email) = lower(?) LIMIT 1",
-                (user_email,),
-            )
-            row = cur.fetchone()
-            if not row:
-                return default
-            user_id, team_id, raw_tier = row
-            user_tier = _normalize_tier(raw_tier)
-
-            team_name = None
-            team_member_count = 0
-            effective_tier = user_tier
-            via_team = False
-
-            if team_id:
-                # Pull owner tier + team name
-                tcur = conn.execute(
-                    """
-                    SELECT t.name, COALESCE(u.Tier, u.tier) AS owner_tier
-                    FROM teams t
-                    LEFT JOIN users u ON u.id = t.owner_user_id
-                    WHERE t.id = ?
-                    LIMIT 1
-                    """,
-                    (team_id,),
-                )
-                trow = tcur.fetchone()
-                if trow:
-                    team_name = trow[0] or "Team"
-                    owner_tier = _normalize_tier(trow[1])
-                    if _TIER_ORDER.get(owner_tier.lower(), 0) > _TIER_ORDER.get(user_tier.lower(), 0):
-                        effective_tier = owner_tier
-                        via_team = True
-                try:
-                    ccur = conn.execute(
-                        "SELECT COUNT(*) FROM team_members WHERE team_id = ? AND (accepted_at IS NOT NULL OR role = 'owner')",
-                        (team_id,),
-                    )
-                    crow = ccur.fetchone()
-                    team_member_count = int(crow[0]) if crow and crow[0] is not None else 0
-                except Exception:
-                    team_member_count = 0
-
-            label = f"{effective_tier} (via Team)" if via_team else effective_tier
-            info = {
-                "effective": effective_tier,
-                "label": label,
-                "source": "team" if via_team else "self",
-                "team_id": team_id,
-                "team_name": team_name,
-                "team_member_count": team_member_count,
-                "user_id": user_id,
-            }
-            try:
-                print(
-                    f"[tier lookup] email={user_email} tier={effective_tier} label={label} via_team={via_team} db={db_path}"
-                )
-            except Exception:
-                pass
-            return info
-        finally:
-            conn.close()
-    except Exception:
-        return default
-
-
-def _get_user_tier(user_email: Optional[str]) -> str:
+    return await get_tier_info(user_email)
+
+
+async def _get_user_tier(user_email: Optional[str]) -> str:
     """Compatibility wrapper used by older views; returns the effective label."""
-    return _get_user_tier_info(user_email).get("label", "Free")
+    return (await get_tier_info(user_email)).get("label", "Free")
 
 
 def page_shell(body_html: str, title: str, user_email: Optional[str]) -> str:
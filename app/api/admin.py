@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, Request
 from app.core.scheduler import job_daily_digest
-from app.ingest.runner import run_ingestors_once
-from app.ingest.municipalities import city_columbus
+from app.ingest.runner import run_ingestors_once, source_names
+from app.ingest.source_schedule import get_schedule, reset_schedule
+from app.core import data_version
 from app.core.db_core import save_opportunities
 from app.core.settings import settings
 from app.auth.session import get_current_user_email
@@ -32,10 +33,24 @@ async def send_digest_now(user=Depends(require_web_admin)):
 
 @router.post("/run-columbus")
 async def run_columbus(user=Depends(require_web_admin)):
+    from app.ingest.municipalities import city_columbus
+
     items = await city_columbus.fetch()
     written = await save_opportunities(items)
+    if written:
+        await data_version.bump(data_version.OPPORTUNITIES)
     return {
         "source": "city_columbus",
         "scraped": len(items),
         "processed": written,
     }
+
+@router.get("/source-schedule")
+async def source_schedule(user=Depends(require_web_admin)):
+    rows = await get_schedule(source_names())
+    return {"sources": rows}
+
+@router.post("/source-schedule/reset")
+async def source_schedule_reset(source: str | None = None, user=Depends(require_web_admin)):
+    await reset_schedule([source] if source else None)
+    return {"status": "ok", "source": source or "all"}
@@ -1,24 +1,12 @@
 from fastapi import HTTPException, Request
 
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.core.db_core import engine
 from app.services.company_profile_template import merge_company_profile_defaults
 
 
 async def require_user_with_team(request: Request) -> dict:
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email, team_id FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"], "team_id": m.get("team_id")}
+    return (await require_identity(request)).as_dict()
 
 
 async def ensure_user_can_access_opportunity(user: dict, opportunity_id: str) -> None:
@@ -13,6 +13,8 @@ from pathlib import Path
 
 from app.core.db import AsyncSessionLocal
 from app.security import hash_password, verify_password
+from app.auth.identity import invalidate_identity
+from app.services.tier import invalidate_tier
 from app.auth.session import create_session_token, get_current_user_email, SESSION_COOKIE_NAME
 from app.core.settings import settings
 from app.api.team import _ensure_team_feature_access
@@ -186,6 +188,8 @@ async def _auto_accept_invite(email: str) -> None:
                 {"email": email, "team": team_id},
             )
             await session.commit()
+            invalidate_identity(email=email)
+            invalidate_tier(email=email)
     except SQLAlchemyError:
         # Don't block auth on invite acceptance failures.
         return
@@ -987,6 +991,7 @@ async def update_profile(request: Request, payload: dict):
             {"fn": first_name, "ln": last_name, "email": user_email},
         )
         await db.commit()
+        invalidate_identity(email=user_email)
     return {"ok": True}
 
 
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from app.core import data_version
 from app.core.db_core import engine
-from app.auth.session import get_current_user_email  # uses session cookie
+from app.auth.identity import require_identity
 from app.services import record_milestone
 
 router = APIRouter(prefix="/tracker", tags=["tracker"])
@@ -11,36 +12,13 @@ router = APIRouter(prefix="/tracker", tags=["tracker"])
 # ============================================================
 
 async def _require_user(request: Request):
-    """
-    Return {'id': int, 'email': str} based on session cookie.
-    Raise 401 if not logged in or missing user.
-    """
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email FROM users WHERE email = :e LIMIT 1",
-            {"e": email}
-        )
-        row = res.first()
+    """{id, email, team_id, tier, is_admin, role} of the session user; 401 if not logged in."""
+    return (await require_identity(request)).as_dict()
 
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
 
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"]}
-
-
-async def _user_team_id(user_id: int) -> int | None:
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT team_id FROM users WHERE id = :uid LIMIT 1",
-            {"uid": user_id}
-        )
-        row = res.first()
-        return row[0] if row else None
+async def _trackers_changed(user) -> None:
+    """Revalidate the user's cached listing / calendar feed (app/core/http_cache.py)."""
+    await data_version.bump(data_version.user_scope("trackers", user["email"]))
 
 
 async def _resolve_opportunity_id(key: str) -> int:
@@ -87,7 +65,7 @@ async def tracker_count(user=Depends(_require_user)):
     """
     Return count of active (non-archived) tracked opportunities for the current user.
     """
-    team_id = await _user_team_id(user["id"])
+    team_id = user["team_id"]
     async with engine.begin() as conn:
         res = await conn.exec_driver_sql(
             """
@@ -112,7 +90,7 @@ async def track_opportunity(opportunity_key: str, user=Depends(_require_user)):
     Safe to call repeatedly — ON CONFLICT DO NOTHING.
     """
     oid = await _resolve_opportunity_id(opportunity_key)
-    team_id = await _user_team_id(user["id"])
+    team_id = user["team_id"]
 
     async with engine.begin() as conn:
         await conn.exec_driver_sql(
@@ -131,6 +109,7 @@ async def track_opportunity(opportunity_key: str, user=Depends(_require_user)):
             {"uid": user["id"]},
         )
         count = count_res.scalar() or 0
+    await _trackers_changed(user)
 
     first_time = await record_milestone(user["email"], "tracked_first", {"opportunity_id": oid})
 
@@ -185,7 +164,7 @@ async def update_tracker(opportunity_key: str, payload: dict, user=Depends(_requ
     Upsert tracker row, then update status/notes.
     """
     oid = await _resolve_opportunity_id(opportunity_key)
-    team_id = await _user_team_id(user["id"])
+    team_id = user["team_id"]
 
     # Always ensure the row exists first (idempotent)
     async with engine.begin() as conn:
@@ -229,6 +208,7 @@ async def update_tracker(opportunity_key: str, payload: dict, user=Depends(_requ
         async with engine.begin() as conn:
             await conn.exec_driver_sql(sql, params)
 
+    await _trackers_changed(user)
     return {"ok": True}
 
 @router.get("/mine")
@@ -237,7 +217,7 @@ async def my_tracked(user=Depends(_require_user)):
     Return list of all tracked opportunities for current user.
     Used for dashboard view.
     """
-    team_id = await _user_team_id(user["id"])
+    team_id = user["team_id"]
     async with engine.begin() as conn:
         res = await conn.exec_driver_sql(
             """
@@ -304,6 +284,7 @@ async def delete_tracker(opportunity_key: str, user=Depends(_require_user)):
             {"uid": user["id"]},
         )
         count = count_res.scalar() or 0
+    await _trackers_changed(user)
 
     return {"ok": True, "count": count}
 
@@ -313,7 +294,7 @@ async def tracker_count(user=Depends(_require_user)):
     """
     Return count of active (non-archived) tracked opportunities for the current user.
     """
-    team_id = await _user_team_id(user["id"])
+    team_id = user["team_id"]
     async with engine.begin() as conn:
         res = await conn.exec_driver_sql(
             """
@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 
 from fastapi import APIRouter, Request, HTTPException
@@ -5,11 +6,15 @@ from fastapi.responses import HTMLResponse
 from fastapi.responses import JSONResponse, RedirectResponse
 
 from app.api._layout import page_shell, _get_user_tier, _get_user_tier_info
+from app.auth.identity import invalidate_identity
+from app.services.tier import invalidate_tier
 from app.auth.session import get_current_user_email
 from app.core.settings import settings
 from app.core.db import AsyncSessionLocal
 from sqlalchemy import text
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["billing"])
 
 
@@ -76,8 +81,10 @@ async def _sync_tier_from_stripe(user_email: str | None) -> None:
                 {"tier": tier, "email": user_email, "cid": customer_id, "sid": sub.get("id"), "next_billing_at": next_bill_iso},
             )
             await db.commit()
+            invalidate_identity(email=user_email)
+            invalidate_tier(email=user_email)
         try:
-            print(f"[billing sync] refreshed tier for {user_email}: {tier} via subscription {sub.get('id')}")
+            logger.info(f"billing sync: refreshed tier for {user_email}: {tier} via subscription {sub.get('id')}")
         except Exception:
             pass
     except Exception:
@@ -438,15 +445,17 @@ async def stripe_webhook(request: Request):
                     updates,
                 )
                 await db.commit()
+                invalidate_identity(email=email)
+                invalidate_tier(email=email)
         try:
-            print(
-                f"[stripe webhook] type={event_type} email={email} tier={tier} customer={customer_id} subscription={subscription_id}"
+            logger.info(
+                f"stripe webhook: type={event_type} email={email} tier={tier} customer={customer_id} subscription={subscription_id}"
             )
         except Exception:
             pass
     else:
         try:
-            print(f"[stripe webhook] type={event_type} email={email} payment_link={data.get('payment_link')} price_id={price_id_dbg} tier_resolved={tier}")
+            logger.info(f"stripe webhook: type={event_type} email={email} payment_link={data.get('payment_link')} price_id={price_id_dbg} tier_resolved={tier}")
         except Exception:
             pass
 
@@ -483,7 +492,7 @@ async def billing_portal(request: Request):
 
         customer_id = stored_customer_id
         try:
-            print(f"[stripe portal] stored_customer_id={stored_customer_id} for {user_email}")
+            logger.debug(f"stripe portal: stored_customer_id={stored_customer_id} for {user_email}")
         except Exception:
             pass
         items = []
@@ -501,7 +510,7 @@ async def billing_portal(request: Request):
             created = stripe.Customer.create(email=user_email, name=user_email)
             customer_id = created["id"]
             try:
-                print(f"[stripe portal] created new Stripe customer {customer_id} for {user_email}")
+                logger.info(f"stripe portal: created new Stripe customer {customer_id} for {user_email}")
             except Exception:
                 pass
         if customer_id and customer_id != stored_customer_id:
@@ -523,26 +532,27 @@ async def billing_portal(request: Request):
                 )
                 await db.commit()
             try:
-                print(f"[stripe portal] saved customer_id for {user_email}: {customer_id}")
+                logger.info(f"stripe portal: saved customer_id for {user_email}: {customer_id}")
             except Exception:
                 pass
             # Verify persisted value for debugging
-            try:
-                async with AsyncSessionLocal() as db:
-                    check = await db.execute(
-                        text(
-                            "SELECT stripe_customer_id FROM users WHERE lower(email) = lower(:email) LIMIT 1"
-                        ),
-                        {"email": user_email},
-                    )
-                    row = check.fetchone()
-                    persisted = row[0] if row else None
-                    print(f"[stripe portal] persisted stripe_customer_id={persisted} for {user_email}")
-            except Exception:
-                pass
+            if logger.isEnabledFor(logging.DEBUG):
+                try:
+                    async with AsyncSessionLocal() as db:
+                        check = await db.execute(
+                            text(
+                                "SELECT stripe_customer_id FROM users WHERE lower(email) = lower(:email) LIMIT 1"
+                            ),
+                            {"email": user_email},
+                        )
+                        row = check.fetchone()
+                        persisted = row[0] if row else None
+                        logger.debug(f"stripe portal: persisted stripe_customer_id={persisted} for {user_email}")
+                except Exception:
+                    pass
         else:
             try:
-                print(f"[stripe portal] using existing customer_id for {user_email}: {customer_id}")
+                logger.info(f"stripe portal: using existing customer_id for {user_email}: {customer_id}")
             except Exception:
                 pass
         base = str(request.base_url).rstrip("/")
@@ -563,7 +573,7 @@ async def billing_portal(request: Request):
         raise
     except Exception as exc:  # pragma: no cover
         try:
-            print(f"[stripe portal] unexpected error: {exc}")
+            logger.exception(f"stripe portal: unexpected error: {exc}")
         except Exception:
             pass
         raise HTTPException(status_code=502, detail="Could not create portal session") from exc
@@ -572,5 +582,5 @@ async def billing_portal(request: Request):
 @router.get("/billing/debug-tier", response_class=JSONResponse, include_in_schema=False)
 async def billing_debug_tier(request: Request):
     email = get_current_user_email(request)
-    info = _get_user_tier_info(email)
+    info = await _get_user_tier_info(email)
     return {"email": email, "tier": info.get("effective"), "label": info.get("label"), "source": info.get("source")}
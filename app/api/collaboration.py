@@ -6,6 +6,7 @@ import uuid
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
+from app.auth.identity import lookup_identity
 from app.auth.session import SESSION_COOKIE_NAME, parse_session_token
 from app.core.db_core import engine
 
@@ -61,16 +62,8 @@ async def _get_user_for_ws(ws: WebSocket) -> Dict[str, Any] | None:
     email = parse_session_token(token)
     if not email:
         return None
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email, team_id FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        return None
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"], "team_id": m.get("team_id")}
+    ident = await lookup_identity(email)
+    return ident.as_dict() if ident else None
 
 
 async def _user_can_access_response(user: Dict[str, Any], response_id: int) -> Dict[str, Any] | None:
@@ -2,37 +2,20 @@ from fastapi import APIRouter
 import httpx
 import urllib.parse
 
-router = APIRouter(tags=["columbus_detail"])
-
-BASE_URL_HEADERS = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqheaders"
-BASE_URL_ATTACH  = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqattachments"
-BASE_URL_ITEMS   = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqitems"
-
-
-def _browsery_headers():
-    # Some portals care that we look like a browser and accept JSON.
-    return {
-        "Accept": "application/json",
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120 Safari/537.36"
-        ),
-    }
+from app.core.columbus_portal import (
+    BASE_URL_ATTACH,
+    BASE_URL_ITEMS,
+    browser_headers,
+    build_attachments_query_url,
+    build_header_query_url,
+    build_items_query_url,
+)
 
+router = APIRouter(tags=["columbus_detail"])
 
 #
 # 1. MAIN HEADER LOOKUP
 #
-def build_header_query_url(rfq_case_id: str) -> str:
-    # We ask for just this RFQ (case id like "RFQ031521"), all columns.
-    params = {
-        "$filter": f"cr820_rfqcaseid eq '{rfq_case_id}'",
-        "$select": "*",
-    }
-    return BASE_URL_HEADERS + "?" + urllib.parse.urlencode(params, safe="$, '")
-
-
 @router.get("/columbus_detail/{rfq_case_id}")
 async def get_rfq_header(rfq_case_id: str):
     """
@@ -43,7 +26,7 @@ async def get_rfq_header(rfq_case_id: str):
     url = build_header_query_url(rfq_case_id)
 
     async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(url, headers=_browsery_headers())
+        resp = await client.get(url, headers=browser_headers())
 
     if resp.status_code != 200:
         return {
@@ -104,23 +87,6 @@ async def get_rfq_header(rfq_case_id: str):
 #
 # 2. ATTACHMENTS LOOKUP
 #
-def build_attachments_query_url(rfq_header_id: str) -> str:
-    """
-    Guessed Dataverse collection name: cr820_rfqattachments
-    Guessed FK: _cr820_rfqheaderid_value (typical pattern)
-    We request * so we can see what fields are actually there.
-    """
-    # We try the most likely FK column naming pattern.
-    # If this 400s, we'll inspect the debug response.
-    raw_filter = f"_cr820_rfqheaderid_value eq {rfq_header_id!r}"
-
-    params = {
-        "$filter": raw_filter,
-        "$select": "*",
-    }
-    return BASE_URL_ATTACH + "?" + urllib.parse.urlencode(params, safe="$, '")
-
-
 @router.get("/columbus_detail/{rfq_header_id}/attachments")
 async def get_rfq_attachments(rfq_header_id: str):
     """
@@ -130,7 +96,7 @@ async def get_rfq_attachments(rfq_header_id: str):
     url = build_attachments_query_url(rfq_header_id)
 
     async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(url, headers=_browsery_headers())
+        resp = await client.get(url, headers=browser_headers())
 
     if resp.status_code != 200:
         return {
@@ -173,21 +139,6 @@ async def get_rfq_attachments(rfq_header_id: str):
 #
 # 3. LINE ITEMS LOOKUP
 #
-def build_items_query_url(rfq_header_id: str) -> str:
-    """
-    Guessed Dataverse collection name: cr820_rfqitems
-    Guessed FK: _cr820_rfqheaderid_value
-    We'll try to pull line number, description, qty, UOM.
-    """
-    raw_filter = f"_cr820_rfqheaderid_value eq {rfq_header_id!r}"
-
-    params = {
-        "$filter": raw_filter,
-        "$select": "*",
-    }
-    return BASE_URL_ITEMS + "?" + urllib.parse.urlencode(params, safe="$, '")
-
-
 @router.get("/columbus_detail/{rfq_header_id}/items")
 async def get_rfq_items(rfq_header_id: str):
     """
@@ -197,7 +148,7 @@ async def get_rfq_items(rfq_header_id: str):
     url = build_items_query_url(rfq_header_id)
 
     async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(url, headers=_browsery_headers())
+        resp = await client.get(url, headers=browser_headers())
 
     if resp.status_code != 200:
         return {
@@ -242,7 +193,7 @@ async def debug_attachments_sample():
     url = BASE_URL_ATTACH + "?" + urllib.parse.urlencode(params, safe="$, '")
 
     async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(url, headers=_browsery_headers())
+        resp = await client.get(url, headers=browser_headers())
 
     return {
         "status_code": resp.status_code,
@@ -266,7 +217,7 @@ async def debug_items_sample():
     url = BASE_URL_ITEMS + "?" + urllib.parse.urlencode(params, safe="$, '")
 
     async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(url, headers=_browsery_headers())
+        resp = await client.get(url, headers=browser_headers())
 
     return {
         "status_code": resp.status_code,
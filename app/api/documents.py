@@ -1,9 +1,10 @@
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
 from app.api._layout import page_shell
+from app.auth.identity import require_identity
 from app.auth.session import get_current_user_email
 from app.core.db_core import engine
 from app.storage import create_presigned_get
@@ -865,19 +866,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
 @router.get("/documents/data")
 async def documents_data(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    uid = (await require_identity(request)).id
 
     async with engine.begin() as conn:
-        user_row = await conn.exec_driver_sql(
-            "SELECT id FROM users WHERE lower(email)=lower(:e) LIMIT 1", {"e": email}
-        )
-        row = user_row.first()
-        if not row:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-        uid = row[0]
-
         # Get all user uploads with folder_type
         files_res = await conn.exec_driver_sql(
             """
@@ -5,7 +5,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
 
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.core.db_core import engine
 from app.services.document_processor import DocumentProcessor
 from app.api.uploads import ALLOWED_EXT, ALLOWED_MIME, MAX_BYTES, sanitize_filename
@@ -34,19 +34,8 @@ DOC_TYPES = {
 
 
 async def _require_user(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email, team_id FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"], "team_id": m.get("team_id")}
+    """{id, email, team_id, tier, is_admin, role} of the session user; 401 if not logged in."""
+    return (await require_identity(request)).as_dict()
 
 
 def _parse_tags(raw: str | list | None) -> list:
@@ -0,0 +1,73 @@
+# app/api/metrics.py
+import calendar
+import logging
+import secrets
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from app.api.admin import require_web_admin
+from app.core import metrics
+from app.core.settings import settings
+from app.ingest.runner import source_names
+from app.ingest.source_schedule import get_schedule
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def require_metrics_access(request: Request):
+    """Admin session, or `Authorization: Bearer <METRICS_TOKEN>` for a Prometheus scraper."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = settings.METRICS_TOKEN
+    auth = request.headers.get("authorization", "")
+    if token and auth.lower().startswith("bearer ") and secrets.compare_digest(auth[7:].strip(), token):
+        return "metrics-token"
+    return await require_web_admin(request)
+
+
+def _epoch(val):
+    if val is None:
+        return None
+    if not isinstance(val, datetime):
+        try:
+            val = datetime.fromisoformat(str(val))
+        except ValueError:
+            return None
+    return calendar.timegm(val.utctimetuple())
+
+
+async def _source_gauges() -> str:
+    """Last run per source from source_schedule, so scrapes in worker processes show up too."""
+    rows = await get_schedule(source_names())
+    duration, saved, last_run = [], [], []
+    for r in rows:
+        labels = {"source": r["source"]}
+        if r.get("last_duration_s") is not None:
+            duration.append((labels, float(r["last_duration_s"])))
+        ran_at = _epoch(r.get("last_run_at"))
+        if ran_at is not None:
+            saved.append((labels, int(r.get("last_rows") or 0)))
+            last_run.append((labels, ran_at))
+    return (
+        metrics.render_gauge("ingest_source_last_duration_seconds", "Duration of the last run per source.", duration)
+        + metrics.render_gauge("ingest_source_last_rows", "Rows saved by the last run per source.", saved)
+        + metrics.render_gauge(
+            "ingest_source_last_run_timestamp_seconds", "Unix time (UTC) of the last run per source.", last_run
+        )
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(user=Depends(require_metrics_access)):
+    body = metrics.render()
+    try:
+        body += await _source_gauges()
+    except Exception as exc:
+        logger.debug(f"metrics: source schedule unavailable: {exc}")
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
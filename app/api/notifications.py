@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
+from app.auth.identity import invalidate_identity
+from app.services.tier import invalidate_tier
 from app.auth.session import get_current_user_email
 from app.core.db import AsyncSessionLocal
 
@@ -387,5 +389,7 @@ async def act_on_notification(request: Request, notification_id: str, payload: D
             {"ts": dt.datetime.utcnow(), "id": notification_id, "uid": user_id},
         )
         await session.commit()
+        invalidate_identity(email=user_email)
+        invalidate_tier(email=user_email)
 
     return {"ok": True}
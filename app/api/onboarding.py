@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy import text
+from app.core import data_version
 from app.core.db_core import engine
 from app.api._layout import page_shell
 from app.auth.auth_utils import require_login
@@ -476,6 +477,7 @@ async def onboarding_post(
                     "agencies": agencies_json,
                 },
             )
+        await data_version.bump(data_version.user_scope("preferences", user_email))
 
         # show success confirmation view instead of blind redirect
         success_body = _render_success(
@@ -8,10 +8,12 @@ import math
 import json
 import datetime as dt
 
-from app.core.db_core import engine
+from app.core.db_core import read_engine
 from app.api._layout import page_shell
 from app.auth.auth_utils import require_login
+from app.auth.identity import get_identity
 from app.data.agencies import AGENCIES
+from app.services.open_set import get_open_set
 
 TEMPLATE_DIR = Path(__file__).parent / "templates" / "opportunities"
 
@@ -24,6 +26,37 @@ def render_template(name: str, context: dict[str, str] | None = None) -> str:
         content = content.replace(f"{{{{{key}}}}}", value)
     return content
 
+
+def _sort_open(recs: list, sort_by: str) -> list:
+    """Snapshot rows (already soonest-due first) in the listing's ORDER BY."""
+    if sort_by == "latest_due":
+        recs = sorted(recs, key=lambda r: r.due_ts or dt.datetime.min, reverse=True)
+        return sorted(recs, key=lambda r: r.due_ts is None)
+    if sort_by == "agency_az":
+        return sorted(recs, key=lambda r: (r.agency_name or "", r.title or ""))
+    if sort_by == "title_az":
+        return sorted(recs, key=lambda r: r.title or "")
+    return recs
+
+
+async def _tracked_opportunity_ids(user_id) -> list[str]:
+    """Opportunity ids on the user's (non-archived) tracker, one per tracker row."""
+    if not user_id:
+        return []
+    async with read_engine.connect() as conn:
+        res = await conn.execute(
+            text(
+                """
+                SELECT opportunity_id FROM user_bid_trackers
+                WHERE user_id = :uid
+                  AND COALESCE(status, '') NOT LIKE '%archive%'
+                """
+            ),
+            {"uid": user_id},
+        )
+        return [str(row[0]) for row in res.fetchall()]
+
+
 router = APIRouter(tags=["opportunities"])
 
 
@@ -34,15 +67,8 @@ async def opportunities(request: Request):
     if isinstance(user_email, RedirectResponse):
         return user_email
 
-    user_id = None
-    async with engine.begin() as conn:
-        uid_res = await conn.execute(
-            text("SELECT id FROM users WHERE lower(email) = lower(:email) LIMIT 1"),
-            {"email": user_email},
-        )
-        uid_row = uid_res.first()
-        if uid_row:
-            user_id = uid_row[0]
+    ident = await get_identity(request)
+    user_id = ident.id if ident else None
 
     query_params = request.query_params
 
@@ -72,7 +98,7 @@ async def opportunities(request: Request):
     # -------- saved preferences (agencies, keywords) --------
     pref_agencies = []
     pref_keywords = []
-    async with engine.begin() as conn:
+    async with read_engine.connect() as conn:
         pref_res = await conn.execute(
             text("SELECT agencies, keywords FROM user_preferences WHERE user_email = :email"),
             {"email": user_email},
@@ -160,13 +186,31 @@ async def opportunities(request: Request):
     else:
         order_sql = "(due_date IS NULL) ASC, due_date ASC"
 
-    # -------- total count for pagination --------
-    async with engine.begin() as conn:
-        count_result = await conn.execute(
-            text(f"SELECT COUNT(*) FROM opportunities WHERE {where_sql}"),
-            sql_params,
+    # -------- default "open" view: served from the in-process snapshot --------
+    snap = await get_open_set() if status_filter == "open" else None
+    matches = None
+    if snap is not None:
+        matches = _sort_open(
+            snap.select(
+                agencies=[agency_filter] if agency_filter else None,
+                tags=tags_filter or None,
+                search=search_filter,
+                due_start=sql_params.get("due_start"),
+                due_end=sql_params.get("due_end"),
+            ),
+            sort_by,
         )
-        total_count = count_result.scalar() or 0
+
+    # -------- total count for pagination --------
+    if matches is not None:
+        total_count = len(matches)
+    else:
+        async with read_engine.connect() as conn:
+            count_result = await conn.execute(
+                text(f"SELECT COUNT(*) FROM opportunities WHERE {where_sql}"),
+                sql_params,
+            )
+            total_count = count_result.scalar() or 0
 
     total_pages = max(1, math.ceil(total_count / page_size))
     if page > total_pages:
@@ -174,81 +218,101 @@ async def opportunities(request: Request):
         offset = (page - 1) * page_size
         sql_params["offset_val"] = offset
 
-    # -------- pull page rows --------
-    async with engine.begin() as conn:
-        result = await conn.execute(
-            text(f"""
-                SELECT
-                    opportunities.id AS opp_id,
-                    opportunities.external_id,
-                    opportunities.title,
-                    opportunities.agency_name,
-                    opportunities.due_date,
-                    opportunities.source_url,
-                    opportunities.status,
-                    COALESCE(opportunities.ai_category, opportunities.category) AS category,
-                    opportunities.date_added,
-                    (ubt.opportunity_id IS NOT NULL) AS is_tracked
-                FROM opportunities
-                LEFT JOIN user_bid_trackers ubt
-                  ON ubt.opportunity_id = opportunities.id
-                 AND ubt.user_id = :track_user_id
-                 AND COALESCE(ubt.status, '') NOT LIKE '%archive%'
-                WHERE {where_sql}
-                ORDER BY {order_sql}
-                LIMIT :limit_val OFFSET :offset_val
-            """),
-            {**sql_params, "track_user_id": user_id},
-        )
-        rows = result.fetchall()
-
-    # -------- stats card --------
-    agencies = []
-
-    async with engine.begin() as conn:
-        stats_result = await conn.execute(
-            text(f"""
-                SELECT
-                    COUNT(*) AS result_count,
-                    COUNT(DISTINCT agency_name) AS agency_count,
-                    MIN(due_date) AS next_due
-                FROM opportunities
-                WHERE {where_sql}
-            """),
-            sql_params,
-        )
-        stats_row = stats_result.first()
-
-        agencies_result = await conn.execute(
-            text(
-                """
-                SELECT DISTINCT agency_name
-                FROM opportunities
-                WHERE agency_name IS NOT NULL
-                  AND TRIM(agency_name) <> ''
-                ORDER BY agency_name
-                """
+    # -------- pull page rows / stats card --------
+    if matches is not None:
+        tracked = await _tracked_opportunity_ids(user_id)
+        tracking_count = len(tracked)
+        tracked_ids = set(tracked)
+        rows = [
+            (
+                rec.id, rec.external_id, rec.title, rec.agency_name, rec.due_date,
+                rec.source_url, rec.status, rec.category, rec.date_added,
+                str(rec.id) in tracked_ids,
             )
+            for rec in matches[offset: offset + page_size]
+        ]
+        due_values = [rec.due_ts for rec in matches if rec.due_ts is not None]
+        stats_row = (
+            total_count,
+            len({rec.agency_name for rec in matches if rec.agency_name}),
+            min(due_values) if due_values else None,
         )
-        agencies = [row[0] for row in agencies_result.fetchall() if row[0]]
-
-    if not agencies:
-        agencies = AGENCIES
+        agencies = list(snap.agency_names)
+    else:
+        async with read_engine.connect() as conn:
+            result = await conn.execute(
+                text(f"""
+                    SELECT
+                        opportunities.id AS opp_id,
+                        opportunities.external_id,
+                        opportunities.title,
+                        opportunities.agency_name,
+                        opportunities.due_date,
+                        opportunities.source_url,
+                        opportunities.status,
+                        COALESCE(opportunities.ai_category, opportunities.category) AS category,
+                        opportunities.date_added,
+                        (ubt.opportunity_id IS NOT NULL) AS is_tracked
+                    FROM opportunities
+                    LEFT JOIN user_bid_trackers ubt
+                      ON ubt.opportunity_id = opportunities.id
+                     AND ubt.user_id = :track_user_id
+                     AND COALESCE(ubt.status, '') NOT LIKE '%archive%'
+                    WHERE {where_sql}
+                    ORDER BY {order_sql}
+                    LIMIT :limit_val OFFSET :offset_val
+                """),
+                {**sql_params, "track_user_id": user_id},
+            )
+            rows = result.fetchall()
+
+        # -------- stats card --------
+        agencies = []
+
+        async with read_engine.connect() as conn:
+            stats_result = await conn.execute(
+                text(f"""
+                    SELECT
+                        COUNT(*) AS result_count,
+                        COUNT(DISTINCT agency_name) AS agency_count,
+                        MIN(due_date) AS next_due
+                    FROM opportunities
+                    WHERE {where_sql}
+                """),
+                sql_params,
+            )
+            stats_row = stats_result.first()
 
-    tracking_count = 0
-    if user_id:
-        async with engine.begin() as conn:
-            track_res = await conn.execute(
+            agencies_result = await conn.execute(
                 text(
                     """
-                    SELECT COUNT(*) FROM user_bid_trackers
-                    WHERE user_id = :uid
-                      AND COALESCE(status, '') NOT LIKE '%archive%'
+                    SELECT DISTINCT agency_name
+                    FROM opportunities
+                    WHERE agency_name IS NOT NULL
+                      AND TRIM(agency_name) <> ''
+                    ORDER BY agency_name
                     """
-                ),
-                {"uid": user_id},
+                )
             )
-            tracking_count = track_res.scalar() or 0
+            agencies = [row[0] for row in agencies_result.fetchall() if row[0]]
+
+        tracking_count = 0
+        if user_id:
+            async with read_engine.connect() as conn:
+                track_res = await conn.execute(
+                    text(
+                        """
+                        SELECT COUNT(*) FROM user_bid_trackers
+                        WHERE user_id = :uid
+                          AND COALESCE(status, '') NOT LIKE '%archive%'
+                        """
+                    ),
+                    {"uid": user_id},
+                )
+                tracking_count = track_res.scalar() or 0
+
+    if not agencies:
+        agencies = AGENCIES
 
     open_count = stats_row[0] if stats_row else 0
     agency_count = stats_row[1] if stats_row else 0
@@ -9,6 +9,7 @@ import secrets
 import re
 from urllib.parse import parse_qs
 
+from app.core import data_version
 from app.core.db import AsyncSessionLocal
 from app.api._layout import page_shell
 from app.auth.session import get_current_user_email
@@ -296,6 +297,7 @@ async def quick_preferences(request: Request):
 
         await session.commit()
 
+    await data_version.bump(data_version.user_scope("preferences", user_email))
     await mark_onboarding_completed(user_email, {"source": "quick-setup"})
     return {"ok": True}
 
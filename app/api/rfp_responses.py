@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 import logging
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.core.db_core import engine
 from app.api.auth_helpers import ensure_user_can_access_opportunity, get_company_profile_cached
 from app.services.document_processor import DocumentProcessor
@@ -19,19 +19,8 @@ resp_lib = ResponseLibrary()
 
 
 async def _require_user(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email, team_id FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"], "team_id": m.get("team_id")}
+    """{id, email, team_id, tier, is_admin, role} of the session user; 401 if not logged in."""
+    return (await require_identity(request)).as_dict()
 
 
 async def _get_win_themes(user: dict, theme_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
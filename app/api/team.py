@@ -10,6 +10,8 @@ from sqlalchemy import text
 import uuid
 import datetime as dt
 import asyncio
+from app.auth.identity import invalidate_identity
+from app.services.tier import invalidate_tier
 from app.auth.auth_utils import require_login
 from app.auth.session import get_current_user_email
 from app.core.db import AsyncSessionLocal
@@ -139,6 +141,7 @@ async def list_team_members(request: Request):
                 },
             )
             await session.commit()
+            invalidate_identity(user_id=user_id)
 
         members = await session.execute(
             text(
@@ -319,6 +322,7 @@ async def invite_member(request: Request, payload: dict):
                 )
 
         await session.commit()
+        invalidate_identity(user_id=user_id)
 
     # Send invite email (best-effort)
     try:
@@ -441,6 +445,8 @@ async def accept_invite(request: Request):
                 exc_info=True,
             )
         await session.commit()
+        invalidate_identity(email=user_email, team_id=team_id)
+        invalidate_tier(email=user_email)
 
     return {"ok": True, "team_id": team_id}
 
@@ -517,6 +523,8 @@ async def remove_member(request: Request, member_id: str):
                     exc_info=True,
                 )
         await session.commit()
+        invalidate_identity(user_id=target_user_id, team_id=team_id)
+        invalidate_tier(team_id=team_id)
 
     return {"ok": True, "removed": target_email or target_user_id}
 
@@ -594,6 +602,7 @@ async def update_member_role(request: Request, member_id: str, payload: dict):
                     exc_info=True,
                 )
         await session.commit()
+        invalidate_identity(team_id=team_id)
 
     return {"ok": True, "role": new_role}
 
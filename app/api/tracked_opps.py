@@ -1,25 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Request
 
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.core.db_core import engine
 
 router = APIRouter(prefix="/api/tracked", tags=["tracked"])
 
 
 async def _require_user(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    return {"id": m["id"], "email": m["email"]}
+    """{id, email, team_id, tier, is_admin, role} of the session user; 401 if not logged in."""
+    return (await require_identity(request)).as_dict()
 
 
 @router.get("/my")
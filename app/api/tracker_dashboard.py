@@ -11,6 +11,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy import text
 
+from app.auth.identity import get_identity
 from app.auth.session import get_current_user_email
 from app.core.db_core import engine
 from app.api._layout import page_shell
@@ -100,18 +101,12 @@ async def tracker_dashboard(request: Request) -> HTMLResponse:
     if not user_email:
         return RedirectResponse("/login?next=/tracker/dashboard", status_code=303)
 
-    async with engine.begin() as conn:
-        user_row = await conn.exec_driver_sql(
-            "SELECT id, email, team_id FROM users WHERE lower(email) = lower(:e) LIMIT 1",
-            {"e": user_email},
-        )
-        user_data = user_row.first()
-
-    if not user_data:
+    ident = await get_identity(request)
+    if not ident:
         return RedirectResponse("/login?next=/tracker/dashboard", status_code=303)
 
-    user_id = user_data._mapping["id"]
-    team_id = user_data._mapping.get("team_id")
+    user_id = ident.id
+    team_id = ident.team_id
 
     async with engine.begin() as conn:
         tracked_rows = await conn.exec_driver_sql(
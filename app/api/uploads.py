@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, status, Request
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, status
 from fastapi.responses import StreamingResponse
 from typing import List
 import logging
@@ -8,7 +8,7 @@ from sqlalchemy import text
 from app.core.db import AsyncSessionLocal
 from app.core.db_core import engine
 from app.auth import require_admin
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.storage import store_bytes, create_presigned_get, USE_S3, BUCKET, LOCAL_DIR, _s3
 
 if USE_S3:
@@ -18,24 +18,8 @@ if USE_S3:
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 
 
-# Session-cookie auth helper (same logic as bid_tracker)
-async def _require_user(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(
-            "SELECT id, email FROM users WHERE email = :e LIMIT 1",
-            {"e": email},
-        )
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    # namedtuple-like row; provide attributes for convenience
-    class U: pass
-    u = U(); u.id = m["id"]; u.email = m["email"]
-    return u
+# Session-cookie auth: app/auth/identity.py (one cached lookup per request)
+_require_user = require_identity
 
 
 async def _resolve_opportunity_id(key: str) -> int:
@@ -1,4 +1,6 @@
 # app/routers/vendor_guides.py
+import logging
+
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse
 
@@ -13,6 +15,8 @@ try:
 except ImportError:
     md = None
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/vendor-guides", tags=["vendor-guides"])
 
 
@@ -24,14 +28,13 @@ async def refresh_columbus():
 
 @router.get("/{agency_slug}", response_class=HTMLResponse)
 async def get_guide(agency_slug: str):
-    print(f">>> Vendor guide route hit for {agency_slug}")
+    logger.debug(f"vendor guide requested: {agency_slug}")
     guide = await get_vendor_guide_by_slug(agency_slug)
     if not guide:
         if agency_slug == "city-of-columbus":
             guide = await upsert_vendor_guide_for_columbus()
         else:
             raise HTTPException(status_code=404, detail="Guide not found")
-    print(">>> Guide fetched OK, returning HTML")
 
     summary = guide.get("llm_summary") or ""
 
@@ -1,27 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy import text
 from io import BytesIO
 import zipfile, os
 from app.core.db_core import engine
-from app.auth.session import get_current_user_email
+from app.auth.identity import require_identity
 from app.storage import USE_S3, BUCKET, _s3
 
 router = APIRouter(prefix="/zip", tags=["zip"])
 
-async def _require_user(request: Request):
-    email = get_current_user_email(request)
-    if not email:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    async with engine.begin() as conn:
-        res = await conn.exec_driver_sql(text("SELECT id, email FROM users WHERE email = :e LIMIT 1"), {"e": email})
-        row = res.first()
-    if not row:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    m = row._mapping
-    class U: pass
-    u = U(); u.id = m["id"]; u.email = m["email"]
-    return u
+# Session-cookie auth: app/auth/identity.py (one cached lookup per request)
+_require_user = require_identity
 
 @router.get("/{opportunity_id}")
 async def zip_for_opportunity(opportunity_id: int, user = Depends(_require_user)):
@@ -0,0 +1,132 @@
+# app/auth/identity.py
+"""
+Who is calling: session email -> users row (+ team role), resolved once per
+request and kept in request.state.identity.
+
+Handlers use `require_identity` / `get_identity` as dependencies (or call
+them with the request) instead of re-running their own users lookup. Rows
+are cached in-process for IDENTITY_CACHE_TTL_S; anything that changes a
+user's tier, team or profile calls `invalidate_identity()` after commit.
+"""
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+
+from app.auth.session import get_current_user_email
+from app.core.db_core import read_engine
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENTRIES = 4096
+_UNSET = object()
+
+# lower(email) -> (expires_at, identity)
+_cache: Dict[str, Tuple[float, "Identity"]] = {}
+# Bumped by every invalidation; a lookup that raced one does not cache its row.
+_generation = 0
+
+
+@dataclass(frozen=True)
+class Identity:
+    id: Any
+    email: str
+    team_id: Optional[Any] = None
+    tier: Optional[str] = None
+    is_admin: bool = False
+    role: Optional[str] = None  # team_members.role, lowercased; None without a team
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Fresh dict in the shape the older per-module `_require_user` helpers returned."""
+        return asdict(self)
+
+
+async def _load(email: str) -> Optional[Identity]:
+    async with read_engine.connect() as conn:
+        res = await conn.execute(
+            text("SELECT id, email, team_id, tier, is_admin FROM users WHERE lower(email) = lower(:email) LIMIT 1"),
+            {"email": email},
+        )
+        row = res.first()
+        if not row:
+            return None
+        user_id, db_email, team_id, tier, is_admin = row
+        role = None
+        if team_id:
+            try:
+                rres = await conn.execute(
+                    text("SELECT role FROM team_members WHERE team_id = :team AND user_id = :uid LIMIT 1"),
+                    {"team": team_id, "uid": user_id},
+                )
+                role = ((rres.scalar() or "").strip().lower()) or None
+            except Exception as exc:  # team tables not migrated yet
+                logger.debug(f"identity: no team role for {email}: {exc}")
+    return Identity(
+        id=user_id,
+        email=db_email,
+        team_id=team_id,
+        tier=tier,
+        is_admin=bool(is_admin),
+        role=role,
+    )
+
+
+async def lookup_identity(email: str) -> Optional[Identity]:
+    """Identity for `email` (cached); None when there is no such user."""
+    if not email:
+        return None
+    key = email.strip().lower()
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    generation = _generation
+    ident = await _load(email)
+    ttl = settings.IDENTITY_CACHE_TTL_S
+    if ident is not None and ttl > 0 and generation == _generation:
+        if len(_cache) >= _MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = (now + ttl, ident)
+    return ident
+
+
+async def get_identity(request: Request) -> Optional[Identity]:
+    """Identity of the logged-in caller, or None. One lookup per request."""
+    cached = getattr(request.state, "identity", _UNSET)
+    if cached is not _UNSET:
+        return cached
+    ident = await lookup_identity(get_current_user_email(request) or "")
+    request.state.identity = ident
+    return ident
+
+
+async def require_identity(request: Request) -> Identity:
+    ident = await get_identity(request)
+    if ident is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return ident
+
+
+def invalidate_identity(email: Optional[str] = None, user_id: Any = None, team_id: Any = None) -> None:
+    """
+    Drop cached identities matching any of the given keys (a team id drops
+    every cached member). With no arguments the whole cache is cleared.
+    """
+    global _generation
+    _generation += 1
+    if email is None and user_id is None and team_id is None:
+        _cache.clear()
+        return
+    email_key = email.strip().lower() if email else None
+    for key, (_, ident) in list(_cache.items()):
+        if (
+            key == email_key
+            or (user_id is not None and str(ident.id) == str(user_id))
+            or (team_id is not None and ident.team_id is not None and str(ident.team_id) == str(team_id))
+        ):
+            _cache.pop(key, None)
@@ -0,0 +1,66 @@
+# app/core/columbus_portal.py
+"""
+City of Columbus vendor portal OData endpoints (Power Pages / Dataverse).
+
+Shared by the /columbus_detail API endpoints (app/api/columbus_detail.py)
+and the ingest-side detail fetch (app/ingest/municipalities/columbus_odata.py).
+Lives in core so web workers don't import the ingest package.
+"""
+import urllib.parse
+
+BASE_URL_HEADERS = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqheaders"
+BASE_URL_ATTACH  = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqattachments"
+BASE_URL_ITEMS   = "https://columbusvendorservices.powerappsportals.com/_api/cr820_rfqitems"
+
+
+def browser_headers():
+    # Some portals care that we look like a browser and accept JSON.
+    return {
+        "Accept": "application/json",
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120 Safari/537.36"
+        ),
+    }
+
+
+def build_header_query_url(rfq_case_id: str) -> str:
+    # We ask for just this RFQ (case id like "RFQ031521"), all columns.
+    params = {
+        "$filter": f"cr820_rfqcaseid eq '{rfq_case_id}'",
+        "$select": "*",
+    }
+    return BASE_URL_HEADERS + "?" + urllib.parse.urlencode(params, safe="$, '")
+
+
+def build_attachments_query_url(rfq_header_id: str) -> str:
+    """
+    Guessed Dataverse collection name: cr820_rfqattachments
+    Guessed FK: _cr820_rfqheaderid_value (typical pattern)
+    We request * so we can see what fields are actually there.
+    """
+    # We try the most likely FK column naming pattern.
+    # If this 400s, we'll inspect the debug response.
+    raw_filter = f"_cr820_rfqheaderid_value eq {rfq_header_id!r}"
+
+    params = {
+        "$filter": raw_filter,
+        "$select": "*",
+    }
+    return BASE_URL_ATTACH + "?" + urllib.parse.urlencode(params, safe="$, '")
+
+
+def build_items_query_url(rfq_header_id: str) -> str:
+    """
+    Guessed Dataverse collection name: cr820_rfqitems
+    Guessed FK: _cr820_rfqheaderid_value
+    We'll try to pull line number, description, qty, UOM.
+    """
+    raw_filter = f"_cr820_rfqheaderid_value eq {rfq_header_id!r}"
+
+    params = {
+        "$filter": raw_filter,
+        "$select": "*",
+    }
+    return BASE_URL_ITEMS + "?" + urllib.parse.urlencode(params, safe="$, '")
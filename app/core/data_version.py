@@ -0,0 +1,104 @@
+# app/core/data_version.py
+"""
+Monotonic per-dataset version counters (`data_versions` table).
+
+Writers call `await bump("opportunities")` after committing a batch of
+changes (ingest run, enrichment drain, stale-row closing). Readers that keep
+derived state in memory compare `await current(name)` against the version
+they built from, which works across processes (scrape workers, web
+workers). Callbacks registered with `on_bump()` additionally fire in the
+bumping process so its own snapshots refresh without waiting for a poll.
+
+Per-user data uses scoped names (`user_scope("trackers", email)`), so one
+user's change does not invalidate everyone else's cached pages.
+
+Failures never propagate to the writer: a missed bump only delays refreshes
+until the next one.
+"""
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import bindparam, text
+
+from app.core.db_core import engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+OPPORTUNITIES = "opportunities"
+
+_listeners: Dict[str, List[Callable[[int], None]]] = {}
+
+
+def user_scope(kind: str, email: str) -> str:
+    """Version name for one user's `kind` of data, e.g. "trackers:a@b.com"."""
+    return f"{kind}:{(email or '').strip().lower()}"
+
+
+def on_bump(name: str, callback: Callable[[int], None]) -> None:
+    """Call `callback(new_version)` whenever this process bumps `name`."""
+    _listeners.setdefault(name, []).append(callback)
+
+
+async def current(name: str = OPPORTUNITIES) -> int:
+    """Latest committed version of `name`; 0 when never bumped (or no table yet)."""
+    try:
+        async with read_engine.connect() as conn:
+            res = await conn.execute(
+                text("SELECT version FROM data_versions WHERE name = :n"), {"n": name}
+            )
+            return int(res.scalar() or 0)
+    except Exception as exc:
+        logger.debug(f"data_version: cannot read {name}: {exc}")
+        return 0
+
+
+async def current_many(names: Iterable[str]) -> Dict[str, int]:
+    """{name: version} in one query; names never bumped map to 0."""
+    names = list(dict.fromkeys(names))
+    out = {name: 0 for name in names}
+    if not names:
+        return out
+    try:
+        async with read_engine.connect() as conn:
+            res = await conn.execute(
+                text("SELECT name, version FROM data_versions WHERE name IN :names").bindparams(
+                    bindparam("names", expanding=True)
+                ),
+                {"names": names},
+            )
+            for name, version in res.fetchall():
+                out[name] = int(version or 0)
+    except Exception as exc:
+        logger.debug(f"data_version: cannot read {names}: {exc}")
+    return out
+
+
+async def bump(name: str = OPPORTUNITIES) -> int:
+    """Increment `name` and notify local listeners; returns the new version (0 on failure)."""
+    version = 0
+    try:
+        async with engine.begin() as conn:
+            params = {"n": name, "at": datetime.utcnow()}
+            res = await conn.execute(
+                text("UPDATE data_versions SET version = version + 1, updated_at = :at WHERE name = :n"),
+                params,
+            )
+            if not res.rowcount:
+                await conn.execute(
+                    text("INSERT INTO data_versions (name, version, updated_at) VALUES (:n, 1, :at)"),
+                    params,
+                )
+            res = await conn.execute(
+                text("SELECT version FROM data_versions WHERE name = :n"), {"n": name}
+            )
+            version = int(res.scalar() or 0)
+    except Exception as exc:
+        logger.warning(f"data_version: bump of {name} failed: {exc}")
+
+    for callback in _listeners.get(name, ()):
+        try:
+            callback(version)
+        except Exception as exc:
+            logger.warning(f"data_version: {name} listener failed: {exc}")
+    return version
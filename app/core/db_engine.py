@@ -0,0 +1,125 @@
+# app/core/db_engine.py
+"""
+The one place async engines are created. app/core/db.py and
+app/core/db_core.py both re-export these, so every module shares one pool.
+
+engine       reads and writes (ingest upserts, ORM sessions, migrations)
+read_engine  read-only pages / feeds that must not queue behind ingest
+
+SQLite file database
+    WAL journal, synchronous=NORMAL, larger page cache and mmap. `engine`
+    keeps one pooled write connection plus up to DB_SQLITE_WRITE_OVERFLOW
+    extra ones, so code holding an ORM session can still open
+    `engine.begin()`; concurrent writers wait on busy_timeout (SQLite has
+    one writer anyway). `read_engine` holds DB_SQLITE_READ_CONNECTIONS
+    query_only connections. Under WAL readers see the last committed
+    snapshot and never wait for an open write transaction.
+SQLite in-memory
+    Each connection would be its own empty database, so both names are the
+    same single-connection StaticPool engine (tests, scripts).
+Postgres
+    Sized AsyncAdaptedQueuePool with pre-ping and recycle. MVCC already keeps
+    readers off writers' locks, so read_engine is the same engine.
+
+Both engines carry the query timing hooks from app/core/metrics.py.
+"""
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from app.core.metrics import instrument_engine
+from app.core.settings import settings
+
+_SQLITE_CONNECT_ARGS = {"timeout": 30, "check_same_thread": False}
+
+
+def is_memory_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and (
+        u.database in (None, "", ":memory:") or u.query.get("mode") == "memory"
+    )
+
+
+def _sqlite_pragmas(async_engine: AsyncEngine, read_only: bool = False) -> None:
+    cache_kib = max(int(settings.DB_SQLITE_CACHE_MB), 1) * 1024
+    mmap_bytes = max(int(settings.DB_SQLITE_MMAP_MB), 0) * 1024 * 1024
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute(f"PRAGMA cache_size=-{cache_kib}")
+            cur.execute(f"PRAGMA mmap_size={mmap_bytes}")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA busy_timeout=30000")
+            if read_only:
+                cur.execute("PRAGMA query_only=ON")
+        finally:
+            cur.close()
+
+
+def create_engines(url: str) -> Tuple[AsyncEngine, AsyncEngine]:
+    """(write engine, read engine) for `url`; the two may be the same object."""
+    base = {"echo": False, "future": True}
+
+    if url.startswith("sqlite"):
+        if is_memory_sqlite(url):
+            eng = create_async_engine(
+                url, connect_args=_SQLITE_CONNECT_ARGS, poolclass=StaticPool, **base
+            )
+            return eng, eng
+
+        write = create_async_engine(
+            url,
+            connect_args=_SQLITE_CONNECT_ARGS,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=max(int(settings.DB_SQLITE_WRITE_OVERFLOW), 1),
+            pool_timeout=settings.DB_POOL_TIMEOUT_S,
+            **base,
+        )
+        _sqlite_pragmas(write)
+        read = create_async_engine(
+            url,
+            connect_args=_SQLITE_CONNECT_ARGS,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=max(int(settings.DB_SQLITE_READ_CONNECTIONS), 1),
+            max_overflow=0,
+            pool_timeout=settings.DB_POOL_TIMEOUT_S,
+            **base,
+        )
+        _sqlite_pragmas(read, read_only=True)
+        return write, read
+
+    eng = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=True,
+        **base,
+    )
+    return eng, eng
+
+
+if not settings.DB_URL:
+    # Fail fast with a clear message instead of throwing from SQLAlchemy
+    raise RuntimeError("DB_URL is not configured. Set it in environment or .env before starting the app.")
+
+engine, read_engine = create_engines(settings.DB_URL)
+instrument_engine(engine, "write")
+if read_engine is not engine:
+    instrument_engine(read_engine, "read")
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -8,45 +8,42 @@ async def ensure_uploads_schema(engine) -> None:
     might not have (e.g., 'mime'). Uses simple PRAGMA inspection so it
     works on SQLite without alembic.
     """
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('user_uploads')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-
-            if "mime" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN mime TEXT")
-            if "storage_key" not in cols:
-                # Required for locating files (S3 key or local path)
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN storage_key TEXT")
-            if "size" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN size INTEGER DEFAULT 0")
-            if "created_at" not in cols:
-                # store as TEXT timestamp by default for SQLite compatibility
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN created_at TEXT DEFAULT (datetime('now'))")
-
-            # Future-proof: add optional fields if missing
-            if "version" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN version INTEGER DEFAULT 1")
-            if "source_note" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN source_note TEXT DEFAULT 'user-upload'")
-    except Exception:
-        # Non-SQLite or missing table; ignore quietly.
-        return
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('user_uploads')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if not cols:
+            return  # table not created yet
+
+        if "mime" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN mime TEXT")
+        if "storage_key" not in cols:
+            # Required for locating files (S3 key or local path)
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN storage_key TEXT")
+        if "size" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN size INTEGER DEFAULT 0")
+        if "created_at" not in cols:
+            # store as TEXT timestamp by default for SQLite compatibility
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN created_at TEXT DEFAULT (datetime('now'))")
+
+        # Future-proof: add optional fields if missing
+        if "version" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN version INTEGER DEFAULT 1")
+        if "source_note" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_uploads ADD COLUMN source_note TEXT DEFAULT 'user-upload'")
 
 
 async def ensure_uploads_folder_type(engine) -> None:
     """Add folder_type column to user_uploads for hierarchical organization."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('user_uploads')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('user_uploads')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if not cols:
+            return  # table not created yet
 
-            if "folder_type" not in cols:
-                await conn.exec_driver_sql(
-                    "ALTER TABLE user_uploads ADD COLUMN folder_type TEXT DEFAULT 'root'"
-                )
-    except Exception:
-        return
+        if "folder_type" not in cols:
+            await conn.exec_driver_sql(
+                "ALTER TABLE user_uploads ADD COLUMN folder_type TEXT DEFAULT 'root'"
+            )
 
 
 async def ensure_opportunity_scope_columns(engine) -> None:
@@ -55,43 +52,36 @@ async def ensure_opportunity_scope_columns(engine) -> None:
     Works for both SQLite (via PRAGMA) and Postgres (via IF NOT EXISTS).
     Covers both legacy table names: opportunities (core) and opportunity (ORM).
     """
-    try:
-        async with engine.begin() as conn:
-            dialect = getattr(conn.engine, "dialect", None)
-            dialect_name = getattr(dialect, "name", "unknown") if dialect else "unknown"
-
-            for table in ("opportunities", "opportunity"):
-                try:
-                    if dialect_name == "sqlite":
-                        res = await conn.exec_driver_sql(f"PRAGMA table_info('{table}')")
-                        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-                        if not cols:
-                            continue  # table missing
-                        if "summary" not in cols:
-                            await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN summary TEXT")
-                        if "scope_of_work" not in cols:
-                            await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN scope_of_work TEXT")
-                    else:
-                        await conn.exec_driver_sql(
-                            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS summary TEXT"
-                        )
-                        await conn.exec_driver_sql(
-                            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS scope_of_work TEXT"
-                        )
-                except Exception:
-                    # Table might not exist in this database; skip quietly
-                    continue
-    except Exception:
-        return
+    async with engine.begin() as conn:
+        dialect = getattr(conn.engine, "dialect", None)
+        dialect_name = getattr(dialect, "name", "unknown") if dialect else "unknown"
+
+        for table in ("opportunities", "opportunity"):
+            if dialect_name == "sqlite":
+                res = await conn.exec_driver_sql(f"PRAGMA table_info('{table}')")
+                cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+                if not cols:
+                    continue  # table missing
+                if "summary" not in cols:
+                    await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN summary TEXT")
+                if "scope_of_work" not in cols:
+                    await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN scope_of_work TEXT")
+            else:
+                # IF EXISTS: a failed statement would abort the whole Postgres transaction
+                await conn.exec_driver_sql(
+                    f"ALTER TABLE IF EXISTS {table} ADD COLUMN IF NOT EXISTS summary TEXT"
+                )
+                await conn.exec_driver_sql(
+                    f"ALTER TABLE IF EXISTS {table} ADD COLUMN IF NOT EXISTS scope_of_work TEXT"
+                )
 
 
 async def ensure_onboarding_schema(engine) -> None:
     """Ensure onboarding-related columns/tables exist."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('users')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('users')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if cols:  # empty when the users table doesn't exist yet
             if "first_name" not in cols:
                 await conn.exec_driver_sql(
                     "ALTER TABLE users ADD COLUMN first_name TEXT"
@@ -138,422 +128,548 @@ async def ensure_onboarding_schema(engine) -> None:
                     "ALTER TABLE users ADD COLUMN sms_phone_verified INTEGER DEFAULT 0"
                 )
 
-            res = await conn.exec_driver_sql(
+        res = await conn.exec_driver_sql(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='user_onboarding_events'
+            """
+        )
+        if not res.fetchone():
+            await conn.exec_driver_sql(
                 """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='user_onboarding_events'
+                CREATE TABLE user_onboarding_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_email TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    metadata JSON,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
                 """
             )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE user_onboarding_events (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_email TEXT NOT NULL,
-                        step TEXT NOT NULL,
-                        metadata JSON,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
-                await conn.exec_driver_sql(
-                    "CREATE INDEX idx_onboarding_events_email ON user_onboarding_events(user_email)"
-                )
-    except Exception:
-        # Non-SQLite or insufficient permissions; ignore quietly.
-        return
+            await conn.exec_driver_sql(
+                "CREATE INDEX idx_onboarding_events_email ON user_onboarding_events(user_email)"
+            )
 
 
 async def ensure_company_profile_schema(engine) -> None:
     """Ensure company_profiles table exists for AI autofill."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql(
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='company_profiles'
+            """
+        )
+        if not res.fetchone():
+            await conn.exec_driver_sql(
                 """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='company_profiles'
+                CREATE TABLE company_profiles (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT UNIQUE,
+                    data JSON,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
                 """
             )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE company_profiles (
-                        id TEXT PRIMARY KEY,
-                        user_id TEXT UNIQUE,
-                        data JSON,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
-    except Exception:
-        return
 
 
 async def ensure_tracker_team_schema(engine) -> None:
     """Add team_id + visibility to user_bid_trackers for team sharing."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('user_bid_trackers')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-            if "team_id" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_bid_trackers ADD COLUMN team_id TEXT")
-            if "visibility" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE user_bid_trackers ADD COLUMN visibility TEXT DEFAULT 'private'")
-    except Exception:
-        return
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('user_bid_trackers')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if not cols:
+            return  # table not created yet
+        if "team_id" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_bid_trackers ADD COLUMN team_id TEXT")
+        if "visibility" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE user_bid_trackers ADD COLUMN visibility TEXT DEFAULT 'private'")
 
 
 async def ensure_team_schema(engine) -> None:
     """Ensure team tables exist for collaboration features."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql(
-                """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='teams'
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='teams'
+            """
+        )
+        if not res.fetchone():
+            await conn.exec_driver_sql(
                 """
-            )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE teams (
-                        id TEXT PRIMARY KEY,
-                        name TEXT DEFAULT 'Team',
-                        owner_user_id TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
+                CREATE TABLE teams (
+                    id TEXT PRIMARY KEY,
+                    name TEXT DEFAULT 'Team',
+                    owner_user_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            else:
-                # Backfill missing created_at column if table exists without it
-                res_cols = await conn.exec_driver_sql("PRAGMA table_info('teams')")
-                cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
-                if "created_at" not in cols:
-                    await conn.exec_driver_sql(
-                        "ALTER TABLE teams ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
-                    )
-            res = await conn.exec_driver_sql(
-                """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='team_members'
                 """
             )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE team_members (
-                        id TEXT PRIMARY KEY,
-                        team_id TEXT,
-                        user_id TEXT,
-                        invited_email TEXT,
-                        role TEXT DEFAULT 'member',
-                        invited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        accepted_at TIMESTAMP
-                    )
-                    """
-                )
+        else:
+            # Backfill missing created_at column if table exists without it
+            res_cols = await conn.exec_driver_sql("PRAGMA table_info('teams')")
+            cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
+            if "created_at" not in cols:
                 await conn.exec_driver_sql(
-                    "CREATE INDEX IF NOT EXISTS idx_team_members_team ON team_members(team_id)"
+                    "ALTER TABLE teams ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
                 )
-            else:
-                res_cols = await conn.exec_driver_sql("PRAGMA table_info('team_members')")
-                cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
-                if "invited_at" not in cols:
-                    await conn.exec_driver_sql(
-                        "ALTER TABLE team_members ADD COLUMN invited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
-                    )
-            # Ensure unique index on (team_id, invited_email) for conflict checks
+        res = await conn.exec_driver_sql(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='team_members'
+            """
+        )
+        if not res.fetchone():
             await conn.exec_driver_sql(
-                "CREATE UNIQUE INDEX IF NOT EXISTS idx_team_members_unique ON team_members(team_id, invited_email)"
-            )
-            res = await conn.exec_driver_sql(
                 """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='bid_notes'
+                CREATE TABLE team_members (
+                    id TEXT PRIMARY KEY,
+                    team_id TEXT,
+                    user_id TEXT,
+                    invited_email TEXT,
+                    role TEXT DEFAULT 'member',
+                    invited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    accepted_at TIMESTAMP
+                )
                 """
             )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE bid_notes (
-                        id TEXT PRIMARY KEY,
-                        team_id TEXT,
-                        opportunity_id TEXT,
-                        author_user_id TEXT,
-                        body TEXT,
-                        mentions JSON,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
+            await conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS idx_team_members_team ON team_members(team_id)"
+            )
+        else:
+            res_cols = await conn.exec_driver_sql("PRAGMA table_info('team_members')")
+            cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
+            if "invited_at" not in cols:
                 await conn.exec_driver_sql(
-                    "CREATE INDEX IF NOT EXISTS idx_bid_notes_team ON bid_notes(team_id)"
+                    "ALTER TABLE team_members ADD COLUMN invited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
                 )
-    except Exception:
-        return
-
-
-async def ensure_knowledge_base_schema(engine) -> None:
-    """Create knowledge base + RFP response tables if missing (SQLite-friendly)."""
-    try:
-        async with engine.begin() as conn:
+        # Ensure unique index on (team_id, invited_email) for conflict checks
+        await conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_team_members_unique ON team_members(team_id, invited_email)"
+        )
+        res = await conn.exec_driver_sql(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='bid_notes'
+            """
+        )
+        if not res.fetchone():
             await conn.exec_driver_sql(
                 """
-                CREATE TABLE IF NOT EXISTS knowledge_documents (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
+                CREATE TABLE bid_notes (
+                    id TEXT PRIMARY KEY,
                     team_id TEXT,
-                    filename TEXT NOT NULL,
-                    mime TEXT,
-                    size INTEGER,
-                    storage_key TEXT NOT NULL,
-                    doc_type TEXT NOT NULL,
-                    tags JSON,
-                    extracted_text TEXT,
-                    extraction_status TEXT DEFAULT 'pending',
-                    extraction_error TEXT,
-                    has_embeddings INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    opportunity_id TEXT,
+                    author_user_id TEXT,
+                    body TEXT,
+                    mentions JSON,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_user ON knowledge_documents(user_id)")
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_team ON knowledge_documents(team_id)")
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_type ON knowledge_documents(doc_type)")
-
             await conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS win_themes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    team_id TEXT,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    category TEXT,
-                    supporting_docs JSON,
-                    metrics JSON,
-                    times_used INTEGER DEFAULT 0,
-                    last_used_at TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+                "CREATE INDEX IF NOT EXISTS idx_bid_notes_team ON bid_notes(team_id)"
             )
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_win_themes_user ON win_themes(user_id)")
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_win_themes_cat ON win_themes(category)")
 
-            await conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS rfp_responses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    team_id TEXT,
-                    opportunity_id TEXT NOT NULL,
-                    status TEXT DEFAULT 'draft',
-                    version INTEGER DEFAULT 1,
-                    selected_win_themes JSON,
-                    selected_knowledge_docs JSON,
-                    custom_instructions TEXT,
-                    sections JSON,
-                    compliance_score REAL,
-                    compliance_issues JSON,
-                    assigned_reviewers JSON,
-                    review_comments JSON,
-                    generated_at TIMESTAMP,
-                    submitted_at TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+
+async def ensure_knowledge_base_schema(engine) -> None:
+    """Create knowledge base + RFP response tables if missing (SQLite-friendly)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS knowledge_documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                team_id TEXT,
+                filename TEXT NOT NULL,
+                mime TEXT,
+                size INTEGER,
+                storage_key TEXT NOT NULL,
+                doc_type TEXT NOT NULL,
+                tags JSON,
+                extracted_text TEXT,
+                extraction_status TEXT DEFAULT 'pending',
+                extraction_error TEXT,
+                has_embeddings INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_user ON knowledge_documents(user_id)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_team ON knowledge_documents(team_id)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_kdocs_type ON knowledge_documents(doc_type)")
+
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS win_themes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                team_id TEXT,
+                title TEXT NOT NULL,
+                description TEXT,
+                category TEXT,
+                supporting_docs JSON,
+                metrics JSON,
+                times_used INTEGER DEFAULT 0,
+                last_used_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_rfp_responses_oppty ON rfp_responses(opportunity_id)")
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_rfp_responses_status ON rfp_responses(status)")
-
-            # Add missing columns for existing deployments (SQLite-friendly)
-            try:
-                res_cols = await conn.exec_driver_sql("PRAGMA table_info('rfp_responses')")
-                cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
-                if "review_comments" not in cols:
-                    await conn.exec_driver_sql("ALTER TABLE rfp_responses ADD COLUMN review_comments JSON")
-                if "assigned_reviewers" not in cols:
-                    await conn.exec_driver_sql("ALTER TABLE rfp_responses ADD COLUMN assigned_reviewers JSON")
-            except Exception:
-                pass
-    except Exception:
-        return
+            """
+        )
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_win_themes_user ON win_themes(user_id)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_win_themes_cat ON win_themes(category)")
+
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS rfp_responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                team_id TEXT,
+                opportunity_id TEXT NOT NULL,
+                status TEXT DEFAULT 'draft',
+                version INTEGER DEFAULT 1,
+                selected_win_themes JSON,
+                selected_knowledge_docs JSON,
+                custom_instructions TEXT,
+                sections JSON,
+                compliance_score REAL,
+                compliance_issues JSON,
+                assigned_reviewers JSON,
+                review_comments JSON,
+                generated_at TIMESTAMP,
+                submitted_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_rfp_responses_oppty ON rfp_responses(opportunity_id)")
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_rfp_responses_status ON rfp_responses(status)")
+
+        # Add missing columns for existing deployments (SQLite-friendly)
+        res_cols = await conn.exec_driver_sql("PRAGMA table_info('rfp_responses')")
+        cols: Set[str] = {row._mapping["name"] for row in res_cols.fetchall()}
+        if "review_comments" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE rfp_responses ADD COLUMN review_comments JSON")
+        if "assigned_reviewers" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE rfp_responses ADD COLUMN assigned_reviewers JSON")
 
 
 async def ensure_extraction_cache_schema(engine) -> None:
     """Create extraction_cache table for LLM extraction caching."""
-    try:
-        async with engine.begin() as conn:
-            await conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS extraction_cache (
-                    hash TEXT PRIMARY KEY,
-                    result JSON,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                hash TEXT PRIMARY KEY,
+                result JSON,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_extraction_cache_date ON extraction_cache(created_at)")
-    except Exception:
-        return
+            """
+        )
+        await conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_extraction_cache_date ON extraction_cache(created_at)")
 
 
 async def ensure_user_tier_column(engine) -> None:
     """Ensure users.tier exists so billing/webhooks can persist plan."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('users')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-            if "tier" not in cols:
-                await conn.exec_driver_sql(
-                    "ALTER TABLE users ADD COLUMN tier TEXT DEFAULT 'Free'"
-                )
-    except Exception:
-        return
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('users')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if not cols:
+            return  # table not created yet
+        if "tier" not in cols:
+            await conn.exec_driver_sql(
+                "ALTER TABLE users ADD COLUMN tier TEXT DEFAULT 'Free'"
+            )
 
 
 async def ensure_billing_schema(engine) -> None:
     """Add billing-related columns to users table if missing."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql("PRAGMA table_info('users')")
-            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql("PRAGMA table_info('users')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if not cols:
+            return  # table not created yet
 
-            if "stripe_customer_id" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN stripe_customer_id TEXT")
-            if "stripe_subscription_id" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN stripe_subscription_id TEXT")
-            if "next_billing_at" not in cols:
-                await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN next_billing_at TEXT")
-    except Exception:
-        # Non-SQLite or insufficient permissions; ignore quietly.
-        return
+        if "stripe_customer_id" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN stripe_customer_id TEXT")
+        if "stripe_subscription_id" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN stripe_subscription_id TEXT")
+        if "next_billing_at" not in cols:
+            await conn.exec_driver_sql("ALTER TABLE users ADD COLUMN next_billing_at TEXT")
 
 
 async def ensure_opportunity_extraction_schema(engine) -> None:
     """Ensure opportunities tables have json_blob for extracted metadata."""
-    try:
-        async with engine.begin() as conn:
-            for table in ("opportunities", "opportunity"):
-                try:
-                    res = await conn.exec_driver_sql(f"PRAGMA table_info('{table}')")
-                    cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
-                    if not cols:
-                        continue
-                    if "json_blob" not in cols:
-                        await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN json_blob JSON")
-                except Exception:
-                    continue
-    except Exception:
-        return
+    async with engine.begin() as conn:
+        for table in ("opportunities", "opportunity"):
+            res = await conn.exec_driver_sql(f"PRAGMA table_info('{table}')")
+            cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+            if not cols:
+                continue
+            if "json_blob" not in cols:
+                await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN json_blob JSON")
 
 
 async def ensure_response_library_schema(engine) -> None:
     """Ensure response_library table exists for answer reuse."""
-    try:
-        async with engine.begin() as conn:
-            res = await conn.exec_driver_sql(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='response_library'"
-            )
-            if not res.fetchone():
-                await conn.exec_driver_sql(
-                    """
-                    CREATE TABLE response_library (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id TEXT NOT NULL,
-                        team_id TEXT,
-                        question TEXT NOT NULL,
-                        answer TEXT NOT NULL,
-                        metadata JSON,
-                        embedding TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
-                await conn.exec_driver_sql(
-                    "CREATE INDEX IF NOT EXISTS idx_response_library_user ON response_library(user_id)"
-                )
-                await conn.exec_driver_sql(
-                    "CREATE INDEX IF NOT EXISTS idx_response_library_team ON response_library(team_id)"
-                )
-    except Exception:
-        return
-
-
-async def ensure_ai_sessions_schema(engine) -> None:
-    """Session persistence for AI Studio."""
-    try:
-        async with engine.begin() as conn:
+    async with engine.begin() as conn:
+        res = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='response_library'"
+        )
+        if not res.fetchone():
             await conn.exec_driver_sql(
                 """
-                CREATE TABLE IF NOT EXISTS ai_studio_sessions (
+                CREATE TABLE response_library (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    team_id INTEGER,
-                    opportunity_id TEXT,
-                    name TEXT,
-                    state_json TEXT NOT NULL DEFAULT '{}',
-                    sections_total INTEGER DEFAULT 0,
-                    sections_completed INTEGER DEFAULT 0,
-                    has_cover_letter INTEGER DEFAULT 0,
-                    has_soq INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    user_id TEXT NOT NULL,
+                    team_id TEXT,
+                    question TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    metadata JSON,
+                    embedding TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
             await conn.exec_driver_sql(
-                "CREATE INDEX IF NOT EXISTS idx_ai_sessions_user ON ai_studio_sessions(user_id, last_accessed_at DESC)"
+                "CREATE INDEX IF NOT EXISTS idx_response_library_user ON response_library(user_id)"
+            )
+            await conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS idx_response_library_team ON response_library(team_id)"
+            )
+
+
+async def ensure_ai_sessions_schema(engine) -> None:
+    """Session persistence for AI Studio."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS ai_studio_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                team_id INTEGER,
+                opportunity_id TEXT,
+                name TEXT,
+                state_json TEXT NOT NULL DEFAULT '{}',
+                sections_total INTEGER DEFAULT 0,
+                sections_completed INTEGER DEFAULT 0,
+                has_cover_letter INTEGER DEFAULT 0,
+                has_soq INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-    except Exception:
-        return
+            """
+        )
+        await conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS idx_ai_sessions_user ON ai_studio_sessions(user_id, last_accessed_at DESC)"
+        )
 
 
 async def ensure_ai_chat_schema(engine) -> None:
     """Create ai_chat_messages table for session-scoped Q&A."""
-    try:
-        async with engine.begin() as conn:
-            await conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS ai_chat_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER NOT NULL,
-                    user_id TEXT NOT NULL,
-                    role TEXT NOT NULL CHECK(role IN ('user', 'assistant')),
-                    content TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES ai_studio_sessions(id) ON DELETE CASCADE
-                )
-                """
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS ai_chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                role TEXT NOT NULL CHECK(role IN ('user', 'assistant')),
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (session_id) REFERENCES ai_studio_sessions(id) ON DELETE CASCADE
             )
-            await conn.exec_driver_sql(
-                "CREATE INDEX IF NOT EXISTS idx_chat_session ON ai_chat_messages(session_id, created_at)"
-            )
-    except Exception:
-        return
+            """
+        )
+        await conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS idx_chat_session ON ai_chat_messages(session_id, created_at)"
+        )
 
 
 async def ensure_response_cache_schema(engine) -> None:
     """Create response_cache table for generated answer caching."""
-    try:
-        async with engine.begin() as conn:
-            await conn.exec_driver_sql(
-                """
-                CREATE TABLE IF NOT EXISTS response_cache (
-                    hash TEXT PRIMARY KEY,
-                    result JSON,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                hash TEXT PRIMARY KEY,
+                result JSON,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await conn.exec_driver_sql(
-                "CREATE INDEX IF NOT EXISTS idx_response_cache_date ON response_cache(created_at)"
+            """
+        )
+        await conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_date ON response_cache(created_at)"
+        )
+
+
+# Open-row predicate shared by the feed / listing queries. The partial index
+# below is only used when a query repeats it verbatim (SQLite and Postgres
+# both match partial-index predicates textually), so import it, don't retype it.
+OPEN_STATUS_PREDICATE = "status IS NULL OR TRIM(LOWER(status)) LIKE 'open%'"
+
+# Indexes matching the hot opportunities predicates (see app/core/query_plans.py).
+OPPORTUNITY_INDEXES = [
+    # open feed / landing stats / "open only" listing filter (status makes the counts covering)
+    f"CREATE INDEX IF NOT EXISTS idx_opps_open_due ON opportunities(due_date, status) WHERE {OPEN_STATUS_PREDICATE}",
+    # agency filter: LOWER(agency_name) = LOWER(:a) / IN (...)
+    "CREATE INDEX IF NOT EXISTS idx_opps_agency_key ON opportunities(LOWER(agency_name))",
+    # interest feed: LOWER(COALESCE(ai_category, category)) IN (...)
+    "CREATE INDEX IF NOT EXISTS idx_opps_category_key ON opportunities(LOWER(COALESCE(ai_category, category)))",
+    # runner enrichment + detail endpoints: external_id (+ agency_name)
+    "CREATE INDEX IF NOT EXISTS idx_opps_external_agency ON opportunities(external_id, agency_name)",
+    # digests (status = 'open' AND updated_at >= :since), close_missing_opportunities, 304 last_seen touches
+    "CREATE INDEX IF NOT EXISTS idx_opps_status_updated ON opportunities(status, updated_at)",
+    # due-date windows / ordering
+    "CREATE INDEX IF NOT EXISTS idx_opps_due_date ON opportunities(due_date)",
+]
+
+
+async def ensure_opportunity_indexes(engine) -> None:
+    """Create the query-driven opportunities indexes (idempotent, SQLite + Postgres)."""
+    async with engine.begin() as conn:
+        for ddl in OPPORTUNITY_INDEXES:
+            await conn.exec_driver_sql(ddl)
+
+
+async def ensure_data_versions_schema(engine) -> None:
+    """Create data_versions (app/core/data_version.py) for in-memory snapshot refreshes."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS data_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP
             )
-    except Exception:
-        return
+            """
+        )
+
+
+async def _add_column_if_missing(conn, table: str, column: str, decl: str) -> None:
+    """ALTER TABLE ... ADD COLUMN for tables created before `column` existed."""
+    if conn.dialect.name == "sqlite":
+        res = await conn.exec_driver_sql(f"PRAGMA table_info('{table}')")
+        cols: Set[str] = {row._mapping["name"] for row in res.fetchall()}
+        if column not in cols:
+            await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    else:
+        await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {decl}")
+
+
+# Also run lazily by app/ingest/source_schedule.py, so schedulers work before migrations.
+SOURCE_SCHEDULE_SQL = """
+CREATE TABLE IF NOT EXISTS source_schedule (
+    source TEXT PRIMARY KEY,
+    interval_min INTEGER NOT NULL,
+    change_rate REAL NOT NULL DEFAULT 0.5,
+    runs INTEGER NOT NULL DEFAULT 0,
+    last_run_at TIMESTAMP,
+    last_changed INTEGER DEFAULT 0,
+    last_rows INTEGER DEFAULT 0,
+    last_error TEXT,
+    next_run_at TIMESTAMP,
+    last_duration_s REAL
+)
+"""
+
+
+async def ensure_source_schedule_schema(engine) -> None:
+    """Create source_schedule; add last_duration_s (GET /metrics) to tables created before it."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(SOURCE_SCHEDULE_SQL)
+        await _add_column_if_missing(conn, "source_schedule", "last_duration_s", "REAL")
+
+
+# Also run lazily by app/ingest/runner.py (split-mode ingest workers).
+ENRICHMENT_QUEUE_SQL = """
+CREATE TABLE IF NOT EXISTS ai_enrichment_queue (
+    source_url TEXT PRIMARY KEY,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+async def ensure_enrichment_queue_schema(engine) -> None:
+    """Create ai_enrichment_queue; add attempts (failed enrichments) to tables created before it."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(ENRICHMENT_QUEUE_SQL)
+        await _add_column_if_missing(conn, "ai_enrichment_queue", "attempts", "INTEGER NOT NULL DEFAULT 0")
+
+
+# Also run lazily by app/core/job_lock.py, so schedulers work before migrations.
+SCHEDULER_LOCKS_SQL = """
+CREATE TABLE IF NOT EXISTS scheduler_locks (
+    job_name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    acquired_at TIMESTAMP NOT NULL,
+    lease_until TIMESTAMP NOT NULL,
+    heartbeat_at TIMESTAMP
+)
+"""
+
+JOB_RUNS_SQL = """
+CREATE TABLE IF NOT EXISTS job_runs (
+    id TEXT PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    fire_key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    duration_ms INTEGER,
+    error TEXT,
+    UNIQUE(job_name, fire_key)
+)
+"""
+
+JOB_RUNS_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_job_runs_started ON job_runs(job_name, started_at)"
+
+
+async def ensure_job_lock_schema(engine) -> None:
+    """Create scheduler_locks + job_runs (app/core/job_lock.py)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(SCHEDULER_LOCKS_SQL)
+        await conn.exec_driver_sql(JOB_RUNS_SQL)
+        await conn.exec_driver_sql(JOB_RUNS_INDEX_SQL)
+
+
+# Also run lazily by app/ingest/http.py (conditional GETs in split-mode ingest workers).
+HTTP_VALIDATORS_SQL = """
+CREATE TABLE IF NOT EXISTS http_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    fetched_at TIMESTAMP
+)
+"""
+
+
+async def ensure_http_validators_schema(engine) -> None:
+    """Create http_validators (ETag / Last-Modified / body hash per listing URL)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(HTTP_VALIDATORS_SQL)
+
+
+# Also run lazily by app/ingest/crawl_cursor.py (incremental OhioBuys crawls).
+CRAWL_CURSORS_SQL = """
+CREATE TABLE IF NOT EXISTS crawl_cursors (
+    source TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP
+)
+"""
+
+
+async def ensure_crawl_cursors_schema(engine) -> None:
+    """Create crawl_cursors (one JSON pagination cursor per source)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(CRAWL_CURSORS_SQL)
@@ -0,0 +1,357 @@
+# app/core/digest_render.py
+"""
+Digest HTML rendering with precompiled templates and fragment caches.
+
+Every user in a digest run sees the same opportunity rows, only filtered by
+agency. Rendering each item (and each agency section) once and reusing the
+HTML for every recipient turns the per-user cost into a handful of joins.
+
+Caches are in-process and bounded (LRU). Keys include a content hash of the
+fields that end up in the HTML, so an opportunity that changes between runs
+simply misses and re-renders.
+"""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from string import Template
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus
+
+logger = logging.getLogger("digest_render")
+
+# Max entries per cache. Item/section caches are sized for a few thousand
+# open opportunities; intros are one per agency per content change.
+_ITEM_CACHE_SIZE = 20_000
+_SECTION_CACHE_SIZE = 2_000
+_INTRO_CACHE_SIZE = 500
+
+
+# --------------------------------------------------------------------------------------
+# Precompiled templates
+# --------------------------------------------------------------------------------------
+
+_TAG_CHIP = Template(
+    "<span style='display:inline-block;background:#eef;border-radius:4px;"
+    "padding:2px 6px;margin:0 4px 4px 0;font-size:11px;color:#334;'>$tag</span>"
+)
+
+# Scheduler digest (daily/weekly) ------------------------------------------------------
+
+_ITEM_TPL = Template(
+    "<div style='margin-bottom:14px;padding-bottom:8px;border-bottom:1px solid #eee;'>"
+    "<a href='$url' style='font-weight:600;color:#0366d6;text-decoration:none;'>$title</a>"
+    "<div style='font-size:12px;color:#666;'>Due: $due</div>"
+    "$summary_html"
+    "$tags_html"
+    "</div>"
+)
+_ITEM_SUMMARY_TPL = Template("<p style='margin:4px 0;font-size:13px;color:#333;'>$summary</p>")
+
+_AGENCY_HEADER_TPL = Template(
+    "<h3 style='font-size:16px;font-weight:600;color:#111;margin:24px 0 12px;'>$agency</h3>"
+)
+
+_DIGEST_TPL = Template(
+    "<div style='font-family:Arial,sans-serif;color:#111;font-size:15px;line-height:1.5;"
+    "background-color:#ffffff;padding:24px;max-width:640px;margin:auto;'>"
+    "<h2 style='margin:0 0 8px;font-size:20px;font-weight:600;'>"
+    "EasyRFP - $total New / Updated Opportunities</h2>"
+    "<p style='margin:0 0 24px;color:#4b5563;'>Bids and RFPs from $window.</p>"
+    "$sections"
+    "<hr style='border:none;border-top:1px solid #ddd;margin:24px 0;'>"
+    "<p style='font-size:12px;color:#888;'>"
+    "You're receiving this because you're subscribed to EasyRFP.<br>"
+    "<a href='$unsubscribe_url' style='color:#1a73e8;'>Unsubscribe instantly</a> or "
+    "adjust your preferences."
+    "</p>"
+    "</div>"
+)
+
+# Legacy preview digest (app/email_digest.py) ------------------------------------------
+
+_LEGACY_ITEM_SUMMARY_TPL = Template(
+    "<p style='margin:4px 0 4px 0;font-size:13px;color:#333;'>$summary</p>"
+)
+_LEGACY_AGENCY_HEADER_TPL = Template("<h2 style='margin-top:24px;color:#222;'>$agency</h2>")
+_LEGACY_INTRO_TPL = Template("<p style='color:#555;font-size:13px;margin:4px 0 12px 0;'>$intro</p>")
+_LEGACY_DIGEST_TPL = Template(
+    "<html><body style='font-family:Arial,sans-serif;'>"
+    "<h1 style='margin-bottom:16px;'>EasyRFP - New Opportunities</h1>"
+    "$sections"
+    "</body></html>"
+)
+
+
+# --------------------------------------------------------------------------------------
+# Small bounded LRU
+# --------------------------------------------------------------------------------------
+
+class _LRU:
+    """Minimal bounded LRU dict with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[str]:
+        val = self._data.get(key)
+        if val is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return val
+
+    def set(self, key, value: str) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _content_hash(*parts: Any) -> str:
+    joined = "\x1f".join("" if p is None else str(p) for p in parts)
+    return hashlib.sha1(joined.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _parse_tags(raw) -> List[str]:
+    if isinstance(raw, list):
+        return raw
+    try:
+        tags = json.loads(raw or "[]")
+    except Exception:
+        return []
+    return tags if isinstance(tags, list) else []
+
+
+def _due_str(due) -> str:
+    return str(due).split(" ")[0] if due else "TBD"
+
+
+# --------------------------------------------------------------------------------------
+# Renderer
+# --------------------------------------------------------------------------------------
+
+class DigestRenderer:
+    """
+    Renders digest emails from opportunity row dicts (as returned by
+    `_collect_recent_opportunities`). One instance is shared per process.
+    """
+
+    def __init__(
+        self,
+        item_cache_size: int = _ITEM_CACHE_SIZE,
+        section_cache_size: int = _SECTION_CACHE_SIZE,
+        intro_cache_size: int = _INTRO_CACHE_SIZE,
+    ):
+        self._items = _LRU(item_cache_size)
+        self._sections = _LRU(section_cache_size)
+        self._intros = _LRU(intro_cache_size)
+
+    # ---- keys ------------------------------------------------------------------------
+
+    @staticmethod
+    def item_key(row: Dict[str, Any], base_url: str, style: str = "digest") -> Tuple[str, Any, str]:
+        """(style, opportunity id, content hash) for a row."""
+        opp_key = row.get("id") or row.get("external_id") or row.get("source_url")
+        digest = _content_hash(
+            base_url,
+            row.get("title"),
+            row.get("due_date"),
+            row.get("ai_summary"),
+            row.get("ai_tags_json"),
+            row.get("external_id"),
+            row.get("agency_name"),
+            row.get("source_url"),
+        )
+        return (style, opp_key, digest)
+
+    # ---- fragments -------------------------------------------------------------------
+
+    @staticmethod
+    def _tags_html(tags: Iterable[str]) -> str:
+        tags = list(tags)
+        if not tags:
+            return ""
+        return "<div>" + " ".join(_TAG_CHIP.substitute(tag=t) for t in tags) + "</div>"
+
+    @staticmethod
+    def detail_url(row: Dict[str, Any], base_url: str) -> str:
+        """Link back to /opportunities (by external id, then internal id, then source)."""
+        agency_name = row.get("agency_name") or ""
+        ext_id = row.get("external_id")
+        opp_id = row.get("id")
+        if ext_id:
+            return (
+                f"{base_url}/opportunities?"
+                f"ext={quote_plus(ext_id)}&agency={quote_plus(agency_name)}"
+            )
+        if opp_id:
+            return (
+                f"{base_url}/opportunities?"
+                f"id={quote_plus(str(opp_id))}&agency={quote_plus(agency_name)}"
+            )
+        return row.get("source_url") or "#"
+
+    def render_item(self, row: Dict[str, Any], base_url: str) -> str:
+        """Rendered HTML for one opportunity in the scheduler digest."""
+        key = self.item_key(row, base_url)
+        cached = self._items.get(key)
+        if cached is not None:
+            return cached
+
+        summary = row.get("ai_summary") or ""
+        html = _ITEM_TPL.substitute(
+            url=self.detail_url(row, base_url),
+            title=row.get("title") or "(no title)",
+            due=_due_str(row.get("due_date")),
+            summary_html=_ITEM_SUMMARY_TPL.substitute(summary=summary) if summary else "",
+            tags_html=self._tags_html(_parse_tags(row.get("ai_tags_json"))),
+        )
+        self._items.set(key, html)
+        return html
+
+    def render_agency_section(self, agency_name: str, items: Sequence[Dict[str, Any]], base_url: str) -> str:
+        """Header + every item for one agency; cached on the item keys."""
+        if not items:
+            return ""
+        key = (agency_name, base_url, tuple(self.item_key(r, base_url)[1:] for r in items))
+        cached = self._sections.get(key)
+        if cached is not None:
+            return cached
+
+        html = _AGENCY_HEADER_TPL.substitute(agency=agency_name) + "".join(
+            self.render_item(r, base_url) for r in items
+        )
+        self._sections.set(key, html)
+        return html
+
+    def render_sections(self, by_agency: Dict[str, List[Dict[str, Any]]], base_url: str) -> Dict[str, str]:
+        """
+        Render every agency section once per digest run. The result is shared by
+        all recipients; each user's email is then just a join of their agencies.
+        """
+        sections = {}
+        for agency_name, items in by_agency.items():
+            html = self.render_agency_section(agency_name, items or [], base_url)
+            if html:
+                sections[agency_name] = html
+        return sections
+
+    def render_digest(
+        self,
+        sections: Dict[str, str],
+        agencies: Iterable[str],
+        total_count: int,
+        window_text: str,
+        unsubscribe_url: str,
+    ) -> str:
+        """
+        Full digest body for one user from pre-rendered `sections`. Returns ""
+        when none of `agencies` has a section (caller should skip the send).
+        """
+        parts = [sections[a] for a in sorted(agencies) if a in sections]
+        if not parts:
+            return ""
+        return _DIGEST_TPL.substitute(
+            total=total_count,
+            window=window_text,
+            sections="".join(parts),
+            unsubscribe_url=unsubscribe_url,
+        )
+
+    # ---- legacy preview digest -------------------------------------------------------
+
+    def render_legacy_item(self, row: Dict[str, Any]) -> str:
+        """Item markup used by app/email_digest.py (links straight to the source)."""
+        key = self.item_key(row, "", style="legacy")
+        cached = self._items.get(key)
+        if cached is not None:
+            return cached
+
+        summary = row.get("ai_summary") or ""
+        html = _ITEM_TPL.substitute(
+            url=row.get("source_url") or "#",
+            title=row.get("title") or "(no title)",
+            due=row.get("due_date") or "TBD",
+            summary_html=_LEGACY_ITEM_SUMMARY_TPL.substitute(summary=summary) if summary else "",
+            tags_html=self._tags_html(_parse_tags(row.get("ai_tags_json"))),
+        )
+        self._items.set(key, html)
+        return html
+
+    def agency_intro(self, agency: str, items: Sequence[Dict[str, Any]], llm_client) -> str:
+        """
+        One-paragraph LLM intro for an agency, cached by agency + the titles
+        that go into the prompt. Failures and empty answers are not cached so
+        the next build retries.
+        """
+        if not llm_client or not items:
+            return ""
+        titles = "\n".join(f"- {i.get('title')}" for i in items[:6])
+        key = (agency, _content_hash(agency, titles))
+        cached = self._intros.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = (
+            f"Summarize these municipal RFPs from {agency} in one short paragraph:\n"
+            f"{titles}\n\nLimit to 45 words, plain language."
+        )
+        try:
+            resp = llm_client.chat(
+                [{"role": "user", "content": prompt}],
+                temperature=0,
+            )
+        except Exception as e:
+            logger.warning("digest intro error for %s: %s", agency, e)
+            return ""
+        resp = (resp or "").strip()
+        if resp:
+            self._intros.set(key, resp)
+        return resp
+
+    def render_legacy_digest(self, grouped: Dict[str, List[Dict[str, Any]]], llm_client=None) -> str:
+        sections = []
+        for agency, items in grouped.items():
+            sections.append(_LEGACY_AGENCY_HEADER_TPL.substitute(agency=agency))
+            intro = self.agency_intro(agency, items, llm_client)
+            if intro:
+                sections.append(_LEGACY_INTRO_TPL.substitute(intro=intro))
+            sections.extend(self.render_legacy_item(r) for r in items)
+        return _LEGACY_DIGEST_TPL.substitute(sections="".join(sections))
+
+    # ---- housekeeping ----------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"size": len(c), "hits": c.hits, "misses": c.misses}
+            for name, c in (("items", self._items), ("sections", self._sections), ("intros", self._intros))
+        }
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._sections.clear()
+        self._intros.clear()
+
+
+_renderer: Optional[DigestRenderer] = None
+
+
+def get_digest_renderer() -> DigestRenderer:
+    """Process-wide renderer (caches survive between digest runs)."""
+    global _renderer
+    if _renderer is None:
+        _renderer = DigestRenderer()
+    return _renderer
@@ -1,8 +1,13 @@
+import logging
 import smtplib
+import time
 from email.mime.text import MIMEText
 
+from app.core import metrics
 from app.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 def send_email(to_email: str, subject: str, html_body: str):
     """Send HTML email via Mailtrap (or local SMTP)."""
@@ -11,13 +16,19 @@ def send_email(to_email: str, subject: str, html_body: str):
     msg["From"] = settings.SMTP_FROM
     msg["To"] = to_email
 
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        try:
-            # Attempt STARTTLS when supported; continue without if the server doesn't offer it.
-            server.starttls()  # enable TLS (Mailtrap accepts STARTTLS on 2525)
-        except smtplib.SMTPException:
-            pass
-        if getattr(settings, "SMTP_USERNAME", None) and getattr(settings, "SMTP_PASSWORD", None):
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        server.sendmail(settings.SMTP_FROM, [to_email], msg.as_string())
-        print(f"Sent email to {to_email}")
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
+            try:
+                # Attempt STARTTLS when supported; continue without if the server doesn't offer it.
+                server.starttls()  # enable TLS (Mailtrap accepts STARTTLS on 2525)
+            except smtplib.SMTPException:
+                pass
+            if getattr(settings, "SMTP_USERNAME", None) and getattr(settings, "SMTP_PASSWORD", None):
+                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+            server.sendmail(settings.SMTP_FROM, [to_email], msg.as_string())
+            logger.info(f"Sent email to {to_email}")
+        outcome = "ok"
+    finally:
+        metrics.EMAIL_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
@@ -0,0 +1,305 @@
+# app/core/http_cache.py
+"""
+Rendered-response cache for pages whose content only changes when their
+data does: the marketing home, /calendar.ics, vendor guides and the
+/opportunities listing.
+
+Each CacheRule names the data_versions counters (app/core/data_version.py)
+its page is built from; "{user}" in a name is the caller's email. A request
+is keyed on (rule, path, sorted query, user class) where the user class is
+the session email (or the signed calendar token's) or "anon". Its ETag is a hash of that key, the current
+versions and the UTC date, so it is known *before* rendering:
+
+    If-None-Match matches (or If-Modified-Since is current)  -> 304, no render
+    cached body with the same ETag, younger than ttl_s        -> served (HIT)
+    cached body within ttl_s + swr_s, shared data moved on    -> served (STALE)
+        while one background render replaces it
+    otherwise                                                 -> render (MISS)
+
+Only 200 responses without Set-Cookie are stored. A change to a user-scoped
+counter (their trackers, their preferences) is never answered stale.
+Entries live in-process (LRU, bounded by HTTP_CACHE_MAX_ENTRIES and a
+HTTP_CACHE_MAX_MB byte budget); every worker warms its own copy, and the
+shared version counters keep them consistent.
+"""
+import asyncio
+import datetime as dt
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.requests import Request
+
+from app.auth.session import get_current_user_email
+from app.core import data_version, metrics
+from app.core.calendar_token import parse_calendar_token
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    name: str
+    path: str                    # exact path, or a prefix when it ends with "/"
+    versions: Tuple[str, ...]    # data_versions names; "{user}" -> caller's email
+    ttl_s: int                   # serve without re-rendering
+    swr_s: int = 0               # then serve stale while one request re-renders
+    client_max_age: int = 0      # Cache-Control max-age for browsers / calendar apps
+    skip: Tuple[str, ...] = ()   # paths under a prefix rule that must never be cached
+    calendar_token: bool = False # ?token= (signed calendar feed) identifies the user
+
+    def matches(self, path: str) -> bool:
+        if path in self.skip:
+            return False
+        if self.path.endswith("/") and self.path != "/":
+            return path.startswith(self.path) and path != self.path
+        return path == self.path
+
+
+CACHE_RULES: List[CacheRule] = [
+    CacheRule("home", "/", (data_version.OPPORTUNITIES,), ttl_s=300, swr_s=900),
+    CacheRule(
+        "calendar_ics",
+        "/calendar.ics",
+        (data_version.OPPORTUNITIES, "trackers:{user}"),
+        ttl_s=900,
+        swr_s=3600,
+        client_max_age=900,
+        calendar_token=True,
+    ),
+    CacheRule(
+        "vendor_guide",
+        "/vendor-guides/",
+        ("vendor_guides",),
+        ttl_s=3600,
+        swr_s=86400,
+        skip=("/vendor-guides/city-of-columbus/refresh",),
+    ),
+    CacheRule(
+        "opportunities",
+        "/opportunities",
+        (data_version.OPPORTUNITIES, "trackers:{user}", "preferences:{user}"),
+        ttl_s=120,
+        swr_s=600,
+    ),
+]
+
+_STRIP_HEADERS = {b"content-length", b"etag", b"last-modified", b"cache-control", b"vary", b"date"}
+
+
+@dataclass
+class _Entry:
+    etag: str
+    versions: Dict[str, int]
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    stored_at: float       # monotonic, for ttl / swr
+    last_modified: int     # epoch seconds, for Last-Modified / If-Modified-Since
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+def _match(path: str) -> Optional[CacheRule]:
+    for rule in CACHE_RULES:
+        if rule.matches(path):
+            return rule
+    return None
+
+
+def _etag(key: Tuple, versions: Dict[str, int]) -> str:
+    raw = repr((key, sorted(versions.items()), dt.datetime.utcnow().date().isoformat()))
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def _not_modified_since(header: Optional[str], last_modified: int) -> bool:
+    if not header:
+        return False
+    try:
+        return last_modified <= int(parsedate_to_datetime(header).timestamp())
+    except (TypeError, ValueError):
+        return False
+
+
+class ResponseCacheMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._bytes = 0  # sum of entry sizes, kept under HTTP_CACHE_MAX_MB
+        self._refreshing: set = set()
+        self._tasks: set = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.HTTP_CACHE_ENABLED:
+            return await self.app(scope, receive, send)
+        rule = _match(scope["path"])
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        scope.setdefault(metrics.ROUTE_HINT, rule.path)
+        request = Request(scope)
+        email = get_current_user_email(request)
+        if rule.calendar_token and request.query_params.get("token"):
+            email = parse_calendar_token(request.query_params.get("token")) or email
+        user_class = email.strip().lower() if email else "anon"
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        key = (rule.name, scope["path"], query, user_class)
+
+        names = [name.format(user=user_class) for name in rule.versions]
+        versions = await data_version.current_many(names)
+        etag = _etag(key, versions)
+        entry = self._entries.get(key)
+
+        if _etag_matches(request.headers.get("if-none-match"), etag) or (
+            "if-none-match" not in request.headers
+            and entry is not None
+            and entry.etag == etag
+            and _not_modified_since(request.headers.get("if-modified-since"), entry.last_modified)
+        ):
+            return await self._send_not_modified(send, rule, user_class, etag, entry)
+
+        now = time.monotonic()
+        if entry is not None:
+            age = now - entry.stored_at
+            if entry.etag == etag and age < rule.ttl_s:
+                self._entries.move_to_end(key)
+                return await self._send_entry(send, rule, user_class, entry, b"HIT")
+            user_moved = any(
+                entry.versions.get(name) != versions[name] for name in names if ":" in name
+            )
+            if age < rule.ttl_s + rule.swr_s and not user_moved:
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._revalidate(scope, key, etag, versions))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return await self._send_entry(send, rule, user_class, entry, b"STALE")
+
+        status, headers, body = await self._render(scope, receive)
+        stored = self._store(key, etag, versions, status, headers, body)
+        if stored is not None:
+            return await self._send_entry(send, rule, user_class, stored, b"MISS")
+        metrics.HTTP_CACHE_RESPONSES.inc(rule=rule.name, outcome="BYPASS")
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    # ---- rendering / storage ------------------------------------------------
+
+    async def _render(self, scope, receive) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        return start.get("status", 500), list(start.get("headers", [])), b"".join(chunks)
+
+    async def _revalidate(self, scope, key, etag, versions) -> None:
+        async def empty_receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        try:
+            fresh_scope = dict(scope)
+            fresh_scope["state"] = {}
+            status, headers, body = await self._render(fresh_scope, empty_receive)
+            self._store(key, etag, versions, status, headers, body)
+        except Exception as exc:
+            logger.warning(f"http cache: background render of {scope['path']} failed: {exc}")
+        finally:
+            self._refreshing.discard(key)
+
+    def _store(self, key, etag, versions, status, headers, body) -> Optional[_Entry]:
+        if status != 200 or any(k.lower() == b"set-cookie" for k, _ in headers):
+            self._drop(key)
+            return None
+        if len(body) > settings.HTTP_CACHE_MAX_BODY_KB * 1024:
+            return None
+        entry = _Entry(
+            etag=etag,
+            versions=dict(versions),
+            status=status,
+            headers=[(k, v) for k, v in headers if k.lower() not in _STRIP_HEADERS],
+            body=body,
+            stored_at=time.monotonic(),
+            last_modified=int(time.time()),
+        )
+        budget = int(max(float(settings.HTTP_CACHE_MAX_MB), 0) * 1024 * 1024)
+        if entry.size > budget:
+            return None
+        self._drop(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        max_entries = max(int(settings.HTTP_CACHE_MAX_ENTRIES), 1)
+        while len(self._entries) > max_entries or self._bytes > budget:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+        return entry
+
+    def _drop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    # ---- responses ------------------------------------------------------------
+
+    @staticmethod
+    def _validators(rule: CacheRule, user_class: str, etag: str, last_modified: Optional[int]):
+        scope = "public" if user_class == "anon" else "private"
+        cache_control = f"{scope}, max-age={rule.client_max_age}"
+        if rule.swr_s:
+            cache_control += f", stale-while-revalidate={rule.swr_s}"
+        headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", cache_control.encode()),
+            (b"vary", b"Cookie"),
+        ]
+        if last_modified is not None:
+            headers.append((b"last-modified", formatdate(last_modified, usegmt=True).encode()))
+        return headers
+
+    async def _send_not_modified(self, send, rule, user_class, etag, entry: Optional[_Entry]):
+        last_modified = entry.last_modified if entry is not None and entry.etag == etag else None
+        metrics.HTTP_CACHE_RESPONSES.inc(rule=rule.name, outcome="REVALIDATED")
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": self._validators(rule, user_class, etag, last_modified) + [(b"x-cache", b"REVALIDATED")],
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_entry(self, send, rule, user_class, entry: _Entry, outcome: bytes):
+        metrics.HTTP_CACHE_RESPONSES.inc(rule=rule.name, outcome=outcome.decode())
+        headers = list(entry.headers)
+        headers += self._validators(rule, user_class, entry.etag, entry.last_modified)
+        headers += [(b"content-length", str(len(entry.body)).encode()), (b"x-cache", outcome)]
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,360 @@
+# app/core/job_lock.py
+"""
+Cross-process coordination for scheduled jobs.
+
+Several processes may run the same APScheduler cron (scaled `worker` dynos,
+or START_SCHEDULER_WEB on multiple gunicorn workers). Two layers make sure
+each cron firing is executed by exactly one of them:
+
+1. A per-job mutex, so a long job (e.g. scraping) never overlaps itself:
+   - Postgres: session-level `pg_try_advisory_lock` held on a dedicated
+     connection for the duration of the job.
+   - SQLite/others: a row in `scheduler_locks` with a lease that the owner
+     extends via a heartbeat task. Expired leases can be stolen, so a
+     crashed process does not block the job forever.
+
+2. A `job_runs` history row with UNIQUE(job_name, fire_key). The process
+   that inserts it owns that firing; everyone else skips. The row records
+   status, timing and error for later inspection.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import JOB_RUNS_INDEX_SQL, JOB_RUNS_SQL, SCHEDULER_LOCKS_SQL
+from app.core.settings import settings
+
+logger = logging.getLogger("job_lock")
+
+# Identifies this process in lock rows and run history.
+OWNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# A firing that starts this long after its scheduled time is still treated as
+# the same firing (matches APScheduler's misfire handling for our crons).
+_FIRE_KEY_GRACE = timedelta(minutes=15)
+
+_SCHEMA_READY = False
+
+
+def _is_postgres() -> bool:
+    return engine.url.get_backend_name().startswith("postgres")
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+async def ensure_job_lock_schema() -> None:
+    """Create scheduler_locks + job_runs once per process."""
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+    # Columns added later come from migration steps (app/core/migrate.py).
+    async with engine.begin() as conn:
+        await conn.execute(text(SCHEDULER_LOCKS_SQL))
+        await conn.execute(text(JOB_RUNS_SQL))
+        await conn.execute(text(JOB_RUNS_INDEX_SQL))
+    _SCHEMA_READY = True
+
+
+def fire_key_for(trigger, now: Optional[datetime] = None) -> str:
+    """
+    Stable identifier for the cron firing we are currently in.
+
+    Every process computes the same value (the scheduled fire time) even if
+    their clocks or event loops are a little apart. Falls back to the
+    current minute when the trigger cannot tell us.
+    """
+    tz = getattr(trigger, "timezone", None)
+    now = now or datetime.now(tz)
+    fire_time = None
+    try:
+        # latest fire time within the grace window (crons can fire more than once in it)
+        nxt = trigger.get_next_fire_time(None, now - _FIRE_KEY_GRACE)
+        while nxt is not None and nxt <= now:
+            fire_time = nxt
+            nxt = trigger.get_next_fire_time(nxt, nxt + timedelta(microseconds=1))
+    except Exception:
+        fire_time = None
+    if fire_time is None:
+        fire_time = now.replace(second=0, microsecond=0)
+    return fire_time.isoformat()
+
+
+# --------------------------------------------------------------------------------------
+# Mutex: Postgres advisory lock
+# --------------------------------------------------------------------------------------
+
+def _advisory_key(job_name: str) -> int:
+    # pg advisory locks take a signed bigint; crc32 keeps it stable across processes.
+    return zlib.crc32(f"easyrfp:job:{job_name}".encode("utf-8"))
+
+
+class _AdvisoryLock:
+    def __init__(self, job_name: str):
+        self.key = _advisory_key(job_name)
+        self._conn = None
+
+    async def acquire(self) -> bool:
+        self._conn = await engine.connect()
+        try:
+            res = await self._conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": self.key})
+            got = bool(res.scalar())
+            await self._conn.commit()
+        except Exception:
+            await self._conn.close()
+            self._conn = None
+            raise
+        if not got:
+            await self._conn.close()
+            self._conn = None
+        return got
+
+    async def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": self.key})
+            await self._conn.commit()
+        except Exception as exc:
+            # Session locks survive pool check-in; drop the connection instead.
+            logger.warning("advisory unlock failed, invalidating connection: %s", exc)
+            try:
+                await self._conn.invalidate()
+            except Exception:
+                pass
+        finally:
+            await self._conn.close()
+            self._conn = None
+
+
+# --------------------------------------------------------------------------------------
+# Mutex: lease row with heartbeat (SQLite and anything without advisory locks)
+# --------------------------------------------------------------------------------------
+
+class _LeaseLock:
+    def __init__(self, job_name: str, lease_seconds: int):
+        self.job_name = job_name
+        self.lease = timedelta(seconds=lease_seconds)
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def acquire(self) -> bool:
+        now = _utcnow()
+        params = {
+            "job": self.job_name,
+            "owner": OWNER_ID,
+            "now": now,
+            "lease_until": now + self.lease,
+        }
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO scheduler_locks (job_name, owner, acquired_at, lease_until, heartbeat_at)
+                    VALUES (:job, :owner, :now, :lease_until, :now)
+                    ON CONFLICT(job_name) DO UPDATE SET
+                        owner = excluded.owner,
+                        acquired_at = excluded.acquired_at,
+                        lease_until = excluded.lease_until,
+                        heartbeat_at = excluded.heartbeat_at
+                    WHERE scheduler_locks.lease_until < :now
+                       OR scheduler_locks.owner = :owner
+                """),
+                params,
+            )
+            res = await conn.execute(
+                text("SELECT owner FROM scheduler_locks WHERE job_name = :job"),
+                {"job": self.job_name},
+            )
+            got = res.scalar() == OWNER_ID
+        if got:
+            self._heartbeat = asyncio.create_task(self._beat())
+        return got
+
+    async def _beat(self) -> None:
+        interval = max(self.lease.total_seconds() / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            now = _utcnow()
+            try:
+                async with engine.begin() as conn:
+                    res = await conn.execute(
+                        text("""
+                            UPDATE scheduler_locks
+                            SET lease_until = :lease_until, heartbeat_at = :now
+                            WHERE job_name = :job AND owner = :owner
+                        """),
+                        {"job": self.job_name, "owner": OWNER_ID, "now": now, "lease_until": now + self.lease},
+                    )
+                    if res.rowcount == 0:
+                        logger.warning("lost lease on %s (another process took it over)", self.job_name)
+                        return
+            except Exception as exc:
+                logger.warning("heartbeat for %s failed: %s", self.job_name, exc)
+
+    async def release(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._heartbeat = None
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text("DELETE FROM scheduler_locks WHERE job_name = :job AND owner = :owner"),
+                    {"job": self.job_name, "owner": OWNER_ID},
+                )
+        except Exception as exc:
+            logger.warning("releasing lease on %s failed (it will expire): %s", self.job_name, exc)
+
+
+def _make_lock(job_name: str):
+    if _is_postgres():
+        return _AdvisoryLock(job_name)
+    return _LeaseLock(job_name, settings.SCHEDULER_LOCK_LEASE_S)
+
+
+# --------------------------------------------------------------------------------------
+# Run history
+# --------------------------------------------------------------------------------------
+
+async def _claim_firing(job_name: str, fire_key: str) -> Optional[str]:
+    """Insert the job_runs row for this firing. Returns run id, or None if already claimed."""
+    run_id = str(uuid.uuid4())
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text("""
+                INSERT INTO job_runs (id, job_name, fire_key, owner, status, started_at)
+                VALUES (:id, :job, :fire_key, :owner, 'running', :now)
+                ON CONFLICT(job_name, fire_key) DO NOTHING
+            """),
+            {"id": run_id, "job": job_name, "fire_key": fire_key, "owner": OWNER_ID, "now": _utcnow()},
+        )
+        if res.rowcount == 0:
+            return None
+    return run_id
+
+
+async def _finish_run(run_id: str, started: datetime, status: str, error: Optional[str] = None) -> None:
+    finished = _utcnow()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("""
+                    UPDATE job_runs
+                    SET status = :status, finished_at = :finished, duration_ms = :ms, error = :error
+                    WHERE id = :id
+                """),
+                {
+                    "id": run_id,
+                    "status": status,
+                    "finished": finished,
+                    "ms": int((finished - started).total_seconds() * 1000),
+                    "error": (error or None) and error[:2000],
+                },
+            )
+    except Exception as exc:
+        logger.warning("could not record job run %s: %s", run_id, exc)
+
+
+async def recent_job_runs(job_name: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Latest job_runs rows (newest first), optionally for one job."""
+    await ensure_job_lock_schema()
+    where = "WHERE job_name = :job" if job_name else ""
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text(f"""
+                SELECT job_name, fire_key, owner, status, started_at, finished_at, duration_ms, error
+                FROM job_runs
+                {where}
+                ORDER BY started_at DESC
+                LIMIT :limit
+            """),
+            {"job": job_name, "limit": limit},
+        )
+        return [dict(r) for r in res.mappings().all()]
+
+
+# --------------------------------------------------------------------------------------
+# Public API
+# --------------------------------------------------------------------------------------
+
+async def run_exclusive(job_name: str, fire_key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run `fn` only if this process wins both the job mutex and the firing claim.
+    Returns fn()'s result, or None when skipped.
+    """
+    await ensure_job_lock_schema()
+
+    lock = _make_lock(job_name)
+    try:
+        got = await lock.acquire()
+    except Exception as exc:
+        logger.error("[%s] lock acquire failed, skipping this firing: %s", job_name, exc)
+        return None
+    if not got:
+        logger.info("[%s] another process holds the lock; skipping %s", job_name, fire_key)
+        return None
+
+    try:
+        run_id = await _claim_firing(job_name, fire_key)
+        if run_id is None:
+            logger.info("[%s] firing %s already ran elsewhere; skipping", job_name, fire_key)
+            return None
+
+        started = _utcnow()
+        try:
+            result = await fn()
+        except Exception as exc:
+            await _finish_run(run_id, started, "error", repr(exc))
+            raise
+        await _finish_run(run_id, started, "ok")
+        return result
+    finally:
+        await lock.release()
+
+
+@asynccontextmanager
+async def held_lock(job_name: str, wait_s: float):
+    """
+    Hold the `job_name` mutex for the block, polling for up to `wait_s`
+    seconds while another process has it. Raises TimeoutError after that.
+    No job_runs row is written -- for one-off critical sections (schema DDL).
+    """
+    await ensure_job_lock_schema()
+    lock = _make_lock(job_name)
+    deadline = asyncio.get_running_loop().time() + wait_s
+    while not await lock.acquire():
+        if asyncio.get_running_loop().time() >= deadline:
+            raise TimeoutError(f"{job_name}: lock still held by another process after {wait_s}s")
+        await asyncio.sleep(0.5)
+    try:
+        yield
+    finally:
+        await lock.release()
+
+
+def exclusive_job(job_name: str, fn: Callable[[], Awaitable[Any]], trigger) -> Callable[[], Awaitable[Any]]:
+    """
+    Wrap an async job for APScheduler so only one process runs each firing.
+    When SCHEDULER_LOCK_ENABLED is off the job is returned unchanged.
+    """
+    if not settings.SCHEDULER_LOCK_ENABLED:
+        return fn
+
+    async def _wrapped():
+        return await run_exclusive(job_name, fire_key_for(trigger), fn)
+
+    _wrapped.__name__ = getattr(fn, "__name__", job_name)
+    _wrapped.__qualname__ = _wrapped.__name__
+    return _wrapped
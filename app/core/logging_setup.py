@@ -0,0 +1,117 @@
+# app/core/logging_setup.py
+"""
+Process-wide logging: one QueueHandler on the root logger, one QueueListener
+thread doing the actual (blocking) writes to stdout. Request handlers and
+ingest loops only pay for building a record and a queue put.
+
+    configure_logging()   web app import, worker / scheduler / runner CLIs
+    stop_logging()        flush on shutdown (also registered with atexit)
+
+Settings:
+    LOG_LEVEL           root level
+    LOG_LEVELS          per-module overrides, "app.ingest=DEBUG,httpx=WARNING"
+    LOG_FORMAT          "text" or "json" (one object per line)
+    LOG_ACCESS_SAMPLE   fraction of ordinary "app.access" lines kept; errors
+                        (status >= 400) and requests slower than
+                        LOG_ACCESS_SLOW_MS are always kept
+
+Structured fields: pass `extra={"fields": {...}}`; the JSON format emits them
+as top-level keys, the text format appends them as key=value.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.settings import settings
+
+ACCESS_LOGGER = "app.access"
+
+_listener: Optional[QueueListener] = None
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        return json.dumps(payload, default=str)
+
+
+class AccessSampler(logging.Filter):
+    """Keep every error / slow request and LOG_ACCESS_SAMPLE of the rest."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = getattr(record, "fields", None) or {}
+        if int(fields.get("status", 0)) >= 400:
+            return True
+        if float(fields.get("ms", 0)) >= settings.LOG_ACCESS_SLOW_MS:
+            return True
+        rate = settings.LOG_ACCESS_SAMPLE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse "app.ingest=DEBUG, httpx=warning" into {name: level}; bad entries are skipped."""
+    levels = {}
+    for part in (spec or "").split(","):
+        name, _, level = part.partition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+def configure_logging() -> None:
+    """Install the queue handler on the root logger (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT.lower() == "json" else TextFormatter())
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(records)]
+    root.setLevel(parse_levels(f"root={settings.LOG_LEVEL}").get("root", logging.INFO))
+    for name, level in parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    access = logging.getLogger(ACCESS_LOGGER)
+    if not any(isinstance(f, AccessSampler) for f in access.filters):
+        access.addFilter(AccessSampler())
+
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Drain the queue, stop the writer thread and log synchronously from then on."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().handlers = list(_listener.handlers)
+    _listener = None
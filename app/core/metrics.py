@@ -0,0 +1,290 @@
+# app/core/metrics.py
+"""
+In-process metrics, rendered in the Prometheus text format by GET /metrics
+(app/api/metrics.py).
+
+    MetricsMiddleware     per-route latency, plus DB and LLM time per request
+    instrument_engine()   SQLAlchemy cursor hooks: query count / time
+                          (app/core/db_engine.py installs them on every engine)
+    llm_call()            latency and token counts around the LLM clients'
+                          chat() (app/ai/client.py)
+    INGEST_SOURCE_SECONDS per-source scrape timings (app/ingest/runner.py)
+    EMAIL_SECONDS         SMTP sends (app/core/emailer.py)
+
+Work done while serving a request (queries, LLM calls, also from
+asyncio.to_thread) is added to that request's RequestTimings through a
+context variable, so the route histograms show where its time went.
+
+Values live in this process only. Each web worker reports its own numbers
+(Prometheus sums them per instance); scrapes run by separate workers also
+persist their last duration in source_schedule, which /metrics reads back.
+No prometheus_client dependency: counters and histograms are all we need.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.settings import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SLOW_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# Scope key a middleware can set when it answers without reaching the router
+# (e.g. the response cache), so the request is still labelled by route.
+ROUTE_HINT = "metrics.route"
+UNMATCHED = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + inner + "}" if inner else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labelnames=()):
+        super().__init__(name, doc, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(zip(self.labelnames, key))} {_fmt(v)}" for key, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}  # per bucket, last one is +Inf
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            pairs = list(zip(self.labelnames, key))
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', _fmt(bound))])} {running}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {running}")
+        return lines
+
+
+_REGISTRY: List[_Metric] = []
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to serve a request.", ("method", "route", "status")
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request.", ("route",)
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries issued per request.", ("route",), COUNT_BUCKETS
+)
+REQUEST_LLM_SECONDS = Histogram(
+    "http_request_llm_seconds", "Time spent waiting on the LLM per request (requests that called it).",
+    ("route",), SLOW_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "Single query execution time.", ("engine",))
+LLM_SECONDS = Histogram(
+    "llm_request_duration_seconds", "LLM chat call latency, retries included.",
+    ("provider", "model", "outcome"), SLOW_BUCKETS,
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by the LLM provider.", ("provider", "model", "kind"))
+INGEST_SOURCE_SECONDS = Histogram(
+    "ingest_source_duration_seconds", "Time to fetch and save one source.", ("source", "outcome"), SLOW_BUCKETS
+)
+INGEST_SOURCE_ROWS = Counter("ingest_source_rows_total", "Rows saved per source.", ("source",))
+EMAIL_SECONDS = Histogram("email_send_duration_seconds", "SMTP send time.", ("outcome",))
+HTTP_CACHE_RESPONSES = Counter(
+    "http_cache_responses_total", "Responses from the rendered-page cache.", ("rule", "outcome")
+)
+
+
+class RequestTimings:
+    __slots__ = ("db_s", "db_queries", "llm_s")
+
+    def __init__(self):
+        self.db_s = 0.0
+        self.db_queries = 0
+        self.llm_s = 0.0
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def render() -> str:
+    return "\n".join(line for metric in _REGISTRY for line in metric.render()) + "\n"
+
+
+def render_gauge(name: str, doc: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> str:
+    """Render a gauge family computed at scrape time (e.g. read from the DB)."""
+    lines = [f"# HELP {name} {doc}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_labels(sorted(labels.items()))} {_fmt(value)}" for labels, value in samples]
+    return "\n".join(lines) + "\n"
+
+
+# ---- database ------------------------------------------------------------------
+
+def instrument_engine(async_engine, role: str) -> None:
+    """Time every cursor execution on `async_engine` (labelled engine=`role`)."""
+    if not settings.METRICS_ENABLED:
+        return
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_t0 = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_t0", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        DB_QUERY_SECONDS.observe(elapsed, engine=role)
+        timings = _current.get()
+        if timings is not None:
+            timings.db_s += elapsed
+            timings.db_queries += 1
+
+
+# ---- LLM -----------------------------------------------------------------------
+
+class LLMCall:
+    __slots__ = ("prompt_tokens", "completion_tokens")
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+@contextmanager
+def llm_call(provider: str, model: str):
+    """Time one chat() call; set `.prompt_tokens` / `.completion_tokens` on the yielded record."""
+    call = LLMCall()
+    outcome = "ok"
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        LLM_SECONDS.observe(elapsed, provider=provider, model=model, outcome=outcome)
+        if call.prompt_tokens:
+            LLM_TOKENS.inc(call.prompt_tokens, provider=provider, model=model, kind="prompt")
+        if call.completion_tokens:
+            LLM_TOKENS.inc(call.completion_tokens, provider=provider, model=model, kind="completion")
+        timings = _current.get()
+        if timings is not None:
+            timings.llm_s += elapsed
+
+
+# ---- requests ------------------------------------------------------------------
+
+def route_label(scope) -> str:
+    """Route template ("/opportunities/{id}") rather than the raw path, to bound label cardinality."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    return scope.get(ROUTE_HINT) or UNMATCHED
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; register it outermost so it times the whole stack."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = route_label(scope)
+            REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route, status=status)
+            REQUEST_DB_SECONDS.observe(timings.db_s, route=route)
+            REQUEST_DB_QUERIES.observe(timings.db_queries, route=route)
+            if timings.llm_s:
+                REQUEST_LLM_SECONDS.observe(timings.llm_s, route=route)
@@ -0,0 +1,153 @@
+# app/core/migrate.py
+"""
+Versioned startup migrations.
+
+The `schema_version` table records which numbered steps have run. On boot
+`run_migrations()` does one SELECT; only when steps are pending does it take
+the "schema_migrations" mutex (app/core/job_lock.py: advisory lock on
+Postgres, lease row elsewhere), re-read the version and apply what is still
+missing, so N workers starting together never race each other's DDL.
+
+Steps are the idempotent ensure_* functions from app/core/db_migrations.py
+(plus create_all), so a database created before this table existed simply
+replays them once and is stamped current. A step that raises is not stamped:
+the error propagates and the step is retried on the next boot. Steps written
+against SQLite (PRAGMA / sqlite_master) are stamped as skipped on other
+databases, where create_all already covers their tables. To change the
+schema, append a new step with the next version -- never edit or renumber an
+applied one.
+
+CLI:
+    python -m app.core.migrate           # apply pending steps against DB_URL
+    python -m app.core.migrate --status  # print current / latest version
+"""
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import text
+
+from app.core import db_migrations as m
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAME = "schema_migrations"
+
+_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL
+)
+"""
+
+
+async def _create_all(engine) -> None:
+    from app.core.models_core import metadata as core_metadata
+    from app.core.models_preferences import metadata as prefs_metadata
+    from app.domain.models import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(core_metadata.create_all)
+        await conn.run_sync(prefs_metadata.create_all)
+
+
+# (version, name, step(engine)) -- append only.
+STEPS: List[Tuple[int, str, Callable[..., Awaitable[None]]]] = [
+    (1, "create_all", _create_all),
+    (2, "uploads_schema", m.ensure_uploads_schema),
+    (3, "uploads_folder_type", m.ensure_uploads_folder_type),
+    (4, "onboarding_schema", m.ensure_onboarding_schema),
+    (5, "opportunity_scope_columns", m.ensure_opportunity_scope_columns),
+    (6, "team_schema", m.ensure_team_schema),
+    (7, "user_tier_column", m.ensure_user_tier_column),
+    (8, "billing_schema", m.ensure_billing_schema),
+    (9, "company_profile_schema", m.ensure_company_profile_schema),
+    (10, "tracker_team_schema", m.ensure_tracker_team_schema),
+    (11, "opportunity_extraction_schema", m.ensure_opportunity_extraction_schema),
+    (12, "knowledge_base_schema", m.ensure_knowledge_base_schema),
+    (13, "response_library_schema", m.ensure_response_library_schema),
+    (14, "extraction_cache_schema", m.ensure_extraction_cache_schema),
+    (15, "ai_sessions_schema", m.ensure_ai_sessions_schema),
+    (16, "ai_chat_schema", m.ensure_ai_chat_schema),
+    (17, "response_cache_schema", m.ensure_response_cache_schema),
+    (18, "opportunity_indexes", m.ensure_opportunity_indexes),
+    (19, "data_versions_schema", m.ensure_data_versions_schema),
+    (20, "source_schedule_schema", m.ensure_source_schedule_schema),
+    (21, "enrichment_queue_schema", m.ensure_enrichment_queue_schema),
+    (22, "job_lock_schema", m.ensure_job_lock_schema),
+    (23, "http_validators_schema", m.ensure_http_validators_schema),
+    (24, "crawl_cursors_schema", m.ensure_crawl_cursors_schema),
+]
+
+LATEST_VERSION = STEPS[-1][0]
+
+# Steps that inspect SQLite catalogs; on Postgres they are recorded without running.
+SQLITE_ONLY = frozenset({2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13, 15, 16})
+
+
+async def current_version(engine) -> int:
+    async with engine.begin() as conn:
+        await conn.execute(text(_VERSION_SQL))
+        res = await conn.execute(text("SELECT MAX(version) FROM schema_version"))
+        return int(res.scalar() or 0)
+
+
+async def _apply_pending(engine) -> List[str]:
+    applied = []
+    done = await current_version(engine)
+    for version, name, step in STEPS:
+        if version <= done:
+            continue
+        if version in SQLITE_ONLY and engine.dialect.name != "sqlite":
+            logger.info(f"schema: skipping {version} {name} (SQLite only)")
+        else:
+            logger.info(f"schema: applying {version} {name}")
+            try:
+                await step(engine)
+            except Exception as exc:
+                logger.error(f"schema: step {version} {name} failed: {exc}")
+                raise
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :at)"),
+                {"v": version, "n": name, "at": datetime.utcnow()},
+            )
+        applied.append(name)
+    return applied
+
+
+async def run_migrations(engine) -> List[str]:
+    """Apply pending steps under the cross-process lock; returns the names applied."""
+    if await current_version(engine) >= LATEST_VERSION:
+        return []
+
+    from app.core.job_lock import held_lock
+
+    async with held_lock(_LOCK_NAME, settings.SCHEMA_LOCK_WAIT_S):
+        applied = await _apply_pending(engine)
+    if applied:
+        logger.info(f"schema: now at version {LATEST_VERSION} ({len(applied)} steps applied)")
+    return applied
+
+
+async def _main(argv: List[str]) -> int:
+    from app.core.db_engine import dispose_engines, engine
+
+    try:
+        if "--status" in argv:
+            print(f"schema version {await current_version(engine)} (latest {LATEST_VERSION})")
+            return 0
+        applied = await run_migrations(engine)
+        print(f"applied {len(applied)} steps: {', '.join(applied)}" if applied else "schema is current")
+        return 0
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,188 @@
+# app/core/query_plans.py
+"""
+Hot opportunities queries and a plan check that fails on full table scans.
+
+Each entry mirrors a query the app runs on every page view / ingest / digest
+(same predicates, dummy parameters). `check()` runs EXPLAIN QUERY PLAN
+(SQLite) or EXPLAIN with sequential scans disabled (Postgres, so a tiny
+table still shows whether an index *can* be used) and reports every query
+that walks all of `opportunities`: a table scan, or a scan of a full index.
+
+CLI:
+    python -m app.core.query_plans            # against DB_URL
+    python -m app.core.query_plans --scratch  # fresh in-memory SQLite + indexes (CI)
+    python -m app.core.query_plans -v         # print every plan
+
+Exit status 1 when a query regressed to a full scan. Indexes live in
+app/core/db_migrations.OPPORTUNITY_INDEXES.
+"""
+import asyncio
+import datetime as dt
+import re
+import sys
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from app.core.db_migrations import OPEN_STATUS_PREDICATE, OPPORTUNITY_INDEXES
+
+_OPEN = f"({OPEN_STATUS_PREDICATE})"
+_NOW = dt.datetime(2025, 1, 1)
+
+# name -> (sql, params)
+HOT_QUERIES: Dict[str, Tuple[str, Dict]] = {
+    # app/services/opportunity_feed.py
+    "landing_open_count": (
+        f"SELECT COUNT(*) FROM opportunities WHERE {OPEN_STATUS_PREDICATE}",
+        {},
+    ),
+    "feed_open": (
+        f"SELECT id FROM opportunities WHERE ({_OPEN}) "
+        "ORDER BY (due_date IS NULL) ASC, due_date ASC, date_added DESC LIMIT :limit",
+        {"limit": 7},
+    ),
+    "feed_by_category": (
+        f"SELECT id FROM opportunities WHERE ({_OPEN}) "
+        "AND (LOWER(COALESCE(ai_category, category)) IN (:cat_0, :cat_1)) LIMIT :limit",
+        {"cat_0": "construction", "cat_1": "it", "limit": 7},
+    ),
+    "feed_by_agency": (
+        f"SELECT id FROM opportunities WHERE ({_OPEN}) "
+        "AND (LOWER(agency_name) IN (:agency_0)) LIMIT :limit",
+        {"agency_0": "city of columbus", "limit": 7},
+    ),
+    # app/api/opportunities.py listing filters
+    "listing_agency": (
+        "SELECT COUNT(*) FROM opportunities WHERE 1=1 AND LOWER(agency_name) = LOWER(:agency_name)",
+        {"agency_name": "City of Columbus"},
+    ),
+    "listing_open_only": (
+        "SELECT COUNT(*) FROM opportunities WHERE 1=1 AND "
+        "(opportunities.status IS NULL OR TRIM(LOWER(opportunities.status)) LIKE 'open%')",
+        {},
+    ),
+    "listing_due_window": (
+        "SELECT COUNT(*) FROM opportunities WHERE 1=1 AND "
+        "due_date IS NOT NULL AND due_date >= :due_start AND due_date < :due_end",
+        {"due_start": _NOW, "due_end": _NOW + dt.timedelta(days=8)},
+    ),
+    # app/ingest/runner.py
+    "enrich_lookup": (
+        "SELECT id FROM opportunities WHERE external_id = :ext_id AND agency_name = :agency LIMIT 1",
+        {"ext_id": "RFQ031234", "agency": "City of Columbus"},
+    ),
+    # close_missing_opportunities(), per agency; runner.py compares against
+    # datetime('now', '-1 day'), bound here so the plan also runs on Postgres.
+    # (Its SELECT DISTINCT agency_name walks every row by design.)
+    "close_missing": (
+        "UPDATE opportunities SET status = 'closed' WHERE agency_name = :agency AND status = 'open' "
+        "AND (last_seen IS NULL OR last_seen < :cutoff)",
+        {"agency": "City of Columbus", "cutoff": _NOW - dt.timedelta(days=1)},
+    ),
+    # _touch_listing_last_seen() on a 304: by source, else by agency
+    "touch_last_seen_source": (
+        "UPDATE opportunities SET last_seen = CURRENT_TIMESTAMP "
+        "WHERE source = :key AND status = 'open' AND last_seen >= :since",
+        {"key": "city_gahanna", "since": _NOW},
+    ),
+    "touch_last_seen_agency": (
+        "UPDATE opportunities SET last_seen = CURRENT_TIMESTAMP "
+        "WHERE agency_name = :key AND status = 'open' AND last_seen >= :since",
+        {"key": "City of Columbus", "since": _NOW},
+    ),
+    # detail endpoints (app/api/*_detail.py, opportunity_web.py)
+    "detail_by_external_id": (
+        "SELECT id FROM opportunities WHERE external_id = :ext LIMIT 1",
+        {"ext": "RFQ031234"},
+    ),
+    # app/core/scheduler.py digests
+    "digest_window": (
+        "SELECT id FROM opportunities WHERE updated_at >= :since AND status = 'open' "
+        "ORDER BY agency_name, due_date",
+        {"since": _NOW},
+    ),
+}
+
+_SQLITE_SCAN = re.compile(r"^SCAN (opportunities|o)\b(?: USING (?:COVERING )?INDEX (\w+))?")
+_PG_FULL_SCAN = re.compile(r"Seq Scan on opportunities\b")
+
+# Scanning a partial index only visits the rows it holds (open ones); scanning
+# any other index visits every row, same as the table.
+PARTIAL_INDEXES = {
+    m.group(1) for m in (re.search(r"EXISTS (\w+) ON .* WHERE ", ddl) for ddl in OPPORTUNITY_INDEXES) if m
+}
+
+
+async def explain(conn, sql: str, params: Dict) -> List[str]:
+    """Plan lines for `sql` on this connection's dialect."""
+    if conn.dialect.name == "sqlite":
+        res = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)
+        return [str(row[3]) for row in res.fetchall()]
+    await conn.execute(text("SET LOCAL enable_seqscan = off"))
+    res = await conn.execute(text(f"EXPLAIN {sql}"), params)
+    return [str(row[0]) for row in res.fetchall()]
+
+
+def _is_full_scan(line: str) -> bool:
+    m = _SQLITE_SCAN.search(line.strip())
+    if m:
+        return m.group(2) not in PARTIAL_INDEXES
+    return bool(_PG_FULL_SCAN.search(line))
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    return [line for line in plan if _is_full_scan(line)]
+
+
+async def check(engine, verbose: bool = False) -> List[str]:
+    """Names of hot queries whose plan contains a full scan of opportunities."""
+    failed = []
+    for name, (sql, params) in HOT_QUERIES.items():
+        async with engine.begin() as conn:
+            plan = await explain(conn, sql, params)
+        bad = full_scans(plan)
+        if bad:
+            failed.append(name)
+        if verbose or bad:
+            print(f"{'FULL SCAN' if bad else 'ok':9s} {name}")
+            for line in plan:
+                print(f"          {line}")
+        else:
+            print(f"{'ok':9s} {name}")
+    return failed
+
+
+async def scratch_engine(with_indexes: bool = True):
+    """Empty in-memory SQLite with the opportunities schema (and indexes)."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import StaticPool
+
+    from app.core.models_core import metadata
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        if with_indexes:
+            for ddl in OPPORTUNITY_INDEXES:
+                await conn.exec_driver_sql(ddl)
+    return engine
+
+
+async def _main(argv: List[str]) -> int:
+    if "--scratch" in argv:
+        engine = await scratch_engine()
+    else:
+        from app.core.db_core import engine
+    try:
+        failed = await check(engine, verbose="-v" in argv)
+    finally:
+        await engine.dispose()
+    if failed:
+        print(f"{len(failed)} hot queries scan opportunities: {', '.join(failed)}")
+        return 1
+    print(f"all {len(HOT_QUERIES)} hot queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -1,5 +1,6 @@
 # app/scheduler.py
 import asyncio
+import logging
 from datetime import datetime, timedelta
 import uuid
 from typing import Dict, List, Tuple
@@ -11,12 +12,22 @@ from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import text
 
 from app.core.settings import settings
+from app.core.logging_setup import configure_logging
 from app.core.db_core import engine, save_opportunities
 from app.core.db import AsyncSessionLocal  # legacy ORM session factory for users table
 from app.core.emailer import send_email
-from app.core.sms import send_sms
-from app.ingest.runner import run_ingestors_once
+from app.core.digest_render import get_digest_renderer
+from app.core.sms_dispatch import get_sms_dispatcher
+from app.ingest.runner import (
+    enrich_pending_opportunities,
+    get_sources,
+    run_ingestors_once,
+    shard_sources,
+)
 from app.core.unsubscribe import build_unsubscribe_url
+from app.core.job_lock import exclusive_job
+
+logger = logging.getLogger(__name__)
 
 
 APP_BASE_URL = getattr(settings, "PUBLIC_APP_URL", "http://localhost:8000")
@@ -95,14 +106,28 @@ def build_digest_html(
 # Job: scrape all sources and persist opportunities
 # --------------------------------------------------------------------------------------
 
-async def job_scrape():
+async def job_scrape(sources=None, enrich: bool = True, due_only: bool = False):
     """
-    Run all ingestors and persist opportunities.
+    Run all ingestors (or the given `sources`) and persist opportunities.
     This calls the same logic as python -m app.ingest.runner.
+    With enrich=False, AI enrichment is left to the enrichment worker.
+    With due_only=True, only sources due per source_schedule are scraped.
     """
-    print("[job_scrape] starting")
-    processed = await run_ingestors_once()
-    print(f"[job_scrape] done. processed={processed}")
+    logger.info("job_scrape: starting")
+    processed = await run_ingestors_once(sources=sources, enrich=enrich, due_only=due_only)
+    logger.info(f"job_scrape: done. processed={processed}")
+
+
+async def job_enrich_pending():
+    """Drain the AI enrichment queue filled by split-mode ingest workers."""
+    total = 0
+    while True:
+        done = await enrich_pending_opportunities(limit=100)
+        total += done
+        if done < 100:
+            break
+    if total:
+        logger.info(f"job_enrich_pending: enriched {total} rows")
 
 
 # --------------------------------------------------------------------------------------
@@ -176,8 +201,14 @@ async def _send_digest_to_matching_users(
     total_sent = 0
     total_opps_count = sum(len(v) for v in by_agency_all.values())
     window_text = "the last 24 hours" if target_frequency == "daily" else "the last 7 days"
-
-    print("[digest] cooling down to satisfy Mailtrap rate limits...")
+    renderer = get_digest_renderer()
+    sms = get_sms_dispatcher()
+    sms_queued = 0
+    # the dispatcher is process-wide; its counters are totals, so log this run's share
+    sms_sent0, sms_failed0 = (sms.stats.sent, sms.stats.failed) if sms is not None else (0, 0)
+    sections = renderer.render_sections(by_agency_all, APP_BASE_URL)
+
+    logger.info("digest: cooling down to satisfy Mailtrap rate limits...")
     await asyncio.sleep(2.0)
 
     for row in users:
@@ -214,99 +245,33 @@ async def _send_digest_to_matching_users(
         if not agencies_for_user:
             continue
 
-        agency_sections_html = []
-
-        for agency_name in sorted(agencies_for_user):
-            items = by_agency_all.get(agency_name, [])
-            if not items:
-                continue
-
-            section = [f"<h3 style='font-size:16px;font-weight:600;color:#111;margin:24px 0 12px;'>{agency_name}</h3>"]
-            for r in items:
-                title = r.get("title") or "(no title)"
-                due = r.get("due_date")
-                due_str = str(due).split(" ")[0] if due else "TBD"
-                summary = r.get("ai_summary") or ""
-                agency_name = r.get("agency_name") or ""
-                try:
-                    tags = json.loads(r.get("ai_tags_json") or "[]")
-                except Exception:
-                    tags = []
-
-                # --- build link back to /opportunities with filters ---
-                opp_id = r.get("id")
-                ext_id = r.get("external_id")
-                source_url = r.get("source_url") or "#"
-
-                if ext_id:
-                    # this is the main path for your COTA etc.
-                    detail_url = (
-                        f"{APP_BASE_URL}/opportunities?"
-                        f"ext={quote_plus(ext_id)}&agency={quote_plus(agency_name)}"
-                    )
-                elif opp_id:
-                    # backup: if we only have internal id
-                    detail_url = (
-                        f"{APP_BASE_URL}/opportunities?"
-                        f"id={quote_plus(str(opp_id))}&agency={quote_plus(agency_name)}"
-                    )
-                else:
-                    # last resort: original source
-                    detail_url = source_url
-
-                # --- HTML block ---
-                section.append("<div style='margin-bottom:14px;padding-bottom:8px;border-bottom:1px solid #eee;'>")
-                section.append(
-                    f"<a href='{detail_url}' style='font-weight:600;color:#0366d6;text-decoration:none;'>{title}</a>"
-                )
-                section.append(f"<div style='font-size:12px;color:#666;'>Due: {due_str}</div>")
-                if summary:
-                    section.append(f"<p style='margin:4px 0;font-size:13px;color:#333;'>{summary}</p>")
-                if tags:
-                    chips = ' '.join(
-                        f"<span style='display:inline-block;background:#eef;border-radius:4px;"
-                        f"padding:2px 6px;margin:0 4px 4px 0;font-size:11px;color:#334;'>{t}</span>"
-                        for t in tags
-                    )
-                    section.append(f"<div>{chips}</div>")
-                section.append("</div>")
-
-            agency_sections_html.append(''.join(section))
-
-        if not agency_sections_html:
-            continue
-
         unsubscribe_url = build_unsubscribe_url(email)
-        html_body = (
-            "<div style='font-family:Arial,sans-serif;color:#111;font-size:15px;line-height:1.5;"
-            "background-color:#ffffff;padding:24px;max-width:640px;margin:auto;'>"
-            f"<h2 style='margin:0 0 8px;font-size:20px;font-weight:600;'>"
-            f"EasyRFP - {total_opps_count} New / Updated Opportunities</h2>"
-            f"<p style='margin:0 0 24px;color:#4b5563;'>Bids and RFPs from {window_text}.</p>"
-            + "".join(agency_sections_html) +
-            "<hr style='border:none;border-top:1px solid #ddd;margin:24px 0;'>"
-            "<p style='font-size:12px;color:#888;'>"
-            "You're receiving this because you're subscribed to EasyRFP.<br>"
-            f"<a href='{unsubscribe_url}' style='color:#1a73e8;'>Unsubscribe instantly</a> or "
-            "adjust your preferences."
-            "</p>"
-            "</div>"
+        html_body = renderer.render_digest(
+            sections,
+            agencies_for_user,
+            total_count=total_opps_count,
+            window_text=window_text,
+            unsubscribe_url=unsubscribe_url,
         )
+        if not html_body:
+            continue
 
         subject = f"EasyRFP - {total_opps_count} New / Updated Opportunities"
 
         try:
             await asyncio.to_thread(send_email, email, subject, html_body)
-            print(f"[digest:{target_frequency}] sent to {email}")
+            logger.info(f"digest:{target_frequency}: sent to {email}")
             total_sent += 1
         except Exception as e:
-            print(f"[digest:{target_frequency}] ERROR sending to {email}: {e}")
+            logger.warning(f"digest:{target_frequency}: failed sending to {email}: {e}")
 
-        # Optional SMS nudge for premium, opted-in, verified users
+        # Optional SMS nudge for premium, opted-in, verified users.
+        # Queued on the async dispatcher so sending never blocks the digest loop.
         premium_tiers = {"starter", "professional", "enterprise"}
         phone = (sms_phone or "").strip()
         if (
-            phone
+            sms is not None
+            and phone
             and sms_opt_in
             and sms_phone_verified
             and (tier or "").lower() in premium_tiers
@@ -315,13 +280,18 @@ async def _send_digest_to_matching_users(
                 f"{total_opps_count} new/updated bids in {window_text}. "
                 f"See your feed: {APP_BASE_URL}/opportunities"
             )
-            try:
-                await asyncio.to_thread(send_sms, phone, sms_body)
-            except Exception as exc:
-                print(f"[digest:{target_frequency}] SMS failed for {email}: {exc}")
+            sms.enqueue(phone, sms_body)
+            sms_queued += 1
 
         await asyncio.sleep(2.0)
 
+    if sms is not None and sms_queued:
+        await sms.flush()
+        logger.info(
+            f"digest:{target_frequency}: SMS queued={sms_queued} "
+            f"sent={sms.stats.sent - sms_sent0} failed={sms.stats.failed - sms_failed0}"
+        )
+    logger.info(f"digest:{target_frequency}: render cache {renderer.stats()}")
     return total_sent
 
 
@@ -337,14 +307,14 @@ async def job_daily_digest():
     - Group them by agency.
     - Send to all users with digest_frequency='daily'.
     """
-    print("[job_daily_digest] starting")
+    logger.info("job_daily_digest: starting")
 
     since = datetime.utcnow() - timedelta(days=1)
 
     by_agency_all, row_count = await _collect_recent_opportunities(since)
 
     if row_count == 0:
-        print("[job_daily_digest] no new opportunities in ~24h")
+        logger.info("job_daily_digest: no new opportunities in ~24h")
         return {"sent": 0, "note": "no new opps"}
 
     async with AsyncSessionLocal() as db:
@@ -354,7 +324,7 @@ async def job_daily_digest():
             by_agency_all=by_agency_all,
         )
 
-    print(f"[job_daily_digest] done, sent {sent_count} emails")
+    logger.info(f"job_daily_digest: done, sent {sent_count} emails")
     return {"sent": sent_count, "note": "daily digest complete"}
 
 
@@ -366,14 +336,14 @@ async def job_weekly_digest():
     - Group them by agency.
     - Send to all users with digest_frequency='weekly'.
     """
-    print("[job_weekly_digest] starting")
+    logger.info("job_weekly_digest: starting")
 
     since = datetime.utcnow() - timedelta(days=7)
 
     by_agency_all, row_count = await _collect_recent_opportunities(since)
 
     if row_count == 0:
-        print("[job_weekly_digest] no new opportunities in ~7d")
+        logger.info("job_weekly_digest: no new opportunities in ~7d")
         return {"sent": 0, "note": "no new opps"}
 
     async with AsyncSessionLocal() as db:
@@ -383,7 +353,7 @@ async def job_weekly_digest():
             by_agency_all=by_agency_all,
         )
 
-    print(f"[job_weekly_digest] done, sent {sent_count} emails")
+    logger.info(f"job_weekly_digest: done, sent {sent_count} emails")
     return {"sent": sent_count, "note": "weekly digest complete"}
 
 
@@ -414,7 +384,7 @@ async def job_due_date_reminders():
     Send reminders at 7/3/1 days before due date for tracked opportunities.
     Skips users who have digest_frequency 'none'/'off'.
     """
-    print("[job_due_date_reminders] starting")
+    logger.info("job_due_date_reminders: starting")
     await _ensure_due_reminder_table()
 
     today = datetime.utcnow().date()
@@ -520,7 +490,7 @@ async def job_due_date_reminders():
                 )
                 await db.commit()
             except Exception as exc:
-                print(f"[job_due_date_reminders] failed for {r.get('email')} oid={r.get('opportunity_id')}: {exc}")
+                logger.warning(f"job_due_date_reminders: failed for {r.get('email')} oid={r.get('opportunity_id')}: {exc}")
                 await db.rollback()
 
 
@@ -531,44 +501,98 @@ async def job_due_date_reminders():
 scheduler = AsyncIOScheduler(timezone=settings.TIMEZONE)
 
 
-def start_scheduler():
+ROLE_INGEST = "ingest"
+ROLE_ENRICHMENT = "enrichment"
+ROLE_NOTIFICATIONS = "notifications"
+ALL_ROLES = (ROLE_INGEST, ROLE_ENRICHMENT, ROLE_NOTIFICATIONS)
+
+
+def start_scheduler(roles=None, shard_index: int = 0, shard_count: int = 1):
     """
     Register recurring jobs and start the scheduler.
-    - Scrape every 2 hours on the hour
-    - Daily digest every day at DIGEST_SEND_HOUR
-    - Weekly digest every Friday at 07:00 (local time)
+    - Scrape due sources every SCRAPE_TICK_MIN minutes      (ingest)
+      (every source every 2 hours if SCRAPE_ADAPTIVE_ENABLED is off)
+    - Drain the AI enrichment queue every 5 minutes         (enrichment)
+    - Daily digest every day at DIGEST_SEND_HOUR            (notifications)
+    - Weekly digest every Friday at 07:00 (local time)      (notifications)
+    - Due-date reminders every day at 07:30                 (notifications)
+
+    `roles` limits this process to a subset (see app/core/workers.py);
+    None runs everything in one process, as before. When ingest and
+    enrichment share a process, enrichment stays inline in the scrape.
+    With shard_count > 1 the ingest role only scrapes its share of sources.
+
+    Each job is wrapped with `exclusive_job`, so when several processes run
+    this scheduler only one of them executes a given firing.
     """
+    roles = set(roles or ALL_ROLES)
+    unknown = roles - set(ALL_ROLES)
+    if unknown:
+        raise ValueError(f"unknown scheduler role(s): {', '.join(sorted(unknown))}")
+    inline_enrich = ROLE_INGEST in roles and ROLE_ENRICHMENT in roles
+
+    def _add(fn, trigger, name):
+        scheduler.add_job(
+            exclusive_job(name, fn, trigger),
+            trigger,
+            name=name,
+            max_instances=1,
+            coalesce=True,
+        )
 
-    # Scrape all ingestors every 2 hours (awaited by AsyncIOScheduler)
-    scheduler.add_job(
-        job_scrape,
-        CronTrigger(hour="*/2", minute=0),
-        name="scrape_ingestors",
-    )
+    if ROLE_INGEST in roles:
+        sources = shard_sources(get_sources(), shard_index, shard_count)
+        job_name = "scrape_ingestors"
+        if shard_count > 1:
+            job_name = f"scrape_ingestors:{shard_index}of{shard_count}"
+        logger.info(f"{job_name}: {len(sources)} sources, inline_enrich={inline_enrich}")
+
+        adaptive = settings.SCRAPE_ADAPTIVE_ENABLED
+
+        async def _scrape():
+            await job_scrape(sources=sources, enrich=inline_enrich, due_only=adaptive)
+
+        _scrape.__name__ = "job_scrape"
+
+        if adaptive:
+            # Tick often; each source runs on its own learned interval
+            trigger = CronTrigger(minute=f"*/{max(int(settings.SCRAPE_TICK_MIN), 1)}")
+        else:
+            # Scrape all ingestors every 2 hours (awaited by AsyncIOScheduler)
+            trigger = CronTrigger(hour="*/2", minute=0)
+        _add(_scrape, trigger, job_name)
+
+    if ROLE_ENRICHMENT in roles and not inline_enrich:
+        _add(
+            job_enrich_pending,
+            CronTrigger(minute="*/5"),
+            "enrich_pending",
+        )
 
-    # Daily digest job
-    scheduler.add_job(
-        job_daily_digest,
-        CronTrigger(hour=settings.DIGEST_SEND_HOUR, minute=0),
-        name="daily_digest",
-    )
+    if ROLE_NOTIFICATIONS in roles:
+        # Daily digest job
+        _add(
+            job_daily_digest,
+            CronTrigger(hour=settings.DIGEST_SEND_HOUR, minute=0),
+            "daily_digest",
+        )
 
-    # Weekly digest job (Friday 7:00am local time)
-    scheduler.add_job(
-        job_weekly_digest,
-        CronTrigger(day_of_week="fri", hour=7, minute=0),
-        name="weekly_digest",
-    )
+        # Weekly digest job (Friday 7:00am local time)
+        _add(
+            job_weekly_digest,
+            CronTrigger(day_of_week="fri", hour=7, minute=0),
+            "weekly_digest",
+        )
 
-    # Due-date reminders (daily, morning)
-    scheduler.add_job(
-        job_due_date_reminders,
-        CronTrigger(hour=7, minute=30),
-        name="due_date_reminders",
-    )
+        # Due-date reminders (daily, morning)
+        _add(
+            job_due_date_reminders,
+            CronTrigger(hour=7, minute=30),
+            "due_date_reminders",
+        )
 
     scheduler.start()
-    print("[scheduler] started.")
+    logger.info(f"started. roles={sorted(roles)}")
 
 
 # --------------------------------------------------------------------------------------
@@ -577,6 +601,7 @@ def start_scheduler():
 
 if __name__ == "__main__":
     async def runner():
+        configure_logging()
         start_scheduler()
         print("[main] scheduler running. Ctrl+C to stop.")
         # keep the loop alive forever
@@ -20,11 +20,24 @@ class Settings(BaseSettings):
     # ------------------------------------------------------------------
     ENV: str = "local"
 
+    # Logging (app/core/logging_setup.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = "uvicorn.access=WARNING,httpx=WARNING"  # per-module overrides, e.g. "app.ingest=DEBUG"
+    LOG_FORMAT: str = "text"               # "text" or "json"
+    LOG_ACCESS_SAMPLE: float = 0.1         # share of ordinary app.access lines kept
+    LOG_ACCESS_SLOW_MS: int = 1000         # slower requests (and any >= 400) are always logged
+
+    # Metrics (app/core/metrics.py, GET /metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None    # bearer token for a Prometheus scraper; admins need none
+
     # ------------------------------------------------------------------
     # Auth/session
     # ------------------------------------------------------------------
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRES_MIN: int = 120
+    IDENTITY_CACHE_TTL_S: int = 60         # users/team lookup cache (app/auth/identity.py); 0 = off
+    TIER_CACHE_TTL_S: int = 300            # effective tier cache (app/services/tier.py); 0 = off
 
     # ------------------------------------------------------------------
     # Database
@@ -32,6 +45,26 @@ class Settings(BaseSettings):
     # Optional here to allow Heroku-style DATABASE_URL fallback.
     DB_URL: Optional[str] = None  # resolved at runtime if missing
 
+    # Engine pools (app/core/db_engine.py)
+    DB_POOL_SIZE: int = 10                 # Postgres
+    DB_MAX_OVERFLOW: int = 10              # Postgres
+    DB_POOL_TIMEOUT_S: int = 30
+    DB_POOL_RECYCLE_S: int = 1800          # Postgres; drop connections older than this
+    DB_SQLITE_READ_CONNECTIONS: int = 4    # read-only WAL connections beside the writer
+    DB_SQLITE_WRITE_OVERFLOW: int = 4      # extra writer connections (session + nested engine.begin()); min 1
+    DB_SQLITE_CACHE_MB: int = 64           # page cache per connection
+    DB_SQLITE_MMAP_MB: int = 256
+
+    # In-process open-opportunity snapshot (app/services/open_set.py)
+    HOTSET_ENABLED: bool = True
+    HOTSET_CHECK_S: float = 30             # poll data_versions at most this often
+
+    # Rendered-response cache for semi-static pages (app/core/http_cache.py)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_MAX_ENTRIES: int = 2000
+    HTTP_CACHE_MAX_BODY_KB: int = 1024     # larger responses are passed through uncached
+    HTTP_CACHE_MAX_MB: float = 64          # total cached bytes per worker; least recently used evicted first
+
     # ------------------------------------------------------------------
     # Email / SMTP
     # ------------------------------------------------------------------
@@ -46,6 +79,44 @@ class Settings(BaseSettings):
     # ------------------------------------------------------------------
     DIGEST_SEND_HOUR: int = 7
     TIMEZONE: str = "America/New_York"
+    SCHEDULER_LOCK_ENABLED: bool = True    # one process per cron firing (job_runs + DB lock)
+    SCHEDULER_LOCK_LEASE_S: int = 300      # SQLite lease length; heartbeat renews at 1/3
+
+    # Adaptive per-source scraping (app/ingest/source_schedule.py)
+    SCRAPE_ADAPTIVE_ENABLED: bool = True   # False = every source every 2 hours
+    SCRAPE_TICK_MIN: int = 10              # how often the scheduler checks for due sources
+    SCRAPE_MIN_INTERVAL_MIN: int = 60
+    SCRAPE_DEFAULT_INTERVAL_MIN: int = 120
+    SCRAPE_MAX_INTERVAL_MIN: int = 720     # keep < 24h: stale rows close after a day unseen
+
+    # Shared ingest HTTP client (app/ingest/http.py)
+    INGEST_HTTP_TIMEOUT_S: int = 30
+    INGEST_HTTP_RETRIES: int = 3           # retries on connection errors, 429 and 5xx
+    INGEST_HTTP_PER_HOST: int = 4          # pooled keep-alive connections per host
+    INGEST_HTTP_MAX_CONNECTIONS: int = 50
+    INGEST_HTTP_CONDITIONAL: bool = True   # If-None-Match / If-Modified-Since on listing pages
+    INGEST_HTTP_REVALIDATE_H: int = 24     # full re-parse at least this often regardless
+    INGEST_STREAM_BATCH: int = 50          # rows saved per micro-batch (app/ingest/stream.py)
+
+    # On-disk cache for detail pages / attachments (app/ingest/cache.py)
+    INGEST_CACHE_ENABLED: bool = True
+    INGEST_CACHE_DIR: str = ".cache/ingest"
+    INGEST_CACHE_TTL_H: float = 6          # served without a request while younger than this
+    INGEST_CACHE_PDF_TTL_H: float = 72     # attachments rarely change in place
+    INGEST_CACHE_MAX_MB: int = 512
+    INGEST_HTML_PARSER: str = "auto"       # "auto" (lxml if installed), "lxml" or "html.parser"
+    INGEST_REPLAY: str = "off"             # "record" / "replay" fixtures (app/ingest/replay.py)
+    INGEST_REPLAY_DIR: str = "tests/fixtures/ingest"
+
+    # Warm headless browsers for Selenium/Playwright scrapers (app/ingest/browser_pool.py)
+    BROWSER_POOL_ENABLED: bool = True      # False = launch + quit a browser per fetch
+    BROWSER_MAX_PAGES: int = 2             # concurrent drivers / contexts per pool
+    BROWSER_RECYCLE_AFTER: int = 25        # relaunch after this many checkouts
+
+    # Authenticated portal cookies reused across runs (app/ingest/session_vault.py)
+    SESSION_VAULT_ENABLED: bool = True
+    SESSION_VAULT_DIR: str = ".cache/sessions"
+    SESSION_VAULT_TTL_H: float = 4         # upper bound; earliest cookie expiry wins
 
     # ------------------------------------------------------------------
     # Bootstrap admin
@@ -67,7 +138,8 @@ class Settings(BaseSettings):
     # ------------------------------------------------------------------
     PUBLIC_APP_HOST: Optional[str] = None  # e.g., "www.easyrfp.ai" (no scheme)
     START_SCHEDULER_WEB: bool = False      # start APScheduler in web dyno (default off)
-    RUN_DDL_ON_START: bool = True          # run create_all on startup (disable in prod)
+    RUN_DDL_ON_START: bool = True          # apply pending schema steps on startup (app/core/migrate.py)
+    SCHEMA_LOCK_WAIT_S: int = 300          # how long a worker waits for another one's migrations
 
     # ------------------------------------------------------------------
     # Model configuration
@@ -106,6 +178,9 @@ class Settings(BaseSettings):
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_FROM_NUMBER: Optional[str] = None
+    TWILIO_API_BASE: str = "https://api.twilio.com"  # override for a local stub in tests
+    SMS_RATE_PER_SEC: float = 1.0          # Twilio long-code limit is ~1 msg/sec
+    SMS_CONCURRENCY: int = 4
 
 
 # create global settings instance and normalize DB URL
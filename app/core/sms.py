@@ -9,17 +9,25 @@ from app.core.settings import settings
 log = logging.getLogger(__name__)
 
 
+_CLIENT: Optional[Client] = None
+
+
 def _client() -> Optional[Client]:
+    """Twilio client, built once per process (it holds an HTTP session)."""
+    global _CLIENT
     if not settings.SMS_ENABLED:
         return None
     if not (settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN and settings.TWILIO_FROM_NUMBER):
         log.warning("SMS disabled: missing Twilio credentials or from number")
         return None
+    if _CLIENT is not None:
+        return _CLIENT
     try:
-        return Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        _CLIENT = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
     except Exception as exc:
         log.error("SMS client init failed: %s", exc)
         return None
+    return _CLIENT
 
 
 def send_sms(to_number: str, body: str) -> bool:
@@ -27,6 +35,7 @@ def send_sms(to_number: str, body: str) -> bool:
     Send an SMS via Twilio. Returns True on success, False otherwise.
 
     This is intentionally synchronous; call it from a threadpool if you need non-blocking behavior.
+    Bulk senders (digests) should use app.core.sms_dispatch instead.
     """
     client = _client()
     if not client:
@@ -0,0 +1,217 @@
+# app/core/sms_dispatch.py
+"""
+Async SMS dispatch (Twilio REST over httpx).
+
+`send_sms` in app/core/sms.py is synchronous and builds a Twilio client per
+call. Digests enqueue messages here instead:
+
+- one cached httpx.AsyncClient (keep-alive to api.twilio.com)
+- a small pool of sender tasks draining an asyncio.Queue
+- a token-bucket limit of SMS_RATE_PER_SEC across all senders
+- status is logged in batches (one line per SMS_LOG_BATCH results)
+
+Enqueueing never blocks the caller; `await flush()` waits for the queue
+to drain. TWILIO_API_BASE can point at a local stub server for tests.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import httpx
+
+from app.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+_MAX_BODY = 320  # trim to keep messages concise (same as send_sms)
+
+
+@dataclass
+class SmsResult:
+    to: str
+    ok: bool
+    status: Optional[int] = None
+    sid: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _Stats:
+    sent: int = 0
+    failed: int = 0
+    pending_log: List[SmsResult] = field(default_factory=list)
+
+
+class _RateLimiter:
+    """Token bucket shared by all sender tasks."""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = max(float(rate_per_sec), 0.01)
+        self.capacity = max(int(burst), 1)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SmsDispatcher:
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        api_base: str = "https://api.twilio.com",
+        rate_per_sec: float = 1.0,
+        concurrency: int = 4,
+        log_batch: int = 25,
+        timeout: float = 15.0,
+    ):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.url = f"{api_base.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.concurrency = max(int(concurrency), 1)
+        self.log_batch = max(int(log_batch), 1)
+        self.timeout = timeout
+        self._limiter = _RateLimiter(rate_per_sec)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = _Stats()
+
+    # ---- lifecycle -------------------------------------------------------------------
+
+    def _client_for_loop(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                auth=(self.account_sid, self.auth_token),
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=self.concurrency, max_connections=self.concurrency),
+            )
+        return self._client
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [t for t in self._workers if not t.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def close(self) -> None:
+        """Drain the queue, stop senders and close the HTTP client."""
+        await self.flush()
+        for t in self._workers:
+            t.cancel()
+        for t in self._workers:
+            try:
+                await t
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---- sending ---------------------------------------------------------------------
+
+    async def send_now(self, to_number: str, body: str) -> SmsResult:
+        """Send one message (rate-limited) and return its result."""
+        await self._limiter.acquire()
+        client = self._client_for_loop()
+        try:
+            resp = await client.post(
+                self.url,
+                data={"To": to_number, "From": self.from_number, "Body": (body or "")[:_MAX_BODY]},
+            )
+        except httpx.HTTPError as exc:
+            return SmsResult(to=to_number, ok=False, error=str(exc))
+        if resp.status_code >= 400:
+            detail = resp.text[:200]
+            return SmsResult(to=to_number, ok=False, status=resp.status_code, error=detail)
+        sid = None
+        try:
+            sid = resp.json().get("sid")
+        except ValueError:
+            pass
+        return SmsResult(to=to_number, ok=True, status=resp.status_code, sid=sid)
+
+    def enqueue(self, to_number: str, body: str) -> None:
+        """Queue a message; returns immediately. Must be called from the event loop."""
+        self._ensure_workers()
+        self._queue.put_nowait((to_number, body))
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been attempted; logs the final batch."""
+        if self._queue is not None:
+            await self._queue.join()
+        self._log_batch(force=True)
+
+    async def _worker(self) -> None:
+        while True:
+            to_number, body = await self._queue.get()
+            try:
+                result = await self.send_now(to_number, body)
+            except Exception as exc:  # pragma: no cover - safety net
+                result = SmsResult(to=to_number, ok=False, error=str(exc))
+            finally:
+                self._queue.task_done()
+            self._record(result)
+
+    # ---- status logging --------------------------------------------------------------
+
+    def _record(self, result: SmsResult) -> None:
+        if result.ok:
+            self.stats.sent += 1
+        else:
+            self.stats.failed += 1
+        self.stats.pending_log.append(result)
+        self._log_batch()
+
+    def _log_batch(self, force: bool = False) -> None:
+        batch = self.stats.pending_log
+        if not batch or (len(batch) < self.log_batch and not force):
+            return
+        ok = sum(1 for r in batch if r.ok)
+        failed = [r for r in batch if not r.ok]
+        log.info(
+            "SMS batch: %d sent, %d failed (totals: %d sent, %d failed)",
+            ok, len(failed), self.stats.sent, self.stats.failed,
+        )
+        for r in failed[:5]:
+            log.warning("SMS to %s failed: status=%s %s", r.to, r.status, r.error)
+        self.stats.pending_log = []
+
+
+_dispatcher: Optional[SmsDispatcher] = None
+
+
+def get_sms_dispatcher() -> Optional[SmsDispatcher]:
+    """Process-wide dispatcher, or None when SMS is disabled/unconfigured."""
+    global _dispatcher
+    if not settings.SMS_ENABLED:
+        return None
+    if not (settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN and settings.TWILIO_FROM_NUMBER):
+        log.warning("SMS disabled: missing Twilio credentials or from number")
+        return None
+    if _dispatcher is None:
+        _dispatcher = SmsDispatcher(
+            account_sid=settings.TWILIO_ACCOUNT_SID,
+            auth_token=settings.TWILIO_AUTH_TOKEN,
+            from_number=settings.TWILIO_FROM_NUMBER,
+            api_base=settings.TWILIO_API_BASE,
+            rate_per_sec=settings.SMS_RATE_PER_SEC,
+            concurrency=settings.SMS_CONCURRENCY,
+        )
+    return _dispatcher
@@ -0,0 +1,71 @@
+# app/core/workers.py
+"""
+Role-based worker entrypoints.
+
+Scraping (Selenium/Playwright/captcha) can block its event loop for minutes;
+running it in its own process keeps digests and reminders on time. Each
+process gets its own engine/connection pool and only schedules its roles.
+
+    python -m app.core.workers ingest [--shard 0/2]
+    python -m app.core.workers enrichment
+    python -m app.core.workers notifications
+    python -m app.core.workers all                 # same as app.core.scheduler
+
+Roles can be combined: `python -m app.core.workers ingest enrichment`.
+When ingest runs without enrichment in the same process, changed rows are
+queued (ai_enrichment_queue) and an enrichment worker must be running.
+"""
+import argparse
+import asyncio
+import logging
+from typing import List, Tuple
+
+from app.core.logging_setup import configure_logging
+from app.core.scheduler import ALL_ROLES, start_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'1/3' -> (1, 3). Index is zero-based."""
+    try:
+        idx_s, count_s = value.split("/", 1)
+        idx, count = int(idx_s), int(count_s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like INDEX/COUNT, got {value!r}")
+    if count < 1 or not (0 <= idx < count):
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {count}), got {value!r}")
+    return idx, count
+
+
+def _parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m app.core.workers")
+    ap.add_argument("roles", nargs="+", choices=list(ALL_ROLES) + ["all"])
+    ap.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=(0, 1),
+        help="split ingest sources across processes, e.g. 0/2 and 1/2",
+    )
+    return ap.parse_args(argv)
+
+
+def _resolve_roles(names: List[str]) -> List[str]:
+    if "all" in names:
+        return list(ALL_ROLES)
+    return sorted(set(names))
+
+
+async def run_worker(roles: List[str], shard_index: int = 0, shard_count: int = 1):
+    start_scheduler(roles=roles, shard_index=shard_index, shard_count=shard_count)
+    logger.info(f"worker running roles={roles} shard={shard_index}/{shard_count}. Ctrl+C to stop.")
+    # keep the loop alive forever
+    while True:
+        await asyncio.sleep(3600)
+
+
+if __name__ == "__main__":
+    configure_logging()
+    args = _parse_args()
+    shard_index, shard_count = args.shard
+    asyncio.run(run_worker(_resolve_roles(args.roles), shard_index, shard_count))
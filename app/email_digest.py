@@ -1,5 +1,5 @@
 # app/email_digest.py
-import json
+import logging
 import sys
 from pathlib import Path
 from sqlalchemy import text
@@ -8,10 +8,13 @@ from app.core.db_core import engine
 from app.core.emailer import send_email
 from app.ai.client import get_llm_client
 from app.core.unsubscribe import build_unsubscribe_url
+from app.core.digest_render import get_digest_renderer
+
+logger = logging.getLogger(__name__)
 
 
 async def build_digest_html(conn, llm_client=None) -> str:
-    """Build HTML digest using AI summaries and tags."""
+    """Build HTML digest using AI summaries and tags (fragments/intros are cached)."""
     result = await conn.execute(
         text("""
             SELECT agency_name,
@@ -33,62 +36,7 @@ async def build_digest_html(conn, llm_client=None) -> str:
     for r in rows:
         grouped.setdefault(r["agency_name"], []).append(r)
 
-    html = [
-        "<html><body style='font-family:Arial,sans-serif;'>",
-        "<h1 style='margin-bottom:16px;'>EasyRFP - New Opportunities</h1>",
-    ]
-
-    for agency, items in grouped.items():
-        html.append(f"<h2 style='margin-top:24px;color:#222;'>{agency}</h2>")
-
-        # optional AI intro using LLM
-        if llm_client and items:
-            titles = "\n".join(f"- {i['title']}" for i in items[:6])
-            prompt = (
-                f"Summarize these municipal RFPs from {agency} in one short paragraph:\n"
-                f"{titles}\n\nLimit to 45 words, plain language."
-            )
-            try:
-                resp = llm_client.chat(
-                    [{"role": "user", "content": prompt}],
-                    temperature=0,
-                )
-                resp = (resp or "").strip()
-                if resp:
-                    html.append(f"<p style='color:#555;font-size:13px;margin:4px 0 12px 0;'>{resp}</p>")
-            except Exception as e:
-                print(f"[digest intro error] {e}")
-
-        for r in items:
-            title = r["title"] or "(no title)"
-            due = r["due_date"] or "TBD"
-            url = r["source_url"] or "#"
-            summary = r.get("ai_summary") or ""
-            try:
-                tags = json.loads(r.get("ai_tags_json") or "[]")
-            except Exception:
-                tags = []
-
-            html.append("<div style='margin-bottom:14px;padding-bottom:8px;border-bottom:1px solid #eee;'>")
-            html.append(
-                f"<a href='{url}' style='font-weight:600;color:#0366d6;text-decoration:none;'>{title}</a>"
-            )
-            html.append(f"<div style='font-size:12px;color:#666;'>Due: {due}</div>")
-            if summary:
-                html.append(
-                    f"<p style='margin:4px 0 4px 0;font-size:13px;color:#333;'>{summary}</p>"
-                )
-            if tags:
-                chips = " ".join(
-                    f"<span style='display:inline-block;background:#eef;border-radius:4px;"
-                    f"padding:2px 6px;margin:0 4px 4px 0;font-size:11px;color:#334;'>{t}</span>"
-                    for t in tags
-                )
-                html.append(f"<div>{chips}</div>")
-            html.append("</div>")
-
-    html.append("</body></html>")
-    return "".join(html)
+    return get_digest_renderer().render_legacy_digest(grouped, llm_client=llm_client)
 
 
 async def send_digest(to_email: str):
@@ -103,7 +51,7 @@ async def send_digest(to_email: str):
     )
     subject = "EasyRFP - New Opportunities"
     send_email(to_email, subject, html + footer)
-    print(f"[digest] sent to {to_email}")
+    logger.info(f"digest sent to {to_email}")
 
 
 async def preview_digest(outfile: str = "digest_preview.html"):
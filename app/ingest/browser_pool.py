@@ -0,0 +1,353 @@
+# app/ingest/browser_pool.py
+"""
+Warm, reusable headless browsers for Selenium / Playwright ingestors.
+
+Launching Chrome costs seconds and hundreds of MB, and several scrapers
+used to do it on every fetch (plus `ChromeDriverManager().install()`).
+This module keeps browsers alive between runs:
+
+Selenium (sync scrapers running in worker threads)
+    pool = selenium_pool("city_columbus", _new_driver)
+    driver = pool.acquire()
+    try: ...
+    finally: pool.release(driver)
+
+    - at most BROWSER_MAX_PAGES drivers checked out per pool (others wait)
+    - on release the driver is health-checked and reset (extra windows
+      closed, cookies/storage cleared, about:blank); broken ones are quit
+    - a driver is quit after BROWSER_RECYCLE_AFTER checkouts
+
+Playwright
+    html = await run_playwright(fn, user_agent=...)      # from async code
+    html = run_playwright_sync(fn, user_agent=...)       # from a thread
+
+    `fn(page)` is an async function that gets a page in a fresh, isolated
+    BrowserContext (own cookies/storage), closed afterwards. One Chromium
+    instance lives on a dedicated event-loop thread, so both sync and async
+    callers share it and Windows selector loops are not a problem. The
+    browser is relaunched when disconnected or after BROWSER_RECYCLE_AFTER
+    contexts (once the contexts still using it are done).
+
+With BROWSER_POOL_ENABLED off, every checkout launches a new browser and
+closes it on release (the old behaviour).
+
+Under INGEST_REPLAY (app/ingest/replay.py) each Playwright context records
+or replays a HAR; Selenium checkouts are refused in replay mode.
+"""
+import asyncio
+import atexit
+import logging
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.settings import settings
+from app.ingest import replay
+
+logger = logging.getLogger(__name__)
+
+_chromedriver_lock = threading.Lock()
+_chromedriver: Optional[str] = None
+
+
+def chromedriver_path() -> str:
+    """webdriver-manager install, done once per process instead of per driver."""
+    global _chromedriver
+    with _chromedriver_lock:
+        if _chromedriver is None:
+            from webdriver_manager.chrome import ChromeDriverManager  # type: ignore
+
+            _chromedriver = ChromeDriverManager().install()
+        return _chromedriver
+
+
+def _pool_enabled() -> bool:
+    return bool(settings.BROWSER_POOL_ENABLED)
+
+
+def _max_pages() -> int:
+    return max(int(settings.BROWSER_MAX_PAGES), 1)
+
+
+def _recycle_after() -> int:
+    return max(int(settings.BROWSER_RECYCLE_AFTER), 1)
+
+
+# --------------------------------------------------------------------------------------
+# Selenium
+# --------------------------------------------------------------------------------------
+
+class SeleniumPool:
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self._idle: List[Any] = []
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(_max_pages())
+        self.launched = 0
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver) -> None:
+        handles = driver.window_handles
+        for h in handles[1:]:
+            driver.switch_to.window(h)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank / cross-origin pages have no storage to clear
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _quit(self, driver) -> None:
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Check out a warm driver (launching one if none is idle)."""
+        replay.check_selenium()
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    driver = self.factory()
+                    self.launched += 1
+                    logger.info(f"[browser_pool] {self.name}: launched driver #{self.launched}")
+                    break
+                if self._healthy(driver):
+                    break
+                logger.info(f"[browser_pool] {self.name}: dropping unhealthy driver")
+                self._quit(driver)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver) -> None:
+        """Return a driver; it is reset for the next user, or quit if broken/worn out."""
+        try:
+            keep = (
+                _pool_enabled()
+                and self._uses.get(id(driver), 0) < _recycle_after()
+                and self._healthy(driver)
+            )
+            if keep:
+                try:
+                    self._reset(driver)
+                except Exception as exc:
+                    logger.info(f"[browser_pool] {self.name}: reset failed ({exc}); quitting driver")
+                    keep = False
+            if keep:
+                with self._lock:
+                    self._idle.append(driver)
+            else:
+                self._quit(driver)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for d in idle:
+            self._quit(d)
+
+
+_selenium_pools: Dict[str, SeleniumPool] = {}
+_registry_lock = threading.Lock()
+
+
+def selenium_pool(name: str, factory: Callable[[], Any]) -> SeleniumPool:
+    """Process-wide pool for one scraper's driver configuration."""
+    with _registry_lock:
+        pool = _selenium_pools.get(name)
+        if pool is None:
+            pool = _selenium_pools[name] = SeleniumPool(name, factory)
+        return pool
+
+
+# --------------------------------------------------------------------------------------
+# Playwright
+# --------------------------------------------------------------------------------------
+
+class _Browser:
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+        self.active = 0
+
+
+class PlaywrightPool:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._pw = None
+        self._current: Optional[_Browser] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self.launched = 0
+
+    # ---- loop thread ----------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                if sys.platform == "win32":
+                    loop = asyncio.ProactorEventLoop()  # subprocess support for the driver
+                else:
+                    loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="playwright-pool", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    # ---- browser lifecycle (runs on the pool loop) ---------------------------------
+
+    async def _launch(self) -> _Browser:
+        from playwright.async_api import async_playwright  # type: ignore
+
+        if self._pw is None:
+            self._pw = await async_playwright().start()
+        browser = await self._pw.chromium.launch(headless=True)
+        self.launched += 1
+        logger.info(f"[browser_pool] playwright: launched chromium #{self.launched}")
+        return _Browser(browser)
+
+    async def _checkout(self) -> _Browser:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            cur = self._current
+            worn = cur is not None and (cur.uses >= _recycle_after() or not _pool_enabled())
+            if cur is None or worn or not cur.browser.is_connected():
+                if cur is not None:
+                    self._current = None
+                    if cur.active == 0:
+                        await self._close_browser(cur)
+                self._current = cur = await self._launch()
+            cur.uses += 1
+            cur.active += 1
+            return cur
+
+    async def _checkin(self, b: _Browser) -> None:
+        b.active -= 1
+        retired = b is not self._current or not _pool_enabled()
+        if retired and b.active == 0:
+            if b is self._current:
+                self._current = None
+            await self._close_browser(b)
+
+    @staticmethod
+    async def _close_browser(b: _Browser) -> None:
+        try:
+            await b.browser.close()
+        except Exception:
+            pass
+
+    async def _run(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        context_kwargs: Dict[str, Any],
+        har: Optional[Tuple[str, bool]] = None,
+    ) -> Any:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(_max_pages())
+        if har and har[1]:
+            context_kwargs = {**context_kwargs, "record_har_path": har[0]}
+        async with self._sem:
+            b = await self._checkout()
+            try:
+                context = await b.browser.new_context(**context_kwargs)
+                try:
+                    if har and not har[1]:
+                        await context.route_from_har(har[0], not_found="abort")
+                    page = await context.new_page()
+                    return await fn(page)
+                finally:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+            finally:
+                await self._checkin(b)
+
+    async def _shutdown(self) -> None:
+        cur, self._current = self._current, None
+        if cur is not None:
+            await self._close_browser(cur)
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
+    # ---- public ---------------------------------------------------------------------
+
+    async def run(self, fn: Callable[[Any], Awaitable[Any]], **context_kwargs) -> Any:
+        """Run `await fn(page)` in a fresh context; awaitable from any event loop."""
+        # the HAR is picked here: the pool loop does not see the caller's replay source
+        har = replay.next_har()
+        return await asyncio.wrap_future(self._submit(self._run(fn, context_kwargs, har)))
+
+    def run_sync(self, fn: Callable[[Any], Awaitable[Any]], **context_kwargs) -> Any:
+        """Blocking variant for threads (must not be called from the pool loop)."""
+        har = replay.next_har()
+        return self._submit(self._run(fn, context_kwargs, har)).result()
+
+    def close(self, timeout: float = 15.0) -> None:
+        if self._loop is None:
+            return
+        try:
+            self._submit(self._shutdown()).result(timeout)
+        except Exception as exc:
+            logger.warning(f"[browser_pool] playwright shutdown failed: {exc}")
+
+
+_playwright_pool = PlaywrightPool()
+
+
+async def run_playwright(fn: Callable[[Any], Awaitable[Any]], **context_kwargs) -> Any:
+    return await _playwright_pool.run(fn, **context_kwargs)
+
+
+def run_playwright_sync(fn: Callable[[Any], Awaitable[Any]], **context_kwargs) -> Any:
+    return _playwright_pool.run_sync(fn, **context_kwargs)
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "selenium": {
+            name: {"launched": p.launched, "idle": len(p._idle)} for name, p in _selenium_pools.items()
+        },
+        "playwright": {"launched": _playwright_pool.launched},
+    }
+
+
+@atexit.register
+def close_all() -> None:
+    """Quit every idle Selenium driver and the Playwright browser."""
+    for pool in list(_selenium_pools.values()):
+        pool.close()
+    _playwright_pool.close()
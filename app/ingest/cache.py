@@ -0,0 +1,295 @@
+# app/ingest/cache.py
+"""
+On-disk, content-addressed cache for ingest fetches.
+
+Layout under INGEST_CACHE_DIR:
+
+    meta/ab/<sha256(url)>.json     url, body digest, ETag/Last-Modified, stored_at
+    blobs/cd/<sha256(body)>        response bodies (shared by identical bodies)
+    memo/<namespace>/<sha256>.pkl  parsed results keyed by input content hash
+
+- Entries younger than the TTL are served without touching the network.
+- Older entries are revalidated with If-None-Match / If-Modified-Since
+  (see app/ingest/http.get_cached); a 304 just refreshes stored_at.
+- `memoize()` caches derived results (e.g. PDF text/metadata) by the
+  sha256 of their input bytes, so an unchanged PDF is never parsed twice.
+- `evict()` drops least-recently-used blobs/memos until the cache fits in
+  INGEST_CACHE_MAX_MB, then removes metadata whose blob is gone.
+
+Writes go through a temp file + os.replace, so concurrent ingest processes
+sharing the directory never see partial files.
+
+CLI:
+    python -m app.ingest.cache            # stats
+    python -m app.ingest.cache --evict    # enforce the size cap now
+    python -m app.ingest.cache --clear    # drop everything
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Metadata nobody has used for this long is dropped on evict().
+_META_MAX_IDLE_S = 30 * 24 * 3600
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    digest: str
+    size: int
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+
+    @property
+    def age_s(self) -> float:
+        return time.time() - self.stored_at
+
+
+class DiskCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.hits = 0
+        self.misses = 0
+        self.memo_hits = 0
+        self._lock = threading.Lock()
+
+    # ---- paths ---------------------------------------------------------------------
+
+    def _meta_path(self, url: str) -> Path:
+        key = _sha256(url.encode("utf-8"))
+        return self.root / "meta" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def _memo_path(self, namespace: str, key: str) -> Path:
+        return self.root / "memo" / namespace / f"{key}.pkl"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    # ---- responses -----------------------------------------------------------------
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Metadata for `url`, or None if unknown (or its body was evicted)."""
+        path = self._meta_path(url)
+        try:
+            entry = CacheEntry(**json.loads(path.read_text("utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        if not self._blob_path(entry.digest).exists():
+            return None
+        return entry
+
+    def read(self, entry: CacheEntry) -> Optional[bytes]:
+        path = self._blob_path(entry.digest)
+        try:
+            body = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self._touch(path)
+        self._touch(self._meta_path(entry.url))
+        self.hits += 1
+        return body
+
+    def store(self, url: str, body: bytes, headers: Optional[Mapping[str, str]] = None) -> CacheEntry:
+        headers = headers or {}
+        digest = _sha256(body)
+        blob = self._blob_path(digest)
+        if blob.exists():
+            self._touch(blob)
+        else:
+            self._write_atomic(blob, body)
+        entry = CacheEntry(
+            url=url,
+            digest=digest,
+            size=len(body),
+            stored_at=time.time(),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            content_type=headers.get("Content-Type"),
+        )
+        self._write_atomic(self._meta_path(url), json.dumps(asdict(entry)).encode("utf-8"))
+        self.misses += 1
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> CacheEntry:
+        """Mark a revalidated (304) entry fresh again."""
+        entry.stored_at = time.time()
+        self._write_atomic(self._meta_path(entry.url), json.dumps(asdict(entry)).encode("utf-8"))
+        return entry
+
+    # ---- derived results -----------------------------------------------------------
+
+    def memoize(self, namespace: str, content: bytes, fn: Callable[[bytes], Any]) -> Any:
+        """
+        Return fn(content), computed once per distinct content and cached on
+        disk. Bump the namespace (e.g. "pdf_meta_v2") when fn's output changes.
+        """
+        path = self._memo_path(namespace, _sha256(content))
+        try:
+            with open(path, "rb") as fh:
+                result = pickle.load(fh)
+            self._touch(path)
+            self.memo_hits += 1
+            return result
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+        result = fn(content)
+        try:
+            self._write_atomic(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        except (OSError, pickle.PicklingError, TypeError) as exc:
+            logger.warning(f"memo write failed for {namespace}: {exc}")
+        return result
+
+    # ---- housekeeping --------------------------------------------------------------
+
+    def _files(self, sub: str):
+        base = self.root / sub
+        if not base.exists():
+            return []
+        out = []
+        for p in base.rglob("*"):
+            if p.is_file() and not p.name.startswith(".tmp-"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self) -> Dict[str, int]:
+        """Enforce the size cap (LRU by mtime) and drop orphaned/idle metadata."""
+        with self._lock:
+            data = self._files("blobs") + self._files("memo")
+            total = sum(size for _, size, _ in data)
+            removed = freed = 0
+            if self.max_bytes and total > self.max_bytes:
+                for _, size, path in sorted(data, key=lambda t: t[0]):
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        path.unlink()
+                    except OSError:
+                        continue
+                    total -= size
+                    freed += size
+                    removed += 1
+
+            now = time.time()
+            metas = 0
+            for mtime, _, path in self._files("meta"):
+                stale = now - mtime > _META_MAX_IDLE_S
+                if not stale:
+                    try:
+                        digest = json.loads(path.read_text("utf-8")).get("digest") or ""
+                        stale = not self._blob_path(digest).exists()
+                    except (OSError, ValueError):
+                        stale = True
+                if stale:
+                    try:
+                        path.unlink()
+                        metas += 1
+                    except OSError:
+                        pass
+        if removed or metas:
+            logger.info(f"ingest cache: evicted {removed} files ({freed / 1e6:.1f} MB), {metas} metadata entries")
+        return {"files": removed, "bytes": freed, "meta": metas, "total_bytes": total}
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        blobs = self._files("blobs")
+        memos = self._files("memo")
+        return {
+            "root": str(self.root),
+            "entries": len(self._files("meta")),
+            "blobs": len(blobs),
+            "memos": len(memos),
+            "bytes": sum(s for _, s, _ in blobs) + sum(s for _, s, _ in memos),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "memo_hits": self.memo_hits,
+        }
+
+
+_cache: Optional[DiskCache] = None
+
+
+def get_ingest_cache() -> Optional[DiskCache]:
+    """Process-wide cache, or None when INGEST_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.INGEST_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = DiskCache(settings.INGEST_CACHE_DIR, int(settings.INGEST_CACHE_MAX_MB) * 1024 * 1024)
+    return _cache
+
+
+def memoize(namespace: str, content: bytes, fn: Callable[[bytes], Any]) -> Any:
+    """fn(content) through the disk memo, or called directly when caching is off."""
+    cache = get_ingest_cache()
+    if cache is None or not content:
+        return fn(content)
+    return cache.memoize(namespace, content, fn)
+
+
+def _main(argv) -> None:
+    cache = get_ingest_cache()
+    if cache is None:
+        print("INGEST_CACHE_ENABLED is off.")
+        return
+    if "--clear" in argv:
+        cache.clear()
+        print(f"Cleared {cache.root}")
+    elif "--evict" in argv:
+        print(cache.evict())
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
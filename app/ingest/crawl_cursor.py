@@ -0,0 +1,117 @@
+# app/ingest/crawl_cursor.py
+"""
+Per-source crawl cursors for incremental pagination.
+
+Large paginated sources (OhioBuys) sort their grid newest-first and stop
+paginating at the first page whose rows are all already stored with an
+unchanged hash_body. What they need between runs lives here:
+
+- crawl_cursors: one JSON cursor per source (newest row seen, when the
+  last full crawl started, pages walked last time).
+- stored_hashes(): external_id -> hash_body of the source's open rows,
+  to decide whether a page is "already seen".
+- keep_alive(): an early stop never reaches the older pages, so their
+  open rows get last_seen bumped here; otherwise
+  close_missing_opportunities() would close them a day later. Only rows
+  seen since the last full crawl started are bumped: a row that crawl did
+  not find has really disappeared and is left to close. Sources force a
+  full crawl every few hours (see due_full_crawl()).
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import CRAWL_CURSORS_SQL
+
+_SCHEMA_READY = False
+
+
+async def ensure_crawl_cursor_table() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+    # Columns added later come from migration steps (app/core/migrate.py).
+    async with engine.begin() as conn:
+        await conn.execute(text(CRAWL_CURSORS_SQL))
+    _SCHEMA_READY = True
+
+
+async def load_cursor(source: str) -> Dict[str, Any]:
+    """Stored cursor for `source` ({} if it never completed a crawl)."""
+    await ensure_crawl_cursor_table()
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text("SELECT cursor FROM crawl_cursors WHERE source = :s"), {"s": source}
+        )
+        raw = res.scalar()
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+async def save_cursor(source: str, cursor: Dict[str, Any]) -> None:
+    await ensure_crawl_cursor_table()
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("""
+                INSERT INTO crawl_cursors (source, cursor, updated_at)
+                VALUES (:s, :c, :now)
+                ON CONFLICT(source) DO UPDATE SET
+                    cursor = excluded.cursor,
+                    updated_at = excluded.updated_at
+            """),
+            {"s": source, "c": json.dumps(cursor, default=str), "now": datetime.utcnow()},
+        )
+
+
+def last_full_crawl(cursor: Dict[str, Any]) -> Optional[datetime]:
+    """When the last completed full crawl started (UTC), or None."""
+    last = cursor.get("last_full_at")
+    if not last:
+        return None
+    try:
+        return datetime.fromisoformat(str(last))
+    except ValueError:
+        return None
+
+
+def due_full_crawl(cursor: Dict[str, Any], every_h: float, now: Optional[datetime] = None) -> bool:
+    """True when the last full crawl is older than `every_h` hours (or unknown)."""
+    last_dt = last_full_crawl(cursor)
+    if last_dt is None:
+        return True
+    return (now or datetime.utcnow()) - last_dt >= timedelta(hours=every_h)
+
+
+async def stored_hashes(source: str) -> Dict[str, str]:
+    """external_id -> hash_body for the source's open rows."""
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text("""
+                SELECT external_id, hash_body FROM opportunities
+                WHERE source = :s AND LOWER(status) = 'open' AND external_id IS NOT NULL
+            """),
+            {"s": source},
+        )
+        return {r[0]: (r[1] or "") for r in res.fetchall()}
+
+
+async def keep_alive(source: str, since: datetime) -> None:
+    """
+    Bump last_seen on the source's open rows (pages skipped by an early stop)
+    that were seen at or after `since`, the start of the last full crawl.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("""
+                UPDATE opportunities
+                SET last_seen = CURRENT_TIMESTAMP
+                WHERE source = :s AND LOWER(status) = 'open' AND last_seen >= :since
+            """),
+            # CURRENT_TIMESTAMP has whole seconds; don't miss rows saved in the start second
+            {"s": source, "since": since.replace(microsecond=0)},
+        )
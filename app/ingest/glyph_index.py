@@ -0,0 +1,95 @@
+# app/ingest/glyph_index.py
+"""
+NumPy index over captcha glyph templates.
+
+The OhioBuys access check renders its captcha as ASCII bitmaps, and the
+matcher scores each glyph against every known template on pixel distance
+plus row/column projections. Done with nested Python loops that is
+~100 templates x every pixel, rebuilt for every character.
+
+GlyphIndex packs all templates once into zero-padded arrays
+
+    pixels   (N, H, W) bool
+    rows     (N, H)    row projections
+    cols     (N, W)    column projections
+    counts   (N,)      pixel counts
+
+and scores a query against all of them in a handful of vectorized ops.
+Zero padding is exact here: the pure-Python distances treat anything
+outside a matrix as 0, so padding both sides to a common shape changes
+nothing. Scores (and tie-breaking: first template wins) match the loop.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Same weights as ohiobuys._fuzzy_match_character.
+PIXEL_COUNT_WEIGHT = 0.5
+ROW_WEIGHT = 0.75
+COL_WEIGHT = 0.75
+
+
+def _pad(arr: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    if arr.shape == shape:
+        return arr
+    out = np.zeros(shape, dtype=arr.dtype)
+    out[tuple(slice(0, n) for n in arr.shape)] = arr
+    return out
+
+
+class GlyphIndex:
+    def __init__(self, entries: Sequence[Dict[str, Any]]):
+        """`entries` as returned by ohiobuys._get_known_character_signatures()."""
+        self.chars: List[str] = [e["char"] for e in entries]
+        height = max((len(e["matrix"]) for e in entries), default=0)
+        width = max((len(e["matrix"][0]) for e in entries if e["matrix"]), default=0)
+
+        self.pixels = np.zeros((len(entries), height, width), dtype=bool)
+        for i, e in enumerate(entries):
+            m = np.asarray(e["matrix"], dtype=bool)
+            if m.size:
+                self.pixels[i, : m.shape[0], : m.shape[1]] = m
+        self.rows = self.pixels.sum(axis=2, dtype=np.int32)
+        self.cols = self.pixels.sum(axis=1, dtype=np.int32)
+        self.counts = self.rows.sum(axis=1)
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def scores(self, matrix: List[List[int]]) -> Dict[str, np.ndarray]:
+        """Score components of `matrix` against every template, shape (N,) each."""
+        q = np.asarray(matrix, dtype=bool) if matrix else np.zeros((0, 0), dtype=bool)
+        n, th, tw = self.pixels.shape
+        h, w = max(th, q.shape[0]), max(tw, q.shape[1])
+
+        pixels = _pad(self.pixels, (n, h, w))
+        q = _pad(q, (h, w))
+        q_rows = q.sum(axis=1, dtype=np.int32)
+        q_cols = q.sum(axis=0, dtype=np.int32)
+
+        pixel_distance = np.count_nonzero(pixels ^ q, axis=(1, 2))
+        count_penalty = np.abs(self.counts - q_rows.sum())
+        row_penalty = np.abs(_pad(self.rows, (n, h)) - q_rows).sum(axis=1)
+        col_penalty = np.abs(_pad(self.cols, (n, w)) - q_cols).sum(axis=1)
+        total = (
+            pixel_distance
+            + PIXEL_COUNT_WEIGHT * count_penalty
+            + ROW_WEIGHT * row_penalty
+            + COL_WEIGHT * col_penalty
+        )
+        return {
+            "score": total,
+            "pixel_distance": pixel_distance,
+            "pixel_count_penalty": count_penalty,
+            "row_penalty": row_penalty,
+            "col_penalty": col_penalty,
+        }
+
+    def best(self, matrix: List[List[int]]) -> Tuple[str, float, Dict[str, Any]]:
+        """(char, score, components) of the closest template."""
+        if not self.chars:
+            return "?", float("inf"), {}
+        s = self.scores(matrix)
+        i = int(np.argmin(s["score"]))
+        components = {k: int(v[i]) for k, v in s.items() if k != "score"}
+        return self.chars[i], float(s["score"][i]), components
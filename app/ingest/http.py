@@ -0,0 +1,509 @@
+# app/ingest/http.py
+"""
+Shared HTTP client for ingestors.
+
+Municipality scrapers used to open their own aiohttp.ClientSession (or call
+requests.get) with a private `_fetch` and retry loop. They now go through
+this module, which gives every ingestor:
+
+- pooled keep-alive connections (one aiohttp session per event loop, one
+  requests.Session for sync scrapers), capped per host
+- one retry policy: connection errors, timeouts, 429 and 5xx are retried
+  with exponential backoff + jitter, honouring Retry-After
+- the same charset fallback for legacy pages (header charset, utf-8,
+  then cp1252)
+- conditional GETs for listing pages: stored ETag / Last-Modified are sent
+  as If-None-Match / If-Modified-Since. A 304 (or a 200 with a byte-identical
+  body, for servers without validators) raises NotModified so the ingestor
+  skips parsing and detail fetches entirely.
+
+Validators are only persisted (`http_validators`) after the runner has saved
+the source's rows, so a failed run never hides a change from the next one.
+A listing is fully re-parsed at least every INGEST_HTTP_REVALIDATE_H hours.
+
+Detail pages and attachments go through `get_cached()` instead, backed by the
+on-disk cache in app/ingest/cache.py (TTL, then conditional revalidation).
+
+With INGEST_REPLAY=record|replay (app/ingest/replay.py) responses are
+recorded to / served from per-source fixtures; conditional GETs and the
+disk cache are bypassed then, so fixtures always hold full bodies.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import HTTP_VALIDATORS_SQL
+from app.core.settings import settings
+from app.ingest import replay
+from app.ingest.cache import CacheEntry, get_ingest_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+_BACKOFF_BASE_S = 1.0
+_BACKOFF_MAX_S = 30.0
+_RETRY_AFTER_MAX_S = 60.0
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+class FetchError(Exception):
+    """Non-retryable HTTP status, or retries exhausted on a retryable one."""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+class NotModified(Exception):
+    """
+    Listing page unchanged since the last saved run; nothing to parse.
+    `fetched_at` is when that run's full parse fetched the page (UTC).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        agency_name: Optional[str] = None,
+        source: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ):
+        super().__init__(f"not modified: {url}")
+        self.url = url
+        self.agency_name = agency_name
+        self.source = source
+        self.fetched_at = fetched_at
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    content: bytes
+    headers: Mapping[str, str] = field(default_factory=CaseInsensitiveDict)
+
+    @property
+    def text(self) -> str:
+        return decode_body(self.content, self.headers.get("Content-Type"))
+
+
+def decode_body(raw: bytes, content_type: Optional[str] = None) -> str:
+    """Decode with the declared charset, else utf-8, else cp1252 (never raises)."""
+    m = _CHARSET_RE.search(content_type or "")
+    if m:
+        try:
+            return raw.decode(m.group(1), errors="replace")
+        except LookupError:
+            pass
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252", errors="replace")
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), _RETRY_AFTER_MAX_S)
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own schedule
+    delay = min(_BACKOFF_BASE_S * (2 ** attempt), _BACKOFF_MAX_S)
+    return delay + random.uniform(0, delay / 2)
+
+
+def _retries(retries: Optional[int]) -> int:
+    return max(int(settings.INGEST_HTTP_RETRIES if retries is None else retries), 0)
+
+
+# --------------------------------------------------------------------------------------
+# Validator store (ETag / Last-Modified / body hash per listing URL)
+# --------------------------------------------------------------------------------------
+
+_validators: Optional[Dict[str, Dict]] = None  # None until load_validators() ran
+_pending: Dict[str, Dict] = {}
+_store_lock = threading.Lock()
+
+
+async def load_validators() -> None:
+    """Load stored validators once per process; conditional GETs are off until then."""
+    global _validators
+    if _validators is not None:
+        return
+    # Columns added later come from migration steps (app/core/migrate.py).
+    async with engine.begin() as conn:
+        await conn.execute(text(HTTP_VALIDATORS_SQL))
+        res = await conn.execute(
+            text("SELECT url, etag, last_modified, body_hash, fetched_at FROM http_validators")
+        )
+        rows = {r["url"]: dict(r) for r in res.mappings().all()}
+    with _store_lock:
+        _validators = rows
+
+
+async def commit_validators() -> None:
+    """Persist validators staged by this source's fetches (call after its rows are saved)."""
+    with _store_lock:
+        staged = dict(_pending)
+        _pending.clear()
+    if not staged or _validators is None:
+        return
+    async with engine.begin() as conn:
+        for url, v in staged.items():
+            await conn.execute(
+                text("""
+                    INSERT INTO http_validators (url, etag, last_modified, body_hash, fetched_at)
+                    VALUES (:url, :etag, :last_modified, :body_hash, :fetched_at)
+                    ON CONFLICT(url) DO UPDATE SET
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        body_hash = excluded.body_hash,
+                        fetched_at = excluded.fetched_at
+                """),
+                {"url": url, **v},
+            )
+    with _store_lock:
+        _validators.update(staged)
+
+
+def discard_validators() -> None:
+    """Drop staged validators (the source failed; next run must re-fetch fully)."""
+    with _store_lock:
+        _pending.clear()
+
+
+async def forget_validators() -> None:
+    """Delete every stored validator so the next run re-parses all listings."""
+    global _validators
+    async with engine.begin() as conn:
+        await conn.execute(text(HTTP_VALIDATORS_SQL))
+        await conn.execute(text("DELETE FROM http_validators"))
+    with _store_lock:
+        _pending.clear()
+        _validators = {}
+
+
+def _as_dt(val) -> Optional[datetime]:
+    if val is None or isinstance(val, datetime):
+        return val
+    try:
+        return datetime.fromisoformat(str(val))
+    except ValueError:
+        return None
+
+
+def _stored(url: str) -> Optional[Dict]:
+    """Validators for `url` if conditional GETs are on and the last full parse is recent."""
+    if not settings.INGEST_HTTP_CONDITIONAL or _validators is None or replay.active():
+        return None
+    with _store_lock:
+        v = _validators.get(url)
+    if not v:
+        return None
+    fetched_at = _as_dt(v.get("fetched_at"))
+    max_age = timedelta(hours=max(int(settings.INGEST_HTTP_REVALIDATE_H), 0))
+    if fetched_at is None or datetime.utcnow() - fetched_at > max_age:
+        return None
+    return v
+
+
+def _conditional_headers(v: Optional[Dict]) -> Dict[str, str]:
+    if not v:
+        return {}
+    out = {}
+    if v.get("etag"):
+        out["If-None-Match"] = v["etag"]
+    if v.get("last_modified"):
+        out["If-Modified-Since"] = v["last_modified"]
+    return out
+
+
+def _check_listing(
+    resp: HttpResponse, stored: Optional[Dict], agency_name: Optional[str], source: Optional[str]
+) -> str:
+    """Raise NotModified for a 304 / identical body; otherwise stage validators and return text."""
+    body_hash = hashlib.sha256(resp.content).hexdigest()
+    if resp.status == 304 or (stored and stored.get("body_hash") == body_hash):
+        fetched_at = _as_dt(stored.get("fetched_at")) if stored else None
+        raise NotModified(resp.url, agency_name, source, fetched_at)
+    if _validators is not None:
+        with _store_lock:
+            _pending[resp.url] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "body_hash": body_hash,
+                "fetched_at": datetime.utcnow(),
+            }
+    return resp.text
+
+
+def _replayed(url: str) -> HttpResponse:
+    rec = replay.load("GET", url)
+    return HttpResponse(url=url, status=rec.status, content=rec.content, headers=CaseInsensitiveDict(rec.headers))
+
+
+def _recorded(resp: HttpResponse) -> HttpResponse:
+    if replay.mode() == "record":
+        replay.save("GET", resp.url, resp.status, resp.headers, resp.content)
+    return resp
+
+
+# --------------------------------------------------------------------------------------
+# Async client (aiohttp)
+# --------------------------------------------------------------------------------------
+
+_sessions: Dict[int, aiohttp.ClientSession] = {}
+
+
+def _session() -> aiohttp.ClientSession:
+    """One pooled session per running event loop."""
+    loop = asyncio.get_running_loop()
+    sess = _sessions.get(id(loop))
+    if sess is None or sess.closed:
+        connector = aiohttp.TCPConnector(
+            limit=max(int(settings.INGEST_HTTP_MAX_CONNECTIONS), 1),
+            limit_per_host=max(int(settings.INGEST_HTTP_PER_HOST), 1),
+            ttl_dns_cache=300,
+        )
+        sess = aiohttp.ClientSession(connector=connector)
+        _sessions[id(loop)] = sess
+    return sess
+
+
+async def get(
+    url: str,
+    *,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+) -> HttpResponse:
+    """GET `url` with the shared retry policy. 304 is returned, other >= 400 raise FetchError."""
+    if replay.mode() == "replay":
+        return _replayed(url)
+    attempts = _retries(retries) + 1
+    client_timeout = aiohttp.ClientTimeout(total=timeout or settings.INGEST_HTTP_TIMEOUT_S)
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            async with _session().get(url, headers=headers, timeout=client_timeout) as resp:
+                if resp.status in RETRY_STATUSES and not last:
+                    delay = _backoff(attempt, resp.headers.get("Retry-After"))
+                    logger.warning(f"HTTP {resp.status} for {url}; retry {attempt + 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                if resp.status >= 400:
+                    raise FetchError(url, resp.status)
+                body = await resp.read()
+                return _recorded(HttpResponse(url=url, status=resp.status, content=body, headers=CaseInsensitiveDict(resp.headers)))
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            if last:
+                raise
+            delay = _backoff(attempt)
+            logger.warning(f"Fetch failed for {url} ({e!r}); retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    raise FetchError(url, 0)  # unreachable: the last attempt returns or raises
+
+
+async def get_text(url: str, **kwargs) -> str:
+    """GET and decode (see decode_body)."""
+    return (await get(url, **kwargs)).text
+
+
+async def get_listing(
+    url: str,
+    *,
+    agency_name: Optional[str] = None,
+    source: Optional[str] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    **kwargs,
+) -> str:
+    """
+    Conditional GET for a listing page. Raises NotModified when the page is
+    unchanged since the last saved run; otherwise returns its text.
+    `source` is the `source` value of the rows parsed from the page (the
+    runner keeps exactly those rows alive on a 304).
+    """
+    stored = _stored(url)
+    req_headers = {**(headers or {}), **_conditional_headers(stored)}
+    resp = await get(url, headers=req_headers, **kwargs)
+    return _check_listing(resp, stored, agency_name, source)
+
+
+async def get_cached(
+    url: str,
+    *,
+    ttl_h: Optional[float] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    **kwargs,
+) -> HttpResponse:
+    """
+    GET through the disk cache: fresh entries (younger than ttl_h, default
+    INGEST_CACHE_TTL_H) skip the network, stale ones are revalidated.
+    """
+    cache = get_ingest_cache()
+    if cache is None or replay.active():
+        return await get(url, headers=headers, **kwargs)
+    entry = await asyncio.to_thread(cache.lookup, url)
+    if _is_fresh(entry, ttl_h):
+        body = await asyncio.to_thread(cache.read, entry)
+        if body is not None:
+            return _from_cache(entry, body)
+    resp = await get(url, headers={**(headers or {}), **_revalidation_headers(entry)}, **kwargs)
+    return await asyncio.to_thread(_after_fetch, cache, entry, resp)
+
+
+async def get_cached_text(url: str, **kwargs) -> str:
+    return (await get_cached(url, **kwargs)).text
+
+
+def _is_fresh(entry: Optional[CacheEntry], ttl_h: Optional[float]) -> bool:
+    ttl_s = float(settings.INGEST_CACHE_TTL_H if ttl_h is None else ttl_h) * 3600
+    return entry is not None and entry.age_s < ttl_s
+
+
+def _revalidation_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+    if entry is None:
+        return {}
+    return _conditional_headers({"etag": entry.etag, "last_modified": entry.last_modified})
+
+
+def _from_cache(entry: CacheEntry, body: bytes) -> HttpResponse:
+    hdrs = CaseInsensitiveDict()
+    if entry.content_type:
+        hdrs["Content-Type"] = entry.content_type
+    if entry.etag:
+        hdrs["ETag"] = entry.etag
+    if entry.last_modified:
+        hdrs["Last-Modified"] = entry.last_modified
+    return HttpResponse(url=entry.url, status=200, content=body, headers=hdrs)
+
+
+def _after_fetch(cache, entry: Optional[CacheEntry], resp: HttpResponse) -> HttpResponse:
+    """Store a 200, or turn a 304 into the cached body (blocking disk IO)."""
+    if resp.status == 304 and entry is not None:
+        body = cache.read(entry)
+        if body is not None:
+            return _from_cache(cache.refresh(entry), body)
+        raise FetchError(resp.url, 304)  # evicted in between; next call refetches
+    if resp.status == 200:
+        cache.store(resp.url, resp.content, resp.headers)
+    return resp
+
+
+# --------------------------------------------------------------------------------------
+# Sync client (requests) for thread-run scrapers
+# --------------------------------------------------------------------------------------
+
+_sync_session: Optional[requests.Session] = None
+_sync_lock = threading.Lock()
+
+
+def _requests_session() -> requests.Session:
+    global _sync_session
+    with _sync_lock:
+        if _sync_session is None:
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max(int(settings.INGEST_HTTP_PER_HOST), 1))
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            _sync_session = sess
+        return _sync_session
+
+
+def get_sync(
+    url: str,
+    *,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+) -> HttpResponse:
+    """Blocking twin of get() for requests-based scrapers (same retry policy)."""
+    if replay.mode() == "replay":
+        return _replayed(url)
+    attempts = _retries(retries) + 1
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            resp = _requests_session().get(
+                url, headers=headers, timeout=timeout or settings.INGEST_HTTP_TIMEOUT_S
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if last:
+                raise
+            delay = _backoff(attempt)
+            logger.warning(f"Fetch failed for {url} ({e!r}); retry {attempt + 1} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        if resp.status_code in RETRY_STATUSES and not last:
+            delay = _backoff(attempt, resp.headers.get("Retry-After"))
+            logger.warning(f"HTTP {resp.status_code} for {url}; retry {attempt + 1} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        if resp.status_code >= 400:
+            raise FetchError(url, resp.status_code)
+        return _recorded(HttpResponse(url=url, status=resp.status_code, content=resp.content, headers=CaseInsensitiveDict(resp.headers)))
+    raise FetchError(url, 0)  # unreachable
+
+
+def get_listing_sync(
+    url: str,
+    *,
+    agency_name: Optional[str] = None,
+    source: Optional[str] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    **kwargs,
+) -> str:
+    """Blocking twin of get_listing()."""
+    stored = _stored(url)
+    req_headers = {**(headers or {}), **_conditional_headers(stored)}
+    resp = get_sync(url, headers=req_headers, **kwargs)
+    return _check_listing(resp, stored, agency_name, source)
+
+
+def get_cached_sync(
+    url: str,
+    *,
+    ttl_h: Optional[float] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    **kwargs,
+) -> HttpResponse:
+    """Blocking twin of get_cached()."""
+    cache = get_ingest_cache()
+    if cache is None or replay.active():
+        return get_sync(url, headers=headers, **kwargs)
+    entry = cache.lookup(url)
+    if _is_fresh(entry, ttl_h):
+        body = cache.read(entry)
+        if body is not None:
+            return _from_cache(entry, body)
+    resp = get_sync(url, headers={**(headers or {}), **_revalidation_headers(entry)}, **kwargs)
+    return _after_fetch(cache, entry, resp)
+
+
+# --------------------------------------------------------------------------------------
+# Lifecycle
+# --------------------------------------------------------------------------------------
+
+async def close() -> None:
+    """Close the pooled session for the current loop (and the sync session)."""
+    global _sync_session
+    sess = _sessions.pop(id(asyncio.get_running_loop()), None)
+    if sess is not None and not sess.closed:
+        await sess.close()
+    with _sync_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+            _sync_session = None
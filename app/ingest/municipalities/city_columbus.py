@@ -15,6 +15,14 @@ from selenium.webdriver.remote.webdriver import WebDriver
 
 from app.ingest.utils import safe_source_url
 from app.ingest.base import RawOpportunity
+from app.ingest.browser_pool import chromedriver_path, selenium_pool
+from app.ingest.municipalities.columbus_odata import VAULT_NAME, fetch_rfq_details_sync
+from app.ingest.session_vault import (
+    forget_session,
+    from_browser as vault_from_browser,
+    load_session,
+    save_session,
+)
 
 # Optional: undetected_chromedriver; we default to plain Selenium for stability
 try:
@@ -37,6 +45,11 @@ LOCATION = "Franklin County, OH"
 HEADFUL_DEBUG = False  # show browser while stabilizing; set False in prod
 FORCE_SELENIUM = True  # keep True for reliability on this portal; flip False if you want UC
 ENABLE_MODAL_EXTRACTION = True  # Set False to skip detail-page scrape
+# "odata": fetch details through the portal's OData API after the listing pass,
+#          opening the browser detail page only for RFQs the API can't resolve.
+# "browser": old behaviour, open every row's detail page in Selenium.
+DETAIL_MODE = os.getenv("COLUMBUS_DETAIL_MODE", "odata").strip().lower()
+DETAIL_FALLBACK_BUDGET_S = 60  # browser time allowed for OData misses
 DEBUG_LIMIT_MODALS: Optional[int] = None  # e.g. 3 to only scrape details for first N rows
 
 PAGE_TIMEOUT_S = 60
@@ -218,10 +231,9 @@ def _new_driver() -> WebDriver:
             pass
         driver = uc.Chrome(options=opts)
     else:
-        # Plain Selenium + webdriver-manager (import inside this branch)
+        # Plain Selenium; driver binary resolved once per process by the browser pool
         from selenium import webdriver  # type: ignore
         from selenium.webdriver.chrome.service import Service as ChromeService  # type: ignore
-        from webdriver_manager.chrome import ChromeDriverManager  # type: ignore
 
         opts = webdriver.ChromeOptions()
         if not HEADFUL_DEBUG:
@@ -239,7 +251,7 @@ def _new_driver() -> WebDriver:
         except Exception:
             pass
 
-        service = ChromeService(ChromeDriverManager().install())
+        service = ChromeService(chromedriver_path())
         driver = webdriver.Chrome(service=service, options=opts)
 
     driver.set_page_load_timeout(PAGE_TIMEOUT_S)
@@ -454,6 +466,191 @@ def _extract_detail_panel_data(driver: WebDriver, wait: WebDriverWait) -> Dict[s
     return result
 
 
+def _detail_href(row_element) -> str:
+    """href of the row's 'View Details' link (falls back to the last <a>), or ''."""
+    link = None
+    try:
+        link = row_element.find_element(
+            By.XPATH,
+            ".//a[contains(translate(normalize-space(.), "
+            "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'view details')]",
+        )
+    except Exception:
+        # Fallback: last <a> in the row
+        try:
+            links = row_element.find_elements(By.TAG_NAME, "a")
+            if links:
+                link = links[-1]
+        except Exception:
+            link = None
+    if not link:
+        return ""
+    try:
+        return link.get_attribute("href") or ""
+    except Exception:
+        return ""
+
+
+def _restore_vault_cookies(driver: WebDriver) -> bool:
+    """Add the vaulted portal cookies to the driver (must already be on the portal)."""
+    vaulted = load_session(VAULT_NAME)
+    if vaulted is None:
+        return False
+    added = 0
+    for c in vaulted.cookies:
+        cookie = {"name": c["name"], "value": c["value"], "path": c.get("path") or "/"}
+        if c.get("domain"):
+            cookie["domain"] = c["domain"]
+        if c.get("expires"):
+            cookie["expiry"] = int(c["expires"])
+        try:
+            driver.add_cookie(cookie)
+            added += 1
+        except Exception as e:
+            log.debug(f"Could not restore cookie {c['name']}: {e}")
+    return added > 0
+
+
+def _vault_browser_session(driver: WebDriver) -> None:
+    """Keep the cookies of a session that reached the listing (also used by OData)."""
+    try:
+        save_session(
+            VAULT_NAME,
+            vault_from_browser(driver.get_cookies()),
+            state={"user_agent": driver.execute_script("return navigator.userAgent")},
+        )
+    except Exception as e:
+        log.warning(f"Could not vault Columbus session: {e}")
+
+
+def _open_detail_url(driver: WebDriver, wait: WebDriverWait, href: str) -> Dict[str, Any]:
+    """Browser fallback for one RFQ once the listing pass is done (same tab)."""
+    try:
+        driver.get(href)
+        return _extract_detail_panel_data(driver, wait)
+    except Exception as e:
+        log.warning(f"Detail page fallback failed for {href}: {e}")
+        return _empty_detail_result()
+
+
+def _fill_details(driver: WebDriver, wait: WebDriverWait, records: List[Dict[str, Any]]) -> None:
+    """
+    Resolve details for records the listing pass left open: OData first
+    (concurrent), then the browser for the misses within the fallback budget.
+    """
+    pending = [rec for rec in records if rec["modal"] is None]
+    if not pending:
+        return
+    t0 = time.time()
+    details: Dict[str, Dict[str, Any]] = {}
+    try:
+        details = fetch_rfq_details_sync([rec["rfq_id"] for rec in pending], _parse_date)
+    except Exception as e:
+        log.warning(f"OData detail fetch failed, falling back to the browser: {e}")
+    log.info(f"OData details: {len(details)}/{len(pending)} RFQs in {time.time() - t0:.1f}s")
+
+    t_fallback = time.time()
+    for rec in pending:
+        detail = details.get(rec["rfq_id"])
+        if detail is None and rec["detail_href"]:
+            if time.time() - t_fallback < DETAIL_FALLBACK_BUDGET_S:
+                detail = _open_detail_url(driver, wait, rec["detail_href"])
+            else:
+                log.info(f"Detail fallback budget spent; table data only for {rec['rfq_id']}")
+        rec["modal"] = detail or _empty_detail_result()
+
+
+def _build_opportunity(rec: Dict[str, Any]) -> RawOpportunity:
+    """RawOpportunity from a listing row plus its detail data."""
+    rfq_id = rec["rfq_id"]
+    dept = rec["dept"]
+    title = rec["title"]
+    typ = rec["typ"]
+    due_txt = rec["due_txt"]
+    due_dt = rec["due_dt"]
+    keyword_tag = rec["keyword_tag"]
+    modal_data = rec["modal"]
+
+    # Build the "link" we surface in the UI.
+    src_url = (
+        f"{LIST_URL}#rfq={rfq_id}" if rfq_id else LIST_URL
+    )
+
+    # Title fallback
+    final_title = title or rfq_id or "City of Columbus RFQ"
+
+    # Use full description from detail page if available
+    desc_text = modal_data["description"] or final_title
+
+    # Add line items to description if available
+    if modal_data["line_items"]:
+        line_items_text = "\n\n### Line Items:\n"
+        for idx, item in enumerate(
+            modal_data["line_items"], 1
+        ):
+            line_items_text += f"\n{idx}. "
+            line_items_text += " | ".join(
+                f"{k}: {v}" for k, v in item.items() if v
+            )
+        desc_text = desc_text + line_items_text
+
+    # Use solicitation type from detail if available, otherwise table type
+    final_type = modal_data["solicitation_type"] or typ
+
+    # Build enhanced summary with delivery info
+    summary_parts = [dept, final_type]
+    if modal_data["delivery_name"]:
+        summary_parts.append(
+            f"Delivery: {modal_data['delivery_name']}"
+        )
+    if modal_data["line_items"]:
+        summary_parts.append(
+            f"{len(modal_data['line_items'])} line items"
+        )
+    summary_text = " | ".join(
+        p for p in summary_parts if p
+    )
+
+    # hash_body for diff detection downstream
+    hash_body_val = _make_hash(
+        rfq_id=rfq_id,
+        dept=dept,
+        title=final_title,
+        typ=final_type,
+        due_txt=due_txt,
+    )
+
+    # Build RawOpportunity with enhanced data from detail page
+    return RawOpportunity(
+        source="city_columbus",
+        source_url=safe_source_url(
+            AGENCY_NAME, src_url, LIST_URL
+        ),
+        title=final_title,
+        summary=summary_text,
+        description=desc_text,
+        category=final_type,
+        agency_name=AGENCY_NAME,
+        location_geo=modal_data["delivery_address"]
+        or LOCATION,
+        posted_date=None,  # not present
+        due_date=due_dt,
+        prebid_date=modal_data[
+            "delivery_date"
+        ],  # using delivery date as placeholder
+        attachments=(
+            modal_data["attachments"]
+            if modal_data["attachments"]
+            else None
+        ),
+        status="open",
+        hash_body=hash_body_val,
+        external_id=rfq_id,
+        keyword_tag=keyword_tag,
+        date_added=datetime.now(timezone.utc),
+    )
+
+
 def _click_row_and_extract_modal(
     driver: WebDriver, wait: WebDriverWait, row_element
 ) -> Dict[str, Any]:
@@ -470,28 +667,7 @@ def _click_row_and_extract_modal(
     try:
         log.info("Attempting to open detail page from row...")
 
-        # Try to find a 'View Details' link inside the row
-        link = None
-        try:
-            link = row_element.find_element(
-                By.XPATH,
-                ".//a[contains(translate(normalize-space(.), "
-                "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'view details')]",
-            )
-        except Exception:
-            # Fallback: last <a> in the row
-            try:
-                links = row_element.find_elements(By.TAG_NAME, "a")
-                if links:
-                    link = links[-1]
-            except Exception:
-                link = None
-
-        if not link:
-            log.warning("No detail link found in row; skipping detail extraction")
-            return default
-
-        href = link.get_attribute("href")
+        href = _detail_href(row_element)
         if not href:
             log.warning("Detail link has no href; skipping detail extraction")
             return default
@@ -535,8 +711,9 @@ def _click_row_and_extract_modal(
 # Main scraper
 # ------------------------------------------------------------------------------------
 def fetch_sync() -> List[RawOpportunity]:
-    items: List[RawOpportunity] = []
-    driver = _new_driver()
+    records: List[Dict[str, Any]] = []
+    pool = selenium_pool("city_columbus", _new_driver)
+    driver = pool.acquire()  # warm Chrome reused across runs
     wait = WebDriverWait(driver, WAIT_TIMEOUT_S)
     t0 = time.time()
 
@@ -553,8 +730,15 @@ def fetch_sync() -> List[RawOpportunity]:
         driver.get(LIST_URL)
         time.sleep(1.0)
 
+        # Offline skeleton: retry once with the last session that got through
+        if any(m in driver.page_source for m in OFFLINE_MARKERS) and _restore_vault_cookies(driver):
+            log.info("Offline skeleton; retrying with vaulted session cookies")
+            driver.get(LIST_URL)
+            time.sleep(1.0)
+
         # Check for offline skeleton mode
         if any(m in driver.page_source for m in OFFLINE_MARKERS):
+            forget_session(VAULT_NAME)
             _dump_html(driver)
             _shot(driver, "offline_skeleton")
             raise RuntimeError(
@@ -567,7 +751,7 @@ def fetch_sync() -> List[RawOpportunity]:
         while time.time() - start_poll < 30:  # 30s timeout
             trs = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
             rows_seen = len(trs)
-            print(f"Row probe: {rows_seen} rows")
+            log.debug(f"Row probe: {rows_seen} rows")
             if rows_seen > 0:
                 break
             time.sleep(0.5)
@@ -578,6 +762,7 @@ def fetch_sync() -> List[RawOpportunity]:
             raise TimeoutError(
                 "No rows found in 30s on first page — see HTML dump for actual DOM."
             )
+        _vault_browser_session(driver)
 
         # Iterate through main doc (and any frames if they add them later)
         for ctx in _switch_contexts(driver):
@@ -597,7 +782,7 @@ def fetch_sync() -> List[RawOpportunity]:
                 page_num += 1
                 rows = _rows(ctx)
                 if not rows:
-                    print(f"Page {page_num}: no rows; stopping.")
+                    log.info(f"Page {page_num}: no rows; stopping.")
                     break
 
                 # Collect rows on this page
@@ -640,11 +825,12 @@ def fetch_sync() -> List[RawOpportunity]:
                                 and total_processed < DEBUG_LIMIT_MODALS
                             )
 
-                        if should_extract_modal:
+                        modal_data = None  # filled in by _fill_details()
+                        if should_extract_modal and DETAIL_MODE == "browser":
                             modal_data = _click_row_and_extract_modal(
                                 driver, wait, r
                             )
-                        else:
+                        elif not should_extract_modal or DETAIL_MODE == "off":
                             if (
                                 DEBUG_LIMIT_MODALS is not None
                                 and len(seen_ids) - 1 >= DEBUG_LIMIT_MODALS
@@ -659,85 +845,18 @@ def fetch_sync() -> List[RawOpportunity]:
                                 )
                             modal_data = _empty_detail_result()
 
-                        # Build the "link" we surface in the UI.
-                        src_url = (
-                            f"{LIST_URL}#rfq={rfq_id}" if rfq_id else LIST_URL
-                        )
-
-                        # Title fallback
-                        final_title = title or rfq_id or "City of Columbus RFQ"
-
-                        # Use full description from detail page if available
-                        desc_text = modal_data["description"] or final_title
-
-                        # Add line items to description if available
-                        if modal_data["line_items"]:
-                            line_items_text = "\n\n### Line Items:\n"
-                            for idx, item in enumerate(
-                                modal_data["line_items"], 1
-                            ):
-                                line_items_text += f"\n{idx}. "
-                                line_items_text += " | ".join(
-                                    f"{k}: {v}" for k, v in item.items() if v
-                                )
-                            desc_text = desc_text + line_items_text
-
-                        # Use solicitation type from detail if available, otherwise table type
-                        final_type = modal_data["solicitation_type"] or typ
-
-                        # Build enhanced summary with delivery info
-                        summary_parts = [dept, final_type]
-                        if modal_data["delivery_name"]:
-                            summary_parts.append(
-                                f"Delivery: {modal_data['delivery_name']}"
-                            )
-                        if modal_data["line_items"]:
-                            summary_parts.append(
-                                f"{len(modal_data['line_items'])} line items"
-                            )
-                        summary_text = " | ".join(
-                            p for p in summary_parts if p
-                        )
-
-                        # hash_body for diff detection downstream
-                        hash_body_val = _make_hash(
-                            rfq_id=rfq_id,
-                            dept=dept,
-                            title=final_title,
-                            typ=final_type,
-                            due_txt=due_txt,
-                        )
-
-                        # Build RawOpportunity with enhanced data from detail page
-                        items.append(
-                            RawOpportunity(
-                                source="city_columbus",
-                                source_url=safe_source_url(
-                                    AGENCY_NAME, src_url, LIST_URL
-                                ),
-                                title=final_title,
-                                summary=summary_text,
-                                description=desc_text,
-                                category=final_type,
-                                agency_name=AGENCY_NAME,
-                                location_geo=modal_data["delivery_address"]
-                                or LOCATION,
-                                posted_date=None,  # not present
-                                due_date=due_dt,
-                                prebid_date=modal_data[
-                                    "delivery_date"
-                                ],  # using delivery date as placeholder
-                                attachments=(
-                                    modal_data["attachments"]
-                                    if modal_data["attachments"]
-                                    else None
-                                ),
-                                status="open",
-                                hash_body=hash_body_val,
-                                external_id=rfq_id,
-                                keyword_tag=keyword_tag,
-                                date_added=datetime.now(timezone.utc),
-                            )
+                        records.append(
+                            {
+                                "rfq_id": rfq_id,
+                                "dept": dept,
+                                "title": title,
+                                "typ": typ,
+                                "due_txt": due_txt,
+                                "due_dt": due_dt,
+                                "keyword_tag": keyword_tag,
+                                "detail_href": _detail_href(r) if should_extract_modal else "",
+                                "modal": modal_data,
+                            }
                         )
                         added += 1
 
@@ -746,7 +865,7 @@ def fetch_sync() -> List[RawOpportunity]:
                         _dump_html(driver)
                         _shot(driver, "row_error")
 
-                print(
+                log.info(
                     f"Page {page_num}: rows={len(rows)} added={added} "
                     f"total_unique={len(seen_ids)}"
                 )
@@ -754,7 +873,7 @@ def fetch_sync() -> List[RawOpportunity]:
                 # Find "Next"
                 nxt = _find_next(ctx)
                 if not nxt:
-                    print("No Next button; stopping pagination.")
+                    log.info("No Next button; stopping pagination.")
                     break
 
                 # Did Next actually change?
@@ -771,7 +890,7 @@ def fetch_sync() -> List[RawOpportunity]:
                     try:
                         driver.execute_script("arguments[0].click();", nxt)
                     except Exception:
-                        print("Next click failed; stopping.")
+                        log.warning("Next click failed; stopping.")
                         break
 
                 changed = False
@@ -788,19 +907,22 @@ def fetch_sync() -> List[RawOpportunity]:
                             changed = True
                             break
                 if not changed:
-                    print(
+                    log.warning(
                         "Next click did not change rows; stopping pagination to avoid loop."
                     )
                     break
 
                 if page_num >= max_pages:
-                    print("Max pages reached; stopping pagination.")
+                    log.info("Max pages reached; stopping pagination.")
                     break
 
             # If we successfully scraped from this context, don't bother other iframes
-            if items:
+            if records:
                 break
 
+        _fill_details(driver, wait, records)
+        items = [_build_opportunity(rec) for rec in records]
+
         if not items:
             _dump_html(driver)
             _shot(driver, "no_items")
@@ -808,14 +930,11 @@ def fetch_sync() -> List[RawOpportunity]:
                 "No RFQs parsed; selectors may need a small tweak. Check the HTML dump."
             )
 
-        print(f"Scraped {len(items)} unique RFQs from Columbus.")
+        log.info(f"Scraped {len(items)} unique RFQs from Columbus.")
         return items
 
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        pool.release(driver)
 
 
 # ------------------------------------------------------------------------------------
@@ -4,9 +4,9 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
-import aiohttp
-from bs4 import BeautifulSoup
+from app.ingest import http as ingest_http
 from app.ingest.base import RawOpportunity
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +18,9 @@ LIST_URL = f"{BASE_URL}/Bids.aspx"
 # helpers
 # --------------------------
 
-async def _fetch(session: aiohttp.ClientSession, url: str) -> str:
-    async with session.get(url) as resp:
-        resp.raise_for_status()
-        return await resp.text()
+async def _fetch(url: str) -> str:
+    # detail pages only (listing goes through get_listing); served from the disk cache when fresh
+    return await ingest_http.get_cached_text(url)
 
 def _parse_date_mmddyyyy(text_in: str) -> Optional[datetime]:
     if not text_in:
@@ -76,10 +75,7 @@ def _classify_keyword_tag(title: str, agency: str, default_val: str = "General /
 # detail page scrape
 # --------------------------
 
-async def _fetch_detail(
-    session: aiohttp.ClientSession,
-    url: str
-) -> Tuple[str, Optional[datetime], Optional[datetime], Optional[datetime], List[str], str]:
+async def _fetch_detail(url: str) -> Tuple[str, Optional[datetime], Optional[datetime], Optional[datetime], List[str], str]:
     """
     Return:
         description_text (long narrative under Description:)
@@ -90,12 +86,12 @@ async def _fetch_detail(
         external_id      (Bid Number like "825-5", or "" if missing)
     """
     try:
-        html = await _fetch(session, url)
+        html = await _fetch(url)
     except Exception as e:
         logger.warning(f"Gahanna detail fetch failed {url}: {e}")
         return ("", None, None, None, [], "")
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     # Bid Number lives in <span class="BidDetailSpec">825-5<br></span>
     external_id = ""
@@ -189,117 +185,117 @@ async def _fetch_detail(
 # --------------------------
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
-    async with aiohttp.ClientSession() as session:
-        html = await _fetch(session, LIST_URL)
-        soup = BeautifulSoup(html, "html.parser")
-
-        rows: List[tuple] = []
-
-        # Look for rows in tables
-        for table in soup.find_all("table"):
-            for tr in table.find_all("tr"):
-                tds = tr.find_all("td")
-                if len(tds) < 2:
-                    continue
-                link = tr.find("a", href=True)
-                if not link:
-                    continue
-                href = link.get("href")
-                if not href or "bidid=" not in href.lower():
-                    continue
-
-                detail_url = _normalize_detail_url(href)
-                if not detail_url:
-                    continue
-
-                title = link.get_text(strip=True)
-                row_text = " ".join(td.get_text(" ", strip=True) for td in tds)
-                rows.append((title, detail_url, row_text))
-
-        # Fallback: div cards
-        if not rows:
-            for card in soup.find_all("div", class_="listItemsRow"):
-                link = card.find("a", href=True)
-                if not link:
-                    continue
-                href = link.get("href")
-                if not href or "bidid=" not in href.lower():
-                    continue
-
-                detail_url = _normalize_detail_url(href)
-                if not detail_url:
-                    continue
-
-                title = link.get_text(strip=True)
-                row_text = card.get_text(" ", strip=True)
-                rows.append((title, detail_url, row_text))
-
-        if not rows:
-            page_text_lower = soup.get_text(" ", strip=True).lower()
-            if "no open bid postings" in page_text_lower or "no open bids" in page_text_lower:
-                logger.info("Gahanna: no open bids at this time.")
-                return []
-            logger.warning("Gahanna: page parsed but no recognizable bid rows found.")
-            return []
+    # Raises ingest_http.NotModified when the listing is unchanged since the last saved run.
+    html = await ingest_http.get_listing(LIST_URL, agency_name=AGENCY_NAME, source="city_gahanna")
+    soup = parse_html(html)
+
+    rows: List[tuple] = []
+
+    # Look for rows in tables
+    for table in soup.find_all("table"):
+        for tr in table.find_all("tr"):
+            tds = tr.find_all("td")
+            if len(tds) < 2:
+                continue
+            link = tr.find("a", href=True)
+            if not link:
+                continue
+            href = link.get("href")
+            if not href or "bidid=" not in href.lower():
+                continue
+
+            detail_url = _normalize_detail_url(href)
+            if not detail_url:
+                continue
+
+            title = link.get_text(strip=True)
+            row_text = " ".join(td.get_text(" ", strip=True) for td in tds)
+            rows.append((title, detail_url, row_text))
+
+    # Fallback: div cards
+    if not rows:
+        for card in soup.find_all("div", class_="listItemsRow"):
+            link = card.find("a", href=True)
+            if not link:
+                continue
+            href = link.get("href")
+            if not href or "bidid=" not in href.lower():
+                continue
 
-        # dedupe by detail_url
-        seen = set()
-        unique_rows = []
-        for (title, detail_url, row_text) in rows:
-            if detail_url in seen:
+            detail_url = _normalize_detail_url(href)
+            if not detail_url:
                 continue
-            seen.add(detail_url)
-            unique_rows.append((title, detail_url, row_text))
-
-        out: List[RawOpportunity] = []
-
-        for (title, detail_url, row_text) in unique_rows:
-            due_dt_row = _parse_date_mmddyyyy(row_text)
-
-            (
-                long_desc,
-                posted_dt,
-                due_dt_detail,
-                prebid_dt,
-                attachment_urls,
-                external_id,
-            ) = await _fetch_detail(session, detail_url)
-
-            final_due = due_dt_detail or due_dt_row
-
-            # If there's still no Bid Number, we want to store "Unknown"
-            if not external_id or not external_id.strip():
-                external_id = "Unknown"
-
-            keyword_tag = _classify_keyword_tag(title, AGENCY_NAME)
-            hash_body = hashlib.sha256(
-                f"{external_id}|{title}|{final_due}|{long_desc}".encode("utf-8", errors="ignore")
-            ).hexdigest()
-
-            out.append(
-                RawOpportunity(
-                    source="city_gahanna",
-                    source_url=detail_url,
-                    agency_name=AGENCY_NAME,
-                    location_geo="Franklin County, OH",
-                    title=title,
-                    summary=long_desc[:250] if long_desc else title,
-                    description=long_desc,
-                    category="General / City Bid",
-                    posted_date=posted_dt,
-                    due_date=final_due,
-                    prebid_date=prebid_dt,
-                    attachments=attachment_urls,
-                    status="open",
-                    hash_body=hash_body,
-                    external_id=external_id,
-                    keyword_tag=keyword_tag,
-                    date_added=datetime.now(timezone.utc),  # 👈 NEW LINE
-                )
+
+            title = link.get_text(strip=True)
+            row_text = card.get_text(" ", strip=True)
+            rows.append((title, detail_url, row_text))
+
+    if not rows:
+        page_text_lower = soup.get_text(" ", strip=True).lower()
+        if "no open bid postings" in page_text_lower or "no open bids" in page_text_lower:
+            logger.info("Gahanna: no open bids at this time.")
+            return []
+        logger.warning("Gahanna: page parsed but no recognizable bid rows found.")
+        return []
+
+    # dedupe by detail_url
+    seen = set()
+    unique_rows = []
+    for (title, detail_url, row_text) in rows:
+        if detail_url in seen:
+            continue
+        seen.add(detail_url)
+        unique_rows.append((title, detail_url, row_text))
+
+    out: List[RawOpportunity] = []
+
+    for (title, detail_url, row_text) in unique_rows:
+        due_dt_row = _parse_date_mmddyyyy(row_text)
+
+        (
+            long_desc,
+            posted_dt,
+            due_dt_detail,
+            prebid_dt,
+            attachment_urls,
+            external_id,
+        ) = await _fetch_detail(detail_url)
+
+        final_due = due_dt_detail or due_dt_row
+
+        # If there's still no Bid Number, we want to store "Unknown"
+        if not external_id or not external_id.strip():
+            external_id = "Unknown"
+
+        keyword_tag = _classify_keyword_tag(title, AGENCY_NAME)
+        hash_body = hashlib.sha256(
+            f"{external_id}|{title}|{final_due}|{long_desc}".encode("utf-8", errors="ignore")
+        ).hexdigest()
+
+        out.append(
+            RawOpportunity(
+                source="city_gahanna",
+                source_url=detail_url,
+                agency_name=AGENCY_NAME,
+                location_geo="Franklin County, OH",
+                title=title,
+                summary=long_desc[:250] if long_desc else title,
+                description=long_desc,
+                category="General / City Bid",
+                posted_date=posted_dt,
+                due_date=final_due,
+                prebid_date=prebid_dt,
+                attachments=attachment_urls,
+                status="open",
+                hash_body=hash_body,
+                external_id=external_id,
+                keyword_tag=keyword_tag,
+                date_added=datetime.now(timezone.utc),  # 👈 NEW LINE
             )
+        )
 
-        logger.info(f"Gahanna: scraped {len(out)} bid(s).")
-        return out
+    logger.info(f"Gahanna: scraped {len(out)} bid(s).")
+    return out
 
 # THIS IS CRITICAL FOR runner.py
 async def fetch() -> List[RawOpportunity]:
@@ -4,8 +4,8 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Optional
 import aiohttp
-from bs4 import BeautifulSoup
 from app.ingest.base import RawOpportunity
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ async def _fetch_html(session: aiohttp.ClientSession, url: str) -> str:
 
 async def _scrape_listing(session: aiohttp.ClientSession) -> List[RawOpportunity]:
     html = await _fetch_html(session, LIST_URL)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     # Upcoming solicitations table (open bids)
     table = soup.find("table", id="solicitations")
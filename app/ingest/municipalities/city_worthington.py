@@ -7,6 +7,7 @@ import aiohttp
 from bs4 import BeautifulSoup
 
 from app.ingest.base import RawOpportunity
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +75,7 @@ async def _fetch_detail_description_and_dates_and_attachments(
         logger.warning(f"Worthington detail fetch failed {url}: {e}")
         return ("", None, None, None, [])
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     text_all = soup.get_text(" ", strip=True)
 
     posted_dt = None
@@ -199,7 +200,7 @@ def _extract_rows_from_cards(soup: BeautifulSoup) -> List[tuple]:
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
     html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     page_text = soup.get_text(" ", strip=True).lower()
 
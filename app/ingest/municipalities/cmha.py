@@ -1,6 +1,5 @@
 import re
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 from typing import List, Optional
 
@@ -9,6 +8,7 @@ from app.ingest.municipalities.columbus_metropolitan_library import (
     _clean_ws,
     _extract_meta_from_pdf_bytes,
 )
+from app.ingest.parsing import parse_html
 
 AGENCY_NAME = "Columbus Metropolitan Housing Authority"
 
@@ -33,7 +33,7 @@ def _parse_solicitation(text: str):
 def fetch() -> List[RawOpportunity]:
     resp = requests.get(PURCHASING_URL, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = parse_html(resp.text)
 
     opportunities: List[RawOpportunity] = []
 
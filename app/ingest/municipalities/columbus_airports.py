@@ -12,6 +12,7 @@ from bs4 import BeautifulSoup
 
 from app.ingest.base import RawOpportunity
 from app.ingest.municipalities.city_columbus import _classify_keyword_tag
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -173,7 +174,7 @@ async def _fetch_detail_opportunity(
         logger.warning(f"COTA detail fetch failed {detail_url}: {e}")
         return ("", None, None, [])
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     return _extract_detail_description_dates_attachments(soup)
 
 
@@ -187,10 +188,10 @@ def _locate_opportunity_tiles(soup: BeautifulSoup) -> List[dict]:
     tiles = soup.find_all("a", class_="RecordTile")
     for tile in tiles:
         href_val = tile.get("href", "")
-        print("DEBUG TILE HREF:", href_val)
+        logger.debug(f"tile href: {href_val}")
         m = re.search(r"ViewDetail\('([^']+)'\)", href_val)
         record_id = m.group(1).strip() if m else None
-        print("DEBUG RID:", record_id)
+        logger.debug(f"record id: {record_id}")
 
         desc_div = tile.find("div", class_="Description")
         if not desc_div:
@@ -231,7 +232,7 @@ def _locate_opportunity_tiles(soup: BeautifulSoup) -> List[dict]:
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
     listing_html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(listing_html, "html.parser")
+    soup = parse_html(listing_html)
 
     tiles = _locate_opportunity_tiles(soup)
 
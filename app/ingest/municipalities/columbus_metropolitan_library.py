@@ -1,10 +1,12 @@
 import re
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 from datetime import datetime,timezone
 from typing import List, Optional
 
 from app.ingest.base import RawOpportunity
+from app.ingest.cache import memoize
+from app.ingest.parsing import parse_html
 
 AGENCY_NAME = "Columbus Metropolitan Library"
 BASE_URL = "https://www.columbuslibrary.org/doing-business/"
@@ -89,6 +91,14 @@ def _normalize_date(raw: Optional[str]) -> Optional[datetime]:
 
 
 def _extract_meta_from_pdf_bytes(pdf_bytes: bytes):
+    """
+    (posted_date_dt, due_date_dt, description_text) for a PDF, memoized on
+    disk by content hash so unchanged attachments are parsed once.
+    """
+    return memoize("pdf_meta_v1", pdf_bytes, _parse_meta_from_pdf_bytes)
+
+
+def _parse_meta_from_pdf_bytes(pdf_bytes: bytes):
     """
     Extract posted_date_dt, due_date_dt, description_text from PDF.
     NOTE: This ONLY works if the PDF has an embedded text layer.
@@ -232,7 +242,7 @@ def fetch() -> List[RawOpportunity]:
     """
     resp = requests.get(BASE_URL, timeout=20)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = parse_html(resp.text)
 
     # locate the Bid Opportunities heading block
     bid_header = None
@@ -0,0 +1,167 @@
+# app/ingest/municipalities/columbus_odata.py
+"""
+City of Columbus RFQ details straight from the portal's OData API.
+
+The OpenRFQs listing still needs a browser, but the detail panel that
+city_columbus used to open row by row is backed by the same Dataverse
+tables the /columbus_detail endpoints query (cr820_rfqheaders, plus
+attachments and line items keyed by the header GUID). Fetching those over
+httpx, a few RFQs at a time, takes seconds for the whole list instead of
+several seconds per modal.
+
+fetch_rfq_details() returns {rfq_id: detail} in the same shape as
+city_columbus._empty_detail_result(); RFQs that could not be resolved are
+left out so the caller can fall back to the browser for just those.
+
+Requests carry the portal cookies city_columbus vaults after its browser
+gets through (session_vault, VAULT_NAME), so they look like the same
+visitor the portal already let in.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.core.columbus_portal import (
+    browser_headers,
+    build_attachments_query_url,
+    build_header_query_url,
+    build_items_query_url,
+)
+from app.ingest.session_vault import load_session
+
+log = logging.getLogger("columbus")
+
+ODATA_CONCURRENCY = 8
+ODATA_TIMEOUT_S = 20.0
+VAULT_NAME = "columbus"  # session_vault key shared with city_columbus
+
+_FMT = "@OData.Community.Display.V1.FormattedValue"
+
+
+def _pick(rec: Dict[str, Any], *keys: str) -> str:
+    for k in keys:
+        val = rec.get(k)
+        if val not in (None, ""):
+            return str(val).strip()
+    return ""
+
+
+async def _get_records(client: httpx.AsyncClient, url: str) -> List[Dict[str, Any]]:
+    resp = await client.get(url)
+    resp.raise_for_status()
+    return resp.json().get("value", []) or []
+
+
+def _client_session() -> tuple:
+    """(headers, cookies) for httpx, from the vaulted browser session if any."""
+    headers = browser_headers()
+    cookies = httpx.Cookies()
+    vaulted = load_session(VAULT_NAME)
+    if vaulted is not None:
+        for c in vaulted.cookies:
+            cookies.set(c["name"], c["value"], domain=c.get("domain") or "", path=c.get("path") or "/")
+        if vaulted.state.get("user_agent"):
+            headers["User-Agent"] = vaulted.state["user_agent"]
+    return headers, cookies
+
+
+def _line_order(rec: Dict[str, Any]) -> tuple:
+    """Sort key: numeric line numbers in numeric order ("2" before "10"), then any others as text."""
+    raw = _pick(rec, "cr820_linenumber")
+    try:
+        return (0, float(raw), "")
+    except ValueError:
+        return (1, 0.0, raw)
+
+
+def _line_item(rec: Dict[str, Any]) -> Dict[str, str]:
+    # Same "label: value" shape as the RfqLineTable rows scraped in the browser.
+    item = {
+        "Line": _pick(rec, "cr820_linenumber"),
+        "Item": _pick(rec, "cr820_itemname"),
+        "Description": _pick(rec, "cr820_itemdescription"),
+        "Quantity": _pick(rec, "cr820_qty"),
+        "UOM": _pick(rec, "cr820_uom" + _FMT, "cr820_uom"),
+    }
+    return {k: v for k, v in item.items() if v}
+
+
+async def _fetch_one(client: httpx.AsyncClient, rfq_id: str, parse_date) -> Optional[Dict[str, Any]]:
+    headers = await _get_records(client, build_header_query_url(rfq_id))
+    if not headers:
+        return None
+    header = headers[0]
+
+    result: Dict[str, Any] = {
+        "description": _pick(header, "cr820_psnrfqdescription", "cr820_psnrfqdescription_t_"),
+        "attachments": [],
+        "delivery_date": None,
+        "delivery_name": _pick(header, "cr820_deliveryname"),
+        "delivery_address": _pick(header, "cr820_deliveryaddress"),
+        "solicitation_type": _pick(
+            header, "cr820_solicitationname", "cr820_solicitationtype" + _FMT, "cr820_solicitationtype"
+        ),
+        "line_items": [],
+    }
+    delivery = _pick(header, "cr820_deliverydate" + _FMT, "cr820_deliverydate")
+    if delivery:
+        result["delivery_date"] = parse_date(delivery)
+
+    if not (result["description"] or result["delivery_name"]):
+        return None  # header row without panel content; let the browser look
+
+    header_id = _pick(header, "cr820_rfqheaderid")
+    if header_id:
+        attach_recs, item_recs = await asyncio.gather(
+            _get_records(client, build_attachments_query_url(header_id)),
+            _get_records(client, build_items_query_url(header_id)),
+            return_exceptions=True,
+        )
+        if isinstance(attach_recs, list):
+            result["attachments"] = [
+                u for u in (_pick(r, "cr820_documenturl", "cr820_document") for r in attach_recs) if u
+            ]
+        if isinstance(item_recs, list):
+            items = sorted(item_recs, key=_line_order)
+            result["line_items"] = [li for li in (_line_item(r) for r in items) if li]
+    return result
+
+
+async def fetch_rfq_details(
+    rfq_ids: Iterable[str],
+    parse_date,
+    concurrency: int = ODATA_CONCURRENCY,
+) -> Dict[str, Dict[str, Any]]:
+    """Detail dicts for every RFQ the OData API could resolve (failures omitted)."""
+    ids = [i for i in dict.fromkeys(rfq_ids) if i]
+    if not ids:
+        return {}
+    sem = asyncio.Semaphore(max(concurrency, 1))
+    out: Dict[str, Dict[str, Any]] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    headers, cookies = _client_session()
+    async with httpx.AsyncClient(
+        timeout=ODATA_TIMEOUT_S, headers=headers, cookies=cookies, limits=limits
+    ) as client:
+        async def one(rfq_id: str) -> None:
+            async with sem:
+                try:
+                    detail = await _fetch_one(client, rfq_id, parse_date)
+                except (httpx.HTTPError, ValueError) as e:
+                    log.info(f"OData detail lookup failed for {rfq_id}: {e}")
+                    return
+            if detail is not None:
+                out[rfq_id] = detail
+
+        await asyncio.gather(*(one(i) for i in ids))
+
+    log.info(f"OData details resolved for {len(out)}/{len(ids)} RFQs")
+    return out
+
+
+def fetch_rfq_details_sync(rfq_ids: Iterable[str], parse_date, **kwargs) -> Dict[str, Dict[str, Any]]:
+    """For the Selenium scraper, which runs in a worker thread without a loop."""
+    return asyncio.run(fetch_rfq_details(rfq_ids, parse_date, **kwargs))
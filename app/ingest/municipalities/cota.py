@@ -13,6 +13,7 @@ from bs4 import BeautifulSoup
 from app.ingest.base import RawOpportunity
 from app.ingest.municipalities.city_columbus import _classify_keyword_tag
 from app.ingest.utils import safe_source_url
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -197,7 +198,7 @@ async def _fetch_detail_opportunity(
         logger.warning(f"COTA detail fetch failed {detail_url}: {e}")
         return ("", None, None, [])
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     return _extract_detail_description_dates_attachments(soup)
 
 
@@ -260,7 +261,7 @@ def _locate_opportunity_tiles(soup: BeautifulSoup) -> List[dict]:
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
     listing_html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(listing_html, "html.parser")
+    soup = parse_html(listing_html)
 
     tiles = _locate_opportunity_tiles(soup)
 
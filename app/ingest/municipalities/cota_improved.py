@@ -20,13 +20,13 @@ from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-import aiohttp
-from aiohttp import ClientTimeout
 from bs4 import BeautifulSoup
 
+from app.ingest import http as ingest_http
 from app.ingest.base import RawOpportunity
 from app.ingest.municipalities.city_columbus import _classify_keyword_tag
 from app.ingest.utils import safe_source_url
+from app.ingest.parsing import parse_html
 
 # Import improvement utilities (optional)
 try:
@@ -61,78 +61,25 @@ SELECTORS = {
 }
 
 VALID_STATUSES = {"open", "due soon"}
-MAX_RETRIES = 3
-RETRY_DELAYS = [0.2, 0.6, 1.4]
+
+# Browser-like headers; the portal is picky about bare clients.
+REQUEST_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": LIST_URL,  # Pretend we came from listing page
+}
 
 # =============================================================================
 # HTTP Utilities
 # =============================================================================
 
-async def _read_text_with_fallback(resp: aiohttp.ClientResponse) -> str:
-    """Robust text decoding for legacy encodings."""
-    raw = await resp.read()
-
-    if resp.charset:
-        try:
-            return raw.decode(resp.charset, errors="replace")
-        except (LookupError, UnicodeDecodeError):
-            pass
-
-    try:
-        return raw.decode("cp1252", errors="replace")
-    except UnicodeDecodeError:
-        pass
-
-    return raw.decode("latin-1", errors="replace")
-
-
-async def _fetch(session: aiohttp.ClientSession, url: str) -> str:
-    """HTTP GET with retry logic and browser headers."""
-    last_exc: Optional[Exception] = None
-
-    for attempt in range(MAX_RETRIES):
-        try:
-            resp = await session.get(
-                url,
-                headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
-                    ),
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Referer": LIST_URL,  # NEW: Pretend we came from listing page
-                },
-            )
-            resp.raise_for_status()
-
-            logger.debug(f"Successfully fetched {url} (attempt {attempt + 1})")
-            return await _read_text_with_fallback(resp)
-
-        except aiohttp.ClientError as e:
-            last_exc = e
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAYS[attempt]
-                logger.warning(
-                    f"Fetch failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                await asyncio.sleep(delay)
-        except Exception as e:
-            last_exc = e
-            logger.error(f"Unexpected error fetching {url}: {e}")
-            break
-
-    if last_exc:
-        raise last_exc
-    return ""
-
-
-async def _fetch_html(url: str) -> str:
-    """Fetch HTML with timeout."""
-    timeout = ClientTimeout(total=30)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        return await _fetch(session, url)
+async def _fetch(url: str) -> str:
+    """Detail-page GET (shared client + disk cache) with browser headers."""
+    return await ingest_http.get_cached_text(url, headers=REQUEST_HEADERS)
 
 
 def _abs_url(href: str) -> str:
@@ -273,14 +220,11 @@ def _extract_detail_description_dates_attachments(
     return (full_description, posted_date, due_date, attachment_urls)
 
 
-async def _fetch_detail_opportunity(
-    session: aiohttp.ClientSession,
-    detail_url: str
-) -> Tuple[str, Optional[datetime], Optional[datetime], List[str]]:
+async def _fetch_detail_opportunity(detail_url: str) -> Tuple[str, Optional[datetime], Optional[datetime], List[str]]:
     """Fetch and parse opportunity detail page."""
     try:
-        html = await _fetch(session, detail_url)
-        soup = BeautifulSoup(html, "html.parser")
+        html = await _fetch(detail_url)
+        soup = parse_html(html)
         return _extract_detail_description_dates_attachments(soup)
     except Exception as e:
         logger.warning(f"COTA detail fetch failed for {detail_url}: {e}")
@@ -380,8 +324,11 @@ async def _scrape_listing_page() -> List[RawOpportunity]:
     """Main scraping function."""
     logger.info(f"Starting COTA scraper v{SCRAPER_VERSION}")
 
-    listing_html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(listing_html, "html.parser")
+    # Raises ingest_http.NotModified when the listing is unchanged since the last saved run.
+    listing_html = await ingest_http.get_listing(
+        LIST_URL, agency_name=AGENCY_NAME, source="cota", headers=REQUEST_HEADERS
+    )
+    soup = parse_html(listing_html)
 
     tiles = _locate_opportunity_tiles(soup)
 
@@ -390,104 +337,102 @@ async def _scrape_listing_page() -> List[RawOpportunity]:
         return []
 
     out: List[RawOpportunity] = []
-    timeout = ClientTimeout(total=30)
 
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for i, tile in enumerate(tiles, 1):
-            logger.debug(f"Processing opportunity {i}/{len(tiles)}: {tile['record_id']}")
+    for i, tile in enumerate(tiles, 1):
+        logger.debug(f"Processing opportunity {i}/{len(tiles)}: {tile['record_id']}")
 
-            await asyncio.sleep(0.1)
+        await asyncio.sleep(0.1)
 
-            record_id = tile["record_id"]
-            original_title = tile["title"]
-            due_text_raw = tile["due_text"]
-            question_deadline_raw = tile["question_deadline_text"]
+        record_id = tile["record_id"]
+        original_title = tile["title"]
+        due_text_raw = tile["due_text"]
+        question_deadline_raw = tile["question_deadline_text"]
 
-            # Parse external ID from title: "25-049 - Project Name"
-            match = re.match(
-                r"^\s*(?P<sol>[0-9A-Za-z]+[-/][0-9A-Za-z]+)\s*[-:]\s*(?P<title>.+)$",
-                original_title.strip()
-            )
+        # Parse external ID from title: "25-049 - Project Name"
+        match = re.match(
+            r"^\s*(?P<sol>[0-9A-Za-z]+[-/][0-9A-Za-z]+)\s*[-:]\s*(?P<title>.+)$",
+            original_title.strip()
+        )
 
-            if match:
-                external_id = match.group("sol").strip()
-                clean_title = match.group("title").strip()
-            else:
-                external_id = record_id or ""
-                clean_title = original_title.strip()
-
-            # Parse dates from listing page
-            cleaned_due = _clean_date_string(due_text_raw)
-            due_dt = _parse_datetime(cleaned_due)
-
-            # NEW: Parse question deadline
-            cleaned_question = _clean_date_string(question_deadline_raw)
-            question_deadline_dt = _parse_datetime(cleaned_question)
-
-            # Build detail URL with correct parameters
-            detail_url = DETAIL_URL_TEMPLATE.format(PID=record_id) if record_id else LIST_URL
-
-            # Fetch detail page
-            description_text = ""
-            posted_dt = None
-            detail_due_dt = None
-            attachment_urls: List[str] = []
-
-            if record_id:
-                (
-                    description_text,
-                    posted_dt,
-                    detail_due_dt,
-                    attachment_urls,
-                ) = await _fetch_detail_opportunity(session, detail_url)
-
-            # Use detail due date if available, otherwise listing due date
-            final_due = detail_due_dt or due_dt
-
-            # Ensure timezone-aware
-            if final_due and final_due.tzinfo is None:
-                final_due = final_due.replace(tzinfo=ZoneInfo("America/New_York")).astimezone(timezone.utc)
-
-            # Build summary with question deadline
-            summary_text = description_text or f"Status: {tile['status']}. Due: {cleaned_due}."
-            if question_deadline_dt:
-                question_local = question_deadline_dt.astimezone(ZoneInfo("America/New_York")).strftime("%m/%d/%Y %I:%M %p")
-                summary_text = f"{summary_text} Question deadline: {question_local}."
-
-            # Classify
-            keyword_tag = _classify_keyword_tag(
-                clean_title,
-                AGENCY_NAME,
-                "Transit / Transportation"
-            )
+        if match:
+            external_id = match.group("sol").strip()
+            clean_title = match.group("title").strip()
+        else:
+            external_id = record_id or ""
+            clean_title = original_title.strip()
+
+        # Parse dates from listing page
+        cleaned_due = _clean_date_string(due_text_raw)
+        due_dt = _parse_datetime(cleaned_due)
+
+        # NEW: Parse question deadline
+        cleaned_question = _clean_date_string(question_deadline_raw)
+        question_deadline_dt = _parse_datetime(cleaned_question)
+
+        # Build detail URL with correct parameters
+        detail_url = DETAIL_URL_TEMPLATE.format(PID=record_id) if record_id else LIST_URL
+
+        # Fetch detail page
+        description_text = ""
+        posted_dt = None
+        detail_due_dt = None
+        attachment_urls: List[str] = []
+
+        if record_id:
+            (
+                description_text,
+                posted_dt,
+                detail_due_dt,
+                attachment_urls,
+            ) = await _fetch_detail_opportunity(detail_url)
+
+        # Use detail due date if available, otherwise listing due date
+        final_due = detail_due_dt or due_dt
+
+        # Ensure timezone-aware
+        if final_due and final_due.tzinfo is None:
+            final_due = final_due.replace(tzinfo=ZoneInfo("America/New_York")).astimezone(timezone.utc)
+
+        # Build summary with question deadline
+        summary_text = description_text or f"Status: {tile['status']}. Due: {cleaned_due}."
+        if question_deadline_dt:
+            question_local = question_deadline_dt.astimezone(ZoneInfo("America/New_York")).strftime("%m/%d/%Y %I:%M %p")
+            summary_text = f"{summary_text} Question deadline: {question_local}."
+
+        # Classify
+        keyword_tag = _classify_keyword_tag(
+            clean_title,
+            AGENCY_NAME,
+            "Transit / Transportation"
+        )
 
-            # Generate hash
-            hash_body_val = hashlib.sha256(
-                f"{external_id}||{clean_title}||{cleaned_due}".encode("utf-8", errors="ignore")
-            ).hexdigest()
-
-            # Create opportunity
-            out.append(
-                RawOpportunity(
-                    agency_name=AGENCY_NAME,
-                    title=clean_title,
-                    summary=summary_text,
-                    description=description_text,
-                    due_date=final_due,
-                    posted_date=posted_dt.astimezone(timezone.utc) if posted_dt and posted_dt.tzinfo else posted_dt,
-                    prebid_date=question_deadline_dt,  # Store question deadline as prebid_date
-                    source="cota",
-                    source_url=safe_source_url(AGENCY_NAME, detail_url, LIST_URL),
-                    category="Transit / Transportation",
-                    location_geo="Franklin County, OH",
-                    attachments=attachment_urls,
-                    status="open",
-                    hash_body=hash_body_val,
-                    external_id=external_id,
-                    keyword_tag=keyword_tag,
-                    date_added=datetime.now(timezone.utc),
-                )
+        # Generate hash
+        hash_body_val = hashlib.sha256(
+            f"{external_id}||{clean_title}||{cleaned_due}".encode("utf-8", errors="ignore")
+        ).hexdigest()
+
+        # Create opportunity
+        out.append(
+            RawOpportunity(
+                agency_name=AGENCY_NAME,
+                title=clean_title,
+                summary=summary_text,
+                description=description_text,
+                due_date=final_due,
+                posted_date=posted_dt.astimezone(timezone.utc) if posted_dt and posted_dt.tzinfo else posted_dt,
+                prebid_date=question_deadline_dt,  # Store question deadline as prebid_date
+                source="cota",
+                source_url=safe_source_url(AGENCY_NAME, detail_url, LIST_URL),
+                category="Transit / Transportation",
+                location_geo="Franklin County, OH",
+                attachments=attachment_urls,
+                status="open",
+                hash_body=hash_body_val,
+                external_id=external_id,
+                keyword_tag=keyword_tag,
+                date_added=datetime.now(timezone.utc),
             )
+        )
 
     logger.info(f"COTA: successfully scraped {len(out)} open bid(s)")
     return out
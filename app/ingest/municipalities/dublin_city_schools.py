@@ -4,12 +4,12 @@ from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
 
 from app.ingest.base import RawOpportunity
 from app.ingest.municipalities.columbus_metropolitan_library import (
     _clean_ws,
 )
+from app.ingest.parsing import parse_html
 
 
 AGENCY_NAME = "Dublin City Schools"
@@ -193,7 +193,7 @@ def _parse_due_datetime_from_line(due_line: str) -> Optional[datetime]:
 def fetch() -> List[RawOpportunity]:
     resp = requests.get(BIDDING_URL, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = parse_html(resp.text)
 
     # Find the main content area where the open bids live.
     # From the HTML you gave, it's under:
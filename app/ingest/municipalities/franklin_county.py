@@ -4,10 +4,11 @@ import re
 from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+from app.ingest import http as ingest_http
 from app.ingest.base import RawOpportunity
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -41,45 +42,9 @@ def _normalize_ref_no(ref_no: str) -> str:
     txt = re.sub(r"^(rfp|rfq|itb|bid)\s*#?\s*", "", txt, flags=re.IGNORECASE)
     return txt.strip()
 
-async def _read_text_with_fallback(resp: aiohttp.ClientResponse) -> str:
-    """
-    Robust decode for legacy encodings.
-    """
-    raw = await resp.read()
-
-    if resp.charset:
-        try:
-            return raw.decode(resp.charset, errors="replace")
-        except (LookupError, UnicodeDecodeError):
-            pass
-
-    try:
-        return raw.decode("cp1252", errors="replace")
-    except UnicodeDecodeError:
-        pass
-
-    return raw.decode("latin-1", errors="replace")
-
-
-async def _fetch(session: aiohttp.ClientSession, url: str, max_retries: int = 3) -> str:
-    """Fetch with exponential backoff retry."""
-    for attempt in range(max_retries):
-        try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            resp = await session.get(url, timeout=timeout)
-            resp.raise_for_status()
-            return await _read_text_with_fallback(resp)
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            if attempt == max_retries - 1:
-                raise
-            wait_time = 2 ** attempt  # 1s, 2s, 4s
-            logger.warning(f"Retry {attempt + 1}/{max_retries} for {url} after {wait_time}s: {e}")
-            await asyncio.sleep(wait_time)
-
-
-async def _fetch_html(url: str) -> str:
-    async with aiohttp.ClientSession() as session:
-        return await _fetch(session, url)
+async def _fetch(url: str) -> str:
+    # detail pages only (listing goes through get_listing); served from the disk cache when fresh
+    return await ingest_http.get_cached_text(url)
 
 
 def _abs_url(href: str) -> str:
@@ -320,7 +285,6 @@ def _extract_clean_description(soup: BeautifulSoup) -> str:
 
 
 async def _fetch_detail_description_and_attachments(
-    session: aiohttp.ClientSession,
     url: str
 ) -> Tuple[str, List[str], bool, Optional[datetime]]:
     """
@@ -333,12 +297,12 @@ async def _fetch_detail_description_and_attachments(
     Returns: (description, attachment_urls, requires_login, opening_datetime)
     """
     try:
-        html = await _fetch(session, url)
+        html = await _fetch(url)
     except Exception as e:
         logger.warning(f"Franklin County detail fetch failed {url}: {e}")
         return ("", [], False, None)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     # Check for login indicators
     requires_login = bool(
@@ -444,8 +408,9 @@ def _extract_rows_from_table(soup: BeautifulSoup) -> List[dict]:
 # ---------------------------------
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
-    listing_html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(listing_html, "html.parser")
+    # Raises ingest_http.NotModified when the listing is unchanged since the last saved run.
+    listing_html = await ingest_http.get_listing(LIST_URL, agency_name=AGENCY_NAME)
+    soup = parse_html(listing_html)
 
     rows = _extract_rows_from_table(soup)
     if not rows:
@@ -457,16 +422,15 @@ async def _scrape_listing_page() -> List[RawOpportunity]:
     # Fetch all detail pages in parallel with rate limiting
     semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-    async def fetch_with_limit(session: aiohttp.ClientSession, url: str):
+    async def fetch_with_limit(url: str):
         async with semaphore:
-            return await _fetch_detail_description_and_attachments(session, url)
-
-    async with aiohttp.ClientSession() as session:
-        detail_tasks = [
-            fetch_with_limit(session, row["detail_url"])
-            for row in rows
-        ]
-        detail_results = await asyncio.gather(*detail_tasks, return_exceptions=True)
+            return await _fetch_detail_description_and_attachments(url)
+
+    detail_tasks = [
+        fetch_with_limit(row["detail_url"])
+        for row in rows
+    ]
+    detail_results = await asyncio.gather(*detail_tasks, return_exceptions=True)
 
     # Count successful fetches for logging
     successful_fetches = len([r for r in detail_results if not isinstance(r, Exception)])
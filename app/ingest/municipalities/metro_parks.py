@@ -1,6 +1,5 @@
 import re
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
@@ -9,6 +8,7 @@ from app.ingest.municipalities.columbus_metropolitan_library import (
     _clean_ws,
     _extract_meta_from_pdf_bytes,
 )
+from app.ingest.parsing import parse_html
 
 AGENCY_NAME = "Columbus and Franklin County Metro Parks"
 BASE_URL = "https://www.metroparks.net"
@@ -74,7 +74,7 @@ def _extract_meta_plus_due(pdf_bytes: bytes) -> Tuple[datetime, Optional[datetim
 def fetch() -> List[RawOpportunity]:
     resp = requests.get(BIDDING_URL, timeout=30)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = parse_html(resp.text)
 
     opportunities: List[RawOpportunity] = []
 
@@ -3,20 +3,18 @@ import time
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from bs4 import BeautifulSoup
 
 # Selenium 4 imports
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
-# Auto-install the correct ChromeDriver for the actual Chrome version on this box
-from webdriver_manager.chrome import ChromeDriverManager
-
 # Use undetected_chromedriver's stealth hardening
 import undetected_chromedriver as uc
 
 from app.ingest.base import RawOpportunity
+from app.ingest.browser_pool import chromedriver_path, selenium_pool
+from app.ingest.parsing import parse_html
 
 AGENCY_NAME = "Village of Minerva Park"
 BASE_URL = "https://www.minervapark.gov"
@@ -42,8 +40,8 @@ def _build_driver() -> webdriver.Chrome:
         "Chrome/141.0.0.0 Safari/537.36"
     )
 
-    # >>> THIS is the key new part: use a Service with the right driver binary
-    service = Service(ChromeDriverManager().install())
+    # Use a Service with the right driver binary (webdriver_manager, resolved once per process)
+    service = Service(chromedriver_path())
 
     driver = webdriver.Chrome(service=service, options=chrome_options)
 
@@ -131,17 +129,18 @@ def _parse_closing_date(txt: str) -> Optional[datetime]:
 
 def _get_page_html_via_browser(url: str) -> str:
     """
-    Launch stealth Chrome that matches local Chrome version,
+    Borrow a warm stealth Chrome from the browser pool,
     visit page, wait ~3 seconds for bot check and table render,
-    grab DOM, shut down.
+    grab DOM, hand the driver back.
     """
-    driver = _build_driver()
+    pool = selenium_pool("minerva_park", _build_driver)
+    driver = pool.acquire()
     try:
         driver.get(url)
         time.sleep(3)
         return driver.page_source
     finally:
-        driver.quit()
+        pool.release(driver)
 
 
 def fetch() -> List[RawOpportunity]:
@@ -150,7 +149,7 @@ def fetch() -> List[RawOpportunity]:
     and build RawOpportunity rows for insertion.
     """
     html = _get_page_html_via_browser(RFP_URL)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
 
     # The RFPs are in a table like:
     # <table class="views-table views-view-table ...">
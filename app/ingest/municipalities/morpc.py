@@ -1,14 +1,16 @@
 import re
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
+from app.core.settings import settings
+from app.ingest import http as ingest_http
 from app.ingest.base import RawOpportunity
 from app.ingest.municipalities.columbus_metropolitan_library import (
     _clean_ws,
     _extract_meta_from_pdf_bytes,
 )
+from app.ingest.parsing import parse_html
 
 AGENCY_NAME = "Mid-Ohio Regional Planning Commission (MORPC)"
 BASE_URL = "https://www.morpc.org"
@@ -82,10 +84,10 @@ def _safe_abs_url(href: str) -> str:
 
 def _safe_get_pdf(url: str) -> Optional[bytes]:
     try:
-        r = requests.get(url, timeout=30)
-        if r.status_code == 200 and r.content:
+        r = ingest_http.get_cached_sync(url, ttl_h=settings.INGEST_CACHE_PDF_TTL_H)
+        if r.status == 200 and r.content:
             return r.content
-    except requests.RequestException:
+    except (ingest_http.FetchError, requests.RequestException):
         return None
     return None
 
@@ -178,9 +180,9 @@ def fetch() -> List[RawOpportunity]:
       - capture due date hint near link and parse
       - scrape PDF for backup details
     """
-    page = requests.get(BIDDING_URL, timeout=30)
-    page.raise_for_status()
-    soup = BeautifulSoup(page.text, "html.parser")
+    # Raises ingest_http.NotModified when the page is unchanged since the last saved run.
+    page_html = ingest_http.get_listing_sync(BIDDING_URL, agency_name=AGENCY_NAME, source="morpc")
+    soup = parse_html(page_html)
 
     pdf_entries: List[Tuple[str, str, Optional[str]]] = []
     for a in soup.select("a[href]"):
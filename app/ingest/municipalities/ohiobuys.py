@@ -14,7 +14,7 @@ import random
 
 import time
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
 
 from datetime import datetime, timezone
 
@@ -56,15 +56,37 @@ except Exception:
 
  
 
-try:
+from app.ingest.browser_pool import run_playwright
 
-    from playwright.sync_api import sync_playwright  # type: ignore
+from app.ingest.crawl_cursor import (
+    due_full_crawl,
+    keep_alive,
+    last_full_crawl,
+    load_cursor,
+    save_cursor,
+    stored_hashes,
+)
 
-    HAVE_PLAYWRIGHT_SYNC = True
+from app.ingest.session_vault import (
+    apply_to_jar,
+    forget_session,
+    from_browser as vault_from_browser,
+    from_jar as vault_from_jar,
+    load_session,
+    save_session,
+    to_playwright,
+)
 
-except Exception:
+from app.ingest.utils import hash_parts
+from app.ingest.parsing import parse_html, table_rows
+
+try:
+
+    from app.ingest.glyph_index import GlyphIndex  # NumPy-backed captcha matcher
 
-    HAVE_PLAYWRIGHT_SYNC = False
+except ImportError:
+
+    GlyphIndex = None  # numpy missing: fall back to the pure-Python scan
 
  
 
@@ -93,6 +115,16 @@ USE_PLAYWRIGHT_PAGINATION = (
     os.getenv("OHIOBUYS_USE_PLAYWRIGHT_PAGINATION", "1").strip().lower()
     not in {"0", "false", "no"}
 )
+# Incremental crawl: sort newest-first and stop at the first page whose rows
+# are all stored unchanged. A full crawl still runs every FULL_CRAWL_EVERY_H.
+INCREMENTAL_CRAWL = (
+    os.getenv("OHIOBUYS_INCREMENTAL", "1").strip().lower()
+    not in {"0", "false", "no"}
+)
+FULL_CRAWL_EVERY_H = float(os.getenv("OHIOBUYS_FULL_CRAWL_H", "12"))
+SOURCE_NAME = "OhioBuys"  # rows' `source`, also the crawl cursor key
+SORT_BY_POSTED_BUTTON = "body_x_grid_grd__ctl1_btnSort_colRfpBeginDate"
+VAULT_NAME = "ohiobuys"  # session_vault key for the post-captcha cookies
 
 
 def _human_delay(min_s: float = 0.4, max_s: float = 1.2) -> None:
@@ -1697,21 +1729,31 @@ def _get_known_character_signatures() -> List[Dict[str, Any]]:
 
  
 
-def _fuzzy_match_character(bmp: List[str]) -> Tuple[str, float, Dict[str, Any]]:
+@lru_cache(maxsize=1)
+def _get_glyph_index() -> Optional["GlyphIndex"]:
 
     """
 
-    Match a character bitmap using 2-D comparisons plus feature projections.
+    Templates packed into arrays once per process (None without numpy).
 
-    Returns ("?", score, details) if no good match is found.
+    """
+
+    if GlyphIndex is None:
+        return None
+    return GlyphIndex(_get_known_character_signatures())
+
+
+def _scan_known_signatures(
+    matrix: List[List[int]],
+) -> Tuple[str, float, Dict[str, Any]]:
 
     """
 
-    matrix = _bitmap_to_matrix(bmp)
-    features = _bitmap_features(matrix)
-    threshold = _per_char_distance_threshold(matrix)
-    known_sigs = _get_known_character_signatures()
+    Pure-Python reference scan over every template (used when numpy is missing).
+
+    """
 
+    features = _bitmap_features(matrix)
     best_char = "?"
     best_score = float("inf")
     best_components: Dict[str, Any] = {
@@ -1719,10 +1761,9 @@ def _fuzzy_match_character(bmp: List[str]) -> Tuple[str, float, Dict[str, Any]]:
         "pixel_count_penalty": float("inf"),
         "row_penalty": float("inf"),
         "col_penalty": float("inf"),
-        "threshold": threshold,
     }
 
-    for entry in known_sigs:
+    for entry in _get_known_character_signatures():
         target_features = entry["features"]
         pixel_distance = _matrix_pixel_distance(matrix, entry["matrix"])
         pixel_count_penalty = abs(
@@ -1750,13 +1791,34 @@ def _fuzzy_match_character(bmp: List[str]) -> Tuple[str, float, Dict[str, Any]]:
                 "pixel_count_penalty": pixel_count_penalty,
                 "row_penalty": row_penalty,
                 "col_penalty": col_penalty,
-                "threshold": threshold,
             }
 
+    return best_char, best_score, best_components
+
+
+def _fuzzy_match_character(bmp: List[str]) -> Tuple[str, float, Dict[str, Any]]:
+
+    """
+
+    Match a character bitmap using 2-D comparisons plus feature projections.
+
+    Returns ("?", score, details) if no good match is found.
+
+    """
+
+    matrix = _bitmap_to_matrix(bmp)
+    threshold = _per_char_distance_threshold(matrix)
+
+    index = _get_glyph_index()
+    if index is not None:
+        best_char, best_score, best_components = index.best(matrix)
+    else:
+        best_char, best_score, best_components = _scan_known_signatures(matrix)
+    best_components["threshold"] = threshold
+
     if best_score > threshold:
         return "?", best_score, best_components
 
-    best_components["threshold"] = threshold
     return best_char, best_score, best_components
 
  
@@ -1994,7 +2056,7 @@ def _decode_captcha_ascii_blocks(table_html_escaped: str) -> Dict[str, Any]:
 
  
 
-    soup_tbl = BeautifulSoup(html_real, "html.parser")
+    soup_tbl = parse_html(html_real)
 
     rows = soup_tbl.find_all("tr")
 
@@ -2152,197 +2214,98 @@ def _massage_payload_for_submit(payload: Dict[str, str], captcha_text: str) -> D
 
  
 
-async def _playwright_get_browse_html() -> Optional[str]:
-
-    """
+def _browser_context_kwargs() -> Dict[str, Any]:
+    headers = _default_headers()
+    return {
+        "user_agent": headers.get("User-Agent"),
+        "extra_http_headers": {k: v for k, v in headers.items() if k.lower() != "user-agent"},
+    }
 
-    Use a real browser (Playwright) to navigate through access_check.
 
+async def _playwright_get_browse_html() -> Optional[str]:
     """
-
-    if not HAVE_PLAYWRIGHT_SYNC and not HAVE_PLAYWRIGHT:
-
+    Use a real browser (pooled Playwright Chromium, fresh context) to navigate through access_check.
+    """
+    if not HAVE_PLAYWRIGHT:
         logger.info("Playwright not available in this environment.")
-
         return None
 
- 
-
-    if HAVE_PLAYWRIGHT_SYNC:
-
-        def _run_sync() -> Optional[str]:
-
-            try:
-
-                with sync_playwright() as p:
-
-                    browser = p.chromium.launch(headless=True)
-
-                    context = browser.new_context(
-
-                        user_agent=_default_headers().get("User-Agent"),
-
-                        extra_http_headers={
-
-                            k: v for k, v in _default_headers().items() if k.lower() != "user-agent"
-
-                        },
-
-                    )
-
-                    page = context.new_page()
-
-                    page.goto(ACCESS_CHECK_URL, wait_until="domcontentloaded")
-
- 
-
-                    max_attempts = int(os.getenv("OHIOBUYS_MAX_CAPTCHA_ATTEMPTS", "5") or "5")
-
-                    for attempt in range(max_attempts):
-
-                        access_html = page.content()
-
-                        captcha_html_escaped = _extract_captcha_table_html(access_html)
+    max_attempts = int(os.getenv("OHIOBUYS_MAX_CAPTCHA_ATTEMPTS", "5") or "5")
 
-                        guess_info = _empty_guess_info()
+    async def _browse(page) -> str:
+        if await _resume_vault_in_browser(page):
+            return await page.content()
+        await page.goto(ACCESS_CHECK_URL, wait_until="domcontentloaded")
 
-                        if captcha_html_escaped:
-
-                            decoded_info = _decode_captcha_ascii_blocks(captcha_html_escaped)
-
-                            char_bitmaps = decoded_info["char_bitmaps"]
-
-                            guess_info = _guess_captcha_text_from_bitmaps(char_bitmaps, attempt)
-
- 
-
-                        if _is_confident_captcha_guess(guess_info):
-
-                            captcha_guess = guess_info["text"]
-
-                            logger.info(
-
-                                "[Playwright] Captcha accepted '%s' (score=%.2f/%.2f)",
-
-                                captcha_guess,
-
-                                guess_info["total_distance"],
-
-                                guess_info["max_total_distance"],
-
-                            )
-
-                            try:
-
-                                page.fill("#body_x_prxCaptcha_x_txtCaptcha", captcha_guess)
-
-                            except Exception:
-
-                                try:
-
-                                    page.evaluate(
-
-                                        "(val) => { const el = document.getElementById('body_x_prxCaptcha_x_txtCaptcha'); if (el) el.value = val; }",
-
-                                        captcha_guess,
-
-                                    )
-
-                                except Exception as e:
-
-                                    logger.warning(f"Failed to fill captcha: {e}")
-
- 
-
-                            for sel in [
-
-                                "#proxyActionBar_x__cmdSave",
-
-                                "[id*='_cmdSave']",
-
-                                "text=Continue",
-
-                                "text=Submit",
-
-                            ]:
-
-                                try:
-
-                                    page.click(sel, timeout=2000)
-
-                                    break
-
-                                except Exception:
-
-                                    continue
-
-                            try:
-
-                                page.wait_for_timeout(1500)
-
-                            except Exception:
-
-                                pass
-
-                            break
-
-                        else:
-
-                            reason = _guess_rejection_reason(guess_info)
-
-                            logger.info(
-
-                                f"[Playwright] Captcha rejected ({reason}); refreshing."
-
-                            )
-
-                            try:
-
-                                page.reload(wait_until="domcontentloaded")
-
-                                page.wait_for_timeout(500)
-
-                            except Exception as e:
-
-                                logger.warning(f"Failed to reload: {e}")
-
- 
-
-                    page.goto(BROWSE_URL, wait_until="domcontentloaded")
+        for attempt in range(max_attempts):
+            access_html = await page.content()
+            captcha_html_escaped = _extract_captcha_table_html(access_html)
+            guess_info = _empty_guess_info()
+            if captcha_html_escaped:
+                decoded_info = _decode_captcha_ascii_blocks(captcha_html_escaped)
+                char_bitmaps = decoded_info["char_bitmaps"]
+                guess_info = _guess_captcha_text_from_bitmaps(char_bitmaps, attempt)
 
+            if _is_confident_captcha_guess(guess_info):
+                captcha_guess = guess_info["text"]
+                logger.info(
+                    "[Playwright] Captcha accepted '%s' (score=%.2f/%.2f)",
+                    captcha_guess,
+                    guess_info["total_distance"],
+                    guess_info["max_total_distance"],
+                )
+                try:
+                    await page.fill("#body_x_prxCaptcha_x_txtCaptcha", captcha_guess)
+                except Exception:
                     try:
-
-                        page.wait_for_selector("[id*='body_x_grid_grd']", timeout=5000)
-
+                        await page.evaluate(
+                            "(val) => { const el = document.getElementById('body_x_prxCaptcha_x_txtCaptcha'); if (el) el.value = val; }",
+                            captcha_guess,
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to fill captcha: {e}")
+
+                for sel in [
+                    "#proxyActionBar_x__cmdSave",
+                    "[id*='_cmdSave']",
+                    "text=Continue",
+                    "text=Submit",
+                ]:
+                    try:
+                        await page.click(sel, timeout=2000)
+                        break
                     except Exception:
+                        continue
+                try:
+                    await page.wait_for_timeout(1500)
+                except Exception:
+                    pass
+                break
+            else:
+                reason = _guess_rejection_reason(guess_info)
+                logger.info(f"[Playwright] Captcha rejected ({reason}); refreshing.")
+                try:
+                    await page.reload(wait_until="domcontentloaded")
+                    await page.wait_for_timeout(500)
+                except Exception as e:
+                    logger.warning(f"Failed to reload: {e}")
 
-                        pass
-
-                    html = page.content()
-
-                    context.close()
-
-                    browser.close()
-
-                    return html
-
-            except Exception as e:
-
-                logger.warning(f"Playwright fallback failed: {e}")
-
-                return None
-
- 
-
-        return await asyncio.to_thread(_run_sync)
-
- 
-
-    return None
+        await page.goto(BROWSE_URL, wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector("[id*='body_x_grid_grd']", timeout=5000)
+        except Exception:
+            pass
+        html = await page.content()
+        if "access_check" not in page.url.lower() and "body_x_grid_grd" in html:
+            await _store_vault_from_browser(page)
+        return html
 
- 
+    try:
+        return await run_playwright(_browse, **_browser_context_kwargs())
+    except Exception as e:
+        logger.warning(f"Playwright fallback failed: {e}")
+        return None
 
- 
 
 # ------------------------
 
@@ -2357,7 +2320,7 @@ def _parse_rows_from_html(html: str) -> List[Dict[str, Any]]:
 
     """
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     table = soup.find("table", id="body_x_grid_grd")
     if table:
         rows = _parse_rows_from_table(table)
@@ -2385,13 +2348,10 @@ def _parse_rows_from_table(table_soup: Any) -> List[Dict[str, Any]]:
 
     results: List[Dict[str, Any]] = []
 
-    def _cell_text(cells: List[Any], idx: int) -> str:
-        if idx < len(cells):
-            return cells[idx].get_text(" ", strip=True)
-        return ""
+    def _cell_text(cells: List[str], idx: int) -> str:
+        return cells[idx] if idx < len(cells) else ""
 
-    for tr in table_soup.select("tbody tr[data-id]"):
-        cells = tr.find_all("td")
+    for tr, cells in table_rows(table_soup, "tbody tr[data-id]"):
         if len(cells) < 3:
             continue
 
@@ -2529,7 +2489,7 @@ def _parse_rows_from_inline_controls(html: str) -> List[Dict[str, Any]]:
 
 def _html_has_additional_pages(html: str) -> bool:
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     next_btn = soup.select_one("#body_x_grid_PagerBtnNextPage")
     if next_btn:
         classes = " ".join(next_btn.get("class", [])).lower()
@@ -2609,6 +2569,141 @@ def _client_id_to_unique_id(client_id: str) -> str:
     return client_id.replace("_", ":")
 
 
+def _row_hash(row: Dict[str, Any]) -> str:
+    # Same inputs as the runner's default hash_body for dict rows.
+    desc = row.get("full_text") or row.get("summary") or ""
+    return hash_parts(row.get("title") or "", desc, str(row.get("due_date")))
+
+
+def _page_already_stored(
+    rows: List[Dict[str, Any]], known: Optional[Dict[str, str]]
+) -> bool:
+
+    """
+
+    True when every row on the page is stored with an unchanged hash.
+
+    """
+
+    if not known or not rows:
+        return False
+    return all(
+        row.get("external_id") in known
+        and known[row["external_id"]] == _row_hash(row)
+        for row in rows
+    )
+
+
+def _rows_newest_first(rows: List[Dict[str, Any]]) -> bool:
+
+    posted = [row["posted_date"] for row in rows if row.get("posted_date")]
+    if len(posted) < 2:
+        return False
+    return all(a >= b for a, b in zip(posted, posted[1:])) and posted[0] > posted[-1]
+
+
+def _sort_grid_newest_first(
+    session: requests.Session, html: str
+) -> Tuple[str, bool]:
+
+    """
+
+    Click the Begin Date header until the grid is newest-first (the first
+    click sorts ascending). Returns (html, sorted_ok).
+
+    """
+
+    current = html
+    for _ in range(2):
+        if _rows_newest_first(_parse_rows_from_html(current)):
+            return current, True
+        soup = parse_html(current)
+        payload = _collect_form_fields(soup)
+        if not payload:
+            break
+        payload["__EVENTTARGET"] = _client_id_to_unique_id(SORT_BY_POSTED_BUTTON)
+        payload["__EVENTARGUMENT"] = ""
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Origin": BASE,
+            "Referer": BROWSE_URL,
+        }
+        try:
+            _human_delay()
+            resp = session.post(
+                BROWSE_URL, data=payload, headers=headers, allow_redirects=True
+            )
+        except Exception as exc:
+            logger.warning(f"Sort POST failed: {exc}")
+            break
+        if resp.status_code != 200 or "body_x_grid_grd" not in resp.text:
+            logger.warning("Sort POST failed: status=%s", resp.status_code)
+            break
+        current = resp.text
+    if _rows_newest_first(_parse_rows_from_html(current)):
+        return current, True
+    return html, False
+
+
+async def _load_crawl_state() -> Tuple[Dict[str, Any], Optional[Dict[str, str]]]:
+
+    """
+
+    (cursor, known rows) for this run; known is None when a full crawl is due.
+
+    """
+
+    if not INCREMENTAL_CRAWL:
+        return {}, None
+    started = {"run_started_at": datetime.utcnow().isoformat()}
+    try:
+        cursor = {**await load_cursor(SOURCE_NAME), **started}
+        if due_full_crawl(cursor, FULL_CRAWL_EVERY_H):
+            logger.info("OhioBuys: full crawl due; walking every page.")
+            return cursor, None
+        known = await stored_hashes(SOURCE_NAME)
+    except Exception as exc:
+        logger.warning(f"OhioBuys: crawl cursor unavailable, full crawl: {exc}")
+        return started, None
+    logger.info(f"OhioBuys: incremental crawl against {len(known)} stored rows.")
+    return cursor, known
+
+
+async def _finish_crawl(
+    cursor: Dict[str, Any], progress: Dict[str, Any], rows: List[Dict[str, Any]]
+) -> None:
+
+    """
+
+    Persist the cursor; after an early stop keep the unvisited rows open.
+
+    """
+
+    if not INCREMENTAL_CRAWL or not rows:
+        return
+    now = datetime.utcnow()
+    cursor = dict(cursor)
+    cursor["pages"] = progress.get("pages", 0)
+    cursor["stopped_early"] = bool(progress.get("stopped_early"))
+    cursor["last_run_at"] = now.isoformat()
+    dated = [row for row in rows if row.get("posted_date")]
+    if dated:
+        newest = max(dated, key=lambda row: row["posted_date"])
+        cursor["newest_external_id"] = newest.get("external_id")
+        cursor["newest_posted"] = newest["posted_date"].isoformat()
+    started = cursor.pop("run_started_at", None) or now.isoformat()
+    if not cursor["stopped_early"]:
+        # the start, not now: keep_alive() treats rows saved since then as seen by this crawl
+        cursor["last_full_at"] = started
+    try:
+        last_full = last_full_crawl(cursor)
+        if cursor["stopped_early"] and last_full is not None:
+            await keep_alive(SOURCE_NAME, last_full)
+        await save_cursor(SOURCE_NAME, cursor)
+    except Exception as exc:
+        logger.warning(f"OhioBuys: could not save crawl cursor: {exc}")
+
+
 def _post_grid_page(
     session: requests.Session,
     soup: BeautifulSoup,
@@ -2647,16 +2742,28 @@ def _post_grid_page(
     return None
 
 
-def _collect_additional_pages(
-    session: requests.Session, first_html: str, status_label: str
-) -> List[List[Dict[str, Any]]]:
+def _iter_additional_pages(
+    session: requests.Session,
+    first_html: str,
+    status_label: str,
+    known: Optional[Dict[str, str]] = None,
+    progress: Optional[Dict[str, Any]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
 
-    pages: List[List[Dict[str, Any]]] = []
+    """
+
+    Walk the remaining grid pages via form posts, yielding each page's rows
+    as soon as it is parsed. With `known` (grid sorted newest-first), stop
+    after the first page whose rows are all stored.
+
+    """
+
+    progress = progress if progress is not None else {}
     current_html = first_html
     visited: set[int] = {0}
 
     while True:
-        soup = BeautifulSoup(current_html, "html.parser")
+        soup = parse_html(current_html)
         page_candidates: List[Tuple[int, str]] = []
         for btn in soup.select("button[id^='body_x_grid_PagerBtn'][data-page-index]"):
             data_idx = btn.get("data-page-index")
@@ -2692,42 +2799,68 @@ def _collect_additional_pages(
             )
             break
 
-        pages.append(filtered_rows)
+        progress["pages"] = progress.get("pages", 1) + 1
         current_html = next_html
         visited.add(next_idx)
+        yield filtered_rows
+
+        if _page_already_stored(filtered_rows, known):
+            logger.info(
+                "Grid page %s has only stored rows; stopping pagination early.",
+                next_idx,
+            )
+            progress["stopped_early"] = True
+            break
 
         if not _html_has_additional_pages(next_html):
             break
 
-    return pages
 
+def _collect_additional_pages(
+    session: requests.Session,
+    first_html: str,
+    status_label: str,
+    known: Optional[Dict[str, str]] = None,
+    progress: Optional[Dict[str, Any]] = None,
+) -> List[List[Dict[str, Any]]]:
 
-async def _playwright_scrape_filtered_rows(status_label: str) -> List[Dict[str, Any]]:
+    return list(
+        _iter_additional_pages(session, first_html, status_label, known=known, progress=progress)
+    )
+
+
+async def _playwright_scrape_filtered_rows(
+    status_label: str,
+    known: Optional[Dict[str, str]] = None,
+    progress: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
 
     if not HAVE_PLAYWRIGHT:
         logger.warning("Playwright pagination requested but playwright packages unavailable.")
         return []
 
-    try:
-        from playwright.async_api import async_playwright  # type: ignore
-    except Exception:
-        logger.warning("Failed to import async Playwright; skipping pagination.")
-        return []
-
     rows: List[Dict[str, Any]] = []
     seen_ids: set[str] = set()
     max_attempts = int(os.getenv("OHIOBUYS_MAX_CAPTCHA_ATTEMPTS", "10") or "10")
+    progress = progress if progress is not None else {}
 
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=_default_headers().get("User-Agent"),
-                extra_http_headers={
-                    k: v for k, v in _default_headers().items() if k.lower() != "user-agent"
-                },
-            )
-            page = await context.new_page()
+    async def _sort_newest_first(page) -> bool:
+        for _ in range(2):
+            await page.wait_for_selector("#body_x_grid_grd")
+            if _rows_newest_first(_parse_rows_from_html(await page.content())):
+                return True
+            try:
+                await page.click(f"#{SORT_BY_POSTED_BUTTON}")
+                await page.wait_for_timeout(2000)
+            except Exception as exc:
+                logger.warning(f"Playwright pagination: sort click failed: {exc}")
+                return False
+        await page.wait_for_selector("#body_x_grid_grd")
+        return _rows_newest_first(_parse_rows_from_html(await page.content()))
+
+    async def _paginate(page) -> bool:
+        nonlocal known
+        if not await _resume_vault_in_browser(page):
             await page.goto(ACCESS_CHECK_URL, wait_until="domcontentloaded")
 
             solved = False
@@ -2741,7 +2874,6 @@ async def _playwright_scrape_filtered_rows(status_label: str) -> List[Dict[str,
                 decoded_info = _decode_captcha_ascii_blocks(captcha_html_escaped)
                 char_bitmaps = decoded_info["char_bitmaps"]
                 guess_info = _guess_captcha_text_from_bitmaps(char_bitmaps, attempt)
-
                 if not _is_confident_captcha_guess(guess_info):
                     logger.info(
                         "[Playwright pagination] captcha attempt %s rejected (%s)",
@@ -2769,43 +2901,58 @@ async def _playwright_scrape_filtered_rows(status_label: str) -> List[Dict[str,
 
             if not solved:
                 logger.error("Playwright pagination: failed to solve captcha.")
-                await context.close()
-                await browser.close()
-                return []
+                return False
 
             await page.goto(BROWSE_URL, wait_until="domcontentloaded")
+            await _store_vault_from_browser(page)
+
+        if known is not None and not await _sort_newest_first(page):
+            logger.info("Playwright pagination: could not sort newest-first; full crawl.")
+            known = None
+
+        for page_index in range(20):
+            await page.wait_for_selector("#body_x_grid_grd")
+            html = await page.content()
+            page_rows = _parse_rows_from_html(html)
+            progress["pages"] = page_index + 1
+            for row in page_rows:
+                ext_id = row.get("external_id")
+                if ext_id and ext_id not in seen_ids:
+                    seen_ids.add(ext_id)
+                    rows.append(row)
+
+            if _page_already_stored(
+                _filter_rows_by_status(page_rows, status_label), known
+            ):
+                logger.info(
+                    "Playwright pagination: page %s has only stored rows; stopping early.",
+                    page_index + 1,
+                )
+                progress["stopped_early"] = True
+                break
+
+            next_btn = page.locator("#body_x_grid_PagerBtnNextPage")
+            try:
+                classes = (await next_btn.get_attribute("class")) or ""
+            except Exception:
+                break
 
-            for page_index in range(20):
-                await page.wait_for_selector("#body_x_grid_grd")
-                html = await page.content()
-                page_rows = _parse_rows_from_html(html)
-                for row in page_rows:
-                    ext_id = row.get("external_id")
-                    if ext_id and ext_id not in seen_ids:
-                        seen_ids.add(ext_id)
-                        rows.append(row)
-
-                next_btn = page.locator("#body_x_grid_PagerBtnNextPage")
-                try:
-                    classes = (await next_btn.get_attribute("class")) or ""
-                except Exception:
-                    break
-
-                if "disabled" in classes.lower():
-                    break
+            if "disabled" in classes.lower():
+                break
 
-                try:
-                    await next_btn.click()
-                    await page.wait_for_timeout(2000)
-                except Exception as exc:
-                    logger.warning(
-                        f"Playwright pagination: failed to click next page: {exc}"
-                    )
-                    break
-
-            await context.close()
-            await browser.close()
+            try:
+                await next_btn.click()
+                await page.wait_for_timeout(2000)
+            except Exception as exc:
+                logger.warning(
+                    f"Playwright pagination: failed to click next page: {exc}"
+                )
+                break
+        return True
 
+    try:
+        if not await run_playwright(_paginate, **_browser_context_kwargs()):
+            return []
     except NotImplementedError as exc:
         logger.warning(
             "Playwright pagination is not supported in this environment: %s", exc
@@ -2818,58 +2965,112 @@ async def _playwright_scrape_filtered_rows(status_label: str) -> List[Dict[str,
     return _filter_rows_by_status(rows, status_label)
 
 
-# ------------------------
+def _resume_vault_session(session: requests.Session, cookie_str: str = "") -> str:
 
-# main entrypoint
+    """
 
-# ------------------------
+    Browse page HTML when the vaulted session still gets past access_check,
+    else "" (the stale session is dropped and the cookies reset).
 
+    """
 
-async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
+    vaulted = load_session(VAULT_NAME)
+    if vaulted is None:
+        return ""
+    apply_to_jar(session.cookies, vaulted.cookies)
+    if vaulted.state.get("user_agent"):
+        session.headers["User-Agent"] = vaulted.state["user_agent"]
+    try:
+        _human_delay()
+        resp = session.get(BROWSE_URL, allow_redirects=True)
+        if (
+            resp.status_code == 200
+            and "access_check" not in resp.url.lower()
+            and "body_x_grid_grd" in resp.text
+        ):
+            logger.info("Reusing vaulted OhioBuys session; access check skipped.")
+            return resp.text
+        logger.info(f"Vaulted OhioBuys session rejected (status={resp.status_code}, url={resp.url}).")
+    except Exception as exc:
+        logger.warning(f"Vaulted OhioBuys session check failed: {exc}")
+    forget_session(VAULT_NAME)
+    session.cookies.clear()
+    session.headers.update(_default_headers())
+    if cookie_str:
+        _apply_cookie_string(session, cookie_str)
+    return ""
 
-    """
 
-    Main scraping function with improved captcha handling.
+def _store_vault_session(session: requests.Session, browse_html: str) -> None:
+
+    soup = parse_html(browse_html)
+    viewstate = soup.find("input", {"name": "__VIEWSTATE"})
+    save_session(
+        VAULT_NAME,
+        vault_from_jar(session.cookies),
+        state={
+            "user_agent": session.headers.get("User-Agent"),
+            "viewstate": viewstate.get("value") if viewstate else None,
+        },
+    )
 
-    Set force_playwright to skip HTTP mode and rely on the browser fallback.
+
+async def _resume_vault_in_browser(page) -> bool:
 
     """
 
-    logger.info("Starting OhioBuys scrape (improved captcha solver)...")
-    logger.info(
-        "Ensure OhioBuys scraping complies with posted terms; request official access when available."
-    )
+    Load vaulted cookies into the Playwright context; True when the browse
+    grid opens without the access check.
 
-    env_force = os.getenv("OHIOBUYS_FORCE_PLAYWRIGHT", "").strip().lower()
-    use_force_playwright = force_playwright or env_force in ("1", "true", "yes", "force")
+    """
 
-    if use_force_playwright:
-        logger.info("Force Playwright mode enabled for OhioBuys.")
-        rows = await _playwright_scrape_filtered_rows(STATUS_FILTER_LABEL)
-        if rows:
-            logger.info(f"OhioBuys (Playwright force): scraped {len(rows)} opportunities.")
-            return rows
-        html = await _playwright_get_browse_html()
-        if html:
-            rows = _parse_rows_from_html(html)
-            rows = _filter_rows_by_status(rows, STATUS_FILTER_LABEL)
-            logger.info(f"OhioBuys (Playwright fallback): scraped {len(rows)} opportunities.")
-            return rows
-        logger.warning("Playwright force mode failed; continuing with HTTP session.")
+    vaulted = load_session(VAULT_NAME)
+    if vaulted is None:
+        return False
+    try:
+        await page.context.add_cookies(to_playwright(vaulted.cookies))
+        await page.goto(BROWSE_URL, wait_until="domcontentloaded")
+        if "access_check" not in page.url.lower():
+            await page.wait_for_selector("#body_x_grid_grd", timeout=5000)
+            logger.info("[Playwright] Reusing vaulted OhioBuys session; access check skipped.")
+            return True
+    except Exception as exc:
+        logger.info(f"[Playwright] Vaulted OhioBuys session rejected: {exc}")
+    forget_session(VAULT_NAME)
+    try:
+        await page.context.clear_cookies()
+    except Exception:
+        pass
+    return False
 
-    session = _create_http_session()
 
-    cookie_str = os.getenv("OHIOBUYS_COOKIES", "").strip()
+async def _store_vault_from_browser(page) -> None:
+
+    try:
+        cookies = await page.context.cookies()
+        user_agent = await page.evaluate("navigator.userAgent")
+    except Exception as exc:
+        logger.warning(f"[Playwright] Could not read session cookies: {exc}")
+        return
+    save_session(VAULT_NAME, vault_from_browser(cookies), state={"user_agent": user_agent})
 
-    if cookie_str:
-        _apply_cookie_string(session, cookie_str)
-        logger.info("Applied cookies from OHIOBUYS_COOKIES env var.")
+
+async def _pass_access_check(
+    session: requests.Session, cookie_str: str
+) -> Tuple[requests.Session, str, Optional[List[Dict[str, Any]]]]:
+
+    """
+
+    Solve access_check over HTTP. Returns (session, filtered browse HTML, None);
+    when only the Playwright fallback got through, its rows come back instead.
+
+    """
 
     _human_delay()
     r_get = session.get(ACCESS_CHECK_URL)
     if r_get.status_code != 200:
         logger.error(f"access_check GET failed: {r_get.status_code}")
-        return []
+        return session, "", []
 
     if _is_cloudflare_block(r_get.status_code, r_get.text, dict(r_get.headers)):
         logger.warning("Detected Cloudflare challenge. Trying cloudscraper...")
@@ -2887,11 +3088,11 @@ async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
                 rows = _parse_rows_from_html(html)
                 rows = _filter_rows_by_status(rows, STATUS_FILTER_LABEL)
                 logger.info(f"OhioBuys (Playwright): scraped {len(rows)} opportunities.")
-                return rows
-            return []
+                return session, "", rows
+            return session, "", []
 
     access_html = r_get.text
-    soup = BeautifulSoup(access_html, "html.parser")
+    soup = parse_html(access_html)
     logger.info(f"[ACCESS_CHECK] Got {len(access_html)} bytes, status={r_get.status_code}")
 
     max_attempts = int(os.getenv("OHIOBUYS_MAX_CAPTCHA_ATTEMPTS", "10") or "10")
@@ -2922,7 +3123,7 @@ async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
             r_get = session.get(ACCESS_CHECK_URL)
             if r_get.status_code == 200:
                 access_html = r_get.text
-                soup = BeautifulSoup(access_html, "html.parser")
+                soup = parse_html(access_html)
                 continue
             logger.error("Failed to refresh access_check page")
             break
@@ -2976,15 +3177,92 @@ async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
             r_get = session.get(ACCESS_CHECK_URL)
             if r_get.status_code == 200:
                 access_html = r_get.text
-                soup = BeautifulSoup(access_html, "html.parser")
+                soup = parse_html(access_html)
                 continue
             logger.error("Failed to reload access_check after failed submission.")
             break
 
-        browse_soup = BeautifulSoup(r_browse.text, "html.parser")
+        browse_soup = parse_html(r_browse.text)
         filtered_html = _apply_status_filter_to_html(session, browse_soup, STATUS_FILTER_LABEL)
         break
 
+    return session, filtered_html, None
+
+
+# ------------------------
+
+# main entrypoint
+
+# ------------------------
+
+
+async def stream(force_playwright: bool = False) -> AsyncIterator[Dict[str, Any]]:
+
+    """
+
+    Main scraping function with improved captcha handling.
+
+    Yields rows grid page by grid page, so the runner saves each page as it
+    arrives instead of waiting for the whole crawl.
+
+    Set force_playwright to skip HTTP mode and rely on the browser fallback.
+
+    """
+
+    logger.info("Starting OhioBuys scrape (improved captcha solver)...")
+    logger.info(
+        "Ensure OhioBuys scraping complies with posted terms; request official access when available."
+    )
+
+    env_force = os.getenv("OHIOBUYS_FORCE_PLAYWRIGHT", "").strip().lower()
+    use_force_playwright = force_playwright or env_force in ("1", "true", "yes", "force")
+
+    cursor, known = await _load_crawl_state()
+    progress: Dict[str, Any] = {"pages": 1, "stopped_early": False}
+
+    if use_force_playwright:
+        logger.info("Force Playwright mode enabled for OhioBuys.")
+        rows = await _playwright_scrape_filtered_rows(
+            STATUS_FILTER_LABEL, known=known, progress=progress
+        )
+        if rows:
+            logger.info(f"OhioBuys (Playwright force): scraped {len(rows)} opportunities.")
+            await _finish_crawl(cursor, progress, rows)
+            for row in rows:
+                yield row
+            return
+        html = await _playwright_get_browse_html()
+        if html:
+            rows = _parse_rows_from_html(html)
+            rows = _filter_rows_by_status(rows, STATUS_FILTER_LABEL)
+            logger.info(f"OhioBuys (Playwright fallback): scraped {len(rows)} opportunities.")
+            for row in rows:
+                yield row
+            return
+        logger.warning("Playwright force mode failed; continuing with HTTP session.")
+
+    session = _create_http_session()
+
+    cookie_str = os.getenv("OHIOBUYS_COOKIES", "").strip()
+
+    if cookie_str:
+        _apply_cookie_string(session, cookie_str)
+        logger.info("Applied cookies from OHIOBUYS_COOKIES env var.")
+
+    browse_html = _resume_vault_session(session, cookie_str)
+    if browse_html:
+        filtered_html = _apply_status_filter_to_html(
+            session, parse_html(browse_html), STATUS_FILTER_LABEL
+        )
+    else:
+        session, filtered_html, fallback_rows = await _pass_access_check(session, cookie_str)
+        if fallback_rows is not None:
+            for row in fallback_rows:
+                yield row
+            return
+        if filtered_html:
+            _store_vault_session(session, filtered_html)
+
     if not filtered_html:
         logger.error("Failed to solve captcha and reach browse page after all attempts. Trying Playwright...")
         html = await _playwright_get_browse_html()
@@ -2992,48 +3270,87 @@ async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
             rows = _parse_rows_from_html(html)
             rows = _filter_rows_by_status(rows, STATUS_FILTER_LABEL)
             logger.info(f"OhioBuys (Playwright): scraped {len(rows)} opportunities.")
-            return rows
-        return []
+            for row in rows:
+                yield row
+        return
 
-    first_page_rows = _parse_rows_from_html(filtered_html)
-    page_rows_list: List[List[Dict[str, Any]]] = [
-        _filter_rows_by_status(first_page_rows, STATUS_FILTER_LABEL)
-    ]
+    if known is not None:
+        filtered_html, sorted_ok = _sort_grid_newest_first(session, filtered_html)
+        if not sorted_ok:
+            logger.info("Could not sort the grid newest-first; falling back to a full crawl.")
+            known = None
+
+    emitted: List[Dict[str, Any]] = []
+    seen_ids: set[str] = set()
 
-    if _html_has_additional_pages(filtered_html):
+    def _fresh(page_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out = []
+        for row in page_rows:
+            ext_id = row.get("external_id")
+            if ext_id and ext_id in seen_ids:
+                continue
+            if ext_id:
+                seen_ids.add(ext_id)
+            row["status"] = _normalize_status_label(row.get("status", ""))
+            out.append(row)
+        emitted.extend(out)
+        return out
+
+    first_page = _filter_rows_by_status(
+        _parse_rows_from_html(filtered_html), STATUS_FILTER_LABEL
+    )
+    for row in _fresh(first_page):
+        yield row
+
+    if _page_already_stored(first_page, known):
+        logger.info("First grid page has only stored rows; skipping pagination.")
+        progress["stopped_early"] = True
+    elif _html_has_additional_pages(filtered_html):
         logger.info("Detected multiple pages; attempting pagination via HTTP form posts.")
-        extra_pages = _collect_additional_pages(
-            session, filtered_html, STATUS_FILTER_LABEL
+        pages = _iter_additional_pages(
+            session, filtered_html, STATUS_FILTER_LABEL, known=known, progress=progress
         )
-        if extra_pages:
-            page_rows_list.extend(extra_pages)
-        elif USE_PLAYWRIGHT_PAGINATION and HAVE_PLAYWRIGHT:
+        extra_pages = 0
+        while True:
+            # requests + the human delay block; keep them off the event loop
+            page_rows = await asyncio.to_thread(next, pages, None)
+            if page_rows is None:
+                break
+            extra_pages += 1
+            for row in _fresh(page_rows):
+                yield row
+
+        if not extra_pages and USE_PLAYWRIGHT_PAGINATION and HAVE_PLAYWRIGHT:
             logger.info("Form-based pagination unavailable; falling back to Playwright pagination.")
-            rows = await _playwright_scrape_filtered_rows(STATUS_FILTER_LABEL)
+            rows = await _playwright_scrape_filtered_rows(
+                STATUS_FILTER_LABEL, known=known, progress=progress
+            )
             if rows:
                 logger.info(f"OhioBuys (Playwright pagination): scraped {len(rows)} opportunities.")
-                return rows
+                await _finish_crawl(cursor, progress, rows)
+                for row in _fresh(rows):
+                    yield row
+                return
             logger.warning("Playwright pagination failed; returning first page only.")
-        elif USE_PLAYWRIGHT_PAGINATION and not HAVE_PLAYWRIGHT:
+        elif not extra_pages and USE_PLAYWRIGHT_PAGINATION:
             logger.info("Playwright pagination requested but playwright is unavailable; using first page only.")
 
-    deduped_rows: List[Dict[str, Any]] = []
-    seen_ids: set[str] = set()
-    for page_rows in page_rows_list:
-        for row in page_rows:
-            ext_id = row.get("external_id")
-            if ext_id and ext_id in seen_ids:
-                continue
-            if ext_id:
-                seen_ids.add(ext_id)
-            deduped_rows.append(row)
+    logger.info(
+        f"OhioBuys: successfully scraped {len(emitted)} opportunities "
+        f"({progress['pages']} pages{', stopped early' if progress['stopped_early'] else ''})"
+    )
+    await _finish_crawl(cursor, progress, emitted)
 
-    for row in deduped_rows:
-        row["status"] = _normalize_status_label(row.get("status", ""))
 
-    logger.info(f"OhioBuys: successfully scraped {len(deduped_rows)} opportunities")
+async def fetch(force_playwright: bool = False) -> List[Dict[str, Any]]:
+
+    """
+
+    All rows of one scrape as a list (see stream()).
+
+    """
 
-    return deduped_rows
+    return [row async for row in stream(force_playwright)]
 
  
 
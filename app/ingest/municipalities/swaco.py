@@ -4,10 +4,11 @@ import re
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+from app.ingest import http as ingest_http
 from app.ingest.base import RawOpportunity
+from app.ingest.parsing import parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +21,9 @@ BASE_URL = "https://www.swaco.org"
 # HTTP fetch
 # --------------------------
 
-async def _fetch_html(url: str) -> str:
-    async with aiohttp.ClientSession() as session:
-        return await _fetch(session, url)
-
-
-async def _fetch(session: aiohttp.ClientSession, url: str) -> str:
-    async with session.get(url) as resp:
-        resp.raise_for_status()
-        return await resp.text()
+async def _fetch(url: str) -> str:
+    # detail pages only (listing goes through get_listing); served from the disk cache when fresh
+    return await ingest_http.get_cached_text(url)
 
 
 # --------------------------
@@ -137,17 +132,14 @@ def _extract_bid_number(soup: BeautifulSoup, url: str = "") -> Optional[str]:
 # Detail page
 # --------------------------
 
-async def _fetch_detail_description_and_dates_and_attachments(
-    session: aiohttp.ClientSession,
-    url: str
-) -> Tuple[str, Optional[datetime], Optional[datetime], Optional[datetime], List[str], Optional[str]]:
+async def _fetch_detail_description_and_dates_and_attachments(url: str) -> Tuple[str, Optional[datetime], Optional[datetime], Optional[datetime], List[str], Optional[str]]:
     try:
-        html = await _fetch(session, url)
+        html = await _fetch(url)
     except Exception as e:
         logger.warning(f"SWACO detail fetch failed {url}: {e}")
         return ("", None, None, None, [], None)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     text_all = soup.get_text(" ", strip=True)
 
     posted_dt, due_dt, prebid_dt = None, None, None
@@ -258,8 +250,9 @@ def _extract_rows_from_cards(soup: BeautifulSoup) -> List[tuple]:
 # --------------------------
 
 async def _scrape_listing_page() -> List[RawOpportunity]:
-    html = await _fetch_html(LIST_URL)
-    soup = BeautifulSoup(html, "html.parser")
+    # Raises ingest_http.NotModified when the listing is unchanged since the last saved run.
+    html = await ingest_http.get_listing(LIST_URL, agency_name=AGENCY_NAME)
+    soup = parse_html(html)
     page_text = soup.get_text(" ", strip=True).lower()
 
     rows = _extract_rows_from_table(soup)
@@ -276,44 +269,43 @@ async def _scrape_listing_page() -> List[RawOpportunity]:
     seen, out = set(), []
     unique_rows = [(t, u, r) for (t, u, r) in rows if not (u in seen or seen.add(u))]
 
-    async with aiohttp.ClientSession() as session:
-        for (title, detail_url, row_text) in unique_rows:
-            due_dt_row = _parse_date_mmddyyyy(row_text)
-
-            (
-                desc,
-                posted_dt,
-                due_dt_detail,
-                prebid_dt,
-                attachment_urls,
-                bid_no,
-            ) = await _fetch_detail_description_and_dates_and_attachments(session, detail_url)
-
-            best_summary = desc or row_text
-            best_due = due_dt_detail or due_dt_row
-
-            display_title = f"{bid_no} {title}".strip() if bid_no else title
-
-            out.append(
-                RawOpportunity(
-                    agency_name=AGENCY_NAME,
-                    title=display_title,
-                    summary=best_summary,
-                    description=desc,
-                    due_date=best_due,
-                    posted_date=posted_dt,
-                    prebid_date=prebid_dt,
-                    source=detail_url,
-                    source_url=detail_url,
-                    # you can swap this to your new taxonomy
-                    category="Solid Waste / Recycling / Environmental",
-                    location_geo=None,
-                    attachments=attachment_urls,
-                    status="open",
-                    date_added=datetime.now(timezone.utc),
-                    external_id=bid_no if bid_no else None,
-                )
+    for (title, detail_url, row_text) in unique_rows:
+        due_dt_row = _parse_date_mmddyyyy(row_text)
+
+        (
+            desc,
+            posted_dt,
+            due_dt_detail,
+            prebid_dt,
+            attachment_urls,
+            bid_no,
+        ) = await _fetch_detail_description_and_dates_and_attachments(detail_url)
+
+        best_summary = desc or row_text
+        best_due = due_dt_detail or due_dt_row
+
+        display_title = f"{bid_no} {title}".strip() if bid_no else title
+
+        out.append(
+            RawOpportunity(
+                agency_name=AGENCY_NAME,
+                title=display_title,
+                summary=best_summary,
+                description=desc,
+                due_date=best_due,
+                posted_date=posted_dt,
+                prebid_date=prebid_dt,
+                source=detail_url,
+                source_url=detail_url,
+                # you can swap this to your new taxonomy
+                category="Solid Waste / Recycling / Environmental",
+                location_geo=None,
+                attachments=attachment_urls,
+                status="open",
+                date_added=datetime.now(timezone.utc),
+                external_id=bid_no if bid_no else None,
             )
+        )
 
     logger.info(f"SWACO: scraped {len(out)} bid(s).")
     return out
@@ -0,0 +1,138 @@
+# app/ingest/replay.py
+"""
+Record / replay of ingest traffic, for offline tests and benchmarks.
+
+INGEST_REPLAY=record
+    Live run. Every response from the shared HTTP client (app/ingest/http.py)
+    is stored under INGEST_REPLAY_DIR/<source>/, and each Playwright context
+    (app/ingest/browser_pool.py) records a HAR.
+INGEST_REPLAY=replay
+    No network. The shared client answers from those fixtures and raises
+    ReplayMiss for a request that was never recorded; Playwright contexts
+    are routed from the recorded HARs (unmatched requests are aborted).
+    Selenium cannot be replayed and refuses to start.
+
+<source> is the ingestor module's short name (app.ingest.municipalities.swaco
+-> "swaco"), set by the runner through source_context(). Layout:
+
+    <source>/<key>.json        method, url, status, content type / validators
+    <source>/<key>.body        raw response bytes
+    <source>/browser-<n>.har   n-th Playwright context of the run
+
+key = sha256("GET " + url)[:16]. Set-Cookie and other headers are not kept,
+but HARs contain whatever the portal sent -- review them before committing.
+
+Benchmarks over recorded fixtures: python scripts/bench_ingest.py
+"""
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_source: ContextVar[str] = ContextVar("ingest_replay_source", default="shared")
+_har_counts: Dict[str, int] = {}
+
+
+class ReplayMiss(Exception):
+    """Replay mode and no fixture recorded for this request."""
+
+    def __init__(self, source: str, what: str):
+        super().__init__(f"no replay fixture for {what} (source {source})")
+        self.source = source
+        self.what = what
+
+
+@dataclass
+class Recorded:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+def mode() -> str:
+    """"record", "replay" or "off"."""
+    m = (settings.INGEST_REPLAY or "off").strip().lower()
+    return m if m in ("record", "replay") else "off"
+
+
+def active() -> bool:
+    return mode() != "off"
+
+
+def current_source() -> str:
+    return _source.get()
+
+
+@contextmanager
+def source_context(name: str):
+    """Attribute traffic inside the block to ingestor `name` (module path or short name)."""
+    short = name.rsplit(".", 1)[-1]
+    _har_counts.pop(short, None)
+    token = _source.set(short)
+    try:
+        yield short
+    finally:
+        _source.reset(token)
+
+
+def fixture_dir(source: Optional[str] = None) -> Path:
+    return Path(settings.INGEST_REPLAY_DIR) / (source or current_source())
+
+
+def _key(method: str, url: str) -> str:
+    return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()[:16]
+
+
+def load(method: str, url: str) -> Recorded:
+    """Recorded response for this request; raises ReplayMiss when there is none."""
+    base = fixture_dir() / _key(method, url)
+    try:
+        meta = json.loads(base.with_suffix(".json").read_text("utf-8"))
+        content = base.with_suffix(".body").read_bytes()
+    except (OSError, ValueError):
+        raise ReplayMiss(current_source(), f"{method.upper()} {url}") from None
+    return Recorded(url=url, status=int(meta["status"]), headers=meta.get("headers") or {}, content=content)
+
+
+def save(method: str, url: str, status: int, headers: Mapping[str, str], content: bytes) -> None:
+    base = fixture_dir() / _key(method, url)
+    kept = {h: headers[h] for h in _KEEP_HEADERS if headers.get(h)}
+    meta = {"method": method.upper(), "url": url, "status": status, "headers": kept}
+    try:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        base.with_suffix(".body").write_bytes(content)
+        base.with_suffix(".json").write_text(json.dumps(meta, indent=2), "utf-8")
+    except OSError as exc:
+        logger.warning(f"replay: could not record {url}: {exc}")
+
+
+def next_har() -> Optional[Tuple[str, bool]]:
+    """(HAR path, recording?) for the next Playwright context of this source, or None when off."""
+    if not active():
+        return None
+    source = current_source()
+    n = _har_counts[source] = _har_counts.get(source, 0) + 1
+    path = fixture_dir(source) / f"browser-{n}.har"
+    if mode() == "record":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return str(path), True
+    if not path.exists():
+        raise ReplayMiss(source, f"Playwright context #{n}")
+    return str(path), False
+
+
+def check_selenium() -> None:
+    """Selenium drives a live browser with no request interception; refuse it offline."""
+    if mode() == "replay":
+        raise ReplayMiss(current_source(), "Selenium session")
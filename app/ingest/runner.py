@@ -1,8 +1,10 @@
 # app/ingest/runner.py
+import importlib
 import json
-import inspect
-import hashlib
-from typing import List, Set, Optional
+import logging
+import time
+import zlib
+from typing import Callable, List, Set, Optional, Tuple
 from sqlalchemy import text
 import asyncio
 from sqlalchemy import text
@@ -25,30 +27,18 @@ except Exception:
 
 LLM_CLIENT = get_llm_client()
 
-# --- Ingestors ----------------------------------------------------------------
-from app.ingest import mock_ingestor
-from app.ingest.municipalities import city_columbus
-from app.ingest.municipalities import city_grove_city
-from app.ingest.municipalities import city_gahanna
-from app.ingest.municipalities import city_marysville
-from app.ingest.municipalities import city_whitehall
-from app.ingest.municipalities import city_worthington
-from app.ingest.municipalities import city_grandview_heights
-from app.ingest.municipalities import swaco
-from app.ingest.municipalities import cota
-from app.ingest.municipalities import cota_improved
-from app.ingest.municipalities import franklin_county
-from app.ingest.municipalities import city_westerville
-from app.ingest.municipalities import columbus_metropolitan_library
-from app.ingest.municipalities import cmha
-from app.ingest.municipalities import metro_parks
-from app.ingest.municipalities import columbus_airports
-from app.ingest.municipalities import morpc
-from app.ingest.municipalities import dublin_city_schools
-from app.ingest.municipalities import minerva_park
-from app.ingest.municipalities import city_new_albany
-from app.ingest.municipalities import ohiobuys  # new
+from app.core import data_version, metrics
 from app.core.db_core import save_opportunities, engine
+from app.core.db_migrations import ENRICHMENT_QUEUE_SQL
+from app.core.logging_setup import configure_logging
+from app.ingest import http as ingest_http
+from app.ingest import replay
+from app.ingest.cache import get_ingest_cache
+from app.ingest.source_schedule import due_sources, record_run
+from app.ingest.stream import iter_records, micro_batches
+from app.ingest.utils import hash_parts
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------------------------------------------------------------------
@@ -63,7 +53,7 @@ async def close_missing_opportunities():
         )
         agencies = [r[0] for r in result.fetchall() if r[0]]
 
-        print(f"Found {len(agencies)} agencies to check…")
+        logger.info(f"Closing stale rows for {len(agencies)} agencies")
 
         # 2️⃣ loop through each and mark stale as closed
         for agency in agencies:
@@ -77,9 +67,10 @@ async def close_missing_opportunities():
                 """),
                 {"agency": agency},
             )
-            print(f"✅ Checked {agency}")
+            logger.debug(f"Checked {agency}")
 
-    print("🎯 Done marking missing RFPs as closed.")
+    await data_version.bump(data_version.OPPORTUNITIES)
+    logger.info("Done marking missing RFPs as closed.")
 
 
 # ---- for local testing ----
@@ -206,8 +197,8 @@ async def ai_enrich_opportunity(conn, external_id: str, agency_name: str) -> boo
         cat = ai_tags[0]
         conf = 0.9
 
-    print(
-        f"[AI] title={title[:120]!r} | agency={agency!r} | ext={external_id!r} "
+    logger.debug(
+        f"AI title={title[:120]!r} | agency={agency!r} | ext={external_id!r} "
         f"| cat={cat} | conf={conf} | fields={fields} | tags={ai_tags}"
     )
 
@@ -274,244 +265,581 @@ class RowAdapter:
         return self._data
 
 
-def hash_parts(*parts: str) -> str:
-    """Simple hash used to detect content changes."""
-    joined = "|".join((p or "").lower().strip() for p in parts if p is not None)
-    return hashlib.sha256(joined.encode()).hexdigest()
+def _field(r, name: str, default=""):
+    """Read a field from either a dict row or a RawOpportunity-style object."""
+    if isinstance(r, dict):
+        return r.get(name, default)
+    return getattr(r, name, default)
+
+
+# ------------------------------------------------------------------------------
+# Sources
+# ------------------------------------------------------------------------------
+
+# --- Ingestors ----------------------------------------------------------------
+# "module:callable" in run order. Modules are imported only when get_sources()
+# is called, so web workers that merely import the runner never load Selenium,
+# Playwright or the portal parsers.
+SOURCES: List[str] = [
+    # "app.ingest.mock_ingestor:fetch",
+    "app.ingest.municipalities.city_columbus:fetch",
+    "app.ingest.municipalities.city_grove_city:fetch",
+    "app.ingest.municipalities.city_gahanna:fetch",
+    "app.ingest.municipalities.city_marysville:fetch",
+    "app.ingest.municipalities.city_whitehall:fetch",
+    "app.ingest.municipalities.city_worthington:fetch",
+    "app.ingest.municipalities.city_grandview_heights:fetch",
+    "app.ingest.municipalities.swaco:fetch",
+    # "app.ingest.municipalities.cota:fetch",
+    "app.ingest.municipalities.cota_improved:fetch",
+    "app.ingest.municipalities.franklin_county:fetch",
+    "app.ingest.municipalities.city_westerville:fetch",
+    "app.ingest.municipalities.columbus_metropolitan_library:fetch",
+    "app.ingest.municipalities.cmha:fetch",
+    "app.ingest.municipalities.metro_parks:fetch",
+    "app.ingest.municipalities.columbus_airports:fetch",
+    "app.ingest.municipalities.morpc:fetch",
+    "app.ingest.municipalities.dublin_city_schools:fetch",
+    "app.ingest.municipalities.minerva_park:fetch",
+    "app.ingest.municipalities.city_new_albany:fetch",
+    "app.ingest.municipalities.ohiobuys:stream",
+]
+
+
+def load_source(spec: str) -> Callable:
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr or "fetch")
+
+
+def source_names() -> List[str]:
+    """Module names of the registered ingestors, without importing them."""
+    return [spec.partition(":")[0] for spec in SOURCES]
+
+
+def get_sources() -> List[Callable]:
+    """All registered ingestor fetch()/stream() callables, in run order (imports them)."""
+    return [load_source(spec) for spec in SOURCES]
+
+
+def source_name(fetch_fn) -> str:
+    return getattr(fetch_fn, "__module__", str(fetch_fn))
+
+
+def shard_sources(sources: List[Callable], shard_index: int, shard_count: int) -> List[Callable]:
+    """
+    Stable split of sources across `shard_count` ingest processes.
+    A source always lands on the same shard (crc32 of its module name).
+    """
+    if shard_count <= 1:
+        return list(sources)
+    return [
+        fn for fn in sources
+        if zlib.crc32(source_name(fn).encode("utf-8")) % shard_count == shard_index
+    ]
+
+
+# ------------------------------------------------------------------------------
+# Normalization
+# ------------------------------------------------------------------------------
+
+def _normalize_batch(batch) -> List:
+    normalized_rows = []
+    for r in batch:
+        if isinstance(r, dict):
+            # Ensure required fields exist
+            r.setdefault("source", "")
+            r.setdefault("source_url", "")
+            r.setdefault("title", "")
+            r.setdefault("summary", "")
+            r.setdefault("full_text", "")
+            r.setdefault("category", "")
+            r.setdefault("external_id", "")
+            r.setdefault("keyword_tag", None)
+            r.setdefault("agency_name", "")
+            r.setdefault("location_geo", "")
+            r.setdefault("posted_date", None)
+            r.setdefault("due_date", None)
+            r.setdefault("prebid_date", None)
+            r.setdefault("attachments", [])
+            r.setdefault("status", "open")
+
+            title_val = r.get("title") or ""
+            desc_val = r.get("full_text") or r.get("summary") or ""
+            due_val = r.get("due_date")
+            hash_val = r.get("hash_body")
+            if not hash_val:
+                hash_val = hash_parts(title_val, desc_val, str(due_val))
+            r["hash_body"] = hash_val
+
+            normalized_rows.append(RowAdapter(r))
+        else:
+            # object-style record
+            if not hasattr(r, "keyword_tag"):
+                setattr(r, "keyword_tag", None)
+            if not hasattr(r, "location_geo"):
+                setattr(r, "location_geo", "")
+            if not hasattr(r, "prebid_date"):
+                setattr(r, "prebid_date", None)
+            if not hasattr(r, "attachments"):
+                setattr(r, "attachments", [])
+
+            title_val = getattr(r, "title", "") or ""
+            desc_val = (
+                getattr(r, "full_text", "")
+                or getattr(r, "summary", "")
+                or getattr(r, "description", "")
+                or ""
+            )
+            due_val = getattr(r, "due_date", None)
+
+            hash_val = getattr(r, "hash_body", None)
+            if not hash_val:
+                hash_val = hash_parts(title_val, desc_val, str(due_val))
+                setattr(r, "hash_body", hash_val)
+
+            normalized_rows.append(r)
+    return normalized_rows
+
+
+# ------------------------------------------------------------------------------
+# AI enrichment
+# ------------------------------------------------------------------------------
+
+async def _enrich_row(conn, r, cols: Set[str]) -> None:
+    """Enrich one saved row (dict or object) via ai_enrich_opportunity or the title/hash fallback."""
+    ext_id = _field(r, "external_id")
+    agency = _field(r, "agency_name")
+    updated = False
+    if ext_id and agency:
+        updated = await ai_enrich_opportunity(conn, ext_id, agency)
+    if updated:
+        return
+
+    # ✅ NEW: fallback so these rows don't stay NULL
+    title = _field(r, "title")
+    summary = _field(r, "summary")
+    desc = (
+        _field(r, "full_text")
+        or summary
+        or _field(r, "description")
+        or title
+    )
+    combined_blob = " ".join([p for p in (
+        _field(r, "full_text"),
+        summary,
+        desc,
+        title,
+    ) if p])
+    hash_body = _field(r, "hash_body")
+    blob = desc or title
+
+    cat, conf = classify_opportunity(
+        title=title or "",
+        agency=agency or "",
+        description=blob,
+        llm_client=LLM_CLIENT,
+    )
+    fields = extract_key_fields(blob, llm_client=LLM_CLIENT)
+
+    # optional summary/tags
+    ai_summary = ""
+    ai_tags = []
+    if summarize_scope is not None:
+        ai_summary = summarize_scope(
+            title=title or "",
+            description=desc or "",
+            full_text=blob or "",
+            llm_client=LLM_CLIENT,
+        ) or ""
+    if auto_tags_from_blob is not None:
+        ai_tags = auto_tags_from_blob(
+            title=title or "",
+            description=desc or "",
+            full_text=combined_blob or "",
+            llm_client=LLM_CLIENT,
+        ) or []
+        if not ai_tags and summary:
+            ai_tags = auto_tags_from_blob(
+                title=title or "",
+                description=summary or "",
+                full_text=summary or "",
+                llm_client=LLM_CLIENT,
+            ) or []
+
+    # Use specialty tags to set category when we otherwise have "other"/none.
+    if ai_tags and (not cat or cat == "other"):
+        cat = ai_tags[0]
+        conf = 0.9
+
+    # baseline update (what you had)
+    await conn.execute(
+        text("""
+            UPDATE opportunities
+            SET
+                ai_category = :cat,
+                ai_category_conf = :conf,
+                ai_fields_json = :fields_json,
+                ai_version = :ver
+            WHERE title = :title
+              AND (:hash IS NULL OR :hash = '' OR hash_body = :hash)
+        """),
+        {
+            "cat": cat or "other",
+            "conf": float(conf or 0.0),
+            "fields_json": json.dumps(fields),
+            "ver": "v1.0",
+            "title": title or "",
+            "hash": (hash_body or None),
+        },
+    )
+
+    # additive update if columns exist
+    if "ai_summary" in cols or "ai_tags_json" in cols:
+        await conn.execute(
+            text("""
+                UPDATE opportunities
+                SET
+                    ai_summary = CASE WHEN :summary IS NULL THEN ai_summary ELSE :summary END,
+                    ai_tags_json = CASE WHEN :tags_json IS NULL THEN ai_tags_json ELSE :tags_json END,
+                    ai_version = :ver
+                WHERE title = :title
+                  AND (:hash IS NULL OR :hash = '' OR hash_body = :hash)
+            """),
+            {
+                "summary": ai_summary if "ai_summary" in cols else None,
+                "tags_json": json.dumps(ai_tags) if "ai_tags_json" in cols else None,
+                "ver": "v1.1",
+                "title": title or "",
+                "hash": (hash_body or None),
+            },
+        )
+
+
+async def enrich_rows(rows) -> None:
+    """AI-enrich a batch of just-saved rows in one transaction (inline mode)."""
+    async with engine.begin() as conn:
+        cols = await _get_opportunity_columns(conn)  # warm cache once per loop
+        for r in rows:
+            await _enrich_row(conn, r, cols)
+
+
+# --- Deferred enrichment (separate enrichment worker) -------------------------
+
+# A row whose enrichment keeps failing is dropped after this many attempts.
+ENRICH_MAX_ATTEMPTS = 5
+
+_ENRICH_QUEUE_READY = False
+
+
+async def _ensure_enrichment_queue():
+    # Columns added later come from migration steps (app/core/migrate.py).
+    global _ENRICH_QUEUE_READY
+    if _ENRICH_QUEUE_READY:
+        return
+    async with engine.begin() as conn:
+        await conn.execute(text(ENRICHMENT_QUEUE_SQL))
+    _ENRICH_QUEUE_READY = True
+
+
+async def _existing_hashes(conn, urls: List[str]) -> dict:
+    found = {}
+    for i in range(0, len(urls), 500):
+        chunk = urls[i:i + 500]
+        params = {f"u{j}": u for j, u in enumerate(chunk)}
+        placeholders = ", ".join(f":u{j}" for j in range(len(chunk)))
+        res = await conn.execute(
+            text(f"SELECT source_url, hash_body FROM opportunities WHERE source_url IN ({placeholders})"),
+            params,
+        )
+        found.update({row[0]: row[1] for row in res.fetchall()})
+    return found
+
+
+async def _changed_source_urls(rows) -> List[str]:
+    """source_urls in `rows` that are new or whose hash_body differs from the DB."""
+    urls = [u for u in (_field(r, "source_url") for r in rows) if u]
+    if not urls:
+        return []
+    async with engine.begin() as conn:
+        existing = await _existing_hashes(conn, urls)
+    return [
+        _field(r, "source_url") for r in rows
+        if _field(r, "source_url")
+        and existing.get(_field(r, "source_url")) != _field(r, "hash_body")
+    ]
+
+
+async def _enqueue_for_enrichment(urls: List[str]) -> None:
+    if not urls:
+        return
+    await _ensure_enrichment_queue()
+    async with engine.begin() as conn:
+        for u in urls:
+            await conn.execute(
+                text("""
+                    INSERT INTO ai_enrichment_queue (source_url, queued_at, attempts)
+                    VALUES (:u, CURRENT_TIMESTAMP, 0)
+                    ON CONFLICT(source_url) DO UPDATE SET queued_at = CURRENT_TIMESTAMP, attempts = 0
+                """),
+                {"u": u},
+            )
+
+
+async def _enrichment_failed(url: str, error: Exception) -> None:
+    """Count a failed attempt; drop the row once it reaches ENRICH_MAX_ATTEMPTS."""
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("UPDATE ai_enrichment_queue SET attempts = attempts + 1 WHERE source_url = :u"),
+                {"u": url},
+            )
+            res = await conn.execute(
+                text("SELECT attempts FROM ai_enrichment_queue WHERE source_url = :u"), {"u": url}
+            )
+            attempts = int(res.scalar() or 0)
+            if attempts >= ENRICH_MAX_ATTEMPTS:
+                await conn.execute(text("DELETE FROM ai_enrichment_queue WHERE source_url = :u"), {"u": url})
+    except Exception as e:
+        logger.warning(f"enrichment failed for {url}: {error}; could not record the attempt: {e}")
+        return
+    if attempts >= ENRICH_MAX_ATTEMPTS:
+        logger.error(f"enrichment failed for {url} {attempts} times, dropped from the queue: {error}")
+    else:
+        logger.warning(f"enrichment failed for {url} (attempt {attempts}): {error}")
+
+
+async def enrich_pending_opportunities(limit: int = 100) -> int:
+    """
+    Drain up to `limit` rows from ai_enrichment_queue (fewest attempts, then
+    oldest first). Each row commits on its own, so progress survives a crash
+    mid-batch. A row that fails goes behind the untried ones and is dropped
+    after ENRICH_MAX_ATTEMPTS, so failing rows cannot stall the queue.
+    Returns number of rows enriched.
+    """
+    await _ensure_enrichment_queue()
+    async with engine.begin() as conn:
+        res = await conn.execute(
+            text("SELECT source_url FROM ai_enrichment_queue ORDER BY attempts, queued_at LIMIT :n"),
+            {"n": limit},
+        )
+        urls = [row[0] for row in res.fetchall()]
+
+    done = 0
+    for url in urls:
+        try:
+            async with engine.begin() as conn:
+                cols = await _get_opportunity_columns(conn)
+                res = await conn.execute(
+                    text("""
+                        SELECT source_url, title, summary, full_text, external_id, agency_name, hash_body
+                        FROM opportunities
+                        WHERE source_url = :u
+                        LIMIT 1
+                    """),
+                    {"u": url},
+                )
+                row = res.mappings().first()
+                if row:
+                    await _enrich_row(conn, dict(row), cols)
+                    done += 1
+                await conn.execute(
+                    text("DELETE FROM ai_enrichment_queue WHERE source_url = :u"),
+                    {"u": url},
+                )
+        except Exception as e:
+            await _enrichment_failed(url, e)
+    if done:
+        await data_version.bump(data_version.OPPORTUNITIES)
+    return done
+
+
+async def _touch_listing_last_seen(nm: ingest_http.NotModified) -> None:
+    """
+    Listing unchanged (304): the rows its last full parse saved are still
+    posted, so keep them from being closed by close_missing_opportunities().
+    Rows that parse did not see (last_seen before its fetch) are left to
+    close. Rows are matched on `source` when the ingestor names it, else on
+    agency_name (ingestors that store per-row sources).
+    """
+    if nm.fetched_at is None:
+        return
+    if nm.source:
+        scope, params = "source = :key", {"key": nm.source}
+    elif nm.agency_name:
+        scope, params = "agency_name = :key", {"key": nm.agency_name}
+    else:
+        return
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(f"""
+                UPDATE opportunities
+                SET last_seen = CURRENT_TIMESTAMP
+                WHERE {scope} AND status = 'open' AND last_seen >= :since
+            """),
+            # CURRENT_TIMESTAMP has whole seconds; don't miss rows saved in the fetch second
+            {**params, "since": nm.fetched_at.replace(microsecond=0)},
+        )
 
 
-async def _collect_from_ingestor(fn) -> List:
-    """Call either a sync or async fetch() and return list of row dicts/objects."""
-    if inspect.iscoroutinefunction(fn):
-        return await fn()
-    return fn()
+async def _record_source_run(
+    name: str, changed: int, rows: int, started: float, outcome: str, error: Optional[str] = None
+) -> None:
+    duration = time.perf_counter() - started
+    metrics.INGEST_SOURCE_SECONDS.observe(duration, source=name, outcome=outcome)
+    if rows:
+        metrics.INGEST_SOURCE_ROWS.inc(rows, source=name)
+    try:
+        interval = await record_run(name, changed, rows, error=error, duration_s=duration)
+        logger.info(f"Ingestor {name} next run in {interval} min.")
+    except Exception as e:
+        logger.warning(f"could not update schedule for {name}: {e}")
+
+
+def _record_key(r):
+    url = _field(r, "source_url")
+    if url:
+        return url
+    ext_id = _field(r, "external_id")
+    return (_field(r, "source"), ext_id) if ext_id else None
+
+
+def _unseen(batch, seen: Set) -> List:
+    """Rows of `batch` not already saved earlier in this source's run."""
+    out = []
+    for r in batch:
+        key = _record_key(r)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        else:
+            seen.add(id(r))
+        out.append(r)
+    return out
+
+
+async def _save_batch(batch, enrich: bool) -> Tuple[int, int]:
+    """Normalize, save and enrich (or queue) one micro-batch. Returns (saved, changed)."""
+    normalized_rows = _normalize_batch(batch)
+    changed = await _changed_source_urls(normalized_rows)
+    saved = await save_opportunities(normalized_rows)
+
+    # --- AI enrichment step (for new/updated records) -------------------------
+    if enrich:
+        await enrich_rows(batch)
+    else:
+        await _enqueue_for_enrichment(changed)
+    return saved, len(changed)
 
 
 # ------------------------------------------------------------------------------
 # Main entrypoint
 # ------------------------------------------------------------------------------
 
-async def run_ingestors_once() -> int:
+async def run_ingestors_once(
+    sources: Optional[List[Callable]] = None,
+    enrich: bool = True,
+    due_only: bool = False,
+) -> int:
     """
-    Run all registered ingestors and save results to DB.
+    Run all registered ingestors (or just `sources`) and save results to DB.
     Returns total number of items processed (created or updated).
+
+    With enrich=False, new/changed rows are queued in ai_enrichment_queue for
+    the enrichment worker instead of being classified inline.
+    With due_only=True, sources not yet due per source_schedule are skipped.
+    Every run feeds its change count back into the per-source schedule.
+
+    Sources are consumed as streams (app/ingest/stream.py) and saved in
+    micro-batches as rows arrive, so a source that fails midway keeps the
+    rows it produced before the error.
+
+    Listing pages are fetched conditionally (app/ingest/http.py); a source
+    whose listing is unchanged raises NotModified and is skipped without
+    parsing. Its validators are only stored once the whole source is saved.
     """
+    if sources is None:
+        sources = get_sources()
 
-    sources = [
-         #mock_ingestor.fetch,
-         city_columbus.fetch,
-         city_grove_city.fetch,
-         city_gahanna.fetch,
-         city_marysville.fetch,
-         city_whitehall.fetch,
-         city_worthington.fetch,
-         city_grandview_heights.fetch,
-         swaco.fetch,
-         #cota.fetch,
-         cota_improved.fetch,
-         franklin_county.fetch,
-         city_westerville.fetch,
-         columbus_metropolitan_library.fetch,
-         cmha.fetch,
-         metro_parks.fetch,
-         columbus_airports.fetch,
-         morpc.fetch,
-         dublin_city_schools.fetch,
-         minerva_park.fetch,
-         city_new_albany.fetch,
-         ohiobuys.fetch,
-    ]
+    if due_only:
+        due = set(await due_sources(source_name(fn) for fn in sources))
+        skipped = len(sources) - len(due)
+        sources = [fn for fn in sources if source_name(fn) in due]
+        logger.info(f"{len(sources)} sources due, {skipped} not yet due.")
+
+    try:
+        await ingest_http.load_validators()
+    except Exception as e:
+        logger.warning(f"could not load HTTP validators, fetching unconditionally: {e}")
 
     total = 0
 
     for fetch_fn in sources:
-        name = getattr(fetch_fn, "__module__", str(fetch_fn))
-        print(f"Running ingestor: {name}")
-
+        name = source_name(fetch_fn)
+        logger.info(f"Running ingestor: {name}")
+        started = time.perf_counter()
+        # Validators staged by an earlier source that never reached its save.
+        ingest_http.discard_validators()
+
+        seen: Set = set()
+        saved = changed = 0
         try:
-            batch = await _collect_from_ingestor(fetch_fn)
+            with replay.source_context(name):
+                async for batch in micro_batches(iter_records(fetch_fn)):
+                    batch = _unseen(batch, seen)
+                    if not batch:
+                        continue
+                    batch_saved, batch_changed = await _save_batch(batch, enrich)
+                    saved += batch_saved
+                    changed += batch_changed
+        except ingest_http.NotModified as nm:
+            logger.info(f"Ingestor {name} listing not modified; skipped parsing.")
+            await _touch_listing_last_seen(nm)
+            await _record_source_run(name, 0, 0, started, "not_modified")
+            continue
         except Exception as e:
-            print(f"[WARN] Ingestor {name} failed: {e}")
-            batch = []
-
-        if not batch:
-            print(f"[INFO] Ingestor {name} returned no results.")
+            # Batches saved before the failure stay saved; validators do not.
+            logger.warning(f"Ingestor {name} failed after saving {saved} rows: {e}")
+            total += saved
+            await _record_source_run(name, changed, saved, started, "error", error=repr(e))
             continue
 
-        normalized_rows = []
-        for r in batch:
-            if isinstance(r, dict):
-                # Ensure required fields exist
-                r.setdefault("source", "")
-                r.setdefault("source_url", "")
-                r.setdefault("title", "")
-                r.setdefault("summary", "")
-                r.setdefault("full_text", "")
-                r.setdefault("category", "")
-                r.setdefault("external_id", "")
-                r.setdefault("keyword_tag", None)
-                r.setdefault("agency_name", "")
-                r.setdefault("location_geo", "")
-                r.setdefault("posted_date", None)
-                r.setdefault("due_date", None)
-                r.setdefault("prebid_date", None)
-                r.setdefault("attachments", [])
-                r.setdefault("status", "open")
-
-                title_val = r.get("title") or ""
-                desc_val = r.get("full_text") or r.get("summary") or ""
-                due_val = r.get("due_date")
-                hash_val = r.get("hash_body")
-                if not hash_val:
-                    hash_val = hash_parts(title_val, desc_val, str(due_val))
-                r["hash_body"] = hash_val
-
-                normalized_rows.append(RowAdapter(r))
-            else:
-                # object-style record
-                if not hasattr(r, "keyword_tag"):
-                    setattr(r, "keyword_tag", None)
-                if not hasattr(r, "location_geo"):
-                    setattr(r, "location_geo", "")
-                if not hasattr(r, "prebid_date"):
-                    setattr(r, "prebid_date", None)
-                if not hasattr(r, "attachments"):
-                    setattr(r, "attachments", [])
-
-                title_val = getattr(r, "title", "") or ""
-                desc_val = (
-                    getattr(r, "full_text", "")
-                    or getattr(r, "summary", "")
-                    or getattr(r, "description", "")
-                    or ""
-                )
-                due_val = getattr(r, "due_date", None)
+        if not seen:
+            # Validators are not committed: an empty page may be a parse miss.
+            logger.info(f"Ingestor {name} returned no results.")
+            await _record_source_run(name, 0, 0, started, "empty")
+            continue
 
-                hash_val = getattr(r, "hash_body", None)
-                if not hash_val:
-                    hash_val = hash_parts(title_val, desc_val, str(due_val))
-                    setattr(r, "hash_body", hash_val)
+        logger.info(f"Ingestor {name} processed {saved} rows ({changed} new/changed).")
+        if not enrich:
+            logger.info(f"Ingestor {name} queued {changed} rows for enrichment.")
+        await ingest_http.commit_validators()
+        total += saved
+        await _record_source_run(name, changed, saved, started, "ok")
 
-                normalized_rows.append(r)
+    cache = get_ingest_cache()
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.evict)
+        except Exception as e:
+            logger.warning(f"ingest cache eviction failed: {e}")
 
-        saved = await save_opportunities(normalized_rows)
-        print(f"[OK] Ingestor {name} processed {saved} rows.")
-        total += saved
+    if total:
+        # Web workers rebuild their open-opportunity snapshots (app/services/open_set.py).
+        await data_version.bump(data_version.OPPORTUNITIES)
 
-        # --- AI enrichment step (for new/updated records) ---------------------
-        async with engine.begin() as conn:
-            cols = await _get_opportunity_columns(conn)  # warm cache once per loop
-            for r in batch:
-                ext_id = r.get("external_id") if isinstance(r, dict) else getattr(r, "external_id", "")
-                agency = r.get("agency_name") if isinstance(r, dict) else getattr(r, "agency_name", "")
-                updated = False
-                if ext_id and agency:
-                    updated = await ai_enrich_opportunity(conn, ext_id, agency)
-                if not updated:
-                    # ✅ NEW: fallback so these rows don't stay NULL
-                    title = r.get("title") if isinstance(r, dict) else getattr(r, "title", "")
-                    summary = r.get("summary") if isinstance(r, dict) else getattr(r, "summary", "")
-                    desc = (
-                        (r.get("full_text") if isinstance(r, dict) else getattr(r, "full_text", ""))
-                        or summary
-                        or (r.get("description") if isinstance(r, dict) else getattr(r, "description", ""))
-                        or title
-                    )
-                    combined_blob = " ".join([p for p in (
-                        r.get("full_text") if isinstance(r, dict) else getattr(r, "full_text", ""),
-                        summary,
-                        desc,
-                        title,
-                    ) if p])
-                    hash_body = r.get("hash_body") if isinstance(r, dict) else getattr(r, "hash_body", "")
-                    blob = desc or title
-
-                    cat, conf = classify_opportunity(
-                        title=title or "",
-                        agency=agency or "",
-                        description=blob,
-                        llm_client=LLM_CLIENT,
-                    )
-                    fields = extract_key_fields(blob, llm_client=LLM_CLIENT)
-
-                    # optional summary/tags
-                    ai_summary = ""
-                    ai_tags = []
-                    if summarize_scope is not None:
-                        ai_summary = summarize_scope(
-                            title=title or "",
-                            description=desc or "",
-                            full_text=blob or "",
-                            llm_client=LLM_CLIENT,
-                        ) or ""
-                    if auto_tags_from_blob is not None:
-                        ai_tags = auto_tags_from_blob(
-                            title=title or "",
-                            description=desc or "",
-                            full_text=combined_blob or "",
-                            llm_client=LLM_CLIENT,
-                        ) or []
-                        if not ai_tags and summary:
-                            ai_tags = auto_tags_from_blob(
-                                title=title or "",
-                                description=summary or "",
-                                full_text=summary or "",
-                                llm_client=LLM_CLIENT,
-                            ) or []
-
-                    # Use specialty tags to set category when we otherwise have "other"/none.
-                    if ai_tags and (not cat or cat == "other"):
-                        cat = ai_tags[0]
-                        conf = 0.9
-
-                    # baseline update (what you had)
-                    await conn.execute(
-                        text("""
-                            UPDATE opportunities
-                            SET
-                                ai_category = :cat,
-                                ai_category_conf = :conf,
-                                ai_fields_json = :fields_json,
-                                ai_version = :ver
-                            WHERE title = :title
-                              AND (:hash IS NULL OR :hash = '' OR hash_body = :hash)
-                        """),
-                        {
-                            "cat": cat or "other",
-                            "conf": float(conf or 0.0),
-                            "fields_json": json.dumps(fields),
-                            "ver": "v1.0",
-                            "title": title or "",
-                            "hash": (hash_body or None),
-                        },
-                    )
-
-                    # additive update if columns exist
-                    if "ai_summary" in cols or "ai_tags_json" in cols:
-                        await conn.execute(
-                            text("""
-                                UPDATE opportunities
-                                SET
-                                    ai_summary = CASE WHEN :summary IS NULL THEN ai_summary ELSE :summary END,
-                                    ai_tags_json = CASE WHEN :tags_json IS NULL THEN ai_tags_json ELSE :tags_json END,
-                                    ai_version = :ver
-                                WHERE title = :title
-                                  AND (:hash IS NULL OR :hash = '' OR hash_body = :hash)
-                            """),
-                            {
-                                "summary": ai_summary if "ai_summary" in cols else None,
-                                "tags_json": json.dumps(ai_tags) if "ai_tags_json" in cols else None,
-                                "ver": "v1.1",
-                                "title": title or "",
-                                "hash": (hash_body or None),
-                            },
-                        )
-
-    print(f"✅ Completed ingestion run. Total processed: {total}")
+    logger.info(f"Completed ingestion run. Total processed: {total}")
     return total
 
 
+async def _main():
+    configure_logging()
+    try:
+        await run_ingestors_once()
+    finally:
+        await ingest_http.close()
+
+
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(run_ingestors_once())
-
+    asyncio.run(_main())
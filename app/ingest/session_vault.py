@@ -0,0 +1,205 @@
+# app/ingest/session_vault.py
+"""
+Authenticated portal sessions, kept between runs.
+
+Some portals make every new client pass an access check first (OhioBuys:
+ASCII captcha, Columbus: the Power Pages front door that sets its
+anti-forgery/affinity cookies). Once a run gets through, its cookies are
+stored here with an expiry, and the next run -- or another ingestor
+talking to the same portal -- starts from them. The expensive browser /
+captcha flow only runs when the stored session no longer validates.
+
+    sess = load_session("ohiobuys")          # None if missing/expired
+    apply_to_jar(session.cookies, sess.cookies)
+    ...validate; on failure: forget_session("ohiobuys")
+    save_session("ohiobuys", from_jar(session.cookies), state={...})
+
+Cookies are kept in one normalized shape
+    {name, value, domain, path, expires (epoch s or None), secure, httpOnly}
+with converters for requests jars, Selenium and Playwright.
+
+Sessions live as JSON files (mode 0600) under SESSION_VAULT_DIR; writes
+are atomic. A session expires at the earliest cookie expiry or after
+SESSION_VAULT_TTL_H, whichever comes first.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VaultSession:
+    name: str
+    cookies: List[Dict[str, Any]]
+    saved_at: float
+    expires_at: float
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+def _enabled() -> bool:
+    return bool(settings.SESSION_VAULT_ENABLED)
+
+
+def _path(name: str) -> Path:
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name)
+    return Path(settings.SESSION_VAULT_DIR) / f"{safe}.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        os.chmod(tmp, 0o600)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ---- cookie shapes ---------------------------------------------------------------
+
+def _cookie(name, value, domain, path="/", expires=None, secure=False, http_only=False) -> Dict[str, Any]:
+    if expires is not None:
+        try:
+            expires = float(expires)
+        except (TypeError, ValueError):
+            expires = None
+        if expires is not None and expires <= 0:
+            expires = None  # Playwright uses -1 for session cookies
+    return {
+        "name": name,
+        "value": value,
+        "domain": domain or "",
+        "path": path or "/",
+        "expires": expires,
+        "secure": bool(secure),
+        "httpOnly": bool(http_only),
+    }
+
+
+def from_jar(jar) -> List[Dict[str, Any]]:
+    """requests/http.cookiejar cookies -> vault cookies."""
+    return [
+        _cookie(
+            c.name,
+            c.value,
+            c.domain,
+            c.path,
+            c.expires,
+            c.secure,
+            c.has_nonstandard_attr("HttpOnly"),
+        )
+        for c in jar
+    ]
+
+
+def apply_to_jar(jar, cookies: Iterable[Dict[str, Any]]) -> None:
+    for c in cookies:
+        jar.set(
+            c["name"],
+            c["value"],
+            domain=c.get("domain") or None,
+            path=c.get("path") or "/",
+            secure=bool(c.get("secure")),
+            expires=int(c["expires"]) if c.get("expires") else None,
+        )
+
+
+def from_browser(cookies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Selenium get_cookies() ("expiry") or Playwright context.cookies() ("expires")."""
+    return [
+        _cookie(
+            c.get("name"),
+            c.get("value"),
+            c.get("domain"),
+            c.get("path"),
+            c.get("expires", c.get("expiry")),
+            c.get("secure"),
+            c.get("httpOnly"),
+        )
+        for c in cookies
+        if c.get("name")
+    ]
+
+
+def to_playwright(cookies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    out = []
+    for c in cookies:
+        item = {
+            "name": c["name"],
+            "value": c["value"],
+            "domain": c.get("domain") or "",
+            "path": c.get("path") or "/",
+            "secure": bool(c.get("secure")),
+            "httpOnly": bool(c.get("httpOnly")),
+        }
+        if c.get("expires"):
+            item["expires"] = float(c["expires"])
+        out.append(item)
+    return out
+
+
+# ---- vault -----------------------------------------------------------------------
+
+def load_session(name: str) -> Optional[VaultSession]:
+    """Stored session for `name`, or None when missing, unreadable or expired."""
+    if not _enabled():
+        return None
+    path = _path(name)
+    try:
+        sess = VaultSession(**json.loads(path.read_text("utf-8")))
+    except (OSError, ValueError, TypeError):
+        return None
+    if sess.expired or not sess.cookies:
+        forget_session(name)
+        return None
+    return sess
+
+
+def save_session(
+    name: str,
+    cookies: List[Dict[str, Any]],
+    state: Optional[Dict[str, Any]] = None,
+    ttl_h: Optional[float] = None,
+) -> Optional[VaultSession]:
+    """Store `cookies` (vault shape) plus free-form `state` for later runs."""
+    if not _enabled() or not cookies:
+        return None
+    now = time.time()
+    ttl_s = float(settings.SESSION_VAULT_TTL_H if ttl_h is None else ttl_h) * 3600
+    expiries = [c["expires"] for c in cookies if c.get("expires") and c["expires"] > now]
+    expires_at = min([now + ttl_s] + expiries)
+    sess = VaultSession(name=name, cookies=cookies, saved_at=now, expires_at=expires_at, state=state or {})
+    try:
+        _write_atomic(_path(name), json.dumps(asdict(sess)).encode("utf-8"))
+    except OSError as exc:
+        logger.warning(f"session vault: could not store {name}: {exc}")
+        return None
+    logger.info(f"session vault: stored {name} ({len(cookies)} cookies, {int((expires_at - now) / 60)} min)")
+    return sess
+
+
+def forget_session(name: str) -> None:
+    try:
+        _path(name).unlink()
+        logger.info(f"session vault: dropped {name}")
+    except OSError:
+        pass
@@ -0,0 +1,237 @@
+# app/ingest/source_schedule.py
+"""
+Per-source adaptive scrape scheduling.
+
+Each ingestor gets its own interval, learned from how often its rows
+actually change (new rows or hash_body deltas per run):
+
+- change_rate is an EWMA of "did this run see any change" (0..1).
+- After every run the interval is scaled towards TARGET_CHANGE_RATE
+  (roughly: a run should find something about half the time), at most
+  halving or doubling per run, and clamped to
+  [SCRAPE_MIN_INTERVAL_MIN, SCRAPE_MAX_INTERVAL_MIN].
+
+The scheduler ticks every few minutes and only runs sources whose
+next_run_at has passed.
+
+CLI:
+    python -m app.ingest.source_schedule           # show schedule
+    python -m app.ingest.source_schedule --reset   # everything due now
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import SOURCE_SCHEDULE_SQL
+from app.core.settings import settings
+
+# Aim for ~half of runs seeing at least one change.
+TARGET_CHANGE_RATE = 0.5
+# Weight of the newest run in the change-rate EWMA.
+EWMA_ALPHA = 0.3
+# Floor so quiet sources don't blow up the division.
+_MIN_RATE = 0.05
+
+_SCHEMA_READY = False
+
+
+async def ensure_source_schedule_table() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+    # Columns added later come from migration steps (app/core/migrate.py).
+    async with engine.begin() as conn:
+        await conn.execute(text(SOURCE_SCHEDULE_SQL))
+    _SCHEMA_READY = True
+
+
+def _bounds() -> tuple:
+    lo = max(int(settings.SCRAPE_MIN_INTERVAL_MIN), 1)
+    hi = max(int(settings.SCRAPE_MAX_INTERVAL_MIN), lo)
+    return lo, hi
+
+
+def next_interval(interval_min: int, change_rate: float) -> int:
+    """New interval (minutes) given the current one and the learned change rate."""
+    lo, hi = _bounds()
+    factor = TARGET_CHANGE_RATE / max(change_rate, _MIN_RATE)
+    factor = min(max(factor, 0.5), 2.0)
+    return int(min(max(round(interval_min * factor), lo), hi))
+
+
+def _as_dt(val) -> Optional[datetime]:
+    if val is None or isinstance(val, datetime):
+        return val
+    try:
+        return datetime.fromisoformat(str(val))
+    except ValueError:
+        return None
+
+
+async def _load(conn, sources: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    names = list(sources)
+    if not names:
+        return {}
+    params = {f"s{i}": n for i, n in enumerate(names)}
+    placeholders = ", ".join(f":s{i}" for i in range(len(names)))
+    res = await conn.execute(
+        text(f"SELECT * FROM source_schedule WHERE source IN ({placeholders})"),
+        params,
+    )
+    return {row["source"]: dict(row) for row in res.mappings().all()}
+
+
+async def due_sources(sources: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+    """Subset of `sources` whose next run is due (unknown sources are always due)."""
+    await ensure_source_schedule_table()
+    now = now or datetime.utcnow()
+    names = list(sources)
+    async with engine.begin() as conn:
+        rows = await _load(conn, names)
+    due = []
+    for name in names:
+        nxt = _as_dt((rows.get(name) or {}).get("next_run_at"))
+        if nxt is None or nxt <= now:
+            due.append(name)
+    return due
+
+
+async def record_run(
+    source: str,
+    changed: int,
+    rows: int,
+    error: Optional[str] = None,
+    duration_s: Optional[float] = None,
+) -> int:
+    """
+    Update the learned change rate and next run for `source`.
+    Failed runs keep the interval and retry after the minimum interval.
+    `duration_s` is kept for GET /metrics (scrapes usually run in another process).
+    Returns the new interval in minutes.
+    """
+    await ensure_source_schedule_table()
+    now = datetime.utcnow()
+    lo, hi = _bounds()
+    default_interval = min(max(int(settings.SCRAPE_DEFAULT_INTERVAL_MIN), lo), hi)
+
+    async with engine.begin() as conn:
+        cur = (await _load(conn, [source])).get(source) or {}
+        interval = int(cur.get("interval_min") or default_interval)
+        rate = float(cur.get("change_rate") if cur.get("change_rate") is not None else TARGET_CHANGE_RATE)
+        runs = int(cur.get("runs") or 0)
+
+        if error:
+            next_run = now + timedelta(minutes=lo)
+        else:
+            saw_change = 1.0 if changed > 0 else 0.0
+            rate = EWMA_ALPHA * saw_change + (1 - EWMA_ALPHA) * rate
+            interval = next_interval(interval, rate)
+            runs += 1
+            next_run = now + timedelta(minutes=interval)
+
+        await conn.execute(
+            text("""
+                INSERT INTO source_schedule
+                    (source, interval_min, change_rate, runs, last_run_at, last_changed, last_rows, last_error,
+                     next_run_at, last_duration_s)
+                VALUES
+                    (:source, :interval, :rate, :runs, :now, :changed, :rows, :error, :next_run, :duration)
+                ON CONFLICT(source) DO UPDATE SET
+                    interval_min = excluded.interval_min,
+                    change_rate = excluded.change_rate,
+                    runs = excluded.runs,
+                    last_run_at = excluded.last_run_at,
+                    last_changed = excluded.last_changed,
+                    last_rows = excluded.last_rows,
+                    last_error = excluded.last_error,
+                    next_run_at = excluded.next_run_at,
+                    last_duration_s = excluded.last_duration_s
+            """),
+            {
+                "source": source,
+                "interval": interval,
+                "rate": rate,
+                "runs": runs,
+                "now": now,
+                "changed": int(changed),
+                "rows": int(rows),
+                "error": (error or None) and error[:500],
+                "next_run": next_run,
+                "duration": duration_s,
+            },
+        )
+    return interval
+
+
+async def get_schedule(sources: Iterable[str]) -> List[Dict[str, Any]]:
+    """Schedule rows for every source (defaults filled in for never-run sources)."""
+    await ensure_source_schedule_table()
+    names = list(sources)
+    lo, hi = _bounds()
+    default_interval = min(max(int(settings.SCRAPE_DEFAULT_INTERVAL_MIN), lo), hi)
+    async with engine.begin() as conn:
+        rows = await _load(conn, names)
+    out = []
+    for name in names:
+        row = rows.get(name) or {
+            "source": name,
+            "interval_min": default_interval,
+            "change_rate": TARGET_CHANGE_RATE,
+            "runs": 0,
+            "last_run_at": None,
+            "last_changed": 0,
+            "last_rows": 0,
+            "last_error": None,
+            "next_run_at": None,
+            "last_duration_s": None,
+        }
+        out.append(row)
+    out.sort(key=lambda r: (_as_dt(r.get("next_run_at")) or datetime.min))
+    return out
+
+
+async def reset_schedule(sources: Optional[Iterable[str]] = None) -> None:
+    """Make sources (or all) due immediately; learned rates are kept."""
+    await ensure_source_schedule_table()
+    async with engine.begin() as conn:
+        if sources is None:
+            await conn.execute(text("UPDATE source_schedule SET next_run_at = NULL"))
+        else:
+            for name in sources:
+                await conn.execute(
+                    text("UPDATE source_schedule SET next_run_at = NULL WHERE source = :s"),
+                    {"s": name},
+                )
+
+
+def _fmt(val) -> str:
+    dt = _as_dt(val)
+    return dt.strftime("%Y-%m-%d %H:%M") if dt else "now"
+
+
+async def _print_schedule() -> None:
+    from app.ingest.runner import source_names
+
+    rows = await get_schedule(source_names())
+    print(f"{'source':<58} {'every':>7} {'rate':>5} {'runs':>5}  next run (UTC)")
+    for r in rows:
+        err = "  !" if r.get("last_error") else ""
+        print(
+            f"{r['source']:<58} {int(r['interval_min']):>5}m {float(r['change_rate']):>5.2f} "
+            f"{int(r['runs'] or 0):>5}  {_fmt(r.get('next_run_at'))}{err}"
+        )
+
+
+async def _main(argv: List[str]) -> None:
+    if "--reset" in argv:
+        await reset_schedule()
+    await _print_schedule()
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,63 @@
+# app/ingest/stream.py
+"""
+Streaming ingestor contract.
+
+An ingestor may register an async generator instead of a list-returning
+fetch(). It yields records (RawOpportunity or row dicts) as they are
+parsed:
+
+    async def stream():
+        for page in pages:
+            for row in parse(page):
+                yield row
+
+The runner reads every source through iter_records(), which also adapts
+the classic fetch() returning a list (sync fetchers run in a worker
+thread), and saves micro_batches() of INGEST_STREAM_BATCH records as they
+arrive. A source that fails on its last page keeps everything it yielded
+before, and enrichment starts with the first batch.
+"""
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from app.core.settings import settings
+
+
+def is_streaming(fn: Callable) -> bool:
+    return inspect.isasyncgenfunction(fn)
+
+
+async def iter_records(fn: Callable) -> AsyncIterator[Any]:
+    """Records of one ingestor run, whether `fn` streams or returns a list."""
+    if is_streaming(fn):
+        async for record in fn():
+            yield record
+        return
+    if inspect.iscoroutinefunction(fn):
+        records = await fn()
+    else:
+        records = await asyncio.to_thread(fn)
+    for record in records or []:
+        yield record
+
+
+async def micro_batches(records: AsyncIterator[Any], size: Optional[int] = None) -> AsyncIterator[List[Any]]:
+    """
+    Group `records` into lists of `size`. When the source fails, the records
+    collected so far are still handed out before the error is re-raised.
+    """
+    size = max(1, int(size or settings.INGEST_STREAM_BATCH))
+    batch: List[Any] = []
+    try:
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    except Exception:
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
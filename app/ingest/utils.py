@@ -1,4 +1,7 @@
 # app/ingest/utils.py
+import hashlib
+
+
 def safe_source_url(agency_name: str, source_url: str, list_url: str) -> str:
     """
     Ensures source_url is always publicly accessible.
@@ -21,4 +24,9 @@ def safe_source_url(agency_name: str, source_url: str, list_url: str) -> str:
     if "proposalsearchpublicdetail.asp" in u:
         return source_url if ("rid=" in u or "pid=" in u) else list_url
 
-    return source_url
\ No newline at end of file
+    return source_url
+
+def hash_parts(*parts: str) -> str:
+    """Simple hash used to detect content changes."""
+    joined = "|".join((p or "").lower().strip() for p in parts if p is not None)
+    return hashlib.sha256(joined.encode()).hexdigest()
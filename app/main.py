@@ -2,9 +2,11 @@
 import sys
 import asyncio
 import json
+import logging
 import os
 import re
 import secrets
+import time
 from urllib.parse import parse_qs
 
 from fastapi import FastAPI, Request, HTTPException, Depends
@@ -14,6 +16,11 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy import text
 
 from app.core.settings import settings
+from app.core.logging_setup import ACCESS_LOGGER, configure_logging, stop_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
 # -------------------------------------------------------------------
 # Windows event-loop quirk
@@ -26,6 +33,15 @@ if sys.platform.startswith("win"):
 # -------------------------------------------------------------------
 app = FastAPI(title="EasyRFP", version="0.3")
 
+# -------------------------------------------------------------------
+# Rendered-response cache (ETag / 304 / stale-while-revalidate).
+# Added first so it sits inside every other middleware: request logging,
+# canonical-host redirects and the CSRF cookie still apply to cached hits.
+# -------------------------------------------------------------------
+from app.core.http_cache import ResponseCacheMiddleware
+
+app.add_middleware(ResponseCacheMiddleware)
+
 # -------------------------------------------------------------------
 # Canonical host middleware (fixes cookie host mismatch)
 # -------------------------------------------------------------------
@@ -62,56 +78,39 @@ except Exception:
 # Core imports (after app is defined)
 # -------------------------------------------------------------------
 from app.core.db import engine, AsyncSessionLocal
-from app.domain.models import Base
-from app.core.models_core import metadata as core_metadata
-from app.core.models_preferences import metadata as prefs_metadata
+from app.core.db_engine import dispose_engines
 from app.auth import create_admin_if_missing, require_admin
 from app.core.scheduler import start_scheduler
 from app.auth.session import get_current_user_email, SESSION_COOKIE_NAME
 from app.auth.auth_utils import require_login
 from app.api._layout import page_shell
-from app.core.db_migrations import (
-    ensure_onboarding_schema,
-    ensure_uploads_schema,
-    ensure_uploads_folder_type,
-    ensure_team_schema,
-    ensure_user_tier_column,
-    ensure_billing_schema,
-    ensure_company_profile_schema,
-    ensure_tracker_team_schema,
-    ensure_opportunity_scope_columns,
-    ensure_opportunity_extraction_schema,
-    ensure_knowledge_base_schema,
-    ensure_response_library_schema,
-    ensure_extraction_cache_schema,
-    ensure_ai_sessions_schema,
-    ensure_ai_chat_schema,
-    ensure_response_cache_schema,
-)
+from app.core.migrate import run_migrations
 from app.api import dashboard_order as dashboard_order
 
 # -------------------------------------------------------------------
-# Log every request
+# Access log (sampled; errors and slow requests always kept)
 # -------------------------------------------------------------------
 @app.middleware("http")
 async def log_every_request(request: Request, call_next):
-    # ASCII-safe logs for Windows terminals
-    try:
-        print(f"[REQ] {request.method} {request.url.path}")
-    except Exception:
-        pass
+    started = time.perf_counter()
     response = await call_next(request)
-    try:
+    ms = (time.perf_counter() - started) * 1000
+    if access_logger.isEnabledFor(logging.INFO):
         route = request.scope.get("route")
-        route_path = getattr(route, "path", None)
-        base = f"[RES] {response.status_code} for {request.url.path} (route={route_path})"
+        fields = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "ms": round(ms, 1),
+            "route": getattr(route, "path", None),
+        }
         loc = response.headers.get("location")
         if loc:
-            print(base + f" Location={loc}")
-        else:
-            print(base)
-    except Exception:
-        pass
+            fields["location"] = loc
+        access_logger.info(
+            f"{request.method} {request.url.path} {response.status_code} {ms:.0f}ms",
+            extra={"fields": fields},
+        )
     return response
 
 # -------------------------------------------------------------------
@@ -185,13 +184,14 @@ class CSRFMiddleware(BaseHTTPMiddleware):
                             ok = True
                 except Exception:
                     ok = False
-            try:
+            if not ok or logger.isEnabledFor(logging.DEBUG):
                 c8 = (t_norm or "")[:8]
                 h8 = (h_norm or "")[:8]
                 f8 = (_norm(field) or "")[:8]
-                print(f"[CSRF] {request.method} {request.url.path} ok={ok} cookie={c8} hdr={h8} field={f8}")
-            except Exception:
-                pass
+                logger.log(
+                    logging.WARNING if not ok else logging.DEBUG,
+                    f"CSRF {request.method} {request.url.path} ok={ok} cookie={c8} hdr={h8} field={f8}",
+                )
             if not ok:
                 return PlainTextResponse("Forbidden (CSRF)", status_code=403)
         response = await call_next(request)
@@ -206,6 +206,14 @@ class CSRFMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(CSRFMiddleware)
 
+# -------------------------------------------------------------------
+# Metrics (per-route latency, DB and LLM time; GET /metrics).
+# Added last so it is outermost and times every other middleware too.
+# -------------------------------------------------------------------
+from app.core.metrics import MetricsMiddleware
+
+app.add_middleware(MetricsMiddleware)
+
 # -------------------------------------------------------------------
 # Routers
 # -------------------------------------------------------------------
@@ -259,6 +267,7 @@ from app.api import (
     collaboration,
     ai_sessions,
     chat,
+    metrics,
 )
 from app.api.bid_tracker import router as tracker_router
 from app.api.uploads import router as uploads_router
@@ -301,6 +310,7 @@ app.include_router(collaboration.router)
 app.include_router(ai_sessions.router)
 app.include_router(chat.router)
 app.include_router(tracked_opps.router)
+app.include_router(metrics.router)
 
 # -------------------------------------------------------------------
 # Health check
@@ -316,31 +326,18 @@ async def health():
 async def on_startup():
     # Only run DDL in environments that allow it (local/dev)
     if settings.RUN_DDL_ON_START:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-            await conn.run_sync(core_metadata.create_all)
-            await conn.run_sync(prefs_metadata.create_all)
+        await run_migrations(engine)
         async with AsyncSessionLocal() as db:
             await create_admin_if_missing(db)
-        await ensure_uploads_schema(engine)
-        await ensure_uploads_folder_type(engine)
-        await ensure_onboarding_schema(engine)
-        await ensure_opportunity_scope_columns(engine)
-        await ensure_team_schema(engine)
-        await ensure_user_tier_column(engine)
-        await ensure_billing_schema(engine)
-        await ensure_company_profile_schema(engine)
-        await ensure_tracker_team_schema(engine)
-        await ensure_opportunity_extraction_schema(engine)
-        await ensure_knowledge_base_schema(engine)
-        await ensure_response_library_schema(engine)
-        await ensure_extraction_cache_schema(engine)
-        await ensure_ai_sessions_schema(engine)
-        await ensure_ai_chat_schema(engine)
-        await ensure_response_cache_schema(engine)
     if settings.START_SCHEDULER_WEB:
         start_scheduler()
 
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await dispose_engines()
+    stop_logging()
+
 # -------------------------------------------------------------------
 # Global 401 -> login redirect
 # -------------------------------------------------------------------
@@ -1,18 +1,19 @@
+import importlib
 import io
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-# Optional deps; gracefully degrade if missing.
-try:  # PyMuPDF
-    import fitz  # type: ignore
-except ImportError:  # pragma: no cover
-    fitz = None
+# Optional deps; gracefully degrade if missing. Imported on first use --
+# PyMuPDF alone costs ~100 ms at web-worker boot.
+@lru_cache(maxsize=None)
+def _optional(module: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError:  # pragma: no cover
+        return None
 
-try:  # python-docx
-    import docx  # type: ignore
-except ImportError:  # pragma: no cover
-    docx = None
 
 logger = logging.getLogger("document_processor")
 
@@ -65,6 +66,7 @@ class DocumentProcessor:
         }
 
     def _extract_pdf(self, file_bytes: bytes) -> Dict[str, Any]:
+        fitz = _optional("fitz")  # PyMuPDF
         if not fitz:
             return {
                 "text": "",
@@ -99,6 +101,7 @@ class DocumentProcessor:
             return {"text": "", "metadata": {}, "status": "failed", "error": "Failed to read PDF"}
 
     def _extract_docx(self, file_bytes: bytes) -> Dict[str, Any]:
+        docx = _optional("docx")  # python-docx
         if not docx:
             return {
                 "text": "",
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 
 from sqlalchemy import text
 
+from app.core import data_version
 from app.core.db_core import engine
 from app.onboarding.interests import (
     DEFAULT_INTEREST_KEY,
@@ -117,6 +118,7 @@ async def ensure_default_preferences(email: str, interest_key: str) -> None:
                 "needs_frequency": 1 if needs_frequency else 0,
             },
         )
+    await data_version.bump(data_version.user_scope("preferences", email))
 
 
 async def record_milestone(
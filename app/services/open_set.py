@@ -0,0 +1,315 @@
+# app/services/open_set.py
+"""
+In-process snapshot of open opportunities.
+
+The landing stats, welcome feed, top-agency pills and the default ("open")
+/opportunities listing all read the same few thousand open rows, which only
+change when an ingest run lands. `get_open_set()` loads them once into
+`__slots__` records kept in feed order (soonest due first, undated last,
+newest first within a day) with prebuilt indexes by agency, category, tag
+and due date, and serves every later call from memory.
+
+Freshness: the snapshot is tagged with the "opportunities" data version
+(app/core/data_version.py). A bump in this process marks it stale at once;
+other processes notice on their next check, done at most every
+HOTSET_CHECK_S. Returns None when HOTSET_ENABLED is off or the first load
+fails, and callers fall back to their SQL queries.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.core import data_version
+from app.core.db_core import read_engine
+from app.core.db_migrations import OPEN_STATUS_PREDICATE
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+FEED_FIELDS = (
+    "id",
+    "external_id",
+    "title",
+    "agency_name",
+    "category",
+    "due_date",
+    "ai_summary",
+    "summary",
+    "source_url",
+)
+
+_LOAD_SQL = f"""
+    SELECT
+        id,
+        external_id,
+        title,
+        agency_name,
+        COALESCE(ai_category, category) AS category,
+        due_date,
+        date_added,
+        ai_summary,
+        summary,
+        source_url,
+        status,
+        ai_tags_json
+    FROM opportunities
+    WHERE {OPEN_STATUS_PREDICATE}
+"""
+
+# All rows, not just open ones: the top-agency pills and the listing's agency
+# dropdown have always been built from the whole table.
+_AGENCY_SQL = """
+    SELECT agency_name, COUNT(*) AS total
+    FROM opportunities
+    WHERE agency_name IS NOT NULL AND agency_name != ''
+    GROUP BY agency_name
+"""
+
+
+def _as_datetime(value: Any) -> Optional[dt.datetime]:
+    """Naive UTC datetime from a driver value (SQLite hands back strings)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, dt.datetime):
+        parsed = value
+    elif isinstance(value, dt.date):
+        parsed = dt.datetime(value.year, value.month, value.day)
+    else:
+        try:
+            parsed = dt.datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_tags(raw: Any) -> List[str]:
+    if not raw:
+        return []
+    try:
+        tags = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return [str(raw).strip().lower()]
+    if not isinstance(tags, list):
+        return [str(raw).strip().lower()]
+    return [str(t).strip().lower() for t in tags if str(t).strip()]
+
+
+class OpenOpportunity:
+    """One open row. Raw column values are kept as the driver returned them."""
+
+    __slots__ = (
+        "id",
+        "external_id",
+        "title",
+        "agency_name",
+        "category",
+        "due_date",
+        "date_added",
+        "ai_summary",
+        "summary",
+        "source_url",
+        "status",
+        "tags",
+        "due_ts",
+        "added_ts",
+        "title_key",
+    )
+
+    def __init__(self, row: Dict[str, Any]):
+        self.id = row["id"]
+        self.external_id = row["external_id"]
+        self.title = row["title"]
+        self.agency_name = row["agency_name"]
+        self.category = row["category"]
+        self.due_date = row["due_date"]
+        self.date_added = row["date_added"]
+        self.ai_summary = row["ai_summary"]
+        self.summary = row["summary"]
+        self.source_url = row["source_url"]
+        self.status = row["status"]
+        self.tags = tuple(_parse_tags(row["ai_tags_json"]))
+        self.due_ts = _as_datetime(row["due_date"])
+        self.added_ts = _as_datetime(row["date_added"])
+        self.title_key = (self.title or "").lower()
+
+    def as_dict(self, fields: Iterable[str] = FEED_FIELDS) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in fields}
+
+
+def _index(rows: Tuple[OpenOpportunity, ...], key) -> Dict[str, Tuple[int, ...]]:
+    out: Dict[str, List[int]] = {}
+    for pos, rec in enumerate(rows):
+        for k in key(rec):
+            out.setdefault(k, []).append(pos)
+    return {k: tuple(v) for k, v in out.items()}
+
+
+class OpenSet:
+    """Immutable snapshot; positions everywhere index into `rows` (feed order)."""
+
+    def __init__(self, records: List[OpenOpportunity], agency_totals: List[Tuple[str, int]], version: int):
+        # Feed order: dated rows by due date, undated last; newest first on ties.
+        records.sort(key=lambda r: r.added_ts or dt.datetime.min, reverse=True)
+        records.sort(key=lambda r: (r.due_ts is None, r.due_ts or dt.datetime.max))
+        self.rows: Tuple[OpenOpportunity, ...] = tuple(records)
+        self.version = version
+        self.loaded_at = time.time()
+
+        self.by_agency = _index(self.rows, lambda r: [r.agency_name.lower()] if r.agency_name else [])
+        self.by_category = _index(self.rows, lambda r: [r.category.lower()] if r.category else [])
+        self.by_tag = _index(self.rows, lambda r: set(r.tags))
+        # Dated rows are a prefix of `rows`, so this list doubles as a position index.
+        self.due = [r.due_ts for r in self.rows if r.due_ts is not None]
+        self.added = sorted(r.added_ts for r in self.rows if r.added_ts is not None)
+
+        self.agency_totals = sorted(agency_totals, key=lambda item: (-item[1], item[0]))
+        self.agency_names = sorted(name for name, _ in agency_totals if name.strip())
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ---- lookups ---------------------------------------------------------
+
+    def tag_positions(self, tags: Iterable[str]) -> Set[int]:
+        """Rows with a tag containing any of `tags` (the old LIKE '%tag%' match)."""
+        wanted = [t.strip().lower() for t in tags if t and t.strip()]
+        out: Set[int] = set()
+        for tag, positions in self.by_tag.items():
+            if any(w in tag for w in wanted):
+                out.update(positions)
+        return out
+
+    def due_range(self, start: dt.datetime, end: dt.datetime) -> range:
+        """Positions with start <= due < end."""
+        return range(bisect_left(self.due, start), bisect_left(self.due, end))
+
+    def count_due_by(self, cutoff: dt.datetime) -> int:
+        return bisect_right(self.due, cutoff)
+
+    def count_added_since(self, since: dt.datetime) -> int:
+        return len(self.added) - bisect_left(self.added, since)
+
+    def select(
+        self,
+        *,
+        categories: Iterable[str] | None = None,
+        agencies: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+        search: str = "",
+        due_start: Optional[dt.datetime] = None,
+        due_end: Optional[dt.datetime] = None,
+        exclude_ids: Set[Any] | None = None,
+        limit: Optional[int] = None,
+    ) -> List[OpenOpportunity]:
+        """Rows matching every given filter, in feed order."""
+        candidates: Optional[Set[int]] = None
+
+        def narrow(positions: Iterable[int]) -> None:
+            nonlocal candidates
+            positions = set(positions)
+            candidates = positions if candidates is None else candidates & positions
+
+        if categories is not None:
+            narrow(p for c in categories if c for p in self.by_category.get(c.lower(), ()))
+        if agencies is not None:
+            narrow(p for a in agencies if a for p in self.by_agency.get(a.lower(), ()))
+        if tags is not None:
+            narrow(self.tag_positions(tags))
+        if due_start is not None and due_end is not None:
+            narrow(self.due_range(due_start, due_end))
+
+        order = range(len(self.rows)) if candidates is None else sorted(candidates)
+        needle = search.lower()
+        out: List[OpenOpportunity] = []
+        for pos in order:
+            rec = self.rows[pos]
+            if needle and needle not in rec.title_key:
+                continue
+            if exclude_ids and rec.id in exclude_ids:
+                continue
+            out.append(rec)
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+
+# ---- process-wide snapshot ------------------------------------------------
+
+_snapshot: Optional[OpenSet] = None
+_checked_at = 0.0
+_stale = False
+_inflight: Optional[asyncio.Future] = None
+
+
+def _mark_stale(_version: int = 0) -> None:
+    global _stale
+    _stale = True
+
+
+data_version.on_bump(data_version.OPPORTUNITIES, _mark_stale)
+
+
+async def _load(version: int) -> OpenSet:
+    async with read_engine.connect() as conn:
+        res = await conn.execute(text(_LOAD_SQL))
+        records = [OpenOpportunity(dict(row._mapping)) for row in res.fetchall()]
+        res = await conn.execute(text(_AGENCY_SQL))
+        totals = [(row[0], int(row[1] or 0)) for row in res.fetchall() if row[0]]
+    return OpenSet(records, totals, version)
+
+
+async def _refresh() -> OpenSet:
+    global _snapshot, _checked_at, _stale
+    _stale = False
+    version = await data_version.current(data_version.OPPORTUNITIES)
+    _checked_at = time.monotonic()
+    snap = _snapshot
+    if snap is not None and snap.version == version and not _stale:
+        return snap
+    started = time.perf_counter()
+    snap = await _load(version)
+    _snapshot = snap
+    logger.info(
+        f"open set: loaded {len(snap)} rows at version {version} "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return snap
+
+
+async def get_open_set() -> Optional[OpenSet]:
+    """Current snapshot (refreshed if its version moved), or None to use SQL."""
+    global _inflight
+    if not settings.HOTSET_ENABLED:
+        return None
+    snap = _snapshot
+    if snap is not None and not _stale and time.monotonic() - _checked_at < settings.HOTSET_CHECK_S:
+        return snap
+
+    loop = asyncio.get_running_loop()
+    if _inflight is None or _inflight.done() or _inflight.get_loop() is not loop:
+        # One reload at a time; concurrent callers share it.
+        _inflight = asyncio.ensure_future(_refresh())
+    task = _inflight
+    try:
+        return await asyncio.shield(task)
+    except Exception as exc:
+        logger.warning(f"open set: refresh failed, serving previous snapshot: {exc}")
+        return _snapshot
+
+
+def reset_open_set() -> None:
+    """Drop the snapshot (tests, admin tooling); the next call reloads."""
+    global _snapshot, _checked_at, _inflight
+    _snapshot = None
+    _checked_at = 0.0
+    _inflight = None
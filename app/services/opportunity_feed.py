@@ -5,10 +5,23 @@ from typing import Any, Dict, Iterable, List, Set, Tuple
 
 from sqlalchemy import text
 
-from app.core.db_core import engine
+from app.core.db_core import read_engine
+from app.core.db_migrations import OPEN_STATUS_PREDICATE
 from app.onboarding.interests import get_interest_profile
+from app.services.open_set import get_open_set
 
-OPEN_STATUS_CLAUSE = "(status IS NULL OR TRIM(LOWER(status)) LIKE 'open%')"
+OPEN_STATUS_CLAUSE = f"({OPEN_STATUS_PREDICATE})"
+
+_PREVIEW_FIELDS = (
+    "id",
+    "external_id",
+    "title",
+    "agency_name",
+    "due_date",
+    "category",
+    "ai_summary",
+    "summary",
+)
 
 
 async def fetch_landing_snapshot(
@@ -19,7 +32,17 @@ async def fetch_landing_snapshot(
     soon = now + dt.timedelta(days=7)
     recent = now - dt.timedelta(days=1)
 
-    async with engine.begin() as conn:
+    snap = await get_open_set()
+    if snap is not None:
+        stats = {
+            "total_open": len(snap),
+            "closing_soon": snap.count_due_by(soon),
+            "added_recent": snap.count_added_since(recent),
+        }
+        preview = [rec.as_dict(_PREVIEW_FIELDS) for rec in snap.rows[:sample_limit]]
+        return stats, preview
+
+    async with read_engine.connect() as conn:
         stats_res = await conn.exec_driver_sql(
             """
             SELECT
@@ -102,14 +125,21 @@ async def fetch_interest_feed(
 
 async def get_top_agencies(limit: int = 6) -> List[Dict[str, Any]]:
     """Return agencies with the most open opportunities."""
-    async with engine.begin() as conn:
+    snap = await get_open_set()
+    if snap is not None:
+        return [
+            {"agency": name, "count": total}
+            for name, total in snap.agency_totals[:limit]
+        ]
+
+    async with read_engine.connect() as conn:
         res = await conn.exec_driver_sql(
             """
             SELECT agency_name, COUNT(*) AS total
             FROM opportunities
             WHERE agency_name IS NOT NULL AND agency_name != ''
             GROUP BY agency_name
-            ORDER BY total DESC
+            ORDER BY total DESC, agency_name
             LIMIT :limit
             """,
             {"limit": limit},
@@ -129,6 +159,16 @@ async def _query_opportunities(
     agencies: Iterable[str] | None = None,
     exclude_ids: Set[str] | None = None,
 ) -> List[Dict[str, Any]]:
+    snap = await get_open_set()
+    if snap is not None:
+        rows = snap.select(
+            categories=list(categories or []) or None,
+            agencies=list(agencies or []) or None,
+            exclude_ids=exclude_ids,
+            limit=limit,
+        )
+        return [rec.as_dict() for rec in rows]
+
     filters = [OPEN_STATUS_CLAUSE]
     params: Dict[str, Any] = {"limit": limit}
 
@@ -163,7 +203,7 @@ async def _query_opportunities(
 
     where_sql = " AND ".join(f"({clause})" for clause in filters)
 
-    async with engine.begin() as conn:
+    async with read_engine.connect() as conn:
         res = await conn.exec_driver_sql(
             f"""
             SELECT
@@ -205,6 +245,11 @@ async def _query_opportunities_by_tags(
     if not tag_clauses:
         return []
 
+    snap = await get_open_set()
+    if snap is not None:
+        rows = snap.select(tags=tags_clean, exclude_ids=exclude_ids, limit=limit)
+        return [rec.as_dict() for rec in rows]
+
     filters = [OPEN_STATUS_CLAUSE]
     filters.append("(" + " OR ".join(tag_clauses) + ")")
 
@@ -219,7 +264,7 @@ async def _query_opportunities_by_tags(
 
     where_sql = " AND ".join(f"({clause})" for clause in filters)
 
-    async with engine.begin() as conn:
+    async with read_engine.connect() as conn:
         res = await conn.exec_driver_sql(
             f"""
             SELECT
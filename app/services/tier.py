@@ -0,0 +1,147 @@
+# app/services/tier.py
+"""
+Effective subscription tier for a user: their own tier, or their team
+owner's when that is higher. Read through the shared engine (any database)
+and cached per email for TIER_CACHE_TTL_S.
+
+Stripe webhooks / tier syncs and team membership changes call
+invalidate_tier() after commit.
+"""
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.db_core import read_engine
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TIER_ORDER = {"free": 0, "starter": 1, "professional": 2, "enterprise": 3}
+
+_MAX_ENTRIES = 4096
+
+# lower(email) -> (expires_at, info, lower(team owner email) or None)
+_cache: Dict[str, Tuple[float, Dict[str, Any], Optional[str]]] = {}
+_generation = 0
+
+
+def normalize_tier(raw: Optional[str]) -> str:
+    key = (raw or "Free").strip().lower()
+    return key.title() if key in TIER_ORDER else "Free"
+
+
+def default_tier_info() -> Dict[str, Any]:
+    return {
+        "effective": "Free",
+        "label": "Free",
+        "source": "self",
+        "team_id": None,
+        "team_name": None,
+        "team_member_count": 0,
+        "user_id": None,
+    }
+
+
+async def _load(email: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    info = default_tier_info()
+    owner_email = None
+    async with read_engine.connect() as conn:
+        res = await conn.execute(
+            text("SELECT id, team_id, tier FROM users WHERE lower(email) = lower(:email) LIMIT 1"),
+            {"email": email},
+        )
+        row = res.first()
+        if not row:
+            return info, None
+        user_id, team_id, raw_tier = row
+        user_tier = effective = normalize_tier(raw_tier)
+        via_team = False
+        info.update(user_id=user_id, team_id=team_id)
+
+        if team_id:
+            tres = await conn.execute(
+                text(
+                    """
+                    SELECT t.name, u.tier AS owner_tier, u.email AS owner_email
+                    FROM teams t
+                    LEFT JOIN users u ON u.id = t.owner_user_id
+                    WHERE t.id = :team
+                    LIMIT 1
+                    """
+                ),
+                {"team": team_id},
+            )
+            trow = tres.first()
+            if trow:
+                info["team_name"] = trow[0] or "Team"
+                owner_email = (trow[2] or "").strip().lower() or None
+                owner_tier = normalize_tier(trow[1])
+                if TIER_ORDER[owner_tier.lower()] > TIER_ORDER[user_tier.lower()]:
+                    effective = owner_tier
+                    via_team = True
+            try:
+                cres = await conn.execute(
+                    text(
+                        "SELECT COUNT(*) FROM team_members "
+                        "WHERE team_id = :team AND (accepted_at IS NOT NULL OR role = 'owner')"
+                    ),
+                    {"team": team_id},
+                )
+                info["team_member_count"] = int(cres.scalar() or 0)
+            except Exception:
+                info["team_member_count"] = 0
+
+    info["effective"] = effective
+    info["label"] = f"{effective} (via Team)" if via_team else effective
+    info["source"] = "team" if via_team else "self"
+    return info, owner_email
+
+
+async def get_tier_info(user_email: Optional[str]) -> Dict[str, Any]:
+    """
+    Effective tier for the header badge and billing. Keys: effective, label,
+    source, team_id, team_name, team_member_count, user_id. Falls back to Free
+    for anonymous callers and on lookup errors.
+    """
+    if not user_email:
+        return default_tier_info()
+    key = user_email.strip().lower()
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+
+    generation = _generation
+    try:
+        info, owner_email = await _load(user_email)
+    except Exception as exc:
+        logger.warning(f"tier lookup failed for {user_email}: {exc}")
+        return default_tier_info()
+    ttl = settings.TIER_CACHE_TTL_S
+    if ttl > 0 and generation == _generation:
+        if len(_cache) >= _MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = (now + ttl, info, owner_email)
+    return dict(info)
+
+
+def invalidate_tier(email: Optional[str] = None, team_id: Any = None) -> None:
+    """
+    Forget cached tiers for `email` -- and for every member of a team that
+    email owns, since they inherit it -- and/or for everyone on `team_id`.
+    With no arguments the whole cache is cleared.
+    """
+    global _generation
+    _generation += 1
+    if email is None and team_id is None:
+        _cache.clear()
+        return
+    email_key = email.strip().lower() if email else None
+    for key, (_, info, owner_email) in list(_cache.items()):
+        if (
+            (email_key is not None and email_key in (key, owner_email))
+            or (team_id is not None and info.get("team_id") is not None and str(info["team_id"]) == str(team_id))
+        ):
+            _cache.pop(key, None)
@@ -5,7 +5,6 @@ from app.core.settings import settings
 USE_S3 = bool(settings.DOCS_BUCKET)
 BUCKET  = settings.DOCS_BUCKET or ""
 LOCAL_DIR = settings.LOCAL_UPLOAD_DIR or "uploads"
-_s3 = None  # populated when USE_S3 is True
 
 def _build_s3_client():
     import boto3
@@ -25,8 +24,18 @@ def _build_s3_client():
         config=Config(signature_version="s3v4", s3={"addressing_style": addressing}),
     )
 
-if USE_S3:
-    _s3 = _build_s3_client()
+class _LazyS3:
+    """Stands in for the boto3 client; boto3 is imported on the first S3 call, not at boot."""
+
+    _client = None
+
+    def __getattr__(self, name):
+        if self._client is None:
+            type(self)._client = _build_s3_client()
+        return getattr(self._client, name)
+
+
+_s3 = _LazyS3() if USE_S3 else None  # same name/shape importers already use
 
 def _safe_filename(name: str) -> str:
     keep = "".join(c for c in name if c.isalnum() or c in (" ", ".", "_", "-", "(", ")"))
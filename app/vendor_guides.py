@@ -8,6 +8,7 @@ import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy import text as sql_text
 
+from app.core import data_version
 from app.core.db_core import engine
 from app.ai.client import get_llm_client
 
@@ -136,6 +137,7 @@ async def upsert_vendor_guide_for_columbus() -> dict:
                 "updated_at": now,
             },
         )
+    await data_version.bump("vendor_guides")
 
     return {
         "agency_name": agency_name,
@@ -0,0 +1,103 @@
+"""Benchmark digest rendering for many users (no DB, no email).
+
+    python scripts/bench_digest_render.py [--users 10000] [--opps 400] [--agencies 20]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from app.core.digest_render import DigestRenderer
+
+BASE_URL = "https://example.test"
+
+
+def _fake_rows(n_opps: int, n_agencies: int):
+    rnd = random.Random(42)
+    agencies = [f"Agency {i:02d}" for i in range(n_agencies)]
+    by_agency = {}
+    for i in range(n_opps):
+        agency = rnd.choice(agencies)
+        by_agency.setdefault(agency, []).append(
+            {
+                "id": i + 1,
+                "external_id": f"RFQ{100000 + i}",
+                "agency_name": agency,
+                "title": f"Opportunity {i} - road resurfacing and related improvements",
+                "due_date": f"2025-12-{(i % 28) + 1:02d} 00:00:00",
+                "source_url": f"https://portal.test/bid/{i}",
+                "ai_summary": "Furnish labor and materials for resurfacing. " * 3,
+                "ai_tags_json": json.dumps(["Paving", "Construction", "Public Works"]),
+                "ai_category": "Construction",
+            }
+        )
+    return agencies, by_agency
+
+
+def _fake_users(n_users: int, agencies):
+    rnd = random.Random(7)
+    users = []
+    for i in range(n_users):
+        # ~1/3 of users have no filter (all agencies), the rest pick a few
+        flt = [] if i % 3 == 0 else rnd.sample(agencies, k=rnd.randint(1, min(5, len(agencies))))
+        users.append((f"user{i}@example.test", flt))
+    return users
+
+
+def _run(renderer: DigestRenderer, users, by_agency, total, clear_each: bool) -> float:
+    t0 = time.perf_counter()
+    size = 0
+    sections = renderer.render_sections(by_agency, BASE_URL)
+    for email, flt in users:
+        if clear_each:
+            # old behaviour: every user re-renders every item of their agencies
+            renderer.clear()
+            sections = renderer.render_sections(
+                {a: v for a, v in by_agency.items() if not flt or a in flt}, BASE_URL
+            )
+        agencies = [a for a in by_agency if a in flt] if flt else list(by_agency)
+        html = renderer.render_digest(
+            sections,
+            agencies,
+            total_count=total,
+            window_text="the last 24 hours",
+            unsubscribe_url=f"{BASE_URL}/unsubscribe?e={email}",
+        )
+        size += len(html)
+    elapsed = time.perf_counter() - t0
+    print(f"  rendered {len(users)} digests, {size / 1e6:.1f} MB total, {elapsed:.2f}s "
+          f"({elapsed / len(users) * 1e3:.3f} ms/user)")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=10_000)
+    ap.add_argument("--opps", type=int, default=400)
+    ap.add_argument("--agencies", type=int, default=20)
+    args = ap.parse_args()
+
+    agencies, by_agency = _fake_rows(args.opps, args.agencies)
+    users = _fake_users(args.users, agencies)
+    total = sum(len(v) for v in by_agency.values())
+
+    print("uncached (caches cleared per user):")
+    cold = _run(DigestRenderer(), users, by_agency, total, clear_each=True)
+
+    print("cached (shared renderer):")
+    renderer = DigestRenderer()
+    warm = _run(renderer, users, by_agency, total, clear_each=False)
+
+    print(f"speedup: {cold / warm:.1f}x")
+    print(f"cache stats: {renderer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark every ingestor's fetch/parse, normalize and save path offline.
+
+    python scripts/bench_ingest.py [--source swaco] [--repeat 3]
+    python scripts/bench_ingest.py --record [--source swaco]   # live: capture fixtures
+
+Replays the per-source fixtures under INGEST_REPLAY_DIR (app/ingest/replay.py)
+into a throwaway in-memory SQLite database and reports, per source: rows,
+fetch+parse / normalize / save time, rows per second and peak traced
+allocations. Sources without fixtures are listed as skipped; Selenium-only
+sources cannot be replayed (see replay.py).
+
+Replay must stay offline, but some ingestors open their own HTTP sessions
+instead of the shared client. While replaying, connections to anything
+but loopback fail, so those sources report "failed" instead of quietly
+benchmarking the live portal. OhioBuys (its own requests/cloudscraper
+session, captcha solving and human-like delays) is skipped outright.
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import os
+import socket
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ["DB_URL"] = "sqlite+aiosqlite:///:memory:"  # never the real database
+
+from app.core.db_core import engine, save_opportunities
+from app.core.models_core import metadata
+from app.core.settings import settings
+from app.ingest import http as ingest_http
+from app.ingest import replay
+from app.ingest.runner import _normalize_batch, get_sources, source_name
+from app.ingest.stream import iter_records
+
+
+# Ingestors that talk to the live site through their own sessions; never replayable.
+LIVE_ONLY = {"ohiobuys"}
+
+
+def _is_loopback(host) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+@contextmanager
+def _offline():
+    """Refuse socket connections to non-loopback hosts (sources bypassing the shared client)."""
+    real_connect = socket.socket.connect
+
+    def connect(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and not _is_loopback(address[0]):
+            raise ConnectionRefusedError(f"live network blocked during replay: {address[0]}")
+        return real_connect(sock, address)
+
+    socket.socket.connect = connect
+    try:
+        yield
+    finally:
+        socket.socket.connect = real_connect
+
+
+async def _fetch(fn):
+    return [r async for r in iter_records(fn)]
+
+
+async def _bench_source(fn, short: str, repeat: int):
+    best = None
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        # a fresh context per run: Playwright HAR numbering restarts at browser-1.har
+        with replay.source_context(short):
+            rows = await _fetch(fn)
+        t1 = time.perf_counter()
+        normalized = _normalize_batch(rows)
+        t2 = time.perf_counter()
+        saved = await save_opportunities(normalized)
+        t3 = time.perf_counter()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        run = (len(rows), saved, t1 - t0, t2 - t1, t3 - t2, peak)
+        if best is None or sum(run[2:5]) < sum(best[2:5]):
+            best = run
+    return best
+
+
+async def _record(sources) -> None:
+    for fn in sources:
+        name = source_name(fn)
+        with replay.source_context(name) as short:
+            try:
+                rows = await _fetch(fn)
+            except Exception as e:
+                print(f"  {short:32s} failed: {e}")
+                continue
+        files = len(list(replay.fixture_dir(short).glob("*"))) if replay.fixture_dir(short).exists() else 0
+        print(f"  {short:32s} {len(rows):5d} rows, {files} fixture files")
+
+
+async def _replay(sources, repeat: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    print(f"{'source':32s} {'rows':>5s} {'fetch ms':>9s} {'norm ms':>8s} {'save ms':>8s} {'rows/s':>8s} {'peak MB':>8s}")
+    for fn in sources:
+        short = source_name(fn).rsplit(".", 1)[-1]
+        if short in LIVE_ONLY:
+            print(f"{short:32s} skipped (live-only: own HTTP session)")
+            continue
+        if not replay.fixture_dir(short).exists():
+            print(f"{short:32s} skipped (no fixtures)")
+            continue
+        try:
+            with _offline():
+                rows, saved, t_fetch, t_norm, t_save, peak = await _bench_source(fn, short, repeat)
+        except replay.ReplayMiss as e:
+            print(f"{short:32s} incomplete fixtures: {e.what}")
+            continue
+        except Exception as e:
+            print(f"{short:32s} failed: {e!r}")
+            continue
+        total = t_fetch + t_norm + t_save
+        rate = rows / total if total else 0.0
+        print(f"{short:32s} {rows:5d} {t_fetch * 1e3:9.1f} {t_norm * 1e3:8.2f} {t_save * 1e3:8.1f} "
+              f"{rate:8.0f} {peak / 1e6:8.2f}")
+
+
+async def _main(args) -> None:
+    sources = get_sources()
+    if args.source:
+        sources = [fn for fn in sources if source_name(fn).rsplit(".", 1)[-1] in args.source]
+    settings.INGEST_REPLAY = "record" if args.record else "replay"
+    print(f"fixtures: {settings.INGEST_REPLAY_DIR} ({settings.INGEST_REPLAY})")
+    try:
+        if args.record:
+            await _record(sources)
+        else:
+            await _replay(sources, args.repeat)
+    finally:
+        await ingest_http.close()
+        await engine.dispose()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", action="append", help="short module name, e.g. swaco (repeatable)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--record", action="store_true", help="fetch live and write fixtures")
+    args = ap.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
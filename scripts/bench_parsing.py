@@ -0,0 +1,89 @@
+"""Benchmark ingestor HTML parsing: stdlib html.parser vs lxml on saved fixtures.
+
+    python scripts/bench_parsing.py [--repeat 5]
+
+Fixtures (repo root): ohiobuys.txt (OhioBuys grid page), tmp_status.html
+(OhioBuys status form), westerville_open_debug.json (JSON API, no HTML --
+shown for scale). Empty fixtures are skipped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core.settings import settings
+from app.ingest import parsing
+from app.ingest.municipalities import city_westerville, ohiobuys
+
+
+def _ohiobuys_grid(text: str) -> int:
+    rows = ohiobuys._parse_rows_from_html(text)
+    ohiobuys._html_has_additional_pages(text)  # same document: served from the tree cache
+    return len(rows)
+
+
+def _ohiobuys_status(text: str) -> int:
+    return len(ohiobuys._collect_form_fields(parsing.parse_html(text)))
+
+
+def _westerville(text: str) -> int:
+    projects = json.loads(text).get("payload", {}).get("projects", {})
+    return len([city_westerville._project_to_raw(p) for p in projects.values()])
+
+
+FIXTURES = [
+    ("ohiobuys grid", "ohiobuys.txt", _ohiobuys_grid, True),
+    ("ohiobuys status form", "tmp_status.html", _ohiobuys_status, True),
+    ("columbus open rfqs", "columbus_openrfqs.html", None, True),
+    ("westerville json", "westerville_open_debug.json", _westerville, False),
+]
+
+
+def _time(fn, text: str, backend: str, repeat: int):
+    settings.INGEST_HTML_PARSER = backend
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        parsing.clear_cache()
+        t0 = time.perf_counter()
+        count = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, count
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    backends = ["html.parser"] + (["lxml"] if parsing.HAVE_LXML else [])
+    if not parsing.HAVE_LXML:
+        print("lxml not installed; timing html.parser only")
+
+    for label, name, fn, is_html in FIXTURES:
+        path = PROJECT_ROOT / name
+        text = path.read_text(encoding="utf-8") if path.exists() else ""
+        if not text.strip() or fn is None:
+            print(f"{label}: {name} missing or empty, skipped")
+            continue
+        print(f"{label} ({len(text) / 1e3:.0f} KB):")
+        results = {}
+        for backend in backends if is_html else backends[:1]:
+            elapsed, count = _time(fn, text, backend, args.repeat)
+            results[backend] = elapsed
+            print(f"  {backend:12s} {elapsed * 1e3:8.2f} ms  ({count} items)")
+        if len(results) == 2:
+            print(f"  speedup: {results['html.parser'] / results['lxml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Import-time budget for web workers.
+
+    python scripts/check_import_time.py [--budget-ms 2500] [--top 15] [--module app.main]
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+fails (exit 1) when the cumulative import time exceeds the budget, or when
+any of HEAVY_MODULES was loaded: those belong to ingest workers or to the
+one endpoint that needs them and must stay behind a deferred import
+(app/ingest/runner.SOURCES, app/storage._LazyS3, local imports in billing
+and exports). Timings are noisy; CI runs it with a generous budget and the
+module check does the real work.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = (
+    "selenium",
+    "undetected_chromedriver",
+    "playwright",
+    "boto3",
+    "botocore",
+    "stripe",
+    "fitz",
+    "docx",
+    "fpdf",
+    "numpy",
+    "twilio",
+    "app.ingest.municipalities",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module: str):
+    """[(cumulative_us, depth, name)] for every module imported by `import module`."""
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "importtime")
+    env.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"import {module} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="app.main")
+    ap.add_argument("--budget-ms", type=float, default=2500.0)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    rows = measure(args.module)
+    total_ms = sum(us for us, depth, _ in rows if depth == 1) / 1e3
+    heavy = sorted({
+        h for _, _, name in rows for h in HEAVY_MODULES
+        if name == h or name.startswith(h + ".")
+    })
+
+    print(f"import {args.module}: {total_ms:.0f} ms, {len(rows)} modules (budget {args.budget_ms:.0f} ms)")
+    for us, depth, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {us / 1e3:8.1f} ms  {'  ' * depth}{name}")
+
+    failed = False
+    if heavy:
+        print(f"heavy modules loaded at import: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
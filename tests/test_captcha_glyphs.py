@@ -0,0 +1,57 @@
+# tests/test_captcha_glyphs.py
+import os
+from pathlib import Path
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.ingest.municipalities import ohiobuys
+
+SAVED = Path(__file__).resolve().parents[1] / "logs" / "captcha_learning"
+
+
+def _saved_bitmaps():
+    # Glyphs the live captcha produced, as written by _save_unknown_bitmap().
+    out = []
+    for path in sorted(SAVED.glob("*.txt")):
+        lines = path.read_text().splitlines()
+        out.append(lines[lines.index("# Raw bitmap:") + 1 :])
+    return out
+
+
+def _noisy(rows, n):
+    # Flip one pixel so the index is also checked off the exact templates.
+    grid = [list(r) for r in rows]
+    r = n % len(grid)
+    c = (n * 7) % len(grid[r])
+    grid[r][c] = " " if grid[r][c] == "*" else "*"
+    return ["".join(row) for row in grid]
+
+
+def _bitmaps():
+    templates = [e["signature"].split("\n") for e in ohiobuys._get_known_character_signatures()]
+    return _saved_bitmaps() + templates + [_noisy(t, i) for i, t in enumerate(templates)]
+
+
+def test_index_matches_reference_scan():
+    index = ohiobuys._get_glyph_index()
+    for bmp in _bitmaps():
+        matrix = ohiobuys._bitmap_to_matrix(bmp)
+        assert index.best(matrix) == ohiobuys._scan_known_signatures(matrix), bmp
+
+
+def test_fuzzy_match_unchanged_without_numpy(monkeypatch):
+    bitmaps = _bitmaps()
+    fast = [ohiobuys._fuzzy_match_character(b) for b in bitmaps]
+    monkeypatch.setattr(ohiobuys, "_get_glyph_index", lambda: None)
+    slow = [ohiobuys._fuzzy_match_character(b) for b in bitmaps]
+
+    assert fast == slow
+    # every template still matches itself exactly
+    chars = [e["char"] for e in ohiobuys._get_known_character_signatures()]
+    n = len(_saved_bitmaps())
+    assert all(fast[n + i][1] == 0 and fast[n + i][0] != "?" for i in range(len(chars)))
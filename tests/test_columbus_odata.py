@@ -0,0 +1,13 @@
+# tests/test_columbus_odata.py
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.ingest.municipalities.columbus_odata import _line_order
+
+
+def test_line_items_sort_numerically():
+    recs = [{"cr820_linenumber": n} for n in ("10", "2", "A", None, 1, "1.5")]
+    ordered = [r["cr820_linenumber"] for r in sorted(recs, key=_line_order)]
+    assert ordered == [1, "1.5", "2", "10", None, "A"]
@@ -0,0 +1,82 @@
+# tests/test_db_engine.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db_engine import create_engines, is_memory_sqlite
+
+
+def test_memory_sqlite_is_one_static_engine():
+    assert is_memory_sqlite("sqlite+aiosqlite:///:memory:")
+    assert is_memory_sqlite("sqlite+aiosqlite://")
+    assert not is_memory_sqlite("sqlite+aiosqlite:///./easyrfp.db")
+    write, read = create_engines("sqlite+aiosqlite:///:memory:")
+    assert write is read
+    asyncio.run(write.dispose())
+
+
+def test_sqlite_reads_do_not_wait_for_an_open_write(tmp_path):
+    write, read = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'wal.db'}")
+
+    async def scenario():
+        try:
+            return await _exercise()
+        finally:
+            await write.dispose()
+            await read.dispose()
+
+    async def _exercise():
+        async with write.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+        async with read.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            sync = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            with pytest.raises(Exception):
+                await conn.execute(text("INSERT INTO t (id) VALUES (9)"))
+
+        async with write.begin() as wconn:  # long ingest transaction, still open
+            await wconn.execute(text("INSERT INTO t (id) VALUES (2)"))
+            async with read.connect() as rconn:
+                seen = await asyncio.wait_for(
+                    rconn.execute(text("SELECT COUNT(*) FROM t")), timeout=2
+                )
+                during = seen.scalar()
+        async with read.connect() as rconn:
+            after = (await rconn.execute(text("SELECT COUNT(*) FROM t"))).scalar()
+        return mode, sync, during, after
+
+    mode, sync, during, after = asyncio.run(scenario())
+    assert (mode, sync) == ("wal", 1)  # 1 = NORMAL
+    assert (during, after) == (1, 2)
+
+
+def test_sqlite_session_can_open_nested_engine_transaction(tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.core.settings import settings
+
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_S", 2)
+    write, read = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'nested.db'}")
+    sessions = async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False)
+
+    async def scenario():
+        try:
+            async with write.begin() as conn:
+                await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            # require_admin-style: the session reads the user, the handler writes through the engine
+            async with sessions() as db:
+                await db.execute(text("SELECT COUNT(*) FROM t"))
+                async with write.begin() as conn:
+                    await conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+                return (await db.execute(text("SELECT COUNT(*) FROM t"))).scalar()
+        finally:
+            await write.dispose()
+            await read.dispose()
+
+    assert asyncio.run(scenario()) in (0, 1)
@@ -0,0 +1,77 @@
+# tests/test_digest_render.py
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core.digest_render import DigestRenderer
+
+BASE = "https://app.test"
+
+
+def _rows():
+    return {
+        "City of Columbus": [
+            {"id": 1, "title": "Road resurfacing", "due_date": "2026-05-01 00:00:00", "agency_name": "City of Columbus",
+             "ai_summary": "Mill and overlay.", "ai_tags_json": '["paving"]'},
+            {"id": 2, "title": "Fleet leasing", "due_date": None, "agency_name": "City of Columbus"},
+        ],
+        "City of Gahanna": [
+            {"id": 3, "title": "Roof replacement", "external_id": "RFQ-9", "agency_name": "City of Gahanna"},
+        ],
+    }
+
+
+def test_second_render_is_served_from_cache():
+    renderer = DigestRenderer()
+    first = renderer.render_sections(_rows(), BASE)
+    second = renderer.render_sections(_rows(), BASE)
+    assert second == first
+    stats = renderer.stats()
+    assert stats["sections"] == {"size": 2, "hits": 2, "misses": 2}
+    assert stats["items"] == {"size": 3, "hits": 0, "misses": 3}  # items only rendered on a section miss
+
+    body = renderer.render_digest(first, ["City of Gahanna"], 1, "the last 24 hours", f"{BASE}/unsubscribe")
+    assert "Roof replacement" in body and "Road resurfacing" not in body
+    assert "ext=RFQ-9" in body
+
+
+def test_changed_inputs_change_the_key():
+    renderer = DigestRenderer()
+    row = _rows()["City of Columbus"][0]
+    key = renderer.item_key(row, BASE)
+    assert renderer.item_key(dict(row), BASE) == key
+    assert renderer.item_key({**row, "due_date": "2026-06-01 00:00:00"}, BASE) != key
+    assert renderer.item_key({**row, "ai_summary": "Resurface 4 miles."}, BASE) != key
+    assert renderer.item_key(row, "https://staging.test") != key
+
+    renderer.render_sections(_rows(), BASE)
+    changed = _rows()
+    changed["City of Columbus"][1]["title"] = "Fleet leasing (amended)"
+    sections = renderer.render_sections(changed, BASE)
+    assert "Fleet leasing (amended)" in sections["City of Columbus"]
+    assert renderer.stats()["sections"]["hits"] == 1  # only Gahanna was unchanged
+
+
+class _LLM:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def chat(self, messages, temperature=0):
+        self.calls += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def test_failed_or_empty_intro_is_retried():
+    renderer = DigestRenderer()
+    items = _rows()["City of Columbus"]
+    llm = _LLM([RuntimeError("timeout"), "  ", "Two city bids this week."])
+    assert renderer.agency_intro("City of Columbus", items, llm) == ""
+    assert renderer.agency_intro("City of Columbus", items, llm) == ""
+    assert renderer.agency_intro("City of Columbus", items, llm) == "Two city bids this week."
+    assert renderer.agency_intro("City of Columbus", items, llm) == "Two city bids this week."
+    assert llm.calls == 3
@@ -0,0 +1,77 @@
+# tests/test_enrichment_queue.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import ensure_data_versions_schema
+from app.core.models_core import metadata
+from app.ingest import runner
+
+URLS = [f"https://bids.test/{i}" for i in range(4)]
+POISON = URLS[0]
+
+
+def test_queue_drains_and_drops_a_poison_row(monkeypatch):
+    # a fresh in-memory database: the queue table has to be created again
+    monkeypatch.setattr(runner, "_ENRICH_QUEUE_READY", False)
+    enriched = []
+
+    async def fake_enrich(conn, row, cols):
+        if row["source_url"] == POISON:
+            raise ValueError("LLM returned garbage")
+        enriched.append(row["source_url"])
+
+    monkeypatch.setattr(runner, "_enrich_row", fake_enrich)
+
+    async def queued():
+        async with engine.begin() as conn:
+            res = await conn.execute(text("SELECT source_url, attempts FROM ai_enrichment_queue"))
+            return dict(res.fetchall())
+
+    async def exercise():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(
+                text(
+                    "INSERT INTO opportunities (id, source, source_url, title, date_added) "
+                    "VALUES (:u, 'test', :u, :u, CURRENT_TIMESTAMP)"
+                ),
+                [{"u": u} for u in URLS],
+            )
+        await ensure_data_versions_schema(engine)
+        await runner._enqueue_for_enrichment(URLS)
+        async with engine.begin() as conn:
+            # oldest first (queued_at has whole seconds, so spell the order out)
+            for i, u in enumerate(URLS):
+                await conn.execute(
+                    text("UPDATE ai_enrichment_queue SET queued_at = :at WHERE source_url = :u"),
+                    {"at": f"2026-01-01 00:00:0{i}", "u": u},
+                )
+
+        # the poison row fails first, then waits behind the untried rows
+        first = await runner.enrich_pending_opportunities(limit=2)
+        after_first = await queued()
+        second = await runner.enrich_pending_opportunities(limit=2)
+        after_second = await queued()
+
+        # nothing else left: it is retried until dropped
+        for _ in range(runner.ENRICH_MAX_ATTEMPTS):
+            await runner.enrich_pending_opportunities(limit=2)
+        return first, after_first, second, after_second, await queued()
+
+    async def scenario():
+        try:
+            return await exercise()
+        finally:
+            await engine.dispose()
+
+    first, after_first, second, after_second, left = asyncio.run(scenario())
+    assert first == 1 and after_first == {POISON: 1, URLS[2]: 0, URLS[3]: 0}
+    assert second == 2 and after_second == {POISON: 1}
+    assert sorted(enriched) == URLS[1:]
+    assert left == {}
@@ -0,0 +1,96 @@
+# tests/test_http_cache.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.auth.session import SESSION_COOKIE_NAME, create_session_token
+from app.core import http_cache
+
+
+def test_etag_304_and_stale_while_revalidate(monkeypatch):
+    versions = {"opportunities": 1, "trackers:a@b.com": 1}
+    renders = []
+
+    async def current_many(names):
+        return {name: versions.get(name, 0) for name in names}
+
+    async def page(request):
+        renders.append(request.url.path)
+        return PlainTextResponse(f"render {len(renders)}")
+
+    monkeypatch.setattr(http_cache.data_version, "current_many", current_many)
+    monkeypatch.setattr(http_cache, "CACHE_RULES", [
+        http_cache.CacheRule("feed", "/feed", ("opportunities", "trackers:{user}"), ttl_s=60, swr_s=600),
+    ])
+    app = http_cache.ResponseCacheMiddleware(Starlette(routes=[Route("/feed", page), Route("/other", page)]))
+
+    async def exercise():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/feed?b=2&a=1")
+            hit = await client.get("/feed?a=1&b=2")
+            not_modified = await client.get("/feed?a=1&b=2", headers={"If-None-Match": first.headers["etag"]})
+            uncached = [(await client.get("/other")).text for _ in range(2)]
+
+            versions["opportunities"] = 2  # ingest landed: old body served once, re-rendered behind it
+            stale = await client.get("/feed?a=1&b=2")
+            for _ in range(20):
+                await asyncio.sleep(0)
+            fresh = await client.get("/feed?a=1&b=2")
+
+            cookie = {"Cookie": f"{SESSION_COOKIE_NAME}={create_session_token('a@b.com')}"}
+            mine = await client.get("/feed?a=1&b=2", headers=cookie)
+            versions["trackers:a@b.com"] = 2  # user-scoped change is never answered stale
+            mine_after = await client.get("/feed?a=1&b=2", headers=cookie)
+            return first, hit, not_modified, uncached, stale, fresh, mine, mine_after
+
+    first, hit, not_modified, uncached, stale, fresh, mine, mine_after = asyncio.run(exercise())
+
+    assert first.text == "render 1" and first.headers["x-cache"] == "MISS"
+    assert hit.text == "render 1" and hit.headers["x-cache"] == "HIT"
+    assert hit.headers["etag"] == first.headers["etag"] and "last-modified" in hit.headers
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert uncached == ["render 2", "render 3"]
+
+    assert stale.text == "render 1" and stale.headers["x-cache"] == "STALE"
+    assert fresh.text == "render 4" and fresh.headers["x-cache"] == "HIT"
+    assert fresh.headers["etag"] != first.headers["etag"]
+
+    assert mine.text == "render 5" and mine.headers["cache-control"].startswith("private")
+    assert mine_after.text == "render 6" and mine_after.headers["x-cache"] == "MISS"
+
+
+def test_byte_budget_evicts_least_recently_used(monkeypatch):
+    async def current_many(names):
+        return {name: 1 for name in names}
+
+    async def page(request):
+        return PlainTextResponse("x" * 1000)
+
+    monkeypatch.setattr(http_cache.data_version, "current_many", current_many)
+    monkeypatch.setattr(http_cache, "CACHE_RULES", [
+        http_cache.CacheRule("feed", "/feed", ("opportunities",), ttl_s=60, swr_s=0),
+    ])
+    monkeypatch.setattr(http_cache.settings, "HTTP_CACHE_MAX_MB", 3.5 / 1024)  # room for three pages
+    app = http_cache.ResponseCacheMiddleware(Starlette(routes=[Route("/feed", page)]))
+
+    async def exercise():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for page_no in (1, 2, 3):
+                await client.get(f"/feed?page={page_no}")
+            hit = await client.get("/feed?page=1")  # now the most recently used
+            await client.get("/feed?page=4")
+            return hit
+
+    hit = asyncio.run(exercise())
+    assert hit.headers["x-cache"] == "HIT"
+    assert sorted(key[2] for key in app._entries) == ["page=1", "page=3", "page=4"]
+    assert app._bytes == sum(entry.size for entry in app._entries.values()) <= 3.5 * 1024
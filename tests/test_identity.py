@@ -0,0 +1,63 @@
+# tests/test_identity.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app.auth import identity
+from app.auth.session import SESSION_COOKIE_NAME, create_session_token
+from app.core.db_core import engine
+from app.domain.models import Base, User
+
+
+def _request(email):
+    cookie = f"{SESSION_COOKIE_NAME}={create_session_token(email)}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+def test_identity_is_cached_per_request_and_invalidated(monkeypatch):
+    loads = []
+    real_load = identity._load
+
+    async def counting_load(email):
+        loads.append(email)
+        return await real_load(email)
+
+    monkeypatch.setattr(identity, "_load", counting_load)
+    identity.invalidate_identity()
+
+    async def scenario():
+        try:
+            return await _exercise()
+        finally:
+            await engine.dispose()
+
+    async def _exercise():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                User.__table__.insert().values(email="Ann@Example.com", password_hash="", tier="free")
+            )
+        req = _request("ann@example.com")
+        first = await identity.require_identity(req)
+        again = await identity.get_identity(req)          # request.state
+        other = await identity.require_identity(_request("ANN@example.com"))  # TTL cache
+
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE users SET tier = 'professional' WHERE id = :id"), {"id": first.id})
+        stale = await identity.lookup_identity("ann@example.com")
+        identity.invalidate_identity(email="ann@example.com")
+        fresh = await identity.lookup_identity("ann@example.com")
+        missing = await identity.get_identity(_request("nobody@example.com"))
+        return first, again, other, stale, fresh, missing
+
+    first, again, other, stale, fresh, missing = asyncio.run(scenario())
+    assert first is again is other
+    assert first.as_dict()["email"] == "Ann@Example.com"
+    assert (stale.tier, fresh.tier) == ("free", "professional")
+    assert missing is None
+    assert loads == ["ann@example.com", "ann@example.com", "nobody@example.com"]
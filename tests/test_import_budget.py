@@ -0,0 +1,17 @@
+# tests/test_import_budget.py
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "check_import_time.py"
+
+
+def test_web_import_skips_heavy_modules():
+    # Budget is deliberately loose (timings vary per machine); the heavy-module check must pass.
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT), "--budget-ms", "60000", "--top", "0"],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
@@ -0,0 +1,207 @@
+# tests/test_ingest_http.py
+import asyncio
+import datetime as dt
+import os
+import uuid
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import ensure_data_versions_schema
+from app.core.models_core import metadata
+from app.core.settings import settings
+from app.ingest import cache as ingest_cache
+from app.ingest import http as ingest_http
+from app.ingest import runner
+
+_ETAG = '"v1"'
+
+
+class _StubSite(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        _StubSite.hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/flaky" and len([h for h in _StubSite.hits if h[0] == "/flaky"]) < 3:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if self.path == "/bids" and self.headers.get("If-None-Match") == _ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = "Bids – open".encode("cp1252")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", _ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSite)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_listing_is_conditional_after_commit():
+    _StubSite.hits = []
+    server = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bids"
+
+    async def run():
+        await ingest_http.forget_validators()
+        first = await ingest_http.get_listing(url, agency_name="Test Agency")
+        # not committed yet (source never saved) -> refetched in full
+        ingest_http.discard_validators()
+        second = await ingest_http.get_listing(url, agency_name="Test Agency")
+        await ingest_http.commit_validators()
+        with pytest.raises(ingest_http.NotModified) as exc:
+            await ingest_http.get_listing(url, agency_name="Test Agency")
+        with pytest.raises(ingest_http.NotModified):
+            ingest_http.get_listing_sync(url, agency_name="Test Agency")
+        await ingest_http.close()
+        await engine.dispose()  # aiosqlite's worker thread would keep the process alive
+        return first, second, exc.value
+
+    try:
+        first, second, not_modified = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert first == second == "Bids – open"  # cp1252 fallback
+    assert not_modified.agency_name == "Test Agency"
+    assert [h[1] for h in _StubSite.hits] == [None, None, _ETAG, _ETAG]
+
+
+def test_retries_on_503():
+    _StubSite.hits = []
+    server = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/flaky"
+
+    async def run():
+        try:
+            return await ingest_http.get_text(url, retries=3)
+        finally:
+            await ingest_http.close()
+
+    try:
+        body = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert body == "Bids – open"
+    assert len(_StubSite.hits) == 3
+
+
+def test_detail_cache_ttl_and_revalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ingest_cache, "_cache", None)
+    _StubSite.hits = []
+    server = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bids"
+
+    async def run():
+        try:
+            a = await ingest_http.get_cached_text(url)
+            b = await ingest_http.get_cached_text(url)  # fresh: no request
+            c = await ingest_http.get_cached_text(url, ttl_h=0)  # stale: 304 -> cached body
+            d = ingest_http.get_cached_sync(url).text
+            return a, b, c, d
+        finally:
+            await ingest_http.close()
+
+    try:
+        bodies = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert set(bodies) == {"Bids – open"}
+    assert [h[1] for h in _StubSite.hits] == [None, _ETAG]
+
+    calls = []
+
+    def parse(data):
+        calls.append(data)
+        return {"len": len(data)}
+
+    assert ingest_cache.memoize("t", b"pdf", parse) == {"len": 3}
+    assert ingest_cache.memoize("t", b"pdf", parse) == {"len": 3}
+    assert len(calls) == 1
+
+    cache = ingest_cache.get_ingest_cache()
+    cache.max_bytes = 1
+    cache.evict()
+    assert cache.lookup(url) is None
+
+
+def test_not_modified_keeps_only_rows_of_the_last_full_parse(monkeypatch):
+    _StubSite.hits = []
+    server = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bids"
+
+    async def listing_source():
+        await ingest_http.get_listing(url, agency_name="Test Agency", source="test_listing")
+        return []
+
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(runner, "_record_source_run", noop)
+    monkeypatch.setattr(runner, "get_ingest_cache", lambda: None)
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+        await ensure_data_versions_schema(engine)
+        await ingest_http.forget_validators()
+        # the last full parse: the page is fetched, its rows saved, validators committed
+        await ingest_http.get_listing(url, agency_name="Test Agency", source="test_listing")
+        day_old = dt.datetime.utcnow() - dt.timedelta(hours=26)
+        rows = [
+            ("LISTED", "test_listing", dt.datetime.utcnow()),
+            ("DELISTED", "test_listing", day_old),  # gone before that parse
+            ("OTHER-SOURCE", "other_portal", day_old),  # same agency, another ingestor
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO opportunities (id, source, source_url, title, agency_name, status, "
+                    "date_added, last_seen) VALUES (:id, :source, :url, :title, 'Test Agency', 'open', "
+                    ":seen, :seen)"
+                ),
+                [
+                    {"id": str(uuid.uuid4()), "source": src, "url": f"https://x/{t}", "title": t, "seen": seen}
+                    for t, src, seen in rows
+                ],
+            )
+        await ingest_http.commit_validators()
+
+        for _ in range(3):  # a run of 304s
+            await runner.run_ingestors_once(sources=[listing_source])
+        await runner.close_missing_opportunities()
+        async with engine.begin() as conn:
+            res = await conn.execute(text("SELECT title, status FROM opportunities"))
+            statuses = dict(res.fetchall())
+        await ingest_http.close()
+        await engine.dispose()
+        return statuses
+
+    try:
+        statuses = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert [h[1] for h in _StubSite.hits] == [None, _ETAG, _ETAG, _ETAG]
+    assert statuses == {"LISTED": "open", "DELISTED": "closed", "OTHER-SOURCE": "closed"}
@@ -0,0 +1,61 @@
+# tests/test_ingest_replay.py
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.core.settings import settings
+from app.ingest import http as ingest_http
+from app.ingest import replay
+from app.ingest.browser_pool import SeleniumPool
+
+
+class _Site(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = f"<table><tr><td>{self.path}</td></tr></table>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Set-Cookie", "session=secret")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_REPLAY_DIR", str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bids"
+
+    async def fetch():
+        try:
+            with replay.source_context("app.ingest.municipalities.swaco"):
+                return await ingest_http.get_listing(url), ingest_http.get_sync(url).text
+        finally:
+            await ingest_http.close()
+
+    monkeypatch.setattr(settings, "INGEST_REPLAY", "record")
+    try:
+        live = asyncio.run(fetch())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert live[0] == "<table><tr><td>/bids</td></tr></table>"
+    meta = next((tmp_path / "swaco").glob("*.json")).read_text("utf-8")
+    assert "secret" not in meta
+
+    monkeypatch.setattr(settings, "INGEST_REPLAY", "replay")
+    assert asyncio.run(fetch()) == live  # server is gone
+
+    with replay.source_context("swaco"):
+        with pytest.raises(replay.ReplayMiss):
+            ingest_http.get_sync(url + "?page=2")
+        with pytest.raises(replay.ReplayMiss):
+            SeleniumPool("test", factory=lambda: None).acquire()
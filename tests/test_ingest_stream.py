@@ -0,0 +1,52 @@
+# tests/test_ingest_stream.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core.settings import settings
+from app.ingest import http as ingest_http
+from app.ingest import runner
+
+
+def _row(i):
+    return {"source": "test", "source_url": f"https://bids.test/{i}", "title": f"Bid {i}"}
+
+
+async def streaming_source():
+    for i in range(5):
+        yield _row(i)
+    raise TimeoutError("portal timed out on the last page")
+
+
+def listing_source():
+    return [_row(1), _row(2), _row(1)]
+
+
+def test_micro_batches_survive_a_late_failure(monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_STREAM_BATCH", 2)
+    saved_batches, runs = [], []
+
+    async def fake_save(batch, enrich):
+        saved_batches.append([r["source_url"][-1] for r in batch])
+        return len(batch), len(batch)
+
+    async def fake_record(name, changed, rows, started, outcome, error=None):
+        runs.append((name.rsplit(".", 1)[-1], rows, error is not None))
+
+    async def noop():
+        return None
+
+    monkeypatch.setattr(runner, "_save_batch", fake_save)
+    monkeypatch.setattr(runner, "_record_source_run", fake_record)
+    monkeypatch.setattr(runner, "get_ingest_cache", lambda: None)
+    monkeypatch.setattr(ingest_http, "load_validators", noop)
+    monkeypatch.setattr(ingest_http, "commit_validators", noop)
+
+    total = asyncio.run(runner.run_ingestors_once(sources=[streaming_source, listing_source]))
+
+    # streamed rows land in batches of two, the partial batch before the error too
+    assert saved_batches == [["0", "1"], ["2", "3"], ["4"], ["1", "2"]]
+    assert runs == [("test_ingest_stream", 5, True), ("test_ingest_stream", 2, False)]
+    assert total == 7
@@ -0,0 +1,104 @@
+# tests/test_job_lock.py
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import text
+
+from app.core import job_lock
+from app.core.db_core import engine
+
+
+def _at(hour, minute, second=0):
+    return datetime(2026, 3, 2, hour, minute, second, tzinfo=timezone.utc)
+
+
+def test_fire_key_is_the_current_firing():
+    every_5 = CronTrigger(minute="*/5", timezone=timezone.utc)
+    assert job_lock.fire_key_for(every_5, _at(10, 5)) == _at(10, 5).isoformat()
+    # late or skewed processes still agree on the firing they are in
+    assert job_lock.fire_key_for(every_5, _at(10, 7, 30)) == _at(10, 5).isoformat()
+    assert job_lock.fire_key_for(every_5, _at(10, 10)) == _at(10, 10).isoformat()
+
+    hourly = CronTrigger(minute=0, timezone=timezone.utc)
+    assert job_lock.fire_key_for(hourly, _at(10, 0, 2)) == _at(10, 0).isoformat()
+    assert job_lock.fire_key_for(hourly, _at(10, 14)) == _at(10, 0).isoformat()
+    # outside the grace window: the current minute
+    assert job_lock.fire_key_for(hourly, _at(10, 20, 45)) == _at(10, 20).isoformat()
+
+
+def test_same_firing_runs_once(monkeypatch):
+    # a fresh in-memory database: the lock tables have to be created again
+    monkeypatch.setattr(job_lock, "_SCHEMA_READY", False)
+    calls = []
+
+    async def body():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        try:
+            first = await asyncio.gather(
+                job_lock.run_exclusive("digest", "2026-03-02T07:00:00", body),
+                job_lock.run_exclusive("digest", "2026-03-02T07:00:00", body),
+            )
+            again = await job_lock.run_exclusive("digest", "2026-03-02T07:00:00", body)
+            runs = await job_lock.recent_job_runs("digest")
+            return first, again, runs
+        finally:
+            await engine.dispose()
+
+    first, again, runs = asyncio.run(scenario())
+    assert sorted(first, key=str) == [None, "done"] and again is None
+    assert len(calls) == 1
+    assert [(r["fire_key"], r["status"]) for r in runs] == [("2026-03-02T07:00:00", "ok")]
+
+
+def test_expired_lease_is_taken_over(monkeypatch):
+    monkeypatch.setattr(job_lock, "_SCHEMA_READY", False)
+    now = datetime.utcnow()
+
+    async def other_process_holds(job, lease_until):
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO scheduler_locks (job_name, owner, acquired_at, lease_until) "
+                    "VALUES (:job, 'other-host:1', :at, :until)"
+                ),
+                {"job": job, "at": now - timedelta(minutes=10), "until": lease_until},
+            )
+
+    async def lease_until(job):
+        async with engine.begin() as conn:
+            res = await conn.execute(
+                text("SELECT owner, lease_until FROM scheduler_locks WHERE job_name = :job"), {"job": job}
+            )
+            return res.first()
+
+    async def scenario():
+        try:
+            await job_lock.ensure_job_lock_schema()
+            await other_process_holds("live", now + timedelta(minutes=5))
+            await other_process_holds("crashed", now - timedelta(seconds=1))
+
+            live = job_lock._LeaseLock("live", 3)
+            crashed = job_lock._LeaseLock("crashed", 3)
+            got_live, got_crashed = await live.acquire(), await crashed.acquire()
+            taken = await lease_until("crashed")
+            await asyncio.sleep(1.3)  # heartbeat every lease / 3 seconds
+            renewed = await lease_until("crashed")
+            await crashed.release()
+            return got_live, got_crashed, taken, renewed, await lease_until("live"), await lease_until("crashed")
+        finally:
+            await engine.dispose()
+
+    got_live, got_crashed, taken, renewed, live_row, released = asyncio.run(scenario())
+    assert not got_live and live_row[0] == "other-host:1"
+    assert got_crashed and taken[0] == job_lock.OWNER_ID
+    assert str(renewed[1]) > str(taken[1])
+    assert released is None
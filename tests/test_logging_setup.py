@@ -0,0 +1,35 @@
+# tests/test_logging_setup.py
+import logging
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core import logging_setup
+from app.core.settings import settings
+
+
+def _access(status, ms):
+    record = logging.LogRecord(logging_setup.ACCESS_LOGGER, logging.INFO, __file__, 0, "GET /", None, None)
+    record.fields = {"status": status, "ms": ms}
+    return record
+
+
+def test_access_sampler_keeps_errors_and_slow_requests(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_ACCESS_SAMPLE", 0.0)
+    monkeypatch.setattr(settings, "LOG_ACCESS_SLOW_MS", 500)
+    sampler = logging_setup.AccessSampler()
+
+    assert not sampler.filter(_access(200, 20))
+    assert sampler.filter(_access(404, 20))
+    assert sampler.filter(_access(200, 800))
+
+    monkeypatch.setattr(settings, "LOG_ACCESS_SAMPLE", 1.0)
+    assert sampler.filter(_access(200, 20))
+
+
+def test_parse_levels_skips_bad_entries():
+    assert logging_setup.parse_levels("app.ingest=debug, httpx=WARNING, bogus=LOUD, =INFO,") == {
+        "app.ingest": logging.DEBUG,
+        "httpx": logging.WARNING,
+    }
@@ -0,0 +1,65 @@
+# tests/test_metrics.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import metrics
+
+
+def _sample(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not in metrics output")
+
+
+def test_request_db_and_llm_time_are_attributed_to_the_route():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    metrics.instrument_engine(engine, "test")
+
+    def fake_llm():
+        with metrics.llm_call("fake", "m1") as call:
+            call.prompt_tokens, call.completion_tokens = 12, 3
+        return "ok"
+
+    api = FastAPI()
+
+    @api.get("/metrics-test/{item_id}", response_class=PlainTextResponse)
+    async def item(item_id: int):
+        async with engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text("SELECT 1"))
+        await asyncio.to_thread(fake_llm)
+        return "done"
+
+    app = metrics.MetricsMiddleware(api)
+
+    async def exercise():
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                assert (await client.get("/metrics-test/1")).text == "done"
+                assert (await client.get("/metrics-test/2")).text == "done"
+                assert (await client.get("/metrics-test-missing")).status_code == 404
+        finally:
+            await engine.dispose()
+
+    asyncio.run(exercise())
+    body = metrics.render()
+
+    route = 'route="/metrics-test/{item_id}"'
+    assert _sample(body, f'http_request_duration_seconds_count{{method="GET",{route},status="200"}}') == 2
+    assert _sample(body, f"http_request_db_queries_sum{{{route}}}") == 6
+    assert _sample(body, f"http_request_llm_seconds_count{{{route}}}") == 2
+    assert _sample(body, 'db_query_duration_seconds_count{engine="test"}') == 6
+    assert _sample(body, 'llm_tokens_total{provider="fake",model="m1",kind="prompt"}') == 24
+    assert _sample(body, 'http_request_duration_seconds_count{method="GET",route="<unmatched>",status="404"}') >= 1
+    assert _sample(body, f'http_request_duration_seconds_bucket{{method="GET",{route},status="200",le="+Inf"}}') == 2
@@ -0,0 +1,112 @@
+# tests/test_migrate.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+
+from app.core import db_migrations, job_lock, migrate
+from app.core.db_core import engine
+
+
+def test_steps_apply_once_and_new_steps_alone(monkeypatch):
+    ran = []
+    base_steps, latest = len(migrate.STEPS), migrate.LATEST_VERSION
+
+    async def new_step(eng):
+        ran.append("new")
+        async with eng.begin() as conn:
+            await conn.execute(text("CREATE TABLE IF NOT EXISTS widgets (id INTEGER PRIMARY KEY)"))
+
+    async def exercise():
+        first = await migrate.run_migrations(engine)
+
+        def no_lock(*args, **kwargs):
+            raise AssertionError("current schema must not take the migration lock")
+
+        monkeypatch.setattr(job_lock, "held_lock", no_lock)
+        second = await migrate.run_migrations(engine)
+        monkeypatch.undo()
+
+        monkeypatch.setattr(migrate, "STEPS", migrate.STEPS + [(migrate.LATEST_VERSION + 1, "widgets", new_step)])
+        monkeypatch.setattr(migrate, "LATEST_VERSION", migrate.LATEST_VERSION + 1)
+        third = await migrate.run_migrations(engine)
+        return first, second, third, await migrate.current_version(engine)
+
+    async def scenario():
+        try:
+            return await exercise()
+        finally:
+            await engine.dispose()
+
+    first, second, third, version = asyncio.run(scenario())
+    assert first[0] == "create_all" and len(first) == base_steps
+    assert second == []
+    assert third == ["widgets"] and ran == ["new"]
+    assert version == latest + 1
+
+
+def test_failing_step_is_not_stamped(monkeypatch):
+    # a fresh in-memory database: the lock table has to be created again
+    monkeypatch.setattr(job_lock, "_SCHEMA_READY", False)
+
+    async def scenario():
+        try:
+            await migrate.run_migrations(engine)
+            before = await migrate.current_version(engine)
+            # ALTER TABLE on a view fails, so the real uploads step must raise
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP TABLE IF EXISTS user_uploads"))
+                await conn.execute(text("CREATE VIEW user_uploads AS SELECT 1 AS id"))
+            step = (before + 1, "uploads_schema_again", db_migrations.ensure_uploads_schema)
+            monkeypatch.setattr(migrate, "STEPS", migrate.STEPS + [step])
+            monkeypatch.setattr(migrate, "LATEST_VERSION", before + 1)
+            try:
+                await migrate.run_migrations(engine)
+            except Exception as exc:
+                error = exc
+            else:
+                error = None
+            return before, error, await migrate.current_version(engine)
+        finally:
+            await engine.dispose()
+
+    before, error, after = asyncio.run(scenario())
+    assert error is not None
+    assert after == before
+
+
+def test_source_schedule_step_adds_duration_column():
+    async def scenario():
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP TABLE IF EXISTS source_schedule"))
+                await conn.execute(text("CREATE TABLE source_schedule (source TEXT PRIMARY KEY, interval_min INTEGER)"))
+            await db_migrations.ensure_source_schedule_schema(engine)
+            await db_migrations.ensure_source_schedule_schema(engine)
+            async with engine.begin() as conn:
+                res = await conn.exec_driver_sql("PRAGMA table_info('source_schedule')")
+                return {row._mapping["name"] for row in res.fetchall()}
+        finally:
+            await engine.dispose()
+
+    assert "last_duration_s" in asyncio.run(scenario())
+
+
+def test_steps_create_the_runtime_tables():
+    # run the steps directly: run_migrations() creates the lock tables itself
+    async def scenario():
+        try:
+            for _, _, step in migrate.STEPS:
+                await step(engine)
+            async with engine.begin() as conn:
+                res = await conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")
+                return {row[0] for row in res.fetchall()}
+        finally:
+            await engine.dispose()
+
+    names = asyncio.run(scenario())
+    assert {"source_schedule", "ai_enrichment_queue", "scheduler_locks", "job_runs", "idx_job_runs_started"} <= names
+    assert {"http_validators", "crawl_cursors"} <= names
@@ -0,0 +1,124 @@
+# tests/test_ohiobuys_incremental.py
+import asyncio
+import datetime as dt
+import os
+import re
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.core.db_migrations import ensure_data_versions_schema
+from app.core.models_core import metadata
+from app.ingest import runner
+from app.ingest.crawl_cursor import due_full_crawl, load_cursor
+from app.ingest.municipalities import ohiobuys
+
+GRID = (Path(__file__).resolve().parents[1] / "ohiobuys.txt").read_text(encoding="utf-8")
+
+
+def _page(k: int, last: int) -> str:
+    # Saved grid page with page-specific solicitation IDs and a pager offering page k+1.
+    html = GRID.replace("SRC0000", f"SRC{k:02d}00")
+    nxt = f'id="body_x_grid_PagerBtn{k + 1}Page" data-page-index="{k + 1}"' if k < last else 'id="x" data-page-index="0"'
+    return re.sub(r'id="body_x_grid_PagerBtn1Page" data-page-index="1"', nxt, html)
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _Session:
+    def __init__(self, last):
+        self.last = last
+        self.posted = []
+
+    def post(self, url, data=None, **kwargs):
+        idx = int(data["hdnCurrentPageIndexbody_x_grid_grd"])
+        self.posted.append(idx)
+        return _Resp(_page(idx, self.last))
+
+
+def test_pagination_stops_at_first_fully_stored_page(monkeypatch):
+    monkeypatch.setattr(ohiobuys, "_human_delay", lambda *a, **k: None)
+    label = ohiobuys.STATUS_FILTER_LABEL
+
+    full = _Session(last=3)
+    pages = ohiobuys._collect_additional_pages(full, _page(0, 3), label)
+    assert full.posted == [1, 2, 3] and len(pages) == 3
+
+    # page 2 (and everything older) already stored, page 1 is new
+    known = {r["external_id"]: ohiobuys._row_hash(r) for r in ohiobuys._parse_rows_from_html(_page(2, 3))}
+    progress = {"pages": 1}
+    session = _Session(last=3)
+    pages = ohiobuys._collect_additional_pages(session, _page(0, 3), label, known=known, progress=progress)
+    assert session.posted == [1, 2]
+    assert progress == {"pages": 3, "stopped_early": True}
+
+    # a changed row on that page (new due date -> new hash) keeps crawling
+    changed = dict(known)
+    changed[next(iter(changed))] = "stale"
+    session = _Session(last=3)
+    ohiobuys._collect_additional_pages(session, _page(0, 3), label, known=changed)
+    assert session.posted == [1, 2, 3]
+
+
+def test_full_crawl_due():
+    assert due_full_crawl({}, 12)
+    assert due_full_crawl({"last_full_at": "2020-01-01T00:00:00"}, 12)
+    assert not due_full_crawl({"last_full_at": "2999-01-01T00:00:00"}, 12)
+
+
+def test_rows_missing_from_full_crawl_are_not_kept_alive(monkeypatch):
+    monkeypatch.setattr(ohiobuys, "INCREMENTAL_CRAWL", True)
+    now = dt.datetime.utcnow().replace(microsecond=0)
+    full_at = now - dt.timedelta(hours=30)
+    seen = {"ext": "STILL-LISTED", "last_seen": full_at + dt.timedelta(minutes=5)}
+    gone = {"ext": "WITHDRAWN", "last_seen": full_at - dt.timedelta(hours=1)}
+
+    async def exercise():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+        await ensure_data_versions_schema(engine)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO opportunities (id, source, source_url, title, agency_name, external_id, "
+                    "status, date_added, last_seen) VALUES (:id, :source, :url, :ext, 'State of Ohio', :ext, "
+                    "'open', :last_seen, :last_seen)"
+                ),
+                [
+                    {"id": str(uuid.uuid4()), "source": ohiobuys.SOURCE_NAME, "url": f"https://x/{r['ext']}", **r}
+                    for r in (seen, gone)
+                ],
+            )
+
+        # an incremental run that stopped early, after a full crawl that missed WITHDRAWN
+        cursor = {"last_full_at": full_at.isoformat(), "run_started_at": now.isoformat()}
+        await ohiobuys._finish_crawl(cursor, {"pages": 1, "stopped_early": True}, [{"external_id": "NEW"}])
+        await runner.close_missing_opportunities()
+        async with engine.begin() as conn:
+            res = await conn.execute(text("SELECT external_id, status FROM opportunities"))
+            statuses = dict(res.fetchall())
+
+        # a completed full crawl is dated from its start
+        cursor = {"run_started_at": now.isoformat()}
+        await ohiobuys._finish_crawl(cursor, {"pages": 3, "stopped_early": False}, [{"external_id": "NEW"}])
+        return statuses, await load_cursor(ohiobuys.SOURCE_NAME)
+
+    async def scenario():
+        try:
+            return await exercise()
+        finally:
+            await engine.dispose()
+
+    statuses, cursor = asyncio.run(scenario())
+    assert statuses == {"STILL-LISTED": "open", "WITHDRAWN": "closed"}
+    assert cursor["last_full_at"] == now.isoformat() and "run_started_at" not in cursor
@@ -0,0 +1,103 @@
+# tests/test_open_set.py
+import asyncio
+import datetime as dt
+import json
+import os
+import uuid
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+
+from app.core import data_version
+from app.core.db_core import engine
+from app.core.db_migrations import ensure_data_versions_schema
+from app.core.models_core import metadata
+from app.core.settings import settings
+from app.services import open_set, opportunity_feed
+
+
+def _row(title, agency, category, due_days, status="open", tags=(), added_days=-3):
+    now = dt.datetime.utcnow().replace(microsecond=0)
+    return {
+        "id": str(uuid.uuid4()),
+        "source": "test",
+        "source_url": f"https://example.gov/{uuid.uuid4()}",
+        "title": title,
+        "agency_name": agency,
+        "category": category,
+        "status": status,
+        "due_date": now + dt.timedelta(days=due_days) if due_days is not None else None,
+        "date_added": now + dt.timedelta(days=added_days),
+        "ai_tags_json": json.dumps(list(tags)),
+    }
+
+
+_INSERT = text(
+    "INSERT INTO opportunities (id, source, source_url, title, agency_name, category, status, "
+    "due_date, date_added, ai_tags_json) VALUES (:id, :source, :source_url, :title, :agency_name, "
+    ":category, :status, :due_date, :date_added, :ai_tags_json)"
+)
+
+ROWS = [
+    _row("Road resurfacing", "City of Columbus", "Construction", 3, tags=["paving", "roads"], added_days=0),
+    _row("Roof replacement", "City of Gahanna", "Construction", 12, tags=["roof"]),
+    _row("Audit services", "Delaware County", "Professional Services", 5, tags=["study"]),
+    _row("Fleet leasing", "City of Columbus", "Transportation / Fleet / Transit", None),
+    _row("Old bridge", "City of Columbus", "Construction", -30, status="closed"),
+]
+
+
+def test_feeds_match_sql_and_refresh_on_bump(monkeypatch):
+    monkeypatch.setattr(settings, "HOTSET_CHECK_S", 3600)
+    open_set.reset_open_set()
+
+    async def feeds():
+        stats, preview = await opportunity_feed.fetch_landing_snapshot(sample_limit=3)
+        feed = await opportunity_feed.fetch_interest_feed("construction", limit=5)
+        agencies = await opportunity_feed.get_top_agencies()
+        return stats, [r["title"] for r in preview], [r["title"] for r in feed], agencies
+
+    async def exercise():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            # enrichment columns are added outside the migrations
+            for col in ("ai_summary", "ai_tags_json"):
+                await conn.execute(text(f"ALTER TABLE opportunities ADD COLUMN {col} TEXT"))
+        await ensure_data_versions_schema(engine)
+        async with engine.begin() as conn:
+            await conn.execute(_INSERT, ROWS)
+
+        monkeypatch.setattr(settings, "HOTSET_ENABLED", False)
+        from_sql = await feeds()
+        monkeypatch.setattr(settings, "HOTSET_ENABLED", True)
+        from_memory = await feeds()
+
+        async with engine.begin() as conn:
+            await conn.execute(_INSERT, [_row("Late addition", "City of Gahanna", "Construction", 1)])
+        cached = len(await open_set.get_open_set())
+        await data_version.bump()
+        refreshed = await open_set.get_open_set()
+        return from_sql, from_memory, cached, refreshed
+
+    async def scenario():
+        try:
+            return await exercise()
+        finally:
+            open_set.reset_open_set()
+            await engine.dispose()
+
+    from_sql, from_memory, cached, refreshed = asyncio.run(scenario())
+
+    assert from_memory == from_sql
+    stats, preview, feed, agencies = from_memory
+    assert stats == {"total_open": 4, "closing_soon": 2, "added_recent": 1}
+    assert preview == ["Road resurfacing", "Audit services", "Roof replacement"]
+    assert feed == ["Road resurfacing", "Roof replacement", "Fleet leasing"]
+    assert agencies[0] == {"agency": "City of Columbus", "count": 3}
+
+    assert cached == 4
+    assert len(refreshed) == 5 and refreshed.version == 1
+    assert refreshed.rows[0].title == "Late addition"
+    assert [r.title for r in refreshed.select(tags=["pav"])] == ["Road resurfacing"]
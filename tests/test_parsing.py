@@ -0,0 +1,51 @@
+# tests/test_parsing.py
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.ingest import parsing
+
+LISTING = """
+<html><body>
+<table id="bids">
+  <thead><tr><th>Number</th><th>Title</th><th>Due</th></tr></thead>
+  <tbody>
+    <tr data-id="1"><td>RFQ-1</td><td> Road <b>resurfacing</b> </td><td>05/01/2026</td></tr>
+    <tr data-id="2"><td>RFQ-2</td><td>Fleet leasing</td><td></td></tr>
+  </tbody>
+</table>
+</body></html>
+"""
+
+
+def test_parse_html_reuses_the_tree_for_the_same_document():
+    parsing.clear_cache()
+    first = parsing.parse_html(LISTING)
+    same_bytes = "".join(list(LISTING))  # equal text, different object (a second fetch)
+    assert same_bytes is not LISTING
+    assert parsing.parse_html(same_bytes) is first
+    assert parsing.parse_html(LISTING, "html.parser") is parsing.parse_html(LISTING, "html.parser")
+    assert parsing.parse_html(LISTING + " ") is not first
+
+    parsing.clear_cache()
+    assert parsing.parse_html(LISTING) is not first
+
+
+def test_table_rows_with_a_header_row():
+    soup = parsing.parse_html(LISTING)
+    rows = parsing.table_rows(soup, "table#bids tr")
+    assert [cells for _, cells in rows] == [
+        ["Number", "Title", "Due"],
+        ["RFQ-1", "Road resurfacing", "05/01/2026"],
+        ["RFQ-2", "Fleet leasing", ""],
+    ]
+    # body rows only, as listing parsers select them
+    body = parsing.table_rows(soup.select_one("table#bids"), "tbody tr[data-id]")
+    assert [tr["data-id"] for tr, _ in body] == ["1", "2"]
+
+
+def test_table_rows_without_the_table():
+    soup = parsing.parse_html("<html><body><p>No open bids at this time.</p></body></html>")
+    assert parsing.table_rows(soup, "table#bids tr") == []
+    assert parsing.table_rows(soup) == []
@@ -0,0 +1,23 @@
+# tests/test_query_plans.py
+import asyncio
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core import query_plans
+
+
+def test_hot_queries_use_indexes():
+    async def run(with_indexes):
+        engine = await query_plans.scratch_engine(with_indexes=with_indexes)
+        try:
+            return await query_plans.check(engine)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run(True)) == []
+    # without the migration most hot queries scan the table
+    assert {"feed_open", "listing_agency", "digest_window", "close_missing", "touch_last_seen_source"} <= set(
+        asyncio.run(run(False))
+    )
@@ -0,0 +1,66 @@
+# tests/test_session_vault.py
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+import requests
+
+from app.core.settings import settings
+from app.ingest import session_vault
+from app.ingest.municipalities import ohiobuys
+
+
+def test_roundtrip_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_VAULT_DIR", str(tmp_path))
+    jar = requests.cookies.RequestsCookieJar()
+    soon = int(time.time()) + 600
+    jar.set("ASP.NET_SessionId", "abc", domain="ohiobuys.ohio.gov", path="/")
+    jar.set("cf_clearance", "xyz", domain=".ohio.gov", path="/", expires=soon)
+
+    saved = session_vault.save_session("portal", session_vault.from_jar(jar), state={"k": 1}, ttl_h=4)
+    assert saved.expires_at == soon  # earliest cookie expiry beats the TTL
+    assert oct((tmp_path / "portal.json").stat().st_mode & 0o777) == "0o600"
+
+    loaded = session_vault.load_session("portal")
+    restored = requests.cookies.RequestsCookieJar()
+    session_vault.apply_to_jar(restored, loaded.cookies)
+    assert restored.get("cf_clearance", domain=".ohio.gov") == "xyz"
+    assert loaded.state == {"k": 1}
+
+    # Playwright marks session cookies with expires=-1
+    pw = session_vault.from_browser([{"name": "a", "value": "1", "domain": "x", "path": "/", "expires": -1}])
+    assert pw[0]["expires"] is None
+    session_vault.save_session("old", pw, ttl_h=0)
+    assert session_vault.load_session("old") is None
+    assert not (tmp_path / "old.json").exists()
+
+
+class _Resp:
+    def __init__(self, url, text, status_code=200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+
+def test_ohiobuys_reuses_vaulted_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_VAULT_DIR", str(tmp_path))
+    monkeypatch.setattr(ohiobuys, "_human_delay", lambda *a, **k: None)
+
+    session = requests.Session()
+    session.cookies.set("auth", "ok", domain="ohiobuys.ohio.gov")
+    ohiobuys._store_vault_session(session, '<input name="__VIEWSTATE" value="vs1">')
+    assert session_vault.load_session(ohiobuys.VAULT_NAME).state["viewstate"] == "vs1"
+
+    fresh = requests.Session()
+    fresh.get = lambda url, **kw: _Resp(url, '<table id="body_x_grid_grd"></table>')
+    assert "body_x_grid_grd" in ohiobuys._resume_vault_session(fresh)
+    assert fresh.cookies.get("auth") == "ok"
+
+    # redirected to the captcha: vault entry dropped, cookies reset
+    fresh = requests.Session()
+    fresh.get = lambda url, **kw: _Resp(ohiobuys.ACCESS_CHECK_URL, "captcha")
+    assert ohiobuys._resume_vault_session(fresh, "manual=1") == ""
+    assert session_vault.load_session(ohiobuys.VAULT_NAME) is None
+    assert dict(fresh.cookies) == {"manual": "1"}
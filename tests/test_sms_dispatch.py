@@ -0,0 +1,72 @@
+# tests/test_sms_dispatch.py
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core.sms_dispatch import SmsDispatcher
+
+
+class _StubTwilio(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        to = form.get("To", [""])[0]
+        _StubTwilio.received.append((time.monotonic(), self.path, to, form.get("Body", [""])[0]))
+        if to == "+15550000000":
+            self.send_response(400)
+            self.end_headers()
+            self.wfile.write(b'{"message": "invalid number"}')
+            return
+        self.send_response(201)
+        self.send_header("content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({"sid": f"SM{len(_StubTwilio.received)}"}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTwilio)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_dispatcher_sends_rate_limited_batch():
+    _StubTwilio.received = []
+    server = _serve()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run():
+        sms = SmsDispatcher("AC123", "token", "+15551112222", api_base=base, rate_per_sec=20, concurrency=3)
+        started = time.monotonic()
+        for i in range(10):
+            sms.enqueue(f"+1555123{i:04d}", f"digest {i}")
+        sms.enqueue("+15550000000", "bad number")
+        enqueue_time = time.monotonic() - started
+        await sms.flush()
+        elapsed = time.monotonic() - started
+        await sms.close()
+        return sms, enqueue_time, elapsed
+
+    try:
+        sms, enqueue_time, elapsed = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert enqueue_time < 0.05  # enqueue never waits on HTTP
+    assert sms.stats.sent == 10
+    assert sms.stats.failed == 1
+    assert len(_StubTwilio.received) == 11
+    assert all(path == "/2010-04-01/Accounts/AC123/Messages.json" for _, path, _, _ in _StubTwilio.received)
+    # 11 messages at 20/s with a burst of 1 -> at least ~0.5s
+    assert elapsed >= 0.45
@@ -0,0 +1,67 @@
+# tests/test_source_schedule.py
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from app.core.db_core import engine
+from app.core.settings import settings
+from app.ingest import source_schedule as sched
+
+
+def _bounds(monkeypatch, lo=60, hi=720, default=120):
+    monkeypatch.setattr(settings, "SCRAPE_MIN_INTERVAL_MIN", lo)
+    monkeypatch.setattr(settings, "SCRAPE_MAX_INTERVAL_MIN", hi)
+    monkeypatch.setattr(settings, "SCRAPE_DEFAULT_INTERVAL_MIN", default)
+
+
+def test_next_interval_factor_is_clamped(monkeypatch):
+    _bounds(monkeypatch)
+    assert sched.next_interval(120, sched.TARGET_CHANGE_RATE) == 120
+    assert sched.next_interval(120, 0.4) == 150            # 0.5 / 0.4 = 1.25x
+    assert sched.next_interval(120, 0.1) == 240            # 5x, clamped to 2x
+    assert sched.next_interval(240, 1.0) == 120            # exactly 0.5x
+    assert sched.next_interval(240, 0.5 / 0.3) == 120      # 0.3x, clamped to 0.5x
+
+
+def test_next_interval_respects_bounds(monkeypatch):
+    _bounds(monkeypatch, lo=60, hi=300)
+    assert sched.next_interval(200, 0.1) == 300
+    assert sched.next_interval(90, 1.0) == 60
+    # a max below the min is raised to it
+    _bounds(monkeypatch, lo=60, hi=10)
+    assert sched.next_interval(120, 0.1) == 60
+
+
+def test_zero_change_rate_uses_the_floor(monkeypatch):
+    _bounds(monkeypatch, lo=1, hi=10_000)
+    # 0.5 / _MIN_RATE is far above 2, so a quiet source just doubles (no division by zero)
+    assert sched.next_interval(100, 0.0) == sched.next_interval(100, sched._MIN_RATE) == 200
+
+
+def test_failed_run_keeps_interval_and_retries_soon(monkeypatch):
+    _bounds(monkeypatch, lo=30, hi=720, default=120)
+    # a fresh in-memory database: the table has to be created again
+    monkeypatch.setattr(sched, "_SCHEMA_READY", False)
+
+    async def scenario():
+        try:
+            ok = await sched.record_run("swaco", changed=0, rows=10)
+            before = (await sched.get_schedule(["swaco"]))[0]
+            failed = await sched.record_run("swaco", changed=0, rows=0, error="HTTP 503")
+            after = (await sched.get_schedule(["swaco"]))[0]
+            return ok, before, failed, after
+        finally:
+            await engine.dispose()
+
+    started = datetime.utcnow()
+    ok, before, failed, after = asyncio.run(scenario())
+    assert ok == 171  # 120 * 0.5 / 0.35 (change rate eased towards "no change")
+    assert failed == ok and after["interval_min"] == ok
+    assert after["runs"] == before["runs"] == 1
+    assert after["change_rate"] == before["change_rate"]
+    assert after["last_error"] == "HTTP 503"
+    next_run = sched._as_dt(after["next_run_at"])
+    assert started + timedelta(minutes=30) <= next_run <= datetime.utcnow() + timedelta(minutes=30)
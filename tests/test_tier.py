@@ -0,0 +1,51 @@
+# tests/test_tier.py
+import asyncio
+import datetime as dt
+import os
+
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+
+from sqlalchemy import text
+
+from app.core.db_core import engine
+from app.domain.models import Base, Team, TeamMember, User
+from app.services import tier
+
+
+def test_team_tier_is_cached_until_the_owner_is_invalidated():
+    tier.invalidate_tier()
+
+    async def exercise():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(User.__table__.insert().values(
+                id="owner", email="boss@firm.com", password_hash="", tier="Professional", team_id="t1"))
+            await conn.execute(User.__table__.insert().values(
+                id="member", email="dev@firm.com", password_hash="", tier="Free", team_id="t1"))
+            await conn.execute(Team.__table__.insert().values(id="t1", name="Firm", owner_user_id="owner"))
+            for uid, email, role in (("owner", "boss@firm.com", "owner"), ("member", "dev@firm.com", "member")):
+                await conn.execute(TeamMember.__table__.insert().values(
+                    team_id="t1", user_id=uid, invited_email=email, role=role, accepted_at=dt.datetime(2025, 1, 1)))
+
+        before = await tier.get_tier_info("Dev@Firm.com")
+        async with engine.begin() as conn:  # Stripe downgrade of the owner
+            await conn.execute(text("UPDATE users SET tier = 'Starter' WHERE id = 'owner'"))
+        cached = await tier.get_tier_info("dev@firm.com")
+        tier.invalidate_tier(email="boss@firm.com")
+        after = await tier.get_tier_info("dev@firm.com")
+        anonymous = await tier.get_tier_info(None)
+        return before, cached, after, anonymous
+
+    async def scenario():
+        try:
+            return await exercise()
+        finally:
+            await engine.dispose()
+
+    before, cached, after, anonymous = asyncio.run(scenario())
+    assert (before["effective"], before["label"], before["source"]) == ("Professional", "Professional (via Team)", "team")
+    assert (before["team_name"], before["team_member_count"]) == ("Firm", 2)
+    assert cached["effective"] == "Professional"
+    assert after["label"] == "Starter (via Team)"
+    assert anonymous == tier.default_tier_info()